@@ -87,6 +87,14 @@ from .helpers import (
     translation,
 )
 from .helpers.dispatcher import async_dispatcher_send_internal
+from .helpers.integration_snapshot import IntegrationSnapshot
+from .helpers.json import save_json
+from .helpers.startup_trace import (
+    STARTUP_TRACE_FILE,
+    StartupTrace,
+    async_enable_startup_trace,
+    get_startup_trace,
+)
 from .helpers.storage import get_internal_store_manager
 from .helpers.system_info import async_get_system_info, is_official_image
 from .helpers.typing import ConfigType
@@ -263,6 +271,8 @@ async def async_setup_hass(
         """Create the hass object and do basic setup."""
         hass = core.HomeAssistant(runtime_config.config_dir)
         loader.async_setup(hass)
+        if runtime_config.startup_trace:
+            async_enable_startup_trace(hass)
 
         await async_enable_logging(
             hass,
@@ -434,6 +444,7 @@ async def async_load_base_functionality(hass: core.HomeAssistant) -> None:
         create_eager_task(label_registry.async_load(hass)),
         hass.async_add_executor_job(_init_blocking_io_modules_in_executor),
         create_eager_task(template.async_load_custom_templates(hass)),
+        create_eager_task(template.async_load_bytecode_cache(hass)),
         create_eager_task(restore_state.async_load(hass)),
         create_eager_task(hass.config_entries.async_initialize()),
         create_eager_task(async_get_system_info(hass)),
@@ -972,9 +983,15 @@ async def _async_set_up_integrations(
     watcher = _WatchPendingSetups(hass, _setup_started(hass))
     watcher.async_start()
 
+    # Resolving the integrations is skipped for the integrations
+    # in the snapshot of the previous start
+    snapshot = IntegrationSnapshot(hass)
+    await snapshot.async_load()
+
     domains_to_setup, integration_cache = await _async_resolve_domains_to_setup(
         hass, config
     )
+    snapshot.async_preimport(domains_to_setup)
 
     # Initialize recorder
     if "recorder" in domains_to_setup:
@@ -983,6 +1000,7 @@ async def _async_set_up_integrations(
     pre_stage_domains = [
         (name, domains_to_setup & domain_group) for name, domain_group in SETUP_ORDER
     ]
+    trace = get_startup_trace(hass)
 
     # calculate what components to setup in what stage
     stage_1_domains: set[str] = set()
@@ -1020,11 +1038,17 @@ async def _async_set_up_integrations(
                 for dep in integration.all_dependencies
             )
             async_set_domains_to_be_loaded(hass, to_be_loaded)
+            if trace is not None:
+                trace.async_add_stage(name, domain_group)
             await async_setup_multi_components(hass, domain_group, config)
 
     # Enables after dependencies when setting up stage 1 domains
     async_set_domains_to_be_loaded(hass, stage_1_domains)
 
+    if trace is not None:
+        trace.async_add_stage("stage 1", stage_1_domains)
+        trace.async_add_stage("stage 2", stage_2_domains)
+
     # Start setup
     if stage_1_domains:
         _LOGGER.info("Setting up stage 1: %s", stage_1_domains)
@@ -1067,6 +1091,7 @@ async def _async_set_up_integrations(
         )
 
     watcher.async_stop()
+    snapshot.async_schedule_save()
 
     if _LOGGER.isEnabledFor(logging.DEBUG):
         setup_time = async_get_setup_timings(hass)
@@ -1074,3 +1099,27 @@ async def _async_set_up_integrations(
             "Integration setup times: %s",
             dict(sorted(setup_time.items(), key=itemgetter(1), reverse=True)),
         )
+
+    if trace is not None:
+        await _async_save_startup_trace(hass, trace)
+
+
+async def _async_save_startup_trace(
+    hass: core.HomeAssistant, trace: StartupTrace
+) -> None:
+    """Save the startup trace and log its critical path."""
+    trace.async_finish()
+    path = hass.config.path(STARTUP_TRACE_FILE)
+    try:
+        await hass.async_add_executor_job(save_json, path, trace.as_chrome_trace())
+    except HomeAssistantError as err:
+        _LOGGER.error("Unable to save the startup trace: %s", err)
+        return
+    _LOGGER.info(
+        "Startup trace saved to %s, critical path: %s",
+        path,
+        " -> ".join(
+            f"{entry.domain} ({entry.end - entry.start:.2f}s)"
+            for entry in trace.critical_path()
+        ),
+    )
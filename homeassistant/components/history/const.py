@@ -5,3 +5,10 @@ DOMAIN = "history"
 EVENT_COALESCE_TIME = 0.35
 
 MAX_PENDING_HISTORY_STATES = 2048
+
+# The minimum number of states sent in each message of a chunked response
+HISTORY_CHUNK_STATES = 4096
+
+# A chunked response waits for the client to read pending messages
+# until there are no more than this many before sending another chunk
+MAX_PENDING_HISTORY_CHUNK_MSG = 64
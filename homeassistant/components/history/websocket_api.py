@@ -13,6 +13,7 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance, history
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.websocket_api import ActiveConnection, messages
 from homeassistant.const import (
     COMPRESSED_STATE_ATTRIBUTES,
@@ -38,7 +39,12 @@ from homeassistant.helpers.json import json_bytes
 from homeassistant.util.async_ import create_eager_task
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import (
+    EVENT_COALESCE_TIME,
+    HISTORY_CHUNK_STATES,
+    MAX_PENDING_HISTORY_CHUNK_MSG,
+    MAX_PENDING_HISTORY_STATES,
+)
 from .helpers import entities_may_have_state_changes_after, has_recorder_run_after
 
 _LOGGER = logging.getLogger(__name__)
@@ -93,6 +99,119 @@ def _ws_get_significant_states(
     )
 
 
+def _ws_get_significant_states_chunk(
+    hass: HomeAssistant,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> tuple[bytes | None, list[str]]:
+    """Fetch the next chunk of history significant_states from the executor.
+
+    Each chunk is fetched with its own session, so the session is not held
+    while the client reads the chunks.
+    """
+    with session_scope(hass=hass, read_only=True) as session:
+        states, entity_ids = history.get_significant_states_chunk_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            HISTORY_CHUNK_STATES,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            True,
+        )
+    if not states:
+        return None, entity_ids
+    return json_bytes(messages.event_message(msg_id, {"states": states})), entity_ids
+
+
+async def _async_send_chunked_history(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> None:
+    """Send the history as chunks of entities followed by a done message.
+
+    The next chunk is only fetched once the client has read the previous
+    chunks, so only a few chunks are in memory at any time.
+    """
+    unsub = callback(lambda: None)
+    connection.subscriptions[msg_id] = unsub
+    connection.send_result(msg_id)
+    instance = get_instance(hass)
+    try:
+        while entity_ids:
+            await connection.async_wait_send_queue(MAX_PENDING_HISTORY_CHUNK_MSG)
+            if connection.subscriptions.get(msg_id) is not unsub:
+                return
+            payload, entity_ids = await instance.async_add_executor_job(
+                _ws_get_significant_states_chunk,
+                hass,
+                msg_id,
+                start_time,
+                end_time,
+                entity_ids,
+                include_start_time_state,
+                significant_changes_only,
+                minimal_response,
+                no_attributes,
+            )
+            if connection.subscriptions.get(msg_id) is not unsub:
+                return
+            if payload is not None:
+                connection.send_message(payload)
+    except Exception:
+        _LOGGER.exception("Error fetching the history of %s", entity_ids)
+        if connection.subscriptions.get(msg_id) is unsub:
+            connection.subscriptions.pop(msg_id)
+            connection.send_event(
+                msg_id,
+                {
+                    "states": {},
+                    "done": True,
+                    "error": {
+                        "code": websocket_api.ERR_UNKNOWN_ERROR,
+                        "message": "Error fetching the history",
+                    },
+                },
+            )
+        return
+    if connection.subscriptions.get(msg_id) is not unsub:
+        return
+    connection.subscriptions.pop(msg_id)
+    connection.send_message(
+        json_bytes(messages.event_message(msg_id, {"states": {}, "done": True}))
+    )
+
+
+@callback
+def _async_send_empty_history(
+    connection: ActiveConnection, msg_id: int, chunked: bool
+) -> None:
+    """Send an empty history response."""
+    if not chunked:
+        connection.send_result(msg_id, {})
+        return
+    connection.send_result(msg_id)
+    connection.send_event(msg_id, {"states": {}, "done": True})
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "history/history_during_period",
@@ -103,6 +222,7 @@ def _ws_get_significant_states(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("chunked", default=False): bool,
     }
 )
 @websocket_api.async_response
@@ -128,8 +248,9 @@ async def ws_get_history_during_period(
     else:
         end_time = None
 
+    chunked: bool = msg["chunked"]
     if start_time > dt_util.utcnow():
-        connection.send_result(msg["id"], {})
+        _async_send_empty_history(connection, msg["id"], chunked)
         return
 
     entity_ids: list[str] = msg["entity_ids"]
@@ -149,12 +270,27 @@ async def ws_get_history_during_period(
             hass, entity_ids, start_time, no_attributes
         )
     ):
-        connection.send_result(msg["id"], {})
+        _async_send_empty_history(connection, msg["id"], chunked)
         return
 
     significant_changes_only = msg["significant_changes_only"]
     minimal_response = msg["minimal_response"]
 
+    if chunked:
+        await _async_send_chunked_history(
+            hass,
+            connection,
+            msg["id"],
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        )
+        return
+
     connection.send_message(
         await get_instance(hass).async_add_executor_job(
             _ws_get_significant_states,
@@ -9,6 +9,7 @@ from typing import TYPE_CHECKING, Any, Final, NamedTuple, cast
 from propcache import cached_property
 from sqlalchemy.engine.row import Row
 
+from homeassistant.components.recorder.compression import shared_json_text
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import (
     bytes_to_ulid_or_none,
@@ -62,7 +63,7 @@ class LazyEventPartialState:
             self.data = event_data
         else:
             self.data = event_data_cache[source] = cast(
-                dict[str, Any], json_loads(source)
+                dict[str, Any], json_loads(shared_json_text(source))
             )
 
     @cached_property
@@ -109,6 +110,8 @@ STATE_POS: Final = 7
 ENTITY_ID_POS: Final = 8
 ICON_POS: Final = 9
 CONTEXT_ONLY_POS: Final = 10
+# - For rows of the database, additional fields are:
+ROW_TYPE_POS: Final = 11
 # - For EventAsRow, additional fields are:
 DATA_POS: Final = 11
 CONTEXT_POS: Final = 12
@@ -5,12 +5,15 @@ from __future__ import annotations
 from collections.abc import Callable, Generator, Sequence
 from dataclasses import dataclass
 from datetime import datetime as dt
+from itertools import islice
 import logging
 import time
 from typing import TYPE_CHECKING, Any
 
 from sqlalchemy.engine import Result
 from sqlalchemy.engine.row import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components.recorder import get_instance
 from homeassistant.components.recorder.filters import Filters
@@ -72,6 +75,7 @@ from .models import (
     EVENT_TYPE_POS,
     ICON_POS,
     ROW_ID_POS,
+    ROW_TYPE_POS,
     STATE_POS,
     TIME_FIRED_TS_POS,
     EventAsRow,
@@ -84,6 +88,11 @@ from .queries.common import PSEUDO_EVENT_STATE_CHANGED
 
 _LOGGER = logging.getLogger(__name__)
 
+# The number of rows selected at a time when paging through the logbook
+LOGBOOK_PAGE_SIZE = 2048
+# The number of contexts kept to link later pages to
+MAX_CONTEXT_LOOKUP_SIZE = 16384
+
 
 @dataclass(slots=True)
 class LogbookRun:
@@ -157,33 +166,105 @@ class EventProcessor:
     ) -> list[dict[str, Any]]:
         """Get events for a period of time."""
         with session_scope(hass=self.hass, read_only=True) as session:
-            metadata_ids: list[int] | None = None
-            instance = get_instance(self.hass)
-            if self.entity_ids:
-                metadata_ids = extract_metadata_ids(
-                    instance.states_meta_manager.get_many(
-                        self.entity_ids, session, False
-                    )
-                )
-            event_type_ids = tuple(
-                extract_event_type_ids(
-                    instance.event_type_manager.get_many(self.event_types, session)
-                )
-            )
-            stmt = statement_for_request(
-                start_day,
-                end_day,
-                event_type_ids,
-                self.entity_ids,
-                metadata_ids,
-                self.device_ids,
-                self.filters,
-                self.context_id,
-            )
+            stmt = self._statement_for_request(session, start_day, end_day)
             return self.humanify(
                 execute_stmt_lambda_element(session, stmt, orm_rows=False)
             )
 
+    def get_events_page(
+        self,
+        start_day: dt,
+        end_day: dt,
+        after: tuple[float, int, int] | None,
+        page_size: int = LOGBOOK_PAGE_SIZE,
+    ) -> tuple[list[dict[str, Any]], tuple[float, int, int] | None]:
+        """Get a page of events for a period of time.
+
+        Returns the events and the key to pass as after to get the next
+        page, or None if this is the last page. Contexts are only linked
+        across pages when the pages are fetched with the same processor.
+        """
+        with session_scope(hass=self.hass, read_only=True) as session:
+            stmt = self._statement_for_request(
+                session, start_day, end_day, page_size, after
+            )
+            rows = execute_stmt_lambda_element(session, stmt, orm_rows=False)
+            events = self.humanify(rows)
+        self._trim_page_caches()
+        if len(rows) < page_size:
+            return events, None
+        last_row = rows[-1]
+        return events, (
+            last_row[TIME_FIRED_TS_POS],
+            last_row[ROW_ID_POS],
+            last_row[ROW_TYPE_POS],
+        )
+
+    def iter_events(
+        self,
+        start_day: dt,
+        end_day: dt,
+        page_size: int = LOGBOOK_PAGE_SIZE,
+    ) -> Generator[dict[str, Any]]:
+        """Generate the events for a period of time a page at a time.
+
+        Only a page of rows is held in memory, so it can be used for
+        long periods of time.
+        """
+        after: tuple[float, int, int] | None = None
+        while True:
+            events, after = self.get_events_page(start_day, end_day, after, page_size)
+            yield from events
+            if after is None:
+                return
+
+    def _statement_for_request(
+        self,
+        session: Session,
+        start_day: dt,
+        end_day: dt,
+        limit: int | None = None,
+        after: tuple[float, int, int] | None = None,
+    ) -> StatementLambdaElement:
+        """Generate the statement for the request."""
+        metadata_ids: list[int] | None = None
+        instance = get_instance(self.hass)
+        if self.entity_ids:
+            metadata_ids = extract_metadata_ids(
+                instance.states_meta_manager.get_many(self.entity_ids, session, False)
+            )
+        event_type_ids = tuple(
+            extract_event_type_ids(
+                instance.event_type_manager.get_many(self.event_types, session)
+            )
+        )
+        return statement_for_request(
+            start_day,
+            end_day,
+            event_type_ids,
+            self.entity_ids,
+            metadata_ids,
+            self.device_ids,
+            self.filters,
+            self.context_id,
+            limit,
+            after,
+        )
+
+    def _trim_page_caches(self) -> None:
+        """Drop the cached rows which are unlikely to be needed by later pages.
+
+        Events are only cached for the rows of the page, and only the
+        rows of the most recent contexts are kept to link later rows to.
+        """
+        self.logbook_run.event_cache.clear()
+        context_lookup = self.logbook_run.context_lookup
+        if (excess := len(context_lookup) - MAX_CONTEXT_LOOKUP_SIZE) > 0:
+            # The lookup is ordered from the oldest to the newest context
+            # and the first key is None which must always be kept
+            for context_id_bin in list(islice(context_lookup, 1, excess + 1)):
+                del context_lookup[context_id_bin]
+
     def humanify(
         self, rows: Generator[EventAsRow] | Sequence[Row] | Result
     ) -> list[dict[str, str]]:
@@ -4,14 +4,17 @@ from __future__ import annotations
 
 from collections.abc import Collection
 from datetime import datetime as dt
+import math
 
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
+from homeassistant.components.recorder.db_schema import Events
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import ulid_to_bytes_or_none
 from homeassistant.helpers.json import json_dumps
 
 from .all import all_stmt
+from .common import select_page, select_page_after
 from .devices import devices_stmt
 from .entities import entities_stmt
 from .entities_and_devices import entities_devices_stmt
@@ -26,10 +29,55 @@ def statement_for_request(
     device_ids: list[str] | None = None,
     filters: Filters | None = None,
     context_id: str | None = None,
+    limit: int | None = None,
+    after: tuple[float, int, int] | None = None,
 ) -> StatementLambdaElement:
-    """Generate the logbook statement for a logbook request."""
+    """Generate the logbook statement for a logbook request.
+
+    When a limit is passed, a page of at most limit rows is selected,
+    ordered by time fired, row id and row type, which starts after the
+    time fired, row id and row type of the last row of the previous page.
+    """
     start_day = start_day_dt.timestamp()
     end_day = end_day_dt.timestamp()
+    if after is not None:
+        # The rows of the page are fired at or after the last row
+        # of the previous page, which lets the database skip over
+        # the rows of the previous pages with the time fired indices
+        start_day = max(start_day, math.nextafter(after[0], -math.inf))
+    stmt = _statement_for_window(
+        start_day,
+        end_day,
+        event_type_ids,
+        entity_ids,
+        states_metadata_ids,
+        device_ids,
+        filters,
+        context_id,
+    )
+    if limit is None:
+        stmt += lambda s: s.order_by(Events.time_fired_ts)
+    elif after is None:
+        stmt += lambda s: select_page(s, limit)
+    else:
+        after_time_fired_ts, after_row_id, after_row_type = after
+        stmt += lambda s: select_page_after(
+            s, after_time_fired_ts, after_row_id, after_row_type, limit
+        )
+    return stmt
+
+
+def _statement_for_window(
+    start_day: float,
+    end_day: float,
+    event_type_ids: tuple[int, ...],
+    entity_ids: list[str] | None,
+    states_metadata_ids: Collection[int] | None,
+    device_ids: list[str] | None,
+    filters: Filters | None,
+    context_id: str | None,
+) -> StatementLambdaElement:
+    """Generate the unordered logbook statement for a time window."""
     # No entities: logbook sends everything for the timeframe
     # limited by the context_id and the yaml configured filter
     if not entity_ids and not device_ids:
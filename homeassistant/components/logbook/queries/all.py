@@ -43,7 +43,6 @@ def all_stmt(
     else:
         stmt += lambda s: s.union_all(_states_query_for_all(start_day, end_day))
 
-    stmt += lambda s: s.order_by(Events.time_fired_ts)
     return stmt
 
 
@@ -8,13 +8,14 @@ import sqlalchemy
 from sqlalchemy import select
 from sqlalchemy.sql.elements import BooleanClauseList, ColumnElement
 from sqlalchemy.sql.expression import literal
-from sqlalchemy.sql.selectable import Select
+from sqlalchemy.sql.selectable import CompoundSelect, Select
 
 from homeassistant.components.recorder.db_schema import (
     EVENTS_CONTEXT_ID_BIN_INDEX,
     OLD_FORMAT_ATTRS_JSON,
     OLD_STATE,
     SHARED_ATTRS_JSON,
+    SHARED_ATTRS_TEXT,
     SHARED_DATA_OR_LEGACY_EVENT_DATA,
     STATES_CONTEXT_ID_BIN_INDEX,
     EventData,
@@ -106,6 +107,60 @@ EVENT_ROWS_NO_STATES = (
 CONTEXT_ONLY = literal(value="1", type_=sqlalchemy.String).label("context_only")
 NOT_CONTEXT_ONLY = literal(value=None, type_=sqlalchemy.String).label("context_only")
 
+# Virtual column to tell the rows of events and states apart
+# since they are numbered separately and their row ids may be the same
+EVENT_ROW_TYPE = literal(value=0, type_=sqlalchemy.Integer).label("row_type")
+STATE_ROW_TYPE = literal(value=1, type_=sqlalchemy.Integer).label("row_type")
+
+
+def select_page(sel: Select | CompoundSelect, limit: int) -> Select:
+    """Select the first page of rows ordered by time fired, row id and row type.
+
+    Rows from outer joins without a match have no time fired and
+    are left out since they can't be paged through.
+    """
+    page = sel.subquery()
+    return (
+        select(page)
+        .where(page.c.time_fired_ts.is_not(None))
+        .order_by(page.c.time_fired_ts, page.c.row_id, page.c.row_type)
+        .limit(limit)
+    )
+
+
+def select_page_after(
+    sel: Select | CompoundSelect,
+    after_time_fired_ts: float,
+    after_row_id: int,
+    after_row_type: int,
+    limit: int,
+) -> Select:
+    """Select the page of rows after a time fired, row id and row type.
+
+    Events and states are numbered separately, so an event and a state
+    fired at the same time may have the same row id. The row type tells
+    them apart so neither of them is left out.
+    """
+    page = sel.subquery()
+    return (
+        select(page)
+        .where(
+            (page.c.time_fired_ts > after_time_fired_ts)
+            | (
+                (page.c.time_fired_ts == after_time_fired_ts)
+                & (
+                    (page.c.row_id > after_row_id)
+                    | (
+                        (page.c.row_id == after_row_id)
+                        & (page.c.row_type > after_row_type)
+                    )
+                )
+            )
+        )
+        .order_by(page.c.time_fired_ts, page.c.row_id, page.c.row_type)
+        .limit(limit)
+    )
+
 
 def select_events_context_id_subquery(
     start_day: float,
@@ -128,7 +183,7 @@ def select_events_context_only() -> Select:
     By marking them as context_only we know they are only for
     linking context ids and we can avoid processing them.
     """
-    return select(*EVENT_ROWS_NO_STATES, CONTEXT_ONLY)
+    return select(*EVENT_ROWS_NO_STATES, CONTEXT_ONLY, EVENT_ROW_TYPE)
 
 
 def select_states_context_only() -> Select:
@@ -138,7 +193,10 @@ def select_states_context_only() -> Select:
     linking context ids and we can avoid processing them.
     """
     return select(
-        *EVENT_COLUMNS_FOR_STATE_SELECT, *STATE_CONTEXT_ONLY_COLUMNS, CONTEXT_ONLY
+        *EVENT_COLUMNS_FOR_STATE_SELECT,
+        *STATE_CONTEXT_ONLY_COLUMNS,
+        CONTEXT_ONLY,
+        STATE_ROW_TYPE,
     )
 
 
@@ -147,7 +205,7 @@ def select_events_without_states(
 ) -> Select:
     """Generate an events select that does not join states."""
     return (
-        select(*EVENT_ROWS_NO_STATES, NOT_CONTEXT_ONLY)
+        select(*EVENT_ROWS_NO_STATES, NOT_CONTEXT_ONLY, EVENT_ROW_TYPE)
         .where((Events.time_fired_ts > start_day) & (Events.time_fired_ts < end_day))
         .where(Events.event_type_id.in_(event_type_ids))
         .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
@@ -161,6 +219,7 @@ def select_states() -> Select:
         *EVENT_COLUMNS_FOR_STATE_SELECT,
         *STATE_COLUMNS,
         NOT_CONTEXT_ONLY,
+        STATE_ROW_TYPE,
     )
 
 
@@ -247,7 +306,7 @@ def _conditionally_continuous_domain_matcher() -> ColumnElement[bool]:
 
 def _not_uom_attributes_matcher() -> BooleanClauseList:
     """Prefilter ATTR_UNIT_OF_MEASUREMENT as its much faster in sql."""
-    return ~StateAttributes.shared_attrs.like(
+    return ~SHARED_ATTRS_TEXT.like(
         UNIT_OF_MEASUREMENT_JSON_LIKE
     ) | ~States.attributes.like(UNIT_OF_MEASUREMENT_JSON_LIKE)
 
@@ -91,7 +91,7 @@ def devices_stmt(
             end_day,
             event_type_ids,
             json_quotable_device_ids,
-        ).order_by(Events.time_fired_ts)
+        )
     )
 
 
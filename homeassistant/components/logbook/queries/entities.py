@@ -111,7 +111,7 @@ def entities_stmt(
             event_type_ids,
             states_metadata_ids,
             json_quoted_entity_ids,
-        ).order_by(Events.time_fired_ts)
+        )
     )
 
 
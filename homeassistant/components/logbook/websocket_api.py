@@ -35,6 +35,8 @@ EVENT_COALESCE_TIME = 0.35
 BIG_QUERY_HOURS = 25
 # how many hours to deliver in the first chunk when we split the query
 BIG_QUERY_RECENT_HOURS = 24
+# the largest page of rows that can be requested
+MAX_PAGE_SIZE = 10000
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -102,58 +104,93 @@ async def _async_send_historical_events(
     )
 
     if not is_big_query:
-        message, last_event_time = await _async_get_ws_stream_events(
+        return await _async_send_historical_pages(
             hass,
+            connection,
             msg_id,
             start_time,
             end_time,
             event_processor,
             partial,
+            force_send,
         )
-        # If there is no last_event_time, there are no historical
-        # results, but we still send an empty message
-        # if its the last one (not partial) so
-        # consumers of the api know their request was
-        # answered but there were no results
-        if last_event_time or not partial or force_send:
-            connection.send_message(message)
-        return last_event_time
 
     # This is a big query so we deliver
     # the first three hours and then
     # we fetch the old data
     recent_query_start = end_time - timedelta(hours=BIG_QUERY_RECENT_HOURS)
-    recent_message, recent_query_last_event_time = await _async_get_ws_stream_events(
+    recent_query_last_event_time = await _async_send_historical_pages(
         hass,
+        connection,
         msg_id,
         recent_query_start,
         end_time,
         event_processor,
         partial=True,
+        force_send=False,
     )
-    if recent_query_last_event_time:
-        connection.send_message(recent_message)
-
-    older_message, older_query_last_event_time = await _async_get_ws_stream_events(
+    older_query_last_event_time = await _async_send_historical_pages(
         hass,
+        connection,
         msg_id,
         start_time,
         recent_query_start,
         event_processor,
         partial,
+        force_send,
     )
-    # If there is no last_event_time, there are no historical
-    # results, but we still send an empty message
-    # if its the last one (not partial) so
-    # consumers of the api know their request was
-    # answered but there were no results
-    if older_query_last_event_time or not partial or force_send:
-        connection.send_message(older_message)
 
     # Returns the time of the newest event
     return recent_query_last_event_time or older_query_last_event_time
 
 
+async def _async_send_historical_pages(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    event_processor: EventProcessor,
+    partial: bool,
+    force_send: bool,
+) -> dt | None:
+    """Deliver the historical data of a time window a page at a time.
+
+    Every page is sent in its own message, so months of history can be
+    delivered without holding all of it in memory at once.
+    """
+    last_event_time: dt | None = None
+    sent = False
+    after: tuple[float, int, int] | None = None
+    while True:
+        (
+            message,
+            page_last_event_time,
+            after,
+        ) = await _async_get_ws_stream_events(
+            hass,
+            msg_id,
+            start_time,
+            end_time,
+            event_processor,
+            partial,
+            after,
+        )
+        # If there is no last_event_time, there are no historical
+        # results, but we still send an empty message
+        # if its the last one (not partial) so
+        # consumers of the api know their request was
+        # answered but there were no results
+        if page_last_event_time or (
+            after is None and (not partial or (force_send and not sent))
+        ):
+            connection.send_message(message)
+            sent = True
+        last_event_time = page_last_event_time or last_event_time
+        if after is None:
+            return last_event_time
+
+
 async def _async_get_ws_stream_events(
     hass: HomeAssistant,
     msg_id: int,
@@ -161,8 +198,9 @@ async def _async_get_ws_stream_events(
     end_time: dt,
     event_processor: EventProcessor,
     partial: bool,
-) -> tuple[bytes, dt | None]:
-    """Async wrapper around _ws_formatted_get_events."""
+    after: tuple[float, int, int] | None,
+) -> tuple[bytes, dt | None, tuple[float, int, int] | None]:
+    """Async wrapper around _ws_stream_get_events."""
     return await get_instance(hass).async_add_executor_job(
         _ws_stream_get_events,
         msg_id,
@@ -170,6 +208,7 @@ async def _async_get_ws_stream_events(
         end_time,
         event_processor,
         partial,
+        after,
     )
 
 
@@ -190,20 +229,21 @@ def _ws_stream_get_events(
     end_day: dt,
     event_processor: EventProcessor,
     partial: bool,
-) -> tuple[bytes, dt | None]:
-    """Fetch events and convert them to json in the executor."""
-    events = event_processor.get_events(start_day, end_day)
+    after: tuple[float, int, int] | None,
+) -> tuple[bytes, dt | None, tuple[float, int, int] | None]:
+    """Fetch a page of events and convert them to json in the executor."""
+    events, after = event_processor.get_events_page(start_day, end_day, after)
     last_time = None
     if events:
         last_time = dt_util.utc_from_timestamp(events[-1]["when"])
     message = _generate_stream_message(events, start_day, end_day)
-    if partial:
+    if partial or after is not None:
         # This is a hint to consumers of the api that
         # we are about to send a another block of historical
         # data in case the UI needs to show that historical
         # data is still loading in the future
         message["partial"] = True
-    return json_bytes(messages.event_message(msg_id, message)), last_time
+    return json_bytes(messages.event_message(msg_id, message)), last_time, after
 
 
 async def _async_events_consumer(
@@ -441,6 +481,23 @@ def _ws_formatted_get_events(
     )
 
 
+def _ws_formatted_get_events_page(
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    event_processor: EventProcessor,
+    after: tuple[float, int, int] | None,
+    page_size: int,
+) -> bytes:
+    """Fetch a page of events and convert them to json in the executor."""
+    events, next_page = event_processor.get_events_page(
+        start_time, end_time, after, page_size
+    )
+    return json_bytes(
+        messages.result_message(msg_id, {"events": events, "next_page": next_page})
+    )
+
+
 @websocket_api.websocket_command(
     {
         vol.Required("type"): "logbook/get_events",
@@ -449,13 +506,20 @@ def _ws_formatted_get_events(
         vol.Optional("entity_ids"): [str],
         vol.Optional("device_ids"): [str],
         vol.Optional("context_id"): str,
+        vol.Optional("page_size"): vol.All(int, vol.Range(min=1, max=MAX_PAGE_SIZE)),
+        vol.Optional("after"): vol.ExactSequence([vol.Coerce(float), int, int]),
     }
 )
 @websocket_api.async_response
 async def ws_get_events(
     hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
 ) -> None:
-    """Handle logbook get events websocket command."""
+    """Handle logbook get events websocket command.
+
+    When a page size is passed, the result holds a page of events and
+    the next_page key to pass as after to get the next page, which is
+    None on the last page.
+    """
     start_time_str = msg["start_time"]
     end_time_str = msg.get("end_time")
     utc_now = dt_util.utcnow()
@@ -500,6 +564,21 @@ async def ws_get_events(
         include_entity_name=False,
     )
 
+    if (page_size := msg.get("page_size")) is not None:
+        after = msg.get("after")
+        connection.send_message(
+            await get_instance(hass).async_add_executor_job(
+                _ws_formatted_get_events_page,
+                msg["id"],
+                start_time,
+                end_time,
+                event_processor,
+                tuple(after) if after else None,
+                page_size,
+            )
+        )
+        return
+
     connection.send_message(
         await get_instance(hass).async_add_executor_job(
             _ws_formatted_get_events,
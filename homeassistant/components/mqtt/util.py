@@ -145,6 +145,106 @@ class EnsureJobAfterCooldown:
             _LOGGER.exception("Error cleaning up task")
 
 
+class _TopicTrieNode[_T]:
+    """A node in the topic trie, representing one topic level."""
+
+    __slots__ = ("children", "values")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: dict[str, _TopicTrieNode[_T]] = {}
+        self.values: set[_T] = set()
+
+
+class TopicTrie[_T]:
+    """Route topics to values registered on (wildcard) topic filters.
+
+    Values are stored in a trie keyed by topic level, so the cost of
+    matching a topic depends on the depth of the topic and not on the
+    number of registered filters. The `+` and `#` wildcards follow the
+    MQTT specification, including section 4.7.2 where filters starting
+    with a wildcard do not match topics starting with `$`.
+    """
+
+    __slots__ = ("_filters", "_root")
+
+    def __init__(self) -> None:
+        """Initialize the topic trie."""
+        self._root: _TopicTrieNode[_T] = _TopicTrieNode()
+        self._filters: dict[str, int] = {}
+
+    def __contains__(self, topic_filter: object) -> bool:
+        """Return True if a value is registered on the topic filter."""
+        return topic_filter in self._filters
+
+    def __len__(self) -> int:
+        """Return the number of registered values."""
+        return sum(self._filters.values())
+
+    def add(self, topic_filter: str, value: _T) -> None:
+        """Register a value on a topic filter."""
+        node = self._root
+        for level in topic_filter.split("/"):
+            if (child := node.children.get(level)) is None:
+                child = node.children[level] = _TopicTrieNode()
+            node = child
+        if value in node.values:
+            return
+        node.values.add(value)
+        self._filters[topic_filter] = self._filters.get(topic_filter, 0) + 1
+
+    def remove(self, topic_filter: str, value: _T) -> None:
+        """Remove a value from a topic filter.
+
+        Raises KeyError if the value is not registered on the topic filter.
+        """
+        path: list[tuple[_TopicTrieNode[_T], str]] = []
+        node = self._root
+        for level in topic_filter.split("/"):
+            path.append((node, level))
+            node = node.children[level]
+        node.values.remove(value)
+        if (count := self._filters[topic_filter] - 1) == 0:
+            del self._filters[topic_filter]
+        else:
+            self._filters[topic_filter] = count
+        # Prune the branch if it is no longer used
+        for parent, level in reversed(path):
+            child = parent.children[level]
+            if child.values or child.children:
+                break
+            del parent.children[level]
+
+    def clear(self) -> None:
+        """Remove all registered values."""
+        self._root = _TopicTrieNode()
+        self._filters.clear()
+
+    def match(self, topic: str) -> list[_T]:
+        """Return the values of all topic filters matching the topic."""
+        levels = topic.split("/")
+        last = len(levels)
+        # Wildcards at the first level do not match topics starting with $
+        wildcards_at_root = not topic.startswith("$")
+        matches: list[_T] = []
+        stack: list[tuple[_TopicTrieNode[_T], int]] = [(self._root, 0)]
+        while stack:
+            node, index = stack.pop()
+            children = node.children
+            wildcards = index > 0 or wildcards_at_root
+            # A multi-level wildcard also matches the parent level
+            if wildcards and (multi := children.get("#")) is not None:
+                matches.extend(multi.values)
+            if index == last:
+                matches.extend(node.values)
+                continue
+            if (child := children.get(levels[index])) is not None:
+                stack.append((child, index + 1))
+            if wildcards and (single := children.get("+")) is not None:
+                stack.append((single, index + 1))
+        return matches
+
+
 def platforms_from_config(config: list[ConfigType]) -> set[Platform | str]:
     """Return the platforms to be set up."""
     return {key for platform in config for key in platform}
@@ -38,6 +38,7 @@ from .const import (  # noqa: F401
     SupportedDialect,
 )
 from .core import Recorder
+from .partitions import PartitionInterval
 from .services import async_register_services
 from .tasks import AddRecorderPlatformTask
 from .util import get_instance
@@ -61,6 +62,9 @@ CONF_PURGE_KEEP_DAYS = "purge_keep_days"
 CONF_PURGE_INTERVAL = "purge_interval"
 CONF_EVENT_TYPES = "event_types"
 CONF_COMMIT_INTERVAL = "commit_interval"
+CONF_INCREMENTAL_PURGE = "incremental_purge"
+CONF_PARTITION_INTERVAL = "partition_interval"
+CONF_COMPRESSED_STORAGE = "compressed_storage"
 
 
 EXCLUDE_SCHEMA = INCLUDE_EXCLUDE_FILTER_SCHEMA_INNER.extend(
@@ -100,6 +104,11 @@ CONFIG_SCHEMA = vol.Schema(
                         vol.Coerce(int), vol.Range(min=1)
                     ),
                     vol.Optional(CONF_PURGE_INTERVAL, default=1): cv.positive_int,
+                    vol.Optional(CONF_INCREMENTAL_PURGE, default=False): cv.boolean,
+                    vol.Optional(CONF_PARTITION_INTERVAL): vol.Coerce(
+                        PartitionInterval
+                    ),
+                    vol.Optional(CONF_COMPRESSED_STORAGE, default=False): cv.boolean,
                     vol.Optional(CONF_DB_URL): vol.All(cv.string, validate_db_url),
                     vol.Optional(
                         CONF_COMMIT_INTERVAL, default=DEFAULT_COMMIT_INTERVAL
@@ -139,6 +148,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
     auto_purge = conf[CONF_AUTO_PURGE]
     auto_repack = conf[CONF_AUTO_REPACK]
     keep_days = conf[CONF_PURGE_KEEP_DAYS]
+    incremental_purge = conf[CONF_INCREMENTAL_PURGE]
+    partition_interval = conf.get(CONF_PARTITION_INTERVAL)
+    compressed_storage = conf[CONF_COMPRESSED_STORAGE]
     commit_interval = conf[CONF_COMMIT_INTERVAL]
     db_max_retries = conf[CONF_DB_MAX_RETRIES]
     db_retry_wait = conf[CONF_DB_RETRY_WAIT]
@@ -163,6 +175,9 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
         db_retry_wait=db_retry_wait,
         entity_filter=entity_filter,
         exclude_event_types=exclude_event_types,
+        incremental_purge=incremental_purge,
+        partition_interval=partition_interval,
+        compressed_storage=compressed_storage,
     )
     get_instance.cache_clear()
     instance.async_initialize()
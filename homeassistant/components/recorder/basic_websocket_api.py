@@ -37,6 +37,10 @@ def ws_info(
         # for the thread state lock which will block the event loop.
         is_running = instance.is_running
         max_backlog = instance.max_backlog
+        commit_interval = instance.commit_scheduler.as_dict()
+        purge_progress = (
+            instance.purge_progress.as_dict() if instance.incremental_purge else None
+        )
     else:
         backlog = None
         migration_in_progress = False
@@ -44,12 +48,16 @@ def ws_info(
         recording = False
         is_running = False
         max_backlog = None
+        commit_interval = None
+        purge_progress = None
 
     recorder_info = {
         "backlog": backlog,
+        "commit_interval": commit_interval,
         "max_backlog": max_backlog,
         "migration_in_progress": migration_in_progress,
         "migration_is_live": migration_is_live,
+        "purge_progress": purge_progress,
         "recording": recording,
         "thread_running": is_running,
     }
@@ -0,0 +1,186 @@
+"""Write pending rows with multi-row inserts."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import cache
+from typing import Any
+
+from sqlalchemy import Column, insert, inspect
+from sqlalchemy.orm.session import Session
+
+from .db_schema import Base
+
+
+@dataclass(slots=True, frozen=True)
+class _BulkInsertMapping:
+    """Columns and relationships needed to insert rows of a mapped class."""
+
+    table_index: int
+    primary_key: str
+    columns: tuple[tuple[str, Callable[[], Any] | None], ...]
+    # (relationship key, foreign key column, related primary key)
+    relationships: tuple[tuple[str, str, str], ...]
+    self_relationships: tuple[str, ...]
+
+
+def _column_default(column: Column) -> Callable[[], Any] | None:
+    """Return a factory for the python side default of a column."""
+    if (default := column.default) is None:
+        return None
+    if default.is_scalar:
+        value = default.arg  # type: ignore[attr-defined]
+        return lambda: value
+    if default.is_callable:
+        func = default.arg  # type: ignore[attr-defined]
+        return lambda: func(None)
+    return None
+
+
+@cache
+def _bulk_insert_mapping(cls: type[Base]) -> _BulkInsertMapping:
+    """Build the bulk insert mapping for a mapped class."""
+    mapper = inspect(cls)
+    table = mapper.local_table
+    primary_key = mapper.get_property_by_column(table.primary_key.columns[0]).key
+    columns: list[tuple[str, Callable[[], Any] | None]] = []
+    for prop in mapper.column_attrs:
+        if prop.key == primary_key:
+            continue
+        columns.append((prop.key, _column_default(prop.columns[0])))
+    relationships: list[tuple[str, str, str]] = []
+    self_relationships: list[str] = []
+    for rel in mapper.relationships:
+        ((local, remote),) = rel.local_remote_pairs
+        relationships.append(
+            (
+                rel.key,
+                mapper.get_property_by_column(local).key,
+                rel.mapper.get_property_by_column(remote).key,
+            )
+        )
+        if rel.mapper is mapper:
+            self_relationships.append(rel.key)
+    return _BulkInsertMapping(
+        table.metadata.sorted_tables.index(table),
+        primary_key,
+        tuple(columns),
+        tuple(relationships),
+        tuple(self_relationships),
+    )
+
+
+class BulkInsertQueue:
+    """Collect new rows and write them with one multi-row insert per table.
+
+    Rows are collected as transient ORM objects which are linked to each other
+    with the same relationships the ORM uses. When the queue is written, tables
+    are inserted in foreign key dependency order and the primary keys returned
+    by the database are assigned to the objects, so foreign keys to rows
+    written earlier in the same batch resolve without a per-row flush.
+
+    Rows that reference rows in the same table, such as a state referencing
+    its old state, are written in generations so the referenced row always
+    has its primary key before it is needed.
+
+    This requires a database that returns the primary keys of a multi-row
+    insert in parameter order.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the bulk insert queue."""
+        self._pending: dict[type[Base], list[Base]] = {}
+
+    def __bool__(self) -> bool:
+        """Return True if there are rows to write."""
+        return bool(self._pending)
+
+    def add(self, obj: Base) -> None:
+        """Queue a row to be inserted."""
+        if (rows := self._pending.get(cls := type(obj))) is None:
+            self._pending[cls] = [obj]
+        else:
+            rows.append(obj)
+
+    def clear(self) -> None:
+        """Discard all queued rows."""
+        self._pending.clear()
+
+    def write(self, session: Session) -> int:
+        """Insert all queued rows and return the number of rows written.
+
+        The queue is only cleared once all rows are written. If an
+        insert fails, the session is rolled back and the primary keys
+        assigned so far are reset so the write can be retried.
+        """
+        written: list[tuple[_BulkInsertMapping, list[Base]]] = []
+        try:
+            for cls, rows in sorted(
+                self._pending.items(),
+                key=lambda item: _bulk_insert_mapping(item[0]).table_index,
+            ):
+                mapping = _bulk_insert_mapping(cls)
+                for generation in _generations(mapping, rows):
+                    _insert_rows(session, cls, mapping, generation)
+                    written.append((mapping, generation))
+        except Exception:
+            session.rollback()
+            for mapping, rows in written:
+                for obj in rows:
+                    setattr(obj, mapping.primary_key, None)
+            raise
+        self._pending.clear()
+        return sum(len(rows) for _, rows in written)
+
+
+def _generations(mapping: _BulkInsertMapping, rows: list[Base]) -> list[list[Base]]:
+    """Split rows so rows referencing rows in the same table come later."""
+    if not (self_relationships := mapping.self_relationships):
+        return [rows]
+    depth_by_id: dict[int, int] = {}
+    generations: list[list[Base]] = []
+    for obj in rows:
+        depth = 0
+        state = obj.__dict__
+        for key in self_relationships:
+            if (related := state.get(key)) is not None and (
+                related_depth := depth_by_id.get(id(related))
+            ) is not None:
+                depth = max(depth, related_depth + 1)
+        depth_by_id[id(obj)] = depth
+        if depth == len(generations):
+            generations.append([obj])
+        else:
+            generations[depth].append(obj)
+    return generations
+
+
+def _insert_rows(
+    session: Session,
+    cls: type[Base],
+    mapping: _BulkInsertMapping,
+    rows: list[Base],
+) -> None:
+    """Insert rows of one table and assign the returned primary keys."""
+    params: list[dict[str, Any]] = []
+    for obj in rows:
+        state = obj.__dict__
+        row: dict[str, Any] = {}
+        for key, default in mapping.columns:
+            if key in state:
+                row[key] = state[key]
+            else:
+                row[key] = default() if default is not None else None
+        for rel_key, local_key, remote_key in mapping.relationships:
+            if (related := state.get(rel_key)) is not None:
+                row[local_key] = getattr(related, remote_key)
+        params.append(row)
+    table = cls.__table__
+    primary_key = mapping.primary_key
+    result = session.execute(
+        insert(table).returning(table.c[primary_key], sort_by_parameter_order=True),
+        params,
+    )
+    for obj, row_id in zip(rows, result.scalars(), strict=True):
+        setattr(obj, primary_key, row_id)
@@ -0,0 +1,123 @@
+"""Adapt the interval between commits of the event session."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from enum import StrEnum
+from typing import Any
+
+# The interval is never shrunk below this or the configured interval
+MIN_COMMIT_INTERVAL = 1.0
+# The interval is never grown above the configured interval times this
+MAX_COMMIT_INTERVAL_FACTOR = 4
+# A backlog of at least this many items grows the interval so
+# each commit writes a larger batch and the queue drains faster
+COMMIT_BACKLOG_THRESHOLD = 1000
+# Commits taking longer than this share of the interval grow the interval
+MAX_COMMIT_DURATION_SHARE = 0.1
+# Commits writing fewer rows than this are considered idle
+IDLE_COMMIT_MAX_WRITES = 10
+# The number of idle commits in a row before the interval grows
+IDLE_COMMITS_BEFORE_GROW = 3
+# Less available memory than this shrinks the interval to the minimum
+# so the rows held by the session are written out sooner
+MIN_AVAILABLE_MEMORY_FOR_COMMIT_BATCH = 512 * 1024**2
+
+
+class CommitIntervalReason(StrEnum):
+    """Reason for the current commit interval."""
+
+    CONFIGURED = "configured"
+    BACKLOG = "backlog"
+    SLOW_COMMIT = "slow_commit"
+    IDLE = "idle"
+    LOW_MEMORY = "low_memory"
+
+
+class CommitScheduler:
+    """Adapt the commit interval from the backlog, commit duration and memory.
+
+    The interval starts at the configured commit interval. It grows when
+    the queue backs up, when commits take a large share of the interval
+    or when commits only write a handful of rows, and shrinks back once
+    none of these apply. When memory runs low it drops to the minimum.
+
+    Decisions are made on the recorder thread after each commit, the
+    interval is read from the event loop to schedule the next commit.
+    """
+
+    def __init__(self, commit_interval: float) -> None:
+        """Initialize the commit scheduler."""
+        self.configured_interval = commit_interval
+        self.min_interval = min(commit_interval, MIN_COMMIT_INTERVAL)
+        self.max_interval = commit_interval * MAX_COMMIT_INTERVAL_FACTOR
+        self.interval = commit_interval
+        self.reason = CommitIntervalReason.CONFIGURED
+        self.last_commit_duration: float | None = None
+        self.last_commit_writes: int | None = None
+        self.last_backlog: int | None = None
+        self.last_available_memory: int | None = None
+        self._idle_commits = 0
+
+    def commit_finished(
+        self,
+        duration: float,
+        writes: int,
+        backlog: int,
+        available_memory: Callable[[], int],
+    ) -> float:
+        """Update the interval after a commit and return it.
+
+        Available memory is only looked up when the interval would be
+        longer than the configured interval since it is not free.
+        """
+        self.last_commit_duration = duration
+        self.last_commit_writes = writes
+        self.last_backlog = backlog
+        if writes < IDLE_COMMIT_MAX_WRITES:
+            self._idle_commits += 1
+        else:
+            self._idle_commits = 0
+
+        if backlog >= COMMIT_BACKLOG_THRESHOLD:
+            self._grow(CommitIntervalReason.BACKLOG)
+        elif duration > self.interval * MAX_COMMIT_DURATION_SHARE:
+            self._grow(CommitIntervalReason.SLOW_COMMIT)
+        elif self._idle_commits >= IDLE_COMMITS_BEFORE_GROW:
+            self._grow(CommitIntervalReason.IDLE)
+        else:
+            self._shrink()
+
+        if self.interval > self.configured_interval:
+            self.last_available_memory = available_memory()
+            if self.last_available_memory < MIN_AVAILABLE_MEMORY_FOR_COMMIT_BATCH:
+                self.interval = self.min_interval
+                self.reason = CommitIntervalReason.LOW_MEMORY
+        return self.interval
+
+    def _grow(self, reason: CommitIntervalReason) -> None:
+        """Double the interval up to the maximum."""
+        self.interval = min(self.interval * 2, self.max_interval)
+        self.reason = reason
+
+    def _shrink(self) -> None:
+        """Halve the interval down to the configured interval."""
+        if self.interval < self.configured_interval:
+            # Recovering from low memory
+            self.interval = self.configured_interval
+        else:
+            self.interval = max(self.interval / 2, self.configured_interval)
+        if self.interval == self.configured_interval:
+            self.reason = CommitIntervalReason.CONFIGURED
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the current decision for diagnostics."""
+        return {
+            "configured": self.configured_interval,
+            "current": self.interval,
+            "reason": self.reason,
+            "last_commit_duration": self.last_commit_duration,
+            "last_commit_writes": self.last_commit_writes,
+            "last_backlog": self.last_backlog,
+            "last_available_memory": self.last_available_memory,
+        }
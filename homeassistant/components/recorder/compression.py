@@ -0,0 +1,102 @@
+"""Compression of the shared attributes and event data stored by the recorder.
+
+Shared attributes and event data are JSON text. With compressed storage
+they are stored as a blob when that is smaller, which SQLite accepts in a
+text column. The blob is a format byte followed by raw deflate data using
+a preset dictionary of the keys and values most states and events share,
+which is what makes compressing the short JSON objects worthwhile.
+
+Rows are decompressed lazily when the attributes or event data are used.
+Blobs and text can be mixed in a database so compressed storage can be
+turned on and off at any time.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+import zlib
+
+# The SQLite function used by queries which look into the JSON
+SQLITE_DECOMPRESS_FUNCTION = "recorder_decompress"
+
+# The first byte of a blob is the format, a new dictionary needs a new format
+# since a blob can only be decompressed with the dictionary it was compressed with
+COMPRESSED_FORMAT_V1 = 1
+COMPRESSION_LEVEL = 6
+# Raw deflate without the zlib header and checksum, which would be a
+# large share of the compressed size of a small JSON object
+_WBITS = -15
+
+# zlib prefers the most common strings at the end of the dictionary
+_DICTIONARY_V1 = (
+    '"hvac_modes":["off","heat","cool","auto"],"min_temp":7,"max_temp":35,'
+    '"target_temp_step":0.5,"preset_modes":["none","eco","away","boost"],'
+    '"supported_color_modes":["brightness","color_temp","hs","xy"],'
+    '"color_mode":"color_temp","min_color_temp_kelvin":2000,'
+    '"max_color_temp_kelvin":6535,"hs_color":['
+    '"rgb_color":[255,"xy_color":[0.'
+    '"effect_list":['
+    '"source_type":"gps","latitude":,"longitude":,"gps_accuracy":'
+    '"next_dawn":"","next_dusk":"","next_midnight":"","next_noon":"",'
+    '"next_rising":"","next_setting":"","elevation":,"azimuth":,"rising":'
+    '"attribution":"Data provided by '
+    '"last_triggered":"","mode":"single","current":0,"id":"'
+    '"editable":true,"restored":true,"initial":null,"options":['
+    '"min":0,"max":100,"step":1,"mode":"slider",'
+    '"battery_level":100,"temperature":,"current_temperature":'
+    '"brightness":255,"supported_features":0,'
+    '"domain":"","service":"","service_data":{"entity_id":["'
+    '"device_id":"","type":"","event_type":"","event_types":["'
+    '"device_class":"timestamp","device_class":"enum",'
+    '"device_class":"battery","device_class":"humidity",'
+    '"device_class":"power","device_class":"energy",'
+    '"device_class":"temperature",'
+    '"state_class":"total_increasing","state_class":"total",'
+    '"state_class":"measurement",'
+    '"unit_of_measurement":"%","unit_of_measurement":"kWh",'
+    '"unit_of_measurement":"W","unit_of_measurement":"°C",'
+    '"icon":"mdi:","entity_id":"sensor.'
+    '{"friendly_name":"'
+).encode()
+
+_DICTIONARIES = {COMPRESSED_FORMAT_V1: _DICTIONARY_V1}
+
+
+def compress_shared_json(shared_json: bytes) -> bytes | str:
+    """Compress JSON shared attributes or event data for storage.
+
+    Returns the JSON as text when compressing it doesn't make it smaller.
+    """
+    compressor = zlib.compressobj(
+        COMPRESSION_LEVEL, zlib.DEFLATED, _WBITS, zdict=_DICTIONARY_V1
+    )
+    compressed = compressor.compress(shared_json) + compressor.flush()
+    if len(compressed) + 1 >= len(shared_json):
+        return shared_json.decode("utf-8")
+    return bytes((COMPRESSED_FORMAT_V1,)) + compressed
+
+
+def decompress_shared_json(blob: bytes) -> bytes:
+    """Decompress JSON shared attributes or event data stored as a blob."""
+    decompressor = zlib.decompressobj(_WBITS, zdict=_DICTIONARIES[blob[0]])
+    return decompressor.decompress(blob[1:]) + decompressor.flush()
+
+
+def shared_json_text(source: str | bytes) -> str:
+    """Return the JSON text of shared attributes or event data from a row.
+
+    JSON never starts with a format byte, so JSON passed as bytes
+    is only decoded.
+    """
+    if type(source) is not bytes:
+        return source  # type: ignore[return-value]
+    if source and source[0] in _DICTIONARIES:
+        source = decompress_shared_json(source)
+    return source.decode("utf-8")
+
+
+def sqlite_decompress(value: Any) -> Any:
+    """Decompress a blob in a query, other values are returned as is."""
+    if type(value) is bytes:
+        return shared_json_text(value)
+    return value
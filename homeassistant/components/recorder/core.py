@@ -39,17 +39,22 @@ from homeassistant.core import (
     callback,
 )
 from homeassistant.helpers.event import (
+    async_call_later,
     async_track_time_change,
     async_track_time_interval,
     async_track_utc_time_change,
 )
 from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 from homeassistant.util.event_type import EventType
 
 from . import migration, statistics
+from .bulk_insert import BulkInsertQueue
+from .commit_scheduler import CommitScheduler
+from .compression import compress_shared_json
 from .const import (
     DB_WORKER_PREFIX,
     DOMAIN,
@@ -78,18 +83,27 @@ from .db_schema import (
     StatisticsShortTerm,
 )
 from .executor import DBInterruptibleThreadPoolExecutor
+from .incremental_purge import (
+    INCREMENTAL_PURGE_PAUSE_FACTOR,
+    INCREMENTAL_PURGE_SAVE_DELAY,
+    PurgeProgress,
+)
 from .migration import (
     EntityIDMigration,
     EventIDPostMigration,
     EventsContextIDMigration,
     EventTypeIDMigration,
+    MigrationTask,
     StatesContextIDMigration,
+    StatisticsRollupMigration,
 )
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
+from .partitions import PartitionInterval, create_partitions, tables_are_partitioned
 from .pool import POOL_SIZE, MutexPool, RecorderPool
 from .queries import get_migration_changes
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
+from .table_managers.recent_states import RecentStatesManager
 from .table_managers.recorder_runs import RecorderRunsManager
 from .table_managers.state_attributes import StateAttributesManager
 from .table_managers.states import StatesManager
@@ -104,6 +118,7 @@ from .tasks import (
     CompileMissingStatisticsTask,
     DatabaseLockTask,
     ImportStatisticsTask,
+    IncrementalPurgeTask,
     KeepAliveTask,
     PerodicCleanupTask,
     PurgeTask,
@@ -144,6 +159,9 @@ KEEP_ALIVE_TASK = KeepAliveTask()
 WAIT_TASK = WaitTask()
 ADJUST_LRU_SIZE_TASK = AdjustLRUSizeTask()
 
+PURGE_PROGRESS_STORAGE_KEY = f"{DOMAIN}.purge_progress"
+PURGE_PROGRESS_STORAGE_VERSION = 1
+
 DB_LOCK_TIMEOUT = 30
 DB_LOCK_QUEUE_CHECK_TIMEOUT = 10  # check every 10 seconds
 
@@ -173,6 +191,9 @@ class Recorder(threading.Thread):
         db_retry_wait: int,
         entity_filter: Callable[[str], bool] | None,
         exclude_event_types: set[EventType[Any] | str],
+        incremental_purge: bool = False,
+        partition_interval: PartitionInterval | None = None,
+        compressed_storage: bool = False,
     ) -> None:
         """Initialize the recorder."""
         threading.Thread.__init__(self, name="Recorder")
@@ -183,9 +204,25 @@ class Recorder(threading.Thread):
         self.auto_purge = auto_purge
         self.auto_repack = auto_repack
         self.keep_days = keep_days
+        self.incremental_purge = incremental_purge
+        self.purge_progress = PurgeProgress()
+        self._purge_progress_store: Store[dict[str, Any]] = Store(
+            hass, PURGE_PROGRESS_STORAGE_VERSION, PURGE_PROGRESS_STORAGE_KEY
+        )
+        # The incremental purge in progress and the one to start after it
+        self._incremental_purge_task: IncrementalPurgeTask | None = None
+        self._next_incremental_purge_task: IncrementalPurgeTask | None = None
+        # The interval new databases are partitioned by, existing partitioned
+        # databases keep being partitioned by day when it isn't set
+        self.partition_interval = partition_interval
+        self.partitioned_tables = False
+        self.compressed_storage = compressed_storage
+        # Set once connected since only SQLite can store the compressed blobs
+        self._compress_storage = False
         self.is_running: bool = False
         self._hass_started: asyncio.Future[object] = hass.loop.create_future()
         self.commit_interval = commit_interval
+        self.commit_scheduler = CommitScheduler(commit_interval)
         self._queue: queue.SimpleQueue[RecorderTask | Event] = queue.SimpleQueue()
         self.db_url = uri
         self.db_max_retries = db_max_retries
@@ -212,9 +249,16 @@ class Recorder(threading.Thread):
         self.schema_version = 0
         self._commits_without_expire = 0
         self._event_session_has_pending_writes = False
+        self._event_session_writes = 0
+        # Set once connected if the database can return the primary keys
+        # of a multi-row insert in order, new rows are then written in
+        # batches instead of being flushed by the session one at a time.
+        self.bulk_insert = False
+        self._bulk_insert_queue = BulkInsertQueue()
 
         self.recorder_runs_manager = RecorderRunsManager()
         self.states_manager = StatesManager()
+        self.recent_states_manager = RecentStatesManager()
         self.event_data_manager = EventDataManager(self)
         self.event_type_manager = EventTypeManager(self)
         self.states_meta_manager = StatesMetaManager(self)
@@ -227,6 +271,7 @@ class Recorder(threading.Thread):
         self.migration_in_progress = False
         self.migration_is_live = False
         self.use_legacy_events_index = False
+        self.use_statistics_rollups = False
         self._database_lock_task: DatabaseLockTask | None = None
         self._db_executor: DBInterruptibleThreadPoolExecutor | None = None
 
@@ -236,6 +281,7 @@ class Recorder(threading.Thread):
         self._commit_listener: CALLBACK_TYPE | None = None
         self._periodic_listener: CALLBACK_TYPE | None = None
         self._nightly_listener: CALLBACK_TYPE | None = None
+        self._incremental_purge_listener: CALLBACK_TYPE | None = None
         self._dialect_name: SupportedDialect | None = None
         self.enabled = True
 
@@ -278,6 +324,17 @@ class Recorder(threading.Thread):
         """Add a task to the recorder queue."""
         self._queue.put(task)
 
+    def queue_statistics_rollups_rebuild(self) -> None:
+        """Stop using the statistics rollups and queue rebuilding them.
+
+        This is called from the threads reading statistics when the rollups
+        don't match the periods of the current time zone.
+        """
+        if not self.use_statistics_rollups:
+            return
+        self.use_statistics_rollups = False
+        self.queue_task(MigrationTask(StatisticsRollupMigration(SCHEMA_VERSION, {})))
+
     def set_enable(self, enable: bool) -> None:
         """Enable or disable recording events and states."""
         self.enabled = enable
@@ -348,6 +405,19 @@ class Recorder(threading.Thread):
         if self._event_listener:
             self.queue_task(KEEP_ALIVE_TASK)
 
+    @callback
+    def _async_schedule_commit(self) -> None:
+        """Schedule the next commit after the current commit interval."""
+        self._commit_listener = async_call_later(
+            self.hass, self.commit_scheduler.interval, self._async_commit_interval
+        )
+
+    @callback
+    def _async_commit_interval(self, now: datetime) -> None:
+        """Queue a commit and schedule the next one."""
+        self._async_schedule_commit()
+        self._async_commit(now)
+
     @callback
     def _async_commit(self, now: datetime) -> None:
         """Queue a commit."""
@@ -365,6 +435,28 @@ class Recorder(threading.Thread):
         """Add an executor job from within the event loop."""
         return self.hass.loop.run_in_executor(self._db_executor, target, *args)
 
+    @property
+    def supports_parallel_reads(self) -> bool:
+        """Return if read only work can be split across the database executor.
+
+        In memory databases only have a single connection, so reads
+        from the database executor would wait for the recorder thread.
+        """
+        return self._db_executor is not None and not (
+            self.engine is not None and isinstance(self.engine.pool, MutexPool)
+        )
+
+    def executor_map[_T, _R](
+        self, target: Callable[[_T], _R], items: Iterable[_T]
+    ) -> list[_R]:
+        """Run target for each item in the database executor and return the results.
+
+        This is used by the recorder thread to split read only work across
+        the database executor and must only be used if supports_parallel_reads.
+        """
+        assert self._db_executor is not None
+        return list(self._db_executor.map(target, items))
+
     @callback
     def _async_check_queue(self, *_: Any) -> None:
         """Periodic check of the queue size to ensure we do not exhaust memory.
@@ -427,6 +519,9 @@ class Recorder(threading.Thread):
         if self._periodic_listener:
             self._periodic_listener()
             self._periodic_listener = None
+        if self._incremental_purge_listener:
+            self._incremental_purge_listener()
+            self._incremental_purge_listener = None
 
     async def _async_close(self, event: Event) -> None:
         """Empty the queue if its still present at close."""
@@ -524,10 +619,103 @@ class Recorder(threading.Thread):
             # until after the database is vacuumed
             repack = self.auto_repack and is_second_sunday(now)
             purge_before = dt_util.utcnow() - timedelta(days=self.keep_days)
-            self.queue_task(PurgeTask(purge_before, repack=repack, apply_filter=False))
+            self.async_queue_purge(purge_before, repack=repack, apply_filter=False)
         else:
             self.queue_task(PerodicCleanupTask())
 
+    @callback
+    def async_queue_purge(
+        self, purge_before: datetime, repack: bool, apply_filter: bool
+    ) -> None:
+        """Queue a purge of the events and states older than purge_before.
+
+        When incremental purging is enabled and an incremental purge is
+        still in progress, the new purge starts once it is done.
+        """
+        if not self.incremental_purge:
+            self.queue_task(PurgeTask(purge_before, repack, apply_filter))
+            return
+        task = IncrementalPurgeTask(purge_before, repack, apply_filter)
+        if self._incremental_purge_task:
+            self._next_incremental_purge_task = task
+            return
+        self._async_start_incremental_purge(task)
+
+    @callback
+    def _async_start_incremental_purge(self, task: IncrementalPurgeTask) -> None:
+        """Start an incremental purge."""
+        self._incremental_purge_task = task
+        self.purge_progress.start(task.purge_before, task.repack, task.apply_filter)
+        self.queue_task(task)
+
+    @callback
+    def async_incremental_purge_slice_done(
+        self,
+        task: IncrementalPurgeTask,
+        progress: dict[str, Any],
+        done: bool,
+        duration: float,
+        failed: bool = False,
+    ) -> None:
+        """Save the progress of an incremental purge and pause before the next slice.
+
+        The pause is at least the commit interval so the recording gets a
+        commit in between slices, and grows with the duration of the slice
+        to limit the share of the time of the recorder thread the purge takes.
+
+        A failed slice ends the purge, the next scheduled purge or the
+        purge queued in the meantime starts over from the oldest rows.
+        """
+        self._purge_progress_store.async_delay_save(
+            lambda: progress, INCREMENTAL_PURGE_SAVE_DELAY
+        )
+        if failed:
+            _LOGGER.warning(
+                "Incremental purge before %s failed, it will be retried with the"
+                " next purge",
+                task.purge_before,
+            )
+        elif not done:
+            self._incremental_purge_listener = async_call_later(
+                self.hass,
+                max(
+                    self.commit_scheduler.interval,
+                    duration * INCREMENTAL_PURGE_PAUSE_FACTOR,
+                ),
+                self._async_queue_incremental_purge_slice,
+            )
+            return
+        else:
+            _LOGGER.debug("Incremental purge before %s finished", task.purge_before)
+        self._incremental_purge_task = None
+        if next_task := self._next_incremental_purge_task:
+            self._next_incremental_purge_task = None
+            self._async_start_incremental_purge(next_task)
+
+    @callback
+    def _async_queue_incremental_purge_slice(self, now: datetime) -> None:
+        """Queue the next slice of the incremental purge."""
+        self._incremental_purge_listener = None
+        if self._incremental_purge_task:
+            self.queue_task(self._incremental_purge_task)
+
+    async def _async_resume_incremental_purge(self) -> None:
+        """Resume an incremental purge which was in progress at shutdown."""
+        if not (data := await self._purge_progress_store.async_load()):
+            return
+        if self._incremental_purge_task:
+            # A new purge was started in the meantime
+            return
+        self.purge_progress.restore(data)
+        if not (progress := self.purge_progress).in_progress:
+            return
+        assert progress.purge_before is not None
+        _LOGGER.debug("Resuming incremental purge before %s", progress.purge_before)
+        self._incremental_purge_task = IncrementalPurgeTask(
+            progress.purge_before, progress.repack, progress.apply_filter
+        )
+        self.queue_task(self._incremental_purge_task)
+
     @callback
     def _async_five_minute_tasks(self, now: datetime) -> None:
         """Run tasks every five minutes."""
@@ -643,13 +831,15 @@ class Recorder(threading.Thread):
                 name="Recorder keep alive",
             )
 
-        # If the commit interval is not 0, we need to commit periodically
+        # If the commit interval is not 0, we need to commit periodically,
+        # the interval adapts to the load after each commit
         if self.commit_interval:
-            self._commit_listener = async_track_time_interval(
-                self.hass,
-                self._async_commit,
-                timedelta(seconds=self.commit_interval),
-                name="Recorder commit",
+            self._async_schedule_commit()
+
+        if self.incremental_purge:
+            self.hass.async_create_task(
+                self._async_resume_incremental_purge(),
+                "recorder resume incremental purge",
             )
 
         # Run nightly tasks at 4:12am
@@ -697,6 +887,10 @@ class Recorder(threading.Thread):
     def _add_to_session(self, session: Session, obj: object) -> None:
         """Add an object to the session."""
         self._event_session_has_pending_writes = True
+        self._event_session_writes += 1
+        if self.bulk_insert:
+            self._bulk_insert_queue.add(obj)
+            return
         session.add(obj)
 
     def _notify_migration_failed(self) -> None:
@@ -812,6 +1006,7 @@ class Recorder(threading.Thread):
                 EventTypeIDMigration,
                 EntityIDMigration,
                 EventIDPostMigration,
+                StatisticsRollupMigration,
             ):
                 migrator = migrator_cls(schema_status.start_version, migration_changes)
                 migrator.do_migrate(self, session)
@@ -1064,16 +1259,24 @@ class Recorder(threading.Thread):
         # Matching attributes found in the pending commit
         if pending_event_data := event_data_manager.get_pending(shared_data):
             dbevent.event_data_rel = pending_event_data
+            event_data_manager.add_pending_reference(shared_data)
         # Matching attributes id found in the cache
         elif (data_id := event_data_manager.get_from_cache(shared_data)) or (
             (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
             and (data_id := event_data_manager.get(shared_data, hash_, session))
         ):
             dbevent.data_id = data_id
+            event_data_manager.add_reference(data_id)
         else:
             # No matching attributes found, save them in the DB
-            dbevent_data = EventData(shared_data=shared_data, hash=hash_)
-            event_data_manager.add_pending(dbevent_data)
+            dbevent_data = EventData(
+                shared_data=compress_shared_json(shared_data_bytes)
+                if self._compress_storage
+                else shared_data,
+                hash=hash_,
+            )
+            event_data_manager.add_pending(dbevent_data, shared_data)
+            event_data_manager.add_pending_reference(shared_data)
             self._add_to_session(session, dbevent_data)
             dbevent.event_data_rel = dbevent_data
 
@@ -1105,6 +1308,9 @@ class Recorder(threading.Thread):
                 states_manager.update_pending_last_reported(
                     old_state_id, old_state.last_reported_timestamp
                 )
+                self.recent_states_manager.update_pending_last_reported(
+                    entity_id, old_state.last_reported_timestamp
+                )
         if entity_removed:
             dbstate.state = None
         else:
@@ -1141,6 +1347,7 @@ class Recorder(threading.Thread):
         # Matching attributes found in the pending commit
         if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
             dbstate.state_attributes = pending_event_data
+            state_attributes_manager.add_pending_reference(shared_attrs)
         # Matching attributes id found in the cache
         elif (
             attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
@@ -1153,14 +1360,22 @@ class Recorder(threading.Thread):
             )
         ):
             dbstate.attributes_id = attributes_id
+            state_attributes_manager.add_reference(attributes_id)
         else:
             # No matching attributes found, save them in the DB
-            dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
-            state_attributes_manager.add_pending(dbstate_attributes)
+            dbstate_attributes = StateAttributes(
+                shared_attrs=compress_shared_json(shared_attrs_bytes)
+                if self._compress_storage
+                else shared_attrs,
+                hash=hash_,
+            )
+            state_attributes_manager.add_pending(dbstate_attributes, shared_attrs)
+            state_attributes_manager.add_pending_reference(shared_attrs)
             self._add_to_session(session, dbstate_attributes)
             dbstate.state_attributes = dbstate_attributes
 
         self._add_to_session(session, dbstate)
+        self.recent_states_manager.add_pending(entity_id, dbstate)
 
     def _handle_database_error(self, err: Exception, *, setup_run: bool) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1207,6 +1422,10 @@ class Recorder(threading.Thread):
         assert self.event_session is not None
         session = self.event_session
         self._commits_without_expire += 1
+        commit_start = time.monotonic()
+
+        if self._bulk_insert_queue:
+            self._bulk_insert_queue.write(session)
 
         if (
             pending_last_reported
@@ -1225,12 +1444,21 @@ class Recorder(threading.Thread):
                 )
         session.commit()
 
+        if self.commit_interval:
+            self.commit_scheduler.commit_finished(
+                time.monotonic() - commit_start,
+                self._event_session_writes,
+                self.backlog,
+                self._available_memory,
+            )
         self._event_session_has_pending_writes = False
+        self._event_session_writes = 0
         # We just committed the state attributes to the database
         # and we now know the attributes_ids.  We can save
         # many selects for matching attributes by loading them
         # into the LRU or committed now.
         self.states_manager.post_commit_pending()
+        self.recent_states_manager.post_commit_pending()
         self.state_attributes_manager.post_commit_pending()
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
@@ -1257,7 +1485,10 @@ class Recorder(threading.Thread):
 
     def _close_event_session(self) -> None:
         """Close the event session."""
+        self._bulk_insert_queue.clear()
+        self._event_session_writes = 0
         self.states_manager.reset()
+        self.recent_states_manager.reset()
         self.state_attributes_manager.reset()
         self.event_data_manager.reset()
         self.event_type_manager.reset()
@@ -1423,11 +1654,28 @@ class Recorder(threading.Thread):
         self.__dict__.pop("dialect_name", None)
         sqlalchemy_event.listen(self.engine, "connect", self._setup_recorder_connection)
 
+        if self.compressed_storage:
+            self._setup_compressed_storage()
         migration.pre_migrate_schema(self.engine)
+        if self.partition_interval:
+            migration.create_partitioned_schema(self.engine)
         Base.metadata.create_all(self.engine)
+        self.bulk_insert = (
+            self.engine.dialect.insert_executemany_returning_sort_by_parameter_order
+        )
         self._get_session = scoped_session(sessionmaker(bind=self.engine, future=True))
         _LOGGER.debug("Connected to recorder database")
 
+    def _setup_compressed_storage(self) -> None:
+        """Turn on compressed storage if the database supports it."""
+        if self.dialect_name != SupportedDialect.SQLITE:
+            _LOGGER.warning(
+                "Compressed storage is only supported with SQLite, shared"
+                " attributes and event data will be stored uncompressed"
+            )
+            return
+        self._compress_storage = True
+
     def _close_connection(self) -> None:
         """Close the connection."""
         if self.engine:
@@ -1441,8 +1689,30 @@ class Recorder(threading.Thread):
             end_incomplete_runs(session, self.recorder_runs_manager.recording_start)
             self.recorder_runs_manager.start(session)
 
+        assert self.engine is not None
+        if self.engine.dialect.name == SupportedDialect.POSTGRESQL:
+            self._setup_partitions()
+
         self._open_event_session()
 
+    def _setup_partitions(self) -> None:
+        """Find out if the tables are partitioned and create the partitions."""
+        with session_scope(session=self.get_session()) as session:
+            self.partitioned_tables = tables_are_partitioned(session)
+            if not self.partitioned_tables:
+                if self.partition_interval:
+                    _LOGGER.warning(
+                        "The states and events tables of the database were created"
+                        " before partitioning was enabled and will not be"
+                        " partitioned"
+                    )
+                return
+            create_partitions(
+                session,
+                self.partition_interval or PartitionInterval.DAY,
+                time.time(),
+            )
+
     def _schedule_compile_missing_statistics(self) -> None:
         """Add tasks for missing statistics runs."""
         self.queue_task(CompileMissingStatisticsTask())
@@ -33,6 +33,7 @@ from sqlalchemy.dialects import mysql, oracle, postgresql, sqlite
 from sqlalchemy.engine.interfaces import Dialect
 from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.orm import DeclarativeBase, Mapped, aliased, mapped_column, relationship
+from sqlalchemy.sql.functions import FunctionElement
 from sqlalchemy.types import TypeDecorator
 
 from homeassistant.components.sensor import ATTR_STATE_CLASS
@@ -54,6 +55,7 @@ from homeassistant.util.json import (
     json_loads_object,
 )
 
+from .compression import SQLITE_DECOMPRESS_FUNCTION, shared_json_text
 from .const import ALL_DOMAIN_EXCLUDE_ATTRS, SupportedDialect
 from .models import (
     StatisticData,
@@ -77,7 +79,7 @@ class LegacyBase(DeclarativeBase):
     """Base class for tables, used for schema migration."""
 
 
-SCHEMA_VERSION = 47
+SCHEMA_VERSION = 48
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -93,6 +95,8 @@ TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+TABLE_STATISTICS_DAILY = "statistics_daily"
+TABLE_STATISTICS_MONTHLY = "statistics_monthly"
 TABLE_MIGRATION_CHANGES = "migration_changes"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
@@ -116,6 +120,8 @@ ALL_TABLES = [
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_DAILY,
+    TABLE_STATISTICS_MONTHLY,
 ]
 
 TABLES_TO_CHECK = [
@@ -245,6 +251,35 @@ class JSONLiteral(JSON):
         return process
 
 
+class SharedJSON(FunctionElement[str]):
+    """The JSON text of a shared attributes or event data column.
+
+    Compressed rows are stored as blobs, which are only used on SQLite.
+    """
+
+    type = Text()
+    inherit_cache = True
+
+
+@compiles(SharedJSON)  # type: ignore[misc,no-untyped-call]
+def compile_shared_json(element: SharedJSON, compiler: Any, **kw: Any) -> str:
+    """Compile SharedJSON as the column itself."""
+    return cast(str, compiler.process(element.clauses.clauses[0], **kw))
+
+
+@compiles(SharedJSON, "sqlite")  # type: ignore[misc,no-untyped-call]
+def compile_shared_json_sqlite(element: SharedJSON, compiler: Any, **kw: Any) -> str:
+    """Compile SharedJSON to decompress blobs on sqlite.
+
+    Text rows are passed through without calling into Python.
+    """
+    column = compiler.process(element.clauses.clauses[0], **kw)
+    return (
+        f"CASE WHEN typeof({column}) = 'blob' "
+        f"THEN {SQLITE_DECOMPRESS_FUNCTION}({column}) ELSE {column} END"
+    )
+
+
 EVENT_ORIGIN_ORDER = [EventOrigin.local, EventOrigin.remote]
 
 
@@ -358,7 +393,8 @@ class EventData(Base):
     data_id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
     hash: Mapped[int | None] = mapped_column(UINT_32_TYPE, index=True)
     # Note that this is not named attributes to avoid confusion with the states table
-    shared_data: Mapped[str | None] = mapped_column(
+    # Compressed event data is stored as bytes, see compression.py
+    shared_data: Mapped[str | bytes | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
 
@@ -399,7 +435,7 @@ class EventData(Base):
         if shared_data is None:
             return {}
         try:
-            return cast(dict[str, Any], json_loads(shared_data))
+            return cast(dict[str, Any], json_loads(shared_json_text(shared_data)))
         except JSON_DECODE_EXCEPTIONS:
             _LOGGER.exception("Error converting row to event data: %s", self)
             return {}
@@ -583,7 +619,8 @@ class StateAttributes(Base):
     attributes_id: Mapped[int] = mapped_column(ID_TYPE, Identity(), primary_key=True)
     hash: Mapped[int | None] = mapped_column(UINT_32_TYPE, index=True)
     # Note that this is not named attributes to avoid confusion with the states table
-    shared_attrs: Mapped[str | None] = mapped_column(
+    # Compressed attributes are stored as bytes, see compression.py
+    shared_attrs: Mapped[str | bytes | None] = mapped_column(
         Text().with_variant(mysql.LONGTEXT, "mysql", "mariadb")
     )
 
@@ -642,7 +679,7 @@ class StateAttributes(Base):
         if shared_attrs is None:
             return {}
         try:
-            return cast(dict[str, Any], json_loads(shared_attrs))
+            return cast(dict[str, Any], json_loads(shared_json_text(shared_attrs)))
         except JSON_DECODE_EXCEPTIONS:
             # When json_loads fails
             _LOGGER.exception("Error converting row to state attributes: %s", self)
@@ -768,6 +805,53 @@ class StatisticsShortTerm(Base, _StatisticsShortTerm):
     )
 
 
+class StatisticsRollupBase(StatisticsBase):
+    """Long term statistics rolled up to a longer period."""
+
+    # The number of hourly means the mean is the average of, which
+    # weighs the daily means when they are rolled up to a month
+    mean_count: Mapped[int | None] = mapped_column(Integer)
+
+
+class StatisticsDaily(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per day in the local time zone."""
+
+    # Days with a DST transition are shorter or longer
+    duration = timedelta(days=1)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_daily_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_DAILY
+
+
+class StatisticsMonthly(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per month in the local time zone."""
+
+    # Months have a different length, the end of a month is the
+    # start of the next month
+    duration = timedelta(days=31)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_monthly_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_STATISTICS_MONTHLY
+
+
 class LegacyStatisticsShortTerm(LegacyBase, _StatisticsShortTerm):
     """Short term statistics with 32-bit index, used for schema migration."""
 
@@ -904,14 +988,16 @@ class StatisticsRuns(Base):
 
 
 EVENT_DATA_JSON = type_coerce(
-    EventData.shared_data.cast(JSONB_VARIANT_CAST), JSONLiteral(none_as_null=True)
+    SharedJSON(EventData.shared_data).cast(JSONB_VARIANT_CAST),
+    JSONLiteral(none_as_null=True),
 )
 OLD_FORMAT_EVENT_DATA_JSON = type_coerce(
     Events.event_data.cast(JSONB_VARIANT_CAST), JSONLiteral(none_as_null=True)
 )
 
+SHARED_ATTRS_TEXT = SharedJSON(StateAttributes.shared_attrs)
 SHARED_ATTRS_JSON = type_coerce(
-    StateAttributes.shared_attrs.cast(JSON_VARIANT_CAST), JSON(none_as_null=True)
+    SHARED_ATTRS_TEXT.cast(JSON_VARIANT_CAST), JSON(none_as_null=True)
 )
 OLD_FORMAT_ATTRS_JSON = type_coerce(
     States.attributes.cast(JSON_VARIANT_CAST), JSON(none_as_null=True)
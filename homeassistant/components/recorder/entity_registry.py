@@ -68,6 +68,8 @@ def update_states_metadata(
         )
         return
 
+    # The history moves to the new entity_id in the database
+    instance.recent_states_manager.evict_entity_ids({entity_id, new_entity_id})
     with session_scope(
         session=instance.get_session(),
         exception_filter=filter_unique_constraint_integrity_error(instance, "state"),
@@ -16,6 +16,7 @@ from .modern import (
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
     get_last_state_changes as _modern_get_last_state_changes,
     get_significant_states as _modern_get_significant_states,
+    get_significant_states_chunk_with_session as _modern_get_significant_states_chunk_with_session,
     get_significant_states_with_session as _modern_get_significant_states_with_session,
     state_changes_during_period as _modern_state_changes_during_period,
 )
@@ -27,6 +28,7 @@ __all__ = [
     "get_full_significant_states_with_session",
     "get_last_state_changes",
     "get_significant_states",
+    "get_significant_states_chunk_with_session",
     "get_significant_states_with_session",
     "state_changes_during_period",
 ]
@@ -152,6 +154,55 @@ def get_significant_states_with_session(
     )
 
 
+def get_significant_states_chunk_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    chunk_size: int,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+) -> tuple[dict[str, list[State | dict[str, Any]]], list[str]]:
+    """Return the next chunk of the significant states and the entity ids left."""
+    if not get_instance(hass).states_meta_manager.active:
+        from .legacy import (  # pylint: disable=import-outside-toplevel
+            get_significant_states_with_session as _legacy_get_significant_states_with_session,
+        )
+
+        # The legacy schema is only used until the migration
+        # is done so the states are returned as a single chunk
+        return _legacy_get_significant_states_with_session(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            compressed_state_format,
+        ), []
+    return _modern_get_significant_states_chunk_with_session(
+        hass,
+        session,
+        start_time,
+        end_time,
+        entity_ids,
+        chunk_size,
+        include_start_time_state,
+        significant_changes_only,
+        minimal_response,
+        no_attributes,
+        compressed_state_format,
+    )
+
+
 def state_changes_during_period(
     hass: HomeAssistant,
     start_time: datetime,
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from collections.abc import Callable, Iterable, Iterator
 from datetime import datetime
-from itertools import groupby
+from itertools import chain, groupby
 from operator import itemgetter
 from typing import Any, cast
 
@@ -37,6 +37,7 @@ from ..models import (
     process_timestamp,
     row_to_compressed_state,
 )
+from ..table_managers.recent_states import RecentStateRow
 from ..util import execute_stmt_lambda_element, session_scope
 from .const import (
     LAST_CHANGED_KEY,
@@ -229,6 +230,51 @@ def get_significant_states_with_session(
         raise NotImplementedError("Filters are no longer supported")
     if not entity_ids:
         raise ValueError("entity_ids must be provided")
+    if not (
+        query := _significant_states_rows(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+            False,
+        )
+    ):
+        return {}
+    rows, entity_id_to_metadata_id, start_time_ts = query
+    return _sorted_states_to_dict(
+        rows,
+        start_time_ts,
+        entity_ids,
+        entity_id_to_metadata_id,
+        minimal_response,
+        compressed_state_format,
+        no_attributes=no_attributes,
+    )
+
+
+def _significant_states_rows(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    no_attributes: bool,
+    stream: bool,
+) -> tuple[Iterable[Row | RecentStateRow], dict[str, int | None], float | None] | None:
+    """Return the rows of the significant states sorted by metadata_id.
+
+    Also returns the metadata_ids of the entities and the start time
+    timestamp to use for the states at the start time, if any.
+
+    If stream is set, long periods are fetched from the cursor with
+    yield_per instead of all at once.
+    """
     entity_id_to_metadata_id: dict[str, int | None] | None = None
     metadata_ids_in_significant_domains: list[int] = []
     instance = get_instance(hass)
@@ -237,7 +283,7 @@ def get_significant_states_with_session(
             entity_ids, session, False
         )
     ) or not (possible_metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
-        return {}
+        return None
     metadata_ids = possible_metadata_ids
     if significant_changes_only:
         metadata_ids_in_significant_domains = [
@@ -254,38 +300,128 @@ def get_significant_states_with_session(
     start_time_ts = dt_util.utc_to_timestamp(start_time)
     end_time_ts = datetime_to_timestamp_or_none(end_time)
     single_metadata_id = metadata_ids[0] if len(metadata_ids) == 1 else None
-    stmt = lambda_stmt(
-        lambda: _significant_states_stmt(
+    recent_rows: list[RecentStateRow] = []
+    if no_attributes:
+        # Recent states are kept in memory without attributes
+        metadata_ids, recent_rows = _get_recent_state_rows(
+            hass,
+            entity_id_to_metadata_id,
             start_time_ts,
             end_time_ts,
-            single_metadata_id,
-            metadata_ids,
-            metadata_ids_in_significant_domains,
-            significant_changes_only,
-            no_attributes,
+            # The start time state of multiple entities is limited to the run
+            None if single_metadata_id else run_start_ts,
             include_start_time_state,
-            run_start_ts,
-        ),
-        track_on=[
-            bool(single_metadata_id),
-            bool(metadata_ids_in_significant_domains),
-            bool(end_time_ts),
             significant_changes_only,
-            no_attributes,
-            include_start_time_state,
-        ],
-    )
-    return _sorted_states_to_dict(
-        execute_stmt_lambda_element(session, stmt, None, end_time, orm_rows=False),
-        start_time_ts if include_start_time_state else None,
-        entity_ids,
+            set(metadata_ids_in_significant_domains),
+            include_last_changed=not significant_changes_only,
+            include_last_reported=False,
+        )
+    rows: Iterable[Row | RecentStateRow] = recent_rows
+    if metadata_ids:
+        stmt = lambda_stmt(
+            lambda: _significant_states_stmt(
+                start_time_ts,
+                end_time_ts,
+                single_metadata_id,
+                metadata_ids,
+                metadata_ids_in_significant_domains,
+                significant_changes_only,
+                no_attributes,
+                include_start_time_state,
+                run_start_ts,
+            ),
+            track_on=[
+                bool(single_metadata_id),
+                bool(metadata_ids_in_significant_domains),
+                bool(end_time_ts),
+                significant_changes_only,
+                no_attributes,
+                include_start_time_state,
+            ],
+        )
+        rows = chain(
+            execute_stmt_lambda_element(
+                session,
+                stmt,
+                start_time if stream else None,
+                end_time,
+                orm_rows=False,
+            ),
+            recent_rows,
+        )
+    return (
+        rows,
         entity_id_to_metadata_id,
-        minimal_response,
-        compressed_state_format,
-        no_attributes=no_attributes,
+        start_time_ts if include_start_time_state else None,
     )
 
 
+def get_significant_states_chunk_with_session(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    chunk_size: int,
+    include_start_time_state: bool = True,
+    significant_changes_only: bool = True,
+    minimal_response: bool = False,
+    no_attributes: bool = False,
+    compressed_state_format: bool = False,
+) -> tuple[dict[str, list[State | dict[str, Any]]], list[str]]:
+    """Return the next chunk of the states changes during UTC period start_time - end_time.
+
+    Rows are converted as they come off the cursor until the chunk holds
+    at least chunk_size states. The states of an entity are never split
+    across chunks. The entity ids which were not reached are returned with
+    the chunk, and are passed as entity_ids to fetch the next chunk, so
+    merging the chunks gives the same result as
+    get_significant_states_with_session.
+    """
+    if not entity_ids:
+        raise ValueError("entity_ids must be provided")
+    if not (
+        query := _significant_states_rows(
+            hass,
+            session,
+            start_time,
+            end_time,
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            no_attributes,
+            True,
+        )
+    ):
+        return {}, []
+    rows, entity_id_to_metadata_id, start_time_ts = query
+    metadata_id_to_entity_id = {
+        v: k for k, v in entity_id_to_metadata_id.items() if v is not None
+    }
+    chunk: dict[str, list[State | dict[str, Any]]] = {}
+    chunk_states = 0
+    reached: set[str] = set()
+    for metadata_id, group in groupby(rows, itemgetter(_FIELD_MAP["metadata_id"])):
+        if chunk_states >= chunk_size:
+            return chunk, [
+                entity_id for entity_id in entity_ids if entity_id not in reached
+            ]
+        entity_id = metadata_id_to_entity_id[metadata_id]
+        reached.add(entity_id)
+        if entity_states := _sorted_states_to_dict(
+            group,
+            start_time_ts,
+            [entity_id],
+            {entity_id: metadata_id},
+            minimal_response,
+            compressed_state_format,
+            no_attributes=no_attributes,
+        ).get(entity_id):
+            chunk[entity_id] = entity_states
+            chunk_states += len(entity_states)
+    return chunk, []
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -418,6 +554,35 @@ def state_changes_during_period(
             include_start_time_state = False
         start_time_ts = dt_util.utc_to_timestamp(start_time)
         end_time_ts = datetime_to_timestamp_or_none(end_time)
+        if (
+            no_attributes
+            and (
+                recent_rows := instance.recent_states_manager.get_rows(
+                    entity_ids[0],
+                    single_metadata_id,
+                    start_time_ts,
+                    end_time_ts,
+                    None,
+                    include_start_time_state,
+                    True,
+                    False,
+                    has_last_reported,
+                    limit,
+                )
+            )
+            is not None
+        ):
+            return cast(
+                dict[str, list[State]],
+                _sorted_states_to_dict(
+                    recent_rows,
+                    start_time_ts if include_start_time_state else None,
+                    entity_ids,
+                    entity_id_to_metadata_id,
+                    descending=descending,
+                    no_attributes=no_attributes,
+                ),
+            )
         stmt = lambda_stmt(
             lambda: _state_changed_during_period_stmt(
                 start_time_ts,
@@ -452,6 +617,48 @@ def state_changes_during_period(
         )
 
 
+def _get_recent_state_rows(
+    hass: HomeAssistant,
+    entity_id_to_metadata_id: dict[str, int | None],
+    start_time_ts: float,
+    end_time_ts: float | None,
+    start_time_state_after_ts: float | None,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    metadata_ids_in_significant_domains: set[int],
+    include_last_changed: bool,
+    include_last_reported: bool,
+) -> tuple[list[int], list[RecentStateRow]]:
+    """Return the rows of entities with the queried period in memory.
+
+    Also returns the metadata_ids which still need to be queried.
+    """
+    recent_states_manager = get_instance(hass).recent_states_manager
+    metadata_ids: list[int] = []
+    rows: list[RecentStateRow] = []
+    for entity_id, metadata_id in entity_id_to_metadata_id.items():
+        if metadata_id is None:
+            continue
+        if (
+            entity_rows := recent_states_manager.get_rows(
+                entity_id,
+                metadata_id,
+                start_time_ts,
+                end_time_ts,
+                start_time_state_after_ts,
+                include_start_time_state,
+                significant_changes_only
+                and metadata_id not in metadata_ids_in_significant_domains,
+                include_last_changed,
+                include_last_reported,
+            )
+        ) is None:
+            metadata_ids.append(metadata_id)
+        else:
+            rows.extend(entity_rows)
+    return metadata_ids, rows
+
+
 def _get_last_state_changes_single_stmt(metadata_id: int) -> Select:
     return (
         _stmt_and_join_attributes(False, False, False)
@@ -672,7 +879,7 @@ def _get_single_entity_start_time_stmt(
 
 
 def _sorted_states_to_dict(
-    states: Iterable[Row],
+    states: Iterable[Row | RecentStateRow],
     start_time_ts: float | None,
     entity_ids: list[str],
     entity_id_to_metadata_id: dict[str, int | None],
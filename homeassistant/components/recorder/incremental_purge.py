@@ -0,0 +1,141 @@
+"""Budget and progress of incremental purges."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import time
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+# The I/O budget of a slice, the number of states and events rows
+# a slice may delete before it commits and gives way to the recording
+INCREMENTAL_PURGE_MAX_ROWS = 10000
+# The lock-time budget of a slice, the number of seconds a slice may
+# keep its transaction open before it commits
+INCREMENTAL_PURGE_MAX_SECONDS = 0.5
+# The pause after a slice is this many times the duration of the slice,
+# which keeps the purge to a share of the time of the recorder thread
+INCREMENTAL_PURGE_PAUSE_FACTOR = 4
+# The progress is only saved this many seconds after a slice finished
+# so the progress isn't written out after every slice
+INCREMENTAL_PURGE_SAVE_DELAY = 30
+
+
+class PurgeBudget:
+    """Budget of a slice of an incremental purge.
+
+    The rows are counted and the time is checked by the purge between
+    batches, so a slice can overrun its budget by up to one batch.
+    """
+
+    __slots__ = ("events", "max_rows", "max_seconds", "started", "states")
+
+    def __init__(self, max_rows: int, max_seconds: float) -> None:
+        """Initialize the budget and start the clock."""
+        self.max_rows = max_rows
+        self.max_seconds = max_seconds
+        self.started = time.monotonic()
+        self.states = 0
+        self.events = 0
+
+    @property
+    def rows(self) -> int:
+        """Return the number of rows deleted in the slice."""
+        return self.states + self.events
+
+    @property
+    def remaining_rows(self) -> int:
+        """Return the number of rows the slice may still delete."""
+        return max(self.max_rows - self.rows, 0)
+
+    @property
+    def duration(self) -> float:
+        """Return the number of seconds since the slice started."""
+        return time.monotonic() - self.started
+
+    def exhausted(self) -> bool:
+        """Return if the slice should commit and stop."""
+        return self.rows >= self.max_rows or self.duration >= self.max_seconds
+
+
+class PurgeProgress:
+    """Progress of an incremental purge.
+
+    Slices update the progress on the recorder thread, it is read from
+    the event loop to report it and to save it so the purge can resume
+    after a restart.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the progress."""
+        self.purge_before: datetime | None = None
+        self.repack = False
+        self.apply_filter = False
+        self.started: datetime | None = None
+        self.finished: datetime | None = None
+        self.slices = 0
+        self.states = 0
+        self.events = 0
+        self.last_slice_duration: float | None = None
+        self.last_slice_rows: int | None = None
+
+    @property
+    def in_progress(self) -> bool:
+        """Return if a purge has been started but hasn't finished."""
+        return self.purge_before is not None and self.finished is None
+
+    def start(self, purge_before: datetime, repack: bool, apply_filter: bool) -> None:
+        """Start tracking a new purge."""
+        self.purge_before = purge_before
+        self.repack = repack
+        self.apply_filter = apply_filter
+        self.started = dt_util.utcnow()
+        self.finished = None
+        self.slices = self.states = self.events = 0
+        self.last_slice_duration = self.last_slice_rows = None
+
+    def slice_finished(self, budget: PurgeBudget, done: bool) -> None:
+        """Add a finished slice to the progress."""
+        self.slices += 1
+        self.states += budget.states
+        self.events += budget.events
+        self.last_slice_duration = budget.duration
+        self.last_slice_rows = budget.rows
+        if done:
+            self.finished = dt_util.utcnow()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress for diagnostics and storage."""
+        return {
+            "purge_before": _isoformat_or_none(self.purge_before),
+            "repack": self.repack,
+            "apply_filter": self.apply_filter,
+            "started": _isoformat_or_none(self.started),
+            "finished": _isoformat_or_none(self.finished),
+            "slices": self.slices,
+            "states": self.states,
+            "events": self.events,
+            "last_slice_duration": self.last_slice_duration,
+            "last_slice_rows": self.last_slice_rows,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore the progress saved by a previous run."""
+        self.purge_before = dt_util.parse_datetime(data["purge_before"])
+        self.repack = data["repack"]
+        self.apply_filter = data["apply_filter"]
+        self.started = dt_util.parse_datetime(data["started"])
+        self.finished = (
+            dt_util.parse_datetime(finished) if (finished := data["finished"]) else None
+        )
+        self.slices = data["slices"]
+        self.states = data["states"]
+        self.events = data["events"]
+        self.last_slice_duration = data["last_slice_duration"]
+        self.last_slice_rows = data["last_slice_rows"]
+
+
+def _isoformat_or_none(value: datetime | None) -> str | None:
+    """Return the datetime as an ISO string or None."""
+    return value.isoformat() if value else None
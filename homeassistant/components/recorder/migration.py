@@ -13,7 +13,18 @@ from typing import TYPE_CHECKING, Any, cast, final
 from uuid import UUID
 
 import sqlalchemy
-from sqlalchemy import ForeignKeyConstraint, MetaData, Table, func, text, update
+from sqlalchemy import (
+    Column,
+    ForeignKeyConstraint,
+    MetaData,
+    PrimaryKeyConstraint,
+    Sequence,
+    Table,
+    func,
+    select,
+    text,
+    update,
+)
 from sqlalchemy.engine import CursorResult, Engine
 from sqlalchemy.exc import (
     DatabaseError,
@@ -24,7 +35,13 @@ from sqlalchemy.exc import (
     SQLAlchemyError,
 )
 from sqlalchemy.orm.session import Session
-from sqlalchemy.schema import AddConstraint, CreateTable, DropConstraint
+from sqlalchemy.schema import (
+    AddConstraint,
+    CreateIndex,
+    CreateSequence,
+    CreateTable,
+    DropConstraint,
+)
 from sqlalchemy.sql.expression import true
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
@@ -53,19 +70,26 @@ from .const import (
     EVENT_TYPE_IDS_SCHEMA_VERSION,
     LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION,
     STATES_META_SCHEMA_VERSION,
+    STATISTICS_ROLLUP_SCHEMA_VERSION,
     SupportedDialect,
 )
 from .db_schema import (
     BIG_INTEGER_SQL,
     CONTEXT_ID_BIN_MAX_LENGTH,
     DOUBLE_PRECISION_TYPE_SQL,
+    ID_TYPE,
     LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX,
     LEGACY_STATES_EVENT_ID_INDEX,
     MYSQL_COLLATE,
     MYSQL_DEFAULT_CHARSET,
     SCHEMA_VERSION,
     STATISTICS_TABLES,
+    TABLE_EVENT_DATA,
+    TABLE_EVENT_TYPES,
+    TABLE_EVENTS,
+    TABLE_STATE_ATTRIBUTES,
     TABLE_STATES,
+    TABLE_STATES_META,
     Base,
     Events,
     EventTypes,
@@ -81,6 +105,7 @@ from .db_schema import (
 )
 from .models import process_timestamp
 from .models.time import datetime_to_timestamp_or_none
+from .partitions import PARTITIONED_TABLES, default_partition_name
 from .queries import (
     batch_cleanup_entity_ids,
     delete_duplicate_short_term_statistics_row,
@@ -100,7 +125,11 @@ from .queries import (
     migrate_single_short_term_statistics_row_to_timestamp,
     migrate_single_statistics_row_to_timestamp,
 )
-from .statistics import cleanup_statistics_timestamp_migration, get_start_time
+from .statistics import (
+    cleanup_statistics_timestamp_migration,
+    get_start_time,
+    rollup_statistics_month,
+)
 from .tasks import RecorderTask
 from .util import (
     database_job_retry_wrapper,
@@ -271,6 +300,87 @@ def pre_migrate_schema(engine: Engine) -> None:
         )
 
 
+def create_partitioned_schema(engine: Engine) -> bool:
+    """Create the states and events tables as time partitioned tables.
+
+    This function is called before calling Base.metadata.create_all, which
+    then creates the remaining tables. Only new PostgreSQL databases are
+    partitioned, returns if the tables were created.
+
+    The partition key has to be part of the primary key and a foreign key
+    can't refer to a partitioned table, so the primary keys of the
+    partitioned tables include the timestamp and the foreign keys to the
+    states and events tables are left out. PostgreSQL before 17 doesn't
+    support identity columns on partitioned tables, the ids come from a
+    sequence instead.
+    """
+    if engine.dialect.name != SupportedDialect.POSTGRESQL:
+        _LOGGER.warning(
+            "Partitioned tables are only supported with PostgreSQL, "
+            "the states and events tables will not be partitioned"
+        )
+        return False
+    inspector = sqlalchemy.inspect(engine)
+    if inspector.has_table(TABLE_STATES) or inspector.has_table(TABLE_EVENTS):
+        return False
+
+    metadata = MetaData()
+    referenced_tables = [
+        Base.metadata.tables[table].to_metadata(metadata)
+        for table in (
+            TABLE_STATE_ATTRIBUTES,
+            TABLE_STATES_META,
+            TABLE_EVENT_DATA,
+            TABLE_EVENT_TYPES,
+        )
+    ]
+    with engine.begin() as connection:
+        metadata.create_all(connection, referenced_tables)
+        for table_name, column_name, id_column_name in (
+            (TABLE_STATES, PARTITIONED_TABLES[TABLE_STATES], "state_id"),
+            (TABLE_EVENTS, PARTITIONED_TABLES[TABLE_EVENTS], "event_id"),
+        ):
+            table = Base.metadata.tables[table_name].to_metadata(metadata)
+            sequence = Sequence(f"{table_name}_{id_column_name}_seq", metadata=metadata)
+            id_column = Column(
+                id_column_name,
+                ID_TYPE,
+                sequence,
+                server_default=sequence.next_value(),
+                primary_key=True,
+            )
+            table.append_column(id_column, replace_existing=True)
+            partition_column = table.c[column_name]
+            partition_column.primary_key = True
+            partition_column.nullable = False
+            table.append_constraint(PrimaryKeyConstraint(id_column, partition_column))
+            table.dialect_options["postgresql"]["partition_by"] = (
+                f"RANGE ({column_name})"
+            )
+            connection.execute(CreateSequence(sequence))
+            connection.execute(
+                CreateTable(
+                    table,
+                    include_foreign_key_constraints=[
+                        foreign_key
+                        for foreign_key in table.foreign_key_constraints
+                        if foreign_key.elements[0].target_fullname.split(".")[0]
+                        not in PARTITIONED_TABLES
+                    ],
+                )
+            )
+            for index in table.indexes:
+                connection.execute(CreateIndex(index))
+            connection.execute(
+                text(
+                    f"CREATE TABLE {default_partition_name(table_name)} "
+                    f"PARTITION OF {table_name} DEFAULT"
+                )
+            )
+    _LOGGER.info("Created partitioned states and events tables")
+    return True
+
+
 def _migrate_schema(
     instance: Recorder,
     hass: HomeAssistant,
@@ -1758,6 +1868,13 @@ class _SchemaVersion47Migrator(_SchemaVersionMigrator, target_version=47):
         )
 
 
+class _SchemaVersion48Migrator(_SchemaVersionMigrator, target_version=48):
+    def _apply_update(self) -> None:
+        """Version specific update method."""
+        # The statistics_daily and statistics_monthly tables are created by
+        # create_all, they are filled by StatisticsRollupMigration
+
+
 def _migrate_statistics_columns_to_timestamp_removing_duplicates(
     hass: HomeAssistant,
     instance: Recorder,
@@ -2631,6 +2748,48 @@ class EventIDPostMigration(BaseRunTimeMigration):
         return DataMigrationStatus(needs_migrate=False, migration_done=True)
 
 
+class StatisticsRollupMigration(BaseRunTimeMigration):
+    """Migration to roll up the long term statistics per day and month."""
+
+    required_schema_version = STATISTICS_ROLLUP_SCHEMA_VERSION
+    migration_id = "statistics_rollup"
+
+    def __init__(self, schema_version: int, migration_changes: dict[str, int]) -> None:
+        """Initialize a new StatisticsRollupMigration."""
+        super().__init__(schema_version, migration_changes)
+        self._next_month_ts: float | None = None
+
+    def migrate_data_impl(self, instance: Recorder) -> DataMigrationStatus:
+        """Roll up a month of long term statistics, return True if completed.
+
+        The months are rolled up from the oldest to the current one, the
+        rollup tables are only used once all months have been rolled up.
+        """
+        _LOGGER.debug("Rolling up statistics from %s", self._next_month_ts)
+        with session_scope(session=instance.get_session()) as session:
+            next_month_ts = rollup_statistics_month(session, self._next_month_ts)
+        # Only move on once the month is committed
+        self._next_month_ts = next_month_ts
+        is_done = next_month_ts is None
+        _LOGGER.debug("Rolling up statistics done=%s", is_done)
+        return DataMigrationStatus(needs_migrate=not is_done, migration_done=is_done)
+
+    def migration_done(self, instance: Recorder, session: Session) -> None:
+        """Will be called after migrate returns True or if migration is not needed."""
+        _LOGGER.debug("Activating statistics rollups as all statistics are rolled up")
+        instance.use_statistics_rollups = True
+
+    def needs_migrate_impl(
+        self, instance: Recorder, session: Session
+    ) -> DataMigrationStatus:
+        """Return if the migration needs to run."""
+        has_statistics = session.execute(select(Statistics.id).limit(1)).scalar()
+        return DataMigrationStatus(
+            needs_migrate=has_statistics is not None,
+            migration_done=has_statistics is None,
+        )
+
+
 class EntityIDPostMigration(BaseRunTimeMigrationWithQuery):
     """Migration to remove old entity_id strings from states."""
 
@@ -0,0 +1,181 @@
+"""Time partitioned states and events tables."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from enum import StrEnum
+import logging
+import re
+
+from sqlalchemy import text
+from sqlalchemy.orm.session import Session
+
+from .db_schema import TABLE_EVENTS, TABLE_STATES
+
+_LOGGER = logging.getLogger(__name__)
+
+# The tables that can be partitioned and the column they are partitioned on
+PARTITIONED_TABLES = {
+    TABLE_STATES: "last_updated_ts",
+    TABLE_EVENTS: "time_fired_ts",
+}
+# The number of partitions created ahead of the current one so
+# rows are never written to the default partition
+PARTITIONS_AHEAD = 2
+
+DAY_SECONDS = 86400
+WEEK_SECONDS = 7 * DAY_SECONDS
+# The epoch is a Thursday, weeks start on Monday
+EPOCH_WEEKDAY = 3
+
+PARTITION_NAME_RE = re.compile(r"^(?P<table>states|events)_p(?P<start>\d+)$")
+
+
+class PartitionInterval(StrEnum):
+    """Interval covered by each partition."""
+
+    DAY = "day"
+    WEEK = "week"
+
+
+@dataclass(slots=True, frozen=True)
+class Partition:
+    """A partition of a partitioned table."""
+
+    table: str
+    name: str
+    start: float
+    end: float
+
+
+def partition_bounds(timestamp: float, interval: PartitionInterval) -> tuple[int, int]:
+    """Return the start and end of the partition a timestamp belongs to.
+
+    Partitions are aligned to UTC days, weekly partitions start on Monday.
+    """
+    start = int(timestamp // DAY_SECONDS * DAY_SECONDS)
+    if interval is PartitionInterval.DAY:
+        return start, start + DAY_SECONDS
+    start -= (start // DAY_SECONDS + EPOCH_WEEKDAY) % 7 * DAY_SECONDS
+    return start, start + WEEK_SECONDS
+
+
+def partition_name(table: str, start: int) -> str:
+    """Return the name of the partition of a table starting at start."""
+    return f"{table}_p{start}"
+
+
+def default_partition_name(table: str) -> str:
+    """Return the name of the default partition of a table."""
+    return f"{table}_default"
+
+
+def tables_are_partitioned(session: Session) -> bool:
+    """Return if the states and events tables are partitioned.
+
+    Only PostgreSQL databases can have partitioned tables.
+    """
+    return all(
+        session.execute(
+            text(
+                "SELECT relkind = 'p' FROM pg_class "
+                "WHERE oid = to_regclass(:table_name)"
+            ),
+            {"table_name": table},
+        ).scalar()
+        for table in PARTITIONED_TABLES
+    )
+
+
+def find_partitions(session: Session, table: str) -> list[Partition]:
+    """Return the range partitions of a table ordered by start.
+
+    Partitions which weren't created by the recorder, such as the
+    default partition, are ignored.
+    """
+    partitions: list[Partition] = []
+    for name, bound in session.execute(
+        text(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+            "FROM pg_inherits "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE pg_inherits.inhparent = to_regclass(:table_name)"
+        ),
+        {"table_name": table},
+    ):
+        if not (match := PARTITION_NAME_RE.match(name)) or not (
+            bounds := _parse_range_bound(bound)
+        ):
+            continue
+        if match.group("table") != table:
+            continue
+        partitions.append(Partition(table, name, *bounds))
+    partitions.sort(key=lambda partition: partition.start)
+    return partitions
+
+
+def _parse_range_bound(bound: str) -> tuple[float, float] | None:
+    """Parse the bound of a range partition.
+
+    The bound looks like FOR VALUES FROM ('1700000000') TO ('1700086400').
+    """
+    if not (
+        match := re.match(
+            r"^FOR VALUES FROM \('?([\d.]+)'?\) TO \('?([\d.]+)'?\)$", bound
+        )
+    ):
+        return None
+    return float(match.group(1)), float(match.group(2))
+
+
+def create_partitions(
+    session: Session, interval: PartitionInterval, now: float
+) -> list[Partition]:
+    """Create the current partition and the ones ahead of it.
+
+    Periods overlapping an existing partition are skipped so changing
+    the interval of a partitioned database never fails. Periods with rows
+    in the default partition, which happens when the recorder didn't run
+    for a while, are skipped as well since PostgreSQL refuses to create
+    them, these rows are purged row by row.
+    """
+    created: list[Partition] = []
+    for table, column in PARTITIONED_TABLES.items():
+        existing = find_partitions(session, table)
+        default_partition = default_partition_name(table)
+        start, end = partition_bounds(now, interval)
+        for _ in range(PARTITIONS_AHEAD + 1):
+            if (
+                not any(
+                    partition.start < end and start < partition.end
+                    for partition in existing
+                )
+                and not session.execute(
+                    text(
+                        f"SELECT 1 FROM {default_partition} "  # noqa: S608
+                        f"WHERE {column} >= :start AND {column} < :end LIMIT 1"
+                    ),
+                    {"start": start, "end": end},
+                ).scalar()
+            ):
+                name = partition_name(table, start)
+                _LOGGER.debug("Creating partition %s of %s", name, table)
+                session.execute(
+                    text(
+                        f"CREATE TABLE {name} PARTITION OF {table} "  # noqa: S608
+                        f"FOR VALUES FROM ({start}) TO ({end})"
+                    )
+                )
+                created.append(Partition(table, name, start, end))
+            start, end = partition_bounds(end, interval)
+    return created
+
+
+def find_expired_partitions(session: Session, purge_before: float) -> list[Partition]:
+    """Return the partitions only holding rows from before purge_before."""
+    return [
+        partition
+        for table in PARTITIONED_TABLES
+        for partition in find_partitions(session, table)
+        if partition.end <= purge_before
+    ]
@@ -2,19 +2,23 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
 from datetime import datetime
 from itertools import zip_longest
 import logging
 import time
 from typing import TYPE_CHECKING
 
+from sqlalchemy import text
 from sqlalchemy.orm.session import Session
 
 from homeassistant.util.collection import chunked_or_all
 
-from .db_schema import Events, States, StatesMeta
+from .db_schema import TABLE_STATES, Events, States, StatesMeta
+from .incremental_purge import PurgeBudget
 from .models import DatabaseEngine
+from .partitions import Partition, find_expired_partitions
 from .queries import (
     attributes_ids_exist_in_states,
     attributes_ids_exist_in_states_with_fast_in_distinct,
@@ -62,16 +66,23 @@ def purge_old_data(
     apply_filter: bool = False,
     events_batch_size: int = DEFAULT_EVENTS_BATCHES_PER_PURGE,
     states_batch_size: int = DEFAULT_STATES_BATCHES_PER_PURGE,
+    budget: PurgeBudget | None = None,
 ) -> bool:
     """Purge events and states older than purge_before.
 
     Cleans up an timeframe of an hour, based on the oldest record.
+
+    With a budget, the states and events are purged until the budget
+    is exhausted, the rest is left for the next call.
     """
     _LOGGER.debug(
         "Purging states and events before target %s",
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
-    with session_scope(session=instance.get_session()) as session:
+    instance.recent_states_manager.evict_before(purge_before.timestamp())
+    if instance.partitioned_tables:
+        _drop_expired_partitions(instance, purge_before.timestamp())
+    with _purge_session_scope(instance) as session:
         # Purge a max of max_bind_vars, based on the oldest states or events record
         has_more_to_purge = False
         if instance.use_legacy_events_index and _purging_legacy_format(session):
@@ -79,7 +90,9 @@ def purge_old_data(
                 "Purge running in legacy format as there are states with event_id"
                 " remaining"
             )
-            has_more_to_purge |= _purge_legacy_format(instance, session, purge_before)
+            has_more_to_purge |= _purge_legacy_format(
+                instance, session, purge_before, budget
+            )
         else:
             _LOGGER.debug(
                 "Purge running in new format as there are NO states with event_id"
@@ -87,11 +100,15 @@ def purge_old_data(
             )
             # Once we are done purging legacy rows, we use the new method
             has_more_to_purge |= _purge_states_and_attributes_ids(
-                instance, session, states_batch_size, purge_before
-            )
-            has_more_to_purge |= _purge_events_and_data_ids(
-                instance, session, events_batch_size, purge_before
+                instance, session, states_batch_size, purge_before, budget
             )
+            if budget is not None and budget.exhausted():
+                # Leave the events for the next slice
+                has_more_to_purge = True
+            else:
+                has_more_to_purge |= _purge_events_and_data_ids(
+                    instance, session, events_batch_size, purge_before, budget
+                )
 
         statistics_runs = _select_statistics_runs_to_purge(
             session, purge_before, instance.max_bind_vars
@@ -128,13 +145,123 @@ def purge_old_data(
     return True
 
 
+def _drop_expired_partitions(instance: Recorder, purge_before: float) -> None:
+    """Drop the partitions of the states and events tables before purge_before.
+
+    Dropping a partition locks the partitioned table, so the partitions
+    are dropped in a transaction of their own which is kept short and the
+    shared rows no longer used are purged after it. The rows of the
+    partition holding purge_before are purged row by row.
+    """
+    attributes_ids: set[int] = set()
+    data_ids: set[int] = set()
+    with _purge_session_scope(instance) as session:
+        for partition in find_expired_partitions(session, purge_before):
+            if partition.table == TABLE_STATES:
+                attributes_ids |= _drop_states_partition(instance, session, partition)
+            else:
+                data_ids |= _drop_events_partition(instance, session, partition)
+    if not attributes_ids and not data_ids:
+        return
+    with _purge_session_scope(instance) as session:
+        for attributes_ids_chunk in chunked_or_all(
+            attributes_ids, instance.max_bind_vars
+        ):
+            _purge_unused_attributes_ids(instance, session, set(attributes_ids_chunk))
+        for data_ids_chunk in chunked_or_all(data_ids, instance.max_bind_vars):
+            _purge_unused_data_ids(instance, session, set(data_ids_chunk))
+
+
+def _drop_states_partition(
+    instance: Recorder, session: Session, partition: Partition
+) -> set[int]:
+    """Drop a partition of the states table.
+
+    Returns the attributes ids used by the dropped states.
+    """
+    name = partition.name
+    attributes_counts: dict[int, int] = dict(
+        session.execute(
+            text(
+                f"SELECT attributes_id, count(*) FROM {name} "  # noqa: S608
+                "WHERE attributes_id IS NOT NULL GROUP BY attributes_id"
+            )
+        ).all()
+    )
+    max_state_id = session.execute(
+        text(f"SELECT max(state_id) FROM {name}")  # noqa: S608
+    ).scalar()
+    if max_state_id is not None:
+        # The partitioned table has no foreign key on old_state_id,
+        # the newer states pointing into the partition are disconnected
+        # the same way the row purge does
+        disconnected_rows = session.execute(
+            text(
+                "UPDATE states SET old_state_id = NULL "  # noqa: S608
+                f"WHERE old_state_id IN (SELECT state_id FROM {name}) "
+                "AND last_updated_ts >= :partition_end"
+            ),
+            {"partition_end": partition.end},
+        )
+        _LOGGER.debug("Updated %s states to remove old_state_id", disconnected_rows)
+        instance.states_manager.evict_purged_state_ids_up_to(max_state_id)
+    instance.state_attributes_manager.remove_reference_counts(attributes_counts)
+    session.execute(text(f"DROP TABLE {name}"))
+    _LOGGER.debug("Dropped states partition %s", name)
+    return set(attributes_counts)
+
+
+def _drop_events_partition(
+    instance: Recorder, session: Session, partition: Partition
+) -> set[int]:
+    """Drop a partition of the events table.
+
+    Returns the event data ids used by the dropped events.
+    """
+    name = partition.name
+    data_counts: dict[int, int] = dict(
+        session.execute(
+            text(
+                f"SELECT data_id, count(*) FROM {name} "  # noqa: S608
+                "WHERE data_id IS NOT NULL GROUP BY data_id"
+            )
+        ).all()
+    )
+    instance.event_data_manager.remove_reference_counts(data_counts)
+    session.execute(text(f"DROP TABLE {name}"))
+    _LOGGER.debug("Dropped events partition %s", name)
+    return set(data_counts)
+
+
+@contextmanager
+def _purge_session_scope(instance: Recorder) -> Generator[Session]:
+    """Provide a transactional scope for a purge.
+
+    The references removed by the purge are only removed from the
+    reference counts of the table managers once the purge is committed.
+    """
+    managers = (instance.state_attributes_manager, instance.event_data_manager)
+    try:
+        with session_scope(session=instance.get_session()) as session:
+            yield session
+    except BaseException:
+        for manager in managers:
+            manager.discard_removed_references()
+        raise
+    for manager in managers:
+        manager.post_commit_removed_references()
+
+
 def _purging_legacy_format(session: Session) -> bool:
     """Check if there are any legacy event_id linked states rows remaining."""
     return bool(session.execute(find_legacy_row()).scalar())
 
 
 def _purge_legacy_format(
-    instance: Recorder, session: Session, purge_before: datetime
+    instance: Recorder,
+    session: Session,
+    purge_before: datetime,
+    budget: PurgeBudget | None,
 ) -> bool:
     """Purge rows that are still linked by the event_ids."""
     (
@@ -143,12 +270,15 @@ def _purge_legacy_format(
         attributes_ids,
         data_ids,
     ) = _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
-        session, purge_before, instance.max_bind_vars
+        instance, session, purge_before
     )
     _purge_state_ids(instance, session, state_ids)
     _purge_unused_attributes_ids(instance, session, attributes_ids)
     _purge_event_ids(session, event_ids)
     _purge_unused_data_ids(instance, session, data_ids)
+    if budget is not None:
+        budget.states += len(state_ids)
+        budget.events += len(event_ids)
 
     # The database may still have some rows that have an event_id but are not
     # linked to any event. These rows are not linked to any event because the
@@ -159,10 +289,12 @@ def _purge_legacy_format(
         detached_state_ids,
         detached_attributes_ids,
     ) = _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
-        session, purge_before, instance.max_bind_vars
+        instance, session, purge_before
     )
     _purge_state_ids(instance, session, detached_state_ids)
     _purge_unused_attributes_ids(instance, session, detached_attributes_ids)
+    if budget is not None:
+        budget.states += len(detached_state_ids)
     return bool(
         event_ids
         or state_ids
@@ -178,6 +310,7 @@ def _purge_states_and_attributes_ids(
     session: Session,
     states_batch_size: int,
     purge_before: datetime,
+    budget: PurgeBudget | None = None,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -194,13 +327,17 @@ def _purge_states_and_attributes_ids(
     max_bind_vars = instance.max_bind_vars
     for _ in range(states_batch_size):
         state_ids, attributes_ids = _select_state_attributes_ids_to_purge(
-            session, purge_before, max_bind_vars
+            instance, session, purge_before, _batch_limit(max_bind_vars, budget)
         )
         if not state_ids:
             has_remaining_state_ids_to_purge = False
             break
         _purge_state_ids(instance, session, state_ids)
         attributes_ids_batch = attributes_ids_batch | attributes_ids
+        if budget is not None:
+            budget.states += len(state_ids)
+            if budget.exhausted():
+                break
 
     _purge_unused_attributes_ids(instance, session, attributes_ids_batch)
     _LOGGER.debug(
@@ -215,6 +352,7 @@ def _purge_events_and_data_ids(
     session: Session,
     events_batch_size: int,
     purge_before: datetime,
+    budget: PurgeBudget | None = None,
 ) -> bool:
     """Purge states and linked attributes id in a batch.
 
@@ -229,13 +367,17 @@ def _purge_events_and_data_ids(
     max_bind_vars = instance.max_bind_vars
     for _ in range(events_batch_size):
         event_ids, data_ids = _select_event_data_ids_to_purge(
-            session, purge_before, max_bind_vars
+            instance, session, purge_before, _batch_limit(max_bind_vars, budget)
         )
         if not event_ids:
             has_remaining_event_ids_to_purge = False
             break
         _purge_event_ids(session, event_ids)
         data_ids_batch = data_ids_batch | data_ids
+        if budget is not None:
+            budget.events += len(event_ids)
+            if budget.exhausted():
+                break
 
     _purge_unused_data_ids(instance, session, data_ids_batch)
     _LOGGER.debug(
@@ -245,18 +387,36 @@ def _purge_events_and_data_ids(
     return has_remaining_event_ids_to_purge
 
 
+def _batch_limit(max_bind_vars: int, budget: PurgeBudget | None) -> int:
+    """Return the number of rows to select for a batch.
+
+    The budget is only checked after a batch, so a batch is never
+    larger than what is left of the budget.
+    """
+    if budget is None:
+        return max_bind_vars
+    return min(max_bind_vars, budget.remaining_rows)
+
+
 def _select_state_attributes_ids_to_purge(
-    session: Session, purge_before: datetime, max_bind_vars: int
+    instance: Recorder, session: Session, purge_before: datetime, max_bind_vars: int
 ) -> tuple[set[int], set[int]]:
-    """Return sets of state and attribute ids to purge."""
+    """Return sets of state and attribute ids to purge.
+
+    The references of the states to their attributes are removed.
+    """
     state_ids = set()
     attributes_ids = set()
-    for state_id, attributes_id in session.execute(
+    rows = session.execute(
         find_states_to_purge(purge_before.timestamp(), max_bind_vars)
-    ).all():
+    ).all()
+    for state_id, attributes_id in rows:
         state_ids.add(state_id)
         if attributes_id:
             attributes_ids.add(attributes_id)
+    instance.state_attributes_manager.remove_references(
+        attributes_id for _, attributes_id in rows
+    )
     _LOGGER.debug(
         "Selected %s state ids and %s attributes_ids to remove",
         len(state_ids),
@@ -266,17 +426,22 @@ def _select_state_attributes_ids_to_purge(
 
 
 def _select_event_data_ids_to_purge(
-    session: Session, purge_before: datetime, max_bind_vars: int
+    instance: Recorder, session: Session, purge_before: datetime, max_bind_vars: int
 ) -> tuple[set[int], set[int]]:
-    """Return sets of event and data ids to purge."""
+    """Return sets of event and data ids to purge.
+
+    The references of the events to their data are removed.
+    """
     event_ids = set()
     data_ids = set()
-    for event_id, data_id in session.execute(
+    rows = session.execute(
         find_events_to_purge(purge_before.timestamp(), max_bind_vars)
-    ).all():
+    ).all()
+    for event_id, data_id in rows:
         event_ids.add(event_id)
         if data_id:
             data_ids.add(data_id)
+    instance.event_data_manager.remove_references(data_id for _, data_id in rows)
     _LOGGER.debug(
         "Selected %s event ids and %s data_ids to remove", len(event_ids), len(data_ids)
     )
@@ -289,9 +454,16 @@ def _select_unused_attributes_ids(
     attributes_ids: set[int],
     database_engine: DatabaseEngine,
 ) -> set[int]:
-    """Return a set of attributes ids that are not used by any states in the db."""
+    """Return a set of attributes ids that are not used by any states in the db.
+
+    Only the attributes ids with unknown references are looked up in the db.
+    """
+    unused_ids, attributes_ids = instance.state_attributes_manager.split_unused(
+        attributes_ids
+    )
     if not attributes_ids:
-        return set()
+        _LOGGER.debug("Selected %s shared attributes to remove", len(unused_ids))
+        return unused_ids
 
     seen_ids: set[int] = set()
     if not database_engine.optimizer.slow_range_in_select:
@@ -353,7 +525,7 @@ def _select_unused_attributes_ids(
                 ).all()
                 if attrs_id[0] is not None
             }
-    to_remove = attributes_ids - seen_ids
+    to_remove = unused_ids | (attributes_ids - seen_ids)
     _LOGGER.debug(
         "Selected %s shared attributes to remove",
         len(to_remove),
@@ -381,9 +553,14 @@ def _select_unused_event_data_ids(
     data_ids: set[int],
     database_engine: DatabaseEngine,
 ) -> set[int]:
-    """Return a set of event data ids that are not used by any events in the db."""
+    """Return a set of event data ids that are not used by any events in the db.
+
+    Only the event data ids with unknown references are looked up in the db.
+    """
+    unused_ids, data_ids = instance.event_data_manager.split_unused(data_ids)
     if not data_ids:
-        return set()
+        _LOGGER.debug("Selected %s shared event data to remove", len(unused_ids))
+        return unused_ids
 
     seen_ids: set[int] = set()
     # See _select_unused_attributes_ids for why this function
@@ -406,7 +583,7 @@ def _select_unused_event_data_ids(
                 ).all()
                 if data_id[0] is not None
             }
-    to_remove = data_ids - seen_ids
+    to_remove = unused_ids | (data_ids - seen_ids)
     _LOGGER.debug("Selected %s shared event data to remove", len(to_remove))
     return to_remove
 
@@ -455,7 +632,7 @@ def _select_short_term_statistics_to_purge(
 
 
 def _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
-    session: Session, purge_before: datetime, max_bind_vars: int
+    instance: Recorder, session: Session, purge_before: datetime
 ) -> tuple[set[int], set[int]]:
     """Return a list of state, and attribute ids to purge.
 
@@ -465,9 +642,12 @@ def _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
     """
     states = session.execute(
         find_legacy_detached_states_and_attributes_to_purge(
-            purge_before.timestamp(), max_bind_vars
+            purge_before.timestamp(), instance.max_bind_vars
         )
     ).all()
+    instance.state_attributes_manager.remove_references(
+        attributes_id for state_id, attributes_id in states if state_id
+    )
     _LOGGER.debug("Selected %s state ids to remove", len(states))
     state_ids = set()
     attributes_ids = set()
@@ -480,7 +660,7 @@ def _select_legacy_detached_state_and_attributes_and_data_ids_to_purge(
 
 
 def _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
-    session: Session, purge_before: datetime, max_bind_vars: int
+    instance: Recorder, session: Session, purge_before: datetime
 ) -> tuple[set[int], set[int], set[int], set[int]]:
     """Return a list of event, state, and attribute ids to purge linked by the event_id.
 
@@ -490,9 +670,15 @@ def _select_legacy_event_state_and_attributes_and_data_ids_to_purge(
     """
     events = session.execute(
         find_legacy_event_state_and_attributes_and_data_ids_to_purge(
-            purge_before.timestamp(), max_bind_vars
+            purge_before.timestamp(), instance.max_bind_vars
         )
     ).all()
+    instance.event_data_manager.remove_references(
+        data_id for _, data_id, _, _ in events
+    )
+    instance.state_attributes_manager.remove_references(
+        attributes_id for _, _, state_id, attributes_id in events if state_id
+    )
     _LOGGER.debug("Selected %s event ids to remove", len(events))
     event_ids = set()
     state_ids = set()
@@ -697,6 +883,7 @@ def _purge_filtered_states(
     if not to_purge:
         return True
     state_ids, attributes_ids, event_ids = zip(*to_purge, strict=False)
+    instance.state_attributes_manager.remove_references(attributes_ids)
     filtered_event_ids = {id_ for id_ in event_ids if id_ is not None}
     _LOGGER.debug(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
@@ -738,6 +925,7 @@ def _purge_filtered_events(
     if not to_purge:
         return True
     event_ids, data_ids = zip(*to_purge, strict=False)
+    instance.event_data_manager.remove_references(data_ids)
     event_ids_set = set(event_ids)
     _LOGGER.debug(
         "Selected %s event_ids to remove that should be filtered", len(event_ids_set)
@@ -773,7 +961,11 @@ def purge_entity_data(
     database_engine = instance.database_engine
     assert database_engine is not None
     purge_before_timestamp = purge_before.timestamp()
-    with session_scope(session=instance.get_session()) as session:
+    if entity_filter is not None:
+        instance.recent_states_manager.evict_before(
+            purge_before_timestamp, entity_filter
+        )
+    with _purge_session_scope(instance) as session:
         selected_metadata_ids: list[str] = [
             metadata_id
             for (metadata_id, entity_id) in session.query(
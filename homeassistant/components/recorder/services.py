@@ -19,7 +19,7 @@ import homeassistant.util.dt as dt_util
 
 from .const import ATTR_APPLY_FILTER, ATTR_KEEP_DAYS, ATTR_REPACK, DOMAIN
 from .core import Recorder
-from .tasks import PurgeEntitiesTask, PurgeTask
+from .tasks import PurgeEntitiesTask
 
 SERVICE_PURGE = "purge"
 SERVICE_PURGE_ENTITIES = "purge_entities"
@@ -73,7 +73,7 @@ def _async_register_purge_service(hass: HomeAssistant, instance: Recorder) -> No
         repack = cast(bool, kwargs[ATTR_REPACK])
         apply_filter = cast(bool, kwargs[ATTR_APPLY_FILTER])
         purge_before = dt_util.utcnow() - timedelta(days=keep_days)
-        instance.queue_task(PurgeTask(purge_before, repack, apply_filter))
+        instance.async_queue_purge(purge_before, repack, apply_filter)
 
     async_register_admin_service(
         hass,
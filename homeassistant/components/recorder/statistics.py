@@ -7,15 +7,16 @@ from collections.abc import Callable, Iterable, Sequence
 import dataclasses
 from datetime import datetime, timedelta
 from functools import lru_cache, partial
-from itertools import chain, groupby
+from itertools import groupby
 import logging
 from operator import itemgetter
 import re
+import time
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
-from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
+from sqlalchemy import Select, and_, bindparam, func, insert, lambda_stmt, select, text
 from sqlalchemy.engine.row import Row
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, StatementError
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 import voluptuous as vol
@@ -26,6 +27,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.singleton import singleton
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 from homeassistant.util import dt as dt_util
+from homeassistant.util.collection import chunked
 from homeassistant.util.unit_conversion import (
     BaseUnitConverter,
     ConductivityConverter,
@@ -60,6 +62,10 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDaily,
+    StatisticsMeta,
+    StatisticsMonthly,
+    StatisticsRollupBase,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -71,6 +77,7 @@ from .models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
 )
+from .statistics_math import period_groups, reduce_groups
 from .util import (
     execute,
     execute_stmt_lambda_element,
@@ -105,6 +112,18 @@ QUERY_STATISTICS_SHORT_TERM = (
     StatisticsShortTerm.sum,
 )
 
+QUERY_STATISTICS_DAILY = (
+    StatisticsDaily.metadata_id,
+    StatisticsDaily.start_ts,
+    StatisticsDaily.mean,
+    StatisticsDaily.min,
+    StatisticsDaily.max,
+    StatisticsDaily.last_reset_ts,
+    StatisticsDaily.state,
+    StatisticsDaily.sum,
+    StatisticsDaily.mean_count,
+)
+
 QUERY_STATISTICS_SUMMARY_MEAN = (
     StatisticsShortTerm.metadata_id,
     func.avg(StatisticsShortTerm.mean),
@@ -157,6 +176,14 @@ UNIT_CLASSES = {
 
 DATA_SHORT_TERM_STATISTICS_RUN_CACHE = "recorder_short_term_statistics_run_cache"
 
+STATISTICS_ROLLUP_TABLES: dict[str, type[StatisticsRollupBase]] = {
+    "day": StatisticsDaily,
+    "month": StatisticsMonthly,
+}
+# The number of statistics rolled up at once, this bounds the
+# number of hourly statistics loaded when a month is rolled up
+ROLLUP_BATCH_SIZE = 100
+
 
 def mean(values: list[float]) -> float | None:
     """Return the mean of the values.
@@ -444,6 +471,9 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
         for metadata_id, summary_item in summary.items()
     )
 
+    if summary:
+        update_statistics_rollups(session, summary, start_time_ts, end_time_ts)
+
 
 @retryable_database_job("compile missing statistics")
 def compile_missing_statistics(instance: Recorder) -> bool:
@@ -546,6 +576,8 @@ def _compile_statistics(
         return modified_statistic_ids
 
     _LOGGER.debug("Compiling statistics for %s-%s", start, end)
+    timings: dict[str, float] = {}
+    phase_start = time.perf_counter()
     platform_stats: list[StatisticResult] = []
     current_metadata: dict[str, tuple[int, StatisticMetaData]] = {}
     # Collect statistics from all platforms implementing support
@@ -569,6 +601,9 @@ def _compile_statistics(
         platform_stats.extend(compiled.platform_stats)
         current_metadata.update(compiled.current_metadata)
 
+    timings["platforms"] = (now := time.perf_counter()) - phase_start
+    phase_start = now
+
     new_short_term_stats: list[StatisticsBase] = []
     updated_metadata_ids: set[int] = set()
     # Insert collected statistics in the database
@@ -587,6 +622,9 @@ def _compile_statistics(
         ):
             new_short_term_stats.append(new_stat)
 
+    timings["insert"] = (now := time.perf_counter()) - phase_start
+    phase_start = now
+
     if start.minute == 50:
         # Once every hour, update issues
         for platform in instance.hass.data[DOMAIN].recorder_platforms.values():
@@ -602,6 +640,9 @@ def _compile_statistics(
         # A full hour is ready, summarize it
         _compile_hourly_statistics(session, start)
 
+    timings["hourly"] = (now := time.perf_counter()) - phase_start
+    phase_start = now
+
     session.add(StatisticsRuns(start=start))
 
     if fire_events:
@@ -626,6 +667,14 @@ def _compile_statistics(
             )
         )
 
+    timings["flush"] = time.perf_counter() - phase_start
+    _LOGGER.debug(
+        "Compiled %s statistics for %s-%s (%s)",
+        len(platform_stats),
+        start,
+        end,
+        ", ".join(f"{phase}: {timing:.3f}s" for phase, timing in timings.items()),
+    )
     return modified_statistic_ids
 
 
@@ -902,14 +951,11 @@ def list_statistic_ids(
 
 def _reduce_statistics(
     stats: dict[str, list[StatisticsRow]],
-    same_period: Callable[[float, float], bool],
     period_start_end: Callable[[float], tuple[float, float]],
-    period: timedelta,
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to daily or monthly statistics."""
     result: dict[str, list[StatisticsRow]] = defaultdict(list)
-    period_seconds = period.total_seconds()
     _want_mean = "mean" in types
     _want_min = "min" in types
     _want_max = "max" in types
@@ -917,44 +963,53 @@ def _reduce_statistics(
     _want_state = "state" in types
     _want_sum = "sum" in types
     for statistic_id, stat_list in stats.items():
-        max_values: list[float] = []
-        mean_values: list[float] = []
-        min_values: list[float] = []
-        prev_stat: StatisticsRow = stat_list[0]
-        fake_entry: StatisticsRow = {"start": stat_list[-1]["start"] + period_seconds}
-
-        # Loop over the hourly statistics + a fake entry to end the period
-        for statistic in chain(stat_list, (fake_entry,)):
-            if not same_period(prev_stat["start"], statistic["start"]):
-                start, end = period_start_end(prev_stat["start"])
-                # The previous statistic was the last entry of the period
-                row: StatisticsRow = {
-                    "start": start,
-                    "end": end,
-                }
-                if _want_mean:
-                    row["mean"] = mean(mean_values) if mean_values else None
-                    mean_values.clear()
-                if _want_min:
-                    row["min"] = min(min_values) if min_values else None
-                    min_values.clear()
-                if _want_max:
-                    row["max"] = max(max_values) if max_values else None
-                    max_values.clear()
-                if _want_last_reset:
-                    row["last_reset"] = prev_stat.get("last_reset")
-                if _want_state:
-                    row["state"] = prev_stat.get("state")
-                if _want_sum:
-                    row["sum"] = prev_stat["sum"]
-                result[statistic_id].append(row)
-            if _want_max and (_max := statistic.get("max")) is not None:
-                max_values.append(_max)
-            if _want_mean and (_mean := statistic.get("mean")) is not None:
-                mean_values.append(_mean)
-            if _want_min and (_min := statistic.get("min")) is not None:
-                min_values.append(_min)
-            prev_stat = statistic
+        groups = period_groups(
+            [statistic["start"] for statistic in stat_list], period_start_end
+        )
+        group_indices = [group[0] for group in groups]
+        if _want_mean:
+            means = reduce_groups(
+                [statistic.get("mean") for statistic in stat_list],
+                group_indices,
+                "mean",
+            )
+        if _want_min:
+            mins = reduce_groups(
+                [statistic.get("min") for statistic in stat_list],
+                group_indices,
+                "min",
+            )
+        if _want_max:
+            maxes = reduce_groups(
+                [statistic.get("max") for statistic in stat_list],
+                group_indices,
+                "max",
+            )
+        rows = result[statistic_id]
+        for group_idx, (_, start, end) in enumerate(groups):
+            # The last statistic of the period
+            last_stat = stat_list[
+                group_indices[group_idx + 1] - 1
+                if group_idx + 1 < len(group_indices)
+                else -1
+            ]
+            row: StatisticsRow = {
+                "start": start,
+                "end": end,
+            }
+            if _want_mean:
+                row["mean"] = means[group_idx]
+            if _want_min:
+                row["min"] = mins[group_idx]
+            if _want_max:
+                row["max"] = maxes[group_idx]
+            if _want_last_reset:
+                row["last_reset"] = last_stat.get("last_reset")
+            if _want_state:
+                row["state"] = last_stat.get("state")
+            if _want_sum:
+                row["sum"] = last_stat["sum"]
+            rows.append(row)
 
     return result
 
@@ -1002,10 +1057,8 @@ def _reduce_statistics_per_day(
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to daily statistics."""
-    _same_day_ts, _day_start_end_ts = reduce_day_ts_factory()
-    return _reduce_statistics(
-        stats, _same_day_ts, _day_start_end_ts, timedelta(days=1), types
-    )
+    _, _day_start_end_ts = reduce_day_ts_factory()
+    return _reduce_statistics(stats, _day_start_end_ts, types)
 
 
 def reduce_week_ts_factory() -> (
@@ -1052,10 +1105,8 @@ def _reduce_statistics_per_week(
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to weekly statistics."""
-    _same_week_ts, _week_start_end_ts = reduce_week_ts_factory()
-    return _reduce_statistics(
-        stats, _same_week_ts, _week_start_end_ts, timedelta(days=7), types
-    )
+    _, _week_start_end_ts = reduce_week_ts_factory()
+    return _reduce_statistics(stats, _week_start_end_ts, types)
 
 
 def _find_month_end_time(timestamp: datetime) -> datetime:
@@ -1107,10 +1158,154 @@ def _reduce_statistics_per_month(
     types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
 ) -> dict[str, list[StatisticsRow]]:
     """Reduce hourly statistics to monthly statistics."""
-    _same_month_ts, _month_start_end_ts = reduce_month_ts_factory()
-    return _reduce_statistics(
-        stats, _same_month_ts, _month_start_end_ts, timedelta(days=31), types
-    )
+    _, _month_start_end_ts = reduce_month_ts_factory()
+    return _reduce_statistics(stats, _month_start_end_ts, types)
+
+
+def _rollup_statistics(
+    stats: Sequence[Row],
+    period_start_end: Callable[[float], tuple[float, float]],
+    weighted: bool,
+    now_ts: float,
+) -> list[dict[str, Any]]:
+    """Roll up statistics ordered by metadata_id and start to longer periods.
+
+    The mean is the average of the hourly means, rolled up means are weighed
+    by their mean_count. The sum, state and last_reset are the ones of the
+    last statistic in the period, like when hourly statistics are reduced.
+    """
+    rollups: list[dict[str, Any]] = []
+    for metadata_id, group in groupby(stats, itemgetter(0)):
+        rows = list(group)
+        groups = period_groups([row.start_ts for row in rows], period_start_end)
+        ends = [first for first, _, _ in groups[1:]]
+        ends.append(len(rows))
+        for (first, start, _), end in zip(groups, ends, strict=True):
+            period_rows = rows[first:end]
+            mean_total = 0.0
+            mean_count = 0
+            for row in period_rows:
+                if row.mean is None:
+                    continue
+                count = row.mean_count if weighted else 1
+                mean_total += row.mean * count
+                mean_count += count
+            last_row = period_rows[-1]
+            rollups.append(
+                {
+                    "metadata_id": metadata_id,
+                    "created_ts": now_ts,
+                    "start_ts": start,
+                    "mean": mean_total / mean_count if mean_count else None,
+                    "min": min(
+                        (row.min for row in period_rows if row.min is not None),
+                        default=None,
+                    ),
+                    "max": max(
+                        (row.max for row in period_rows if row.max is not None),
+                        default=None,
+                    ),
+                    "last_reset_ts": last_row.last_reset_ts,
+                    "state": last_row.state,
+                    "sum": last_row.sum,
+                    "mean_count": mean_count,
+                }
+            )
+    return rollups
+
+
+def _replace_statistics_rollups(
+    session: Session,
+    table: type[StatisticsRollupBase],
+    metadata_ids: list[int],
+    start_ts: float,
+    end_ts: float,
+    rollups: list[dict[str, Any]],
+) -> None:
+    """Replace the rolled up statistics of a period."""
+    session.query(table).filter(
+        table.metadata_id.in_(metadata_ids),
+        table.start_ts >= start_ts,
+        table.start_ts < end_ts,
+    ).delete(synchronize_session=False)
+    if rollups:
+        session.execute(insert(table), rollups)
+
+
+def update_statistics_rollups(
+    session: Session,
+    metadata_ids: Iterable[int],
+    start_ts: float,
+    end_ts: float,
+) -> None:
+    """Roll up the statistics of the days and months overlapping start - end.
+
+    The daily statistics are rolled up from the hourly statistics and the
+    monthly statistics from the daily statistics, days and months are in
+    the local time zone.
+    """
+    _, day_start_end = reduce_day_ts_factory()
+    _, month_start_end = reduce_month_ts_factory()
+    day_start = day_start_end(start_ts)[0]
+    day_end = day_start_end(max(start_ts, end_ts - 1))[1]
+    month_start = month_start_end(day_start)[0]
+    month_end = month_start_end(day_end - 1)[1]
+    now_ts = time.time()
+    for batch in chunked(metadata_ids, ROLLUP_BATCH_SIZE):
+        hourly = session.execute(
+            select(*QUERY_STATISTICS)
+            .filter(Statistics.metadata_id.in_(batch))
+            .filter(Statistics.start_ts >= day_start)
+            .filter(Statistics.start_ts < day_end)
+            .order_by(Statistics.metadata_id, Statistics.start_ts)
+        ).all()
+        _replace_statistics_rollups(
+            session,
+            StatisticsDaily,
+            batch,
+            day_start,
+            day_end,
+            _rollup_statistics(hourly, day_start_end, False, now_ts),
+        )
+        daily = session.execute(
+            select(*QUERY_STATISTICS_DAILY)
+            .filter(StatisticsDaily.metadata_id.in_(batch))
+            .filter(StatisticsDaily.start_ts >= month_start)
+            .filter(StatisticsDaily.start_ts < month_end)
+            .order_by(StatisticsDaily.metadata_id, StatisticsDaily.start_ts)
+        ).all()
+        _replace_statistics_rollups(
+            session,
+            StatisticsMonthly,
+            batch,
+            month_start,
+            month_end,
+            _rollup_statistics(daily, month_start_end, True, now_ts),
+        )
+
+
+def rollup_statistics_month(session: Session, start_ts: float | None) -> float | None:
+    """Roll up a month of long term statistics to fill the rollup tables.
+
+    When start_ts is None the rollup tables are cleared and the month of the
+    oldest long term statistics is rolled up. Returns the start of the next
+    month to roll up, or None when there are no newer statistics.
+    """
+    if start_ts is None:
+        session.query(StatisticsDaily).delete(synchronize_session=False)
+        session.query(StatisticsMonthly).delete(synchronize_session=False)
+        if (start_ts := session.query(func.min(Statistics.start_ts)).scalar()) is None:
+            return None
+    _, month_start_end = reduce_month_ts_factory()
+    month_start, month_end = month_start_end(start_ts)
+    metadata_ids = [metadata_id for (metadata_id,) in session.query(StatisticsMeta.id)]
+    update_statistics_rollups(session, metadata_ids, month_start, month_end)
+    if (
+        session.query(Statistics.id).filter(Statistics.start_ts >= month_end).first()
+        is None
+    ):
+        return None
+    return month_end
 
 
 def _generate_statistics_during_period_stmt(
@@ -1698,6 +1893,63 @@ def _augment_result_with_change(
             prev_sum = _sum
 
 
+def _rollup_statistics_during_period(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: set[str] | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    metadata_ids: list[int] | None,
+    period: str,
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]] | None:
+    """Return daily or monthly statistics from the rollup tables.
+
+    Returns None if the rolled up periods don't match the periods in the
+    current time zone, the rollups are then rebuilt.
+    """
+    table = STATISTICS_ROLLUP_TABLES[period]
+    stmt = _generate_statistics_during_period_stmt(
+        start_time, end_time, metadata_ids, table, types
+    )
+    stats = cast(
+        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+    )
+    if not stats:
+        return {}
+
+    result = _sorted_statistics_to_dict(
+        hass,
+        stats,
+        statistic_ids,
+        metadata,
+        True,
+        table,
+        units,
+        types,
+    )
+    if period == "day":
+        _, period_start_end = reduce_day_ts_factory()
+    else:
+        _, period_start_end = reduce_month_ts_factory()
+    periods: dict[float, tuple[float, float]] = {}
+    for rows in result.values():
+        for row in rows:
+            start_ts = row["start"]
+            if (start_end := periods.get(start_ts)) is None:
+                start_end = periods[start_ts] = period_start_end(start_ts)
+            if start_end[0] != start_ts:
+                _LOGGER.debug(
+                    "Rolled up statistics don't match the time zone, rebuilding them"
+                )
+                get_instance(hass).queue_statistics_rollups_rebuild()
+                return None
+            row["end"] = start_end[1]
+    return result
+
+
 def _statistics_during_period_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -1768,35 +2020,54 @@ def _statistics_during_period_with_session(
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
-    stmt = _generate_statistics_during_period_stmt(
-        start_time, end_time, metadata_ids, table, types
-    )
-    stats = cast(
-        Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
-    )
+    result: dict[str, list[StatisticsRow]] | None = None
+    if period in STATISTICS_ROLLUP_TABLES and get_instance(hass).use_statistics_rollups:
+        result = _rollup_statistics_during_period(
+            hass,
+            session,
+            start_time,
+            end_time,
+            statistic_ids,
+            metadata,
+            metadata_ids,
+            period,
+            units,
+            types,
+        )
 
-    if not stats:
-        return {}
+    if result is None:
+        stmt = _generate_statistics_during_period_stmt(
+            start_time, end_time, metadata_ids, table, types
+        )
+        stats = cast(
+            Sequence[Row], execute_stmt_lambda_element(session, stmt, orm_rows=False)
+        )
 
-    result = _sorted_statistics_to_dict(
-        hass,
-        stats,
-        statistic_ids,
-        metadata,
-        True,
-        table,
-        units,
-        types,
-    )
+        if not stats:
+            return {}
 
-    if period == "day":
-        result = _reduce_statistics_per_day(result, types)
+        result = _sorted_statistics_to_dict(
+            hass,
+            stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            units,
+            types,
+        )
 
-    if period == "week":
-        result = _reduce_statistics_per_week(result, types)
+        if period == "day":
+            result = _reduce_statistics_per_day(result, types)
 
-    if period == "month":
-        result = _reduce_statistics_per_month(result, types)
+        if period == "week":
+            result = _reduce_statistics_per_week(result, types)
+
+        if period == "month":
+            result = _reduce_statistics_per_month(result, types)
+
+    if not result:
+        return {}
 
     if "change" in _types:
         _augment_result_with_change(
@@ -2340,13 +2611,19 @@ def _import_statistics_with_session(
     _, metadata_id = statistics_meta_manager.update_or_add(
         session, metadata, old_metadata_dict
     )
+    starts: list[float] = []
     for stat in statistics:
+        starts.append(stat["start"].timestamp())
         if stat_id := _statistics_exists(session, table, metadata_id, stat["start"]):
             _update_statistics(session, table, stat_id, stat)
         else:
             _insert_statistics(session, table, metadata_id, stat)
 
     if table != StatisticsShortTerm:
+        if starts:
+            update_statistics_rollups(
+                session, (metadata_id,), min(starts), max(starts) + 1
+            )
         return True
 
     # We just inserted new short term statistics, so we need to update the
@@ -2426,15 +2703,21 @@ def import_statistics(
 ) -> bool:
     """Process an import_statistics job."""
 
+    duplicate_filter = filter_unique_constraint_integrity_error(instance, "statistic")
     with session_scope(
-        session=instance.get_session(),
-        exception_filter=filter_unique_constraint_integrity_error(
-            instance, "statistic"
-        ),
+        session=instance.get_session(), exception_filter=duplicate_filter
     ) as session:
-        return _import_statistics_with_session(
-            instance, session, metadata, statistics, table
-        )
+        try:
+            return _import_statistics_with_session(
+                instance, session, metadata, statistics, table
+            )
+        except StatementError as err:
+            # Updating the rollups flushes the session, duplicated rows
+            # are then blocked here instead of when committing the session
+            if not duplicate_filter(err):
+                raise
+            session.rollback()
+            return True
 
 
 @retryable_database_job("adjust_statistics")
@@ -2476,9 +2759,42 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        _adjust_sum_statistics_rollups(
+            session, metadata[statistic_id][0], start_time, sum_adjustment
+        )
+
     return True
 
 
+def _adjust_sum_statistics_rollups(
+    session: Session,
+    metadata_id: int,
+    start_time: datetime,
+    adj: float,
+) -> None:
+    """Adjust the rolled up statistics after the hourly statistics were adjusted.
+
+    The sum of the days and months after the one start_time is in are adjusted
+    the same way as the hourly statistics, the day and month start_time is in
+    are rolled up again.
+    """
+    start_time_ts = start_time.replace(minute=0).timestamp()
+    _, day_start_end = reduce_day_ts_factory()
+    _, month_start_end = reduce_month_ts_factory()
+    for table, start_end in (
+        (StatisticsDaily, day_start_end),
+        (StatisticsMonthly, month_start_end),
+    ):
+        _adjust_sum_statistics(
+            session,
+            table,
+            metadata_id,
+            dt_util.utc_from_timestamp(start_end(start_time_ts)[1]),
+            adj,
+        )
+    update_statistics_rollups(session, (metadata_id,), start_time_ts, start_time_ts + 1)
+
+
 def _change_statistics_unit_for_table(
     session: Session,
     table: type[StatisticsBase],
@@ -2536,6 +2852,8 @@ def change_statistics_unit(
         tables: tuple[type[StatisticsBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            StatisticsDaily,
+            StatisticsMonthly,
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
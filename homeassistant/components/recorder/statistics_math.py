@@ -0,0 +1,142 @@
+"""Array based reductions used to compile and reduce statistics.
+
+NumPy is used when it is installed and the arrays are large enough
+for it to be faster, otherwise the reductions fall back to pure Python.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable, Sequence
+import math
+from typing import Any, Literal
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+# Below this size the overhead of creating NumPy arrays
+# is larger than the time saved by the vectorized math
+NUMPY_MIN_SIZE = 64
+
+type Reduction = Literal["mean", "min", "max"]
+
+
+def time_weighted_average(
+    timestamps: Sequence[float],
+    values: Sequence[float],
+    start_ts: float,
+    end_ts: float,
+) -> float:
+    """Calculate a time weighted average of values which change at timestamps.
+
+    The timestamps must be sorted. The values are weighted by the duration in
+    seconds until the next change, the last value until end_ts. Timestamps
+    before start_ts count from start_ts, and if the first timestamp is after
+    start_ts the average starts from it since there is no known value before.
+    There's no interpolation of values between state changes.
+    """
+    if not timestamps:
+        return 0.0
+    if np is not None and len(timestamps) >= NUMPY_MIN_SIZE:
+        clamped = np.maximum(np.asarray(timestamps, dtype=np.float64), start_ts)
+        start_ts = float(clamped[0])
+        accumulated = float(
+            np.dot(
+                np.asarray(values, dtype=np.float64),
+                np.diff(clamped, append=end_ts),
+            )
+        )
+    else:
+        accumulated = 0.0
+        prev_ts = start_ts = max(timestamps[0], start_ts)
+        prev_value = values[0]
+        for idx in range(1, len(timestamps)):
+            timestamp = max(timestamps[idx], start_ts)
+            accumulated += prev_value * (timestamp - prev_ts)
+            prev_ts = timestamp
+            prev_value = values[idx]
+        accumulated += prev_value * (end_ts - prev_ts)
+
+    if (period_seconds := end_ts - start_ts) == 0:
+        # If the only state changed that happened was at the exact moment
+        # at the end of the period, we can't calculate a meaningful average
+        # so we return 0.0 since it represents a time duration smaller than
+        # we can measure.
+        return 0.0
+    return accumulated / period_seconds
+
+
+def period_groups(
+    starts: Sequence[float],
+    period_start_end: Callable[[float], tuple[float, float]],
+) -> list[tuple[int, float, float]]:
+    """Group sorted start timestamps by the period they are in.
+
+    Returns the index of the first timestamp of each group together
+    with the start and end of the period. The period of each group is
+    only looked up once, so this is linear in the number of periods
+    rather than the number of timestamps.
+    """
+    groups: list[tuple[int, float, float]] = []
+    idx = 0
+    count = len(starts)
+    while idx < count:
+        period_start, period_end = period_start_end(starts[idx])
+        groups.append((idx, period_start, period_end))
+        idx = bisect_left(starts, period_end, idx + 1)
+    return groups
+
+
+def reduce_groups(
+    values: Sequence[float | None],
+    group_indices: Sequence[int],
+    reduction: Reduction,
+) -> list[float | None]:
+    """Reduce each group of values, ignoring missing values.
+
+    group_indices holds the index of the first value of each group. A group
+    without any values reduces to None.
+    """
+    if np is not None and len(values) >= NUMPY_MIN_SIZE:
+        return _reduce_groups_numpy(values, group_indices, reduction)
+    ends = [*group_indices[1:], len(values)]
+    result: list[float | None] = []
+    for start, end in zip(group_indices, ends, strict=True):
+        group = [value for value in values[start:end] if value is not None]
+        if not group:
+            result.append(None)
+        elif reduction == "mean":
+            result.append(sum(group) / len(group))
+        elif reduction == "min":
+            result.append(min(group))
+        else:
+            result.append(max(group))
+    return result
+
+
+def _reduce_groups_numpy(
+    values: Sequence[float | None],
+    group_indices: Sequence[int],
+    reduction: Reduction,
+) -> list[float | None]:
+    """Reduce each group of values with NumPy."""
+    array: Any = np.array(
+        [math.nan if value is None else value for value in values], dtype=np.float64
+    )
+    indices = np.asarray(group_indices, dtype=np.intp)
+    missing = np.isnan(array)
+    counts = np.add.reduceat(~missing, indices)
+    if reduction == "mean":
+        reduced = np.add.reduceat(np.where(missing, 0.0, array), indices) / np.where(
+            counts, counts, 1
+        )
+    elif reduction == "min":
+        reduced = np.fmin.reduceat(array, indices)
+    else:
+        reduced = np.fmax.reduceat(array, indices)
+    return [
+        float(value) if count else None
+        for value, count in zip(reduced.tolist(), counts.tolist(), strict=True)
+    ]
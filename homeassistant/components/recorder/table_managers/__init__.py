@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Iterable, Mapping
 from typing import TYPE_CHECKING, Any
 
 from lru import LRU
@@ -11,6 +13,11 @@ from homeassistant.util.event_type import EventType
 if TYPE_CHECKING:
     from ..core import Recorder
 
+# The maximum number of shared rows to count the references to, the
+# references to rows created after this are unknown like the references
+# to rows which existed before the recorder started
+MAX_REFERENCE_COUNTS = 262144
+
 
 class BaseTableManager[_DataT]:
     """Base class for table managers."""
@@ -74,3 +81,126 @@ class BaseLRUTableManager[_DataT](BaseTableManager[_DataT]):
         lru = self._id_map
         if new_size > lru.get_size():
             lru.set_size(new_size)
+
+
+class BaseReferenceCountedTableManager[_DataT](BaseLRUTableManager[_DataT]):
+    """Base class for LRU table managers of rows shared by the rows of a big table.
+
+    The references to the shared rows created while the recorder is running
+    are counted, so the shared rows no longer used once the rows of the big
+    table are purged can be found without scanning the big table. The
+    references to shared rows which existed before are unknown and have to
+    be looked up.
+    """
+
+    def __init__(self, recorder: Recorder, lru_size: int) -> None:
+        """Initialize the reference counted table manager."""
+        super().__init__(recorder, lru_size)
+        self._ref_counts: dict[int, int] = {}
+        self._pending_ref_counts: Counter[str] = Counter()
+        self._removed_refs: Counter[int] = Counter()
+
+    def add_reference(self, id_: int) -> None:
+        """Count a reference to a shared row added to the session.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if id_ in self._ref_counts:
+            self._ref_counts[id_] += 1
+
+    def add_pending_reference(self, shared_data: str) -> None:
+        """Count a reference to a pending shared row added to the session.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_ref_counts[shared_data] += 1
+
+    def _post_commit_pending_references(self, shared_data: str, id_: int) -> None:
+        """Start counting the references to a committed pending shared row."""
+        if (count := self._pending_ref_counts.pop(shared_data, 0)) and len(
+            self._ref_counts
+        ) < MAX_REFERENCE_COUNTS:
+            self._ref_counts[id_] = count
+
+    def remove_references(self, ids: Iterable[int | None]) -> None:
+        """Remove references by rows of the big table being purged.
+
+        Each id is removed as often as it is referenced by a purged row,
+        the references are only removed from the counts once the purge
+        is committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        ref_counts = self._ref_counts
+        self._removed_refs.update(id_ for id_ in ids if id_ in ref_counts)
+
+    def remove_reference_counts(self, counts: Mapping[int, int]) -> None:
+        """Remove the references counted by rows of the big table being purged.
+
+        The same as remove_references for rows which are dropped in bulk,
+        such as a dropped partition, and only counted per id.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        ref_counts = self._ref_counts
+        self._removed_refs.update(
+            {id_: count for id_, count in counts.items() if id_ in ref_counts}
+        )
+
+    def split_unused(self, ids: set[int]) -> tuple[set[int], set[int]]:
+        """Split ids into the ones no longer used and the ones with unknown use.
+
+        The ids which are still referenced are left out.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        ref_counts = self._ref_counts
+        removed_refs = self._removed_refs
+        unused: set[int] = set()
+        unknown: set[int] = set()
+        for id_ in ids:
+            if (count := ref_counts.get(id_)) is None:
+                unknown.add(id_)
+            elif count <= removed_refs[id_]:
+                unused.add(id_)
+        return unused, unknown
+
+    def post_commit_removed_references(self) -> None:
+        """Call after a purge is committed to update the counts.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        ref_counts = self._ref_counts
+        for id_, removed in self._removed_refs.items():
+            if (count := ref_counts[id_] - removed) > 0:
+                ref_counts[id_] = count
+            else:
+                del ref_counts[id_]
+        self._removed_refs.clear()
+
+    def discard_removed_references(self) -> None:
+        """Call after a purge is rolled back to keep the counts.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._removed_refs.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        The references to the shared rows are unknown afterwards.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        super().reset()
+        self._ref_counts.clear()
+        self._pending_ref_counts.clear()
+        self._removed_refs.clear()
@@ -12,10 +12,11 @@ from homeassistant.core import Event
 from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
+from ..compression import shared_json_text
 from ..db_schema import EventData
 from ..queries import get_shared_event_datas
 from ..util import execute_stmt_lambda_element
-from . import BaseLRUTableManager
+from . import BaseReferenceCountedTableManager
 
 if TYPE_CHECKING:
     from ..core import Recorder
@@ -26,7 +27,7 @@ CACHE_SIZE = 2048
 _LOGGER = logging.getLogger(__name__)
 
 
-class EventDataManager(BaseLRUTableManager[EventData]):
+class EventDataManager(BaseReferenceCountedTableManager[EventData]):
     """Manage the EventData table."""
 
     def __init__(self, recorder: Recorder) -> None:
@@ -96,23 +97,22 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         results: dict[str, int | None] = {}
         with session.no_autoflush:
             for hashs_chunk in chunked_or_all(hashes, self.recorder.max_bind_vars):
-                for data_id, shared_data in execute_stmt_lambda_element(
+                for data_id, shared_data_source in execute_stmt_lambda_element(
                     session, get_shared_event_datas(hashs_chunk), orm_rows=False
                 ):
+                    shared_data = shared_json_text(shared_data_source)
                     results[shared_data] = self._id_map[shared_data] = cast(
                         int, data_id
                     )
 
         return results
 
-    def add_pending(self, db_event_data: EventData) -> None:
+    def add_pending(self, db_event_data: EventData, shared_data: str) -> None:
         """Add a pending EventData that will be committed at the next interval.
 
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        assert db_event_data.shared_data is not None
-        shared_data: str = db_event_data.shared_data
         self._pending[shared_data] = db_event_data
 
     def post_commit_pending(self) -> None:
@@ -123,7 +123,9 @@ class EventDataManager(BaseLRUTableManager[EventData]):
         """
         for shared_data, db_event_data in self._pending.items():
             self._id_map[shared_data] = db_event_data.data_id
+            self._post_commit_pending_references(shared_data, db_event_data.data_id)
         self._pending.clear()
+        self._pending_ref_counts.clear()
 
     def evict_purged(self, data_ids: set[int]) -> None:
         """Evict purged data_ids from the cache when they are no longer used.
@@ -0,0 +1,253 @@
+"""Support keeping recently committed states in memory."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Callable
+import sys
+import threading
+from typing import TYPE_CHECKING, NamedTuple
+
+from ..db_schema import States
+
+# The maximum number of states kept in memory for each entity
+RECENT_STATES_MAX_ROWS = 1024
+# The number of states evicted at once when an entity is full
+RECENT_STATES_EVICT_ROWS = 128
+# The maximum number of states kept in memory for all entities, the
+# least recently used entities are evicted when it is exceeded
+RECENT_STATES_MAX_TOTAL_ROWS = 200000
+
+
+class RecentStateRow(NamedTuple):
+    """A state row with the columns of a history query without attributes."""
+
+    metadata_id: int
+    state: str | None
+    last_updated_ts: float
+    last_changed_ts: float | None
+    last_reported_ts: float | None
+
+
+class _EntityRecentStates:
+    """Columns of the recently committed states of an entity.
+
+    The optional timestamps are stored as 0.0 when they are NULL
+    in the database.
+    """
+
+    __slots__ = ("last_changed_ts", "last_reported_ts", "last_updated_ts", "states")
+
+    def __init__(self) -> None:
+        """Initialize the columns."""
+        self.states: list[str | None] = []
+        self.last_updated_ts = array("d")
+        self.last_changed_ts = array("d")
+        self.last_reported_ts = array("d")
+
+    def append(self, state: States) -> None:
+        """Append a committed state."""
+        self.states.append(sys.intern(state.state) if state.state is not None else None)
+        self.last_updated_ts.append(state.last_updated_ts or 0.0)
+        self.last_changed_ts.append(state.last_changed_ts or 0.0)
+        self.last_reported_ts.append(state.last_reported_ts or 0.0)
+
+    def evict(self, end: int) -> None:
+        """Evict the states before end."""
+        del self.states[:end]
+        del self.last_updated_ts[:end]
+        del self.last_changed_ts[:end]
+        del self.last_reported_ts[:end]
+
+
+class RecentStatesManager:
+    """Keep the recently committed states of each entity in memory.
+
+    States are added once they are committed, so each entity holds every
+    state written since its oldest kept state, and history queries that
+    start after it can be answered without accessing the database.
+
+    Entities are kept in the order they were last added to or read from,
+    and the least recently used entities are evicted once all entities
+    together hold more than RECENT_STATES_MAX_TOTAL_ROWS states.
+
+    States are written from the recorder thread and read from the database
+    executor, so access is guarded by a lock.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the recent states manager."""
+        self._lock = threading.Lock()
+        self._entities: OrderedDict[str, _EntityRecentStates] = OrderedDict()
+        self._rows = 0
+        self._pending: list[tuple[str, States | float]] = []
+
+    def add_pending(self, entity_id: str, state: States) -> None:
+        """Add a state which is in the session but not yet committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.append((entity_id, state))
+
+    def update_pending_last_reported(
+        self, entity_id: str, last_reported_timestamp: float
+    ) -> None:
+        """Update the last reported timestamp of the last committed state.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.append((entity_id, last_reported_timestamp))
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to move the pending states into memory.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending:
+            return
+        entities = self._entities
+        with self._lock:
+            for entity_id, pending in self._pending:
+                entity = entities.get(entity_id)
+                if type(pending) is float:
+                    if entity is not None:
+                        entity.last_reported_ts[-1] = pending
+                    continue
+                if TYPE_CHECKING:
+                    assert isinstance(pending, States)
+                if entity is None:
+                    entity = entities[entity_id] = _EntityRecentStates()
+                else:
+                    entities.move_to_end(entity_id)
+                    if (pending.last_updated_ts or 0.0) < entity.last_updated_ts[-1]:
+                        # Keep the states ordered by starting over from this state
+                        self._rows -= len(entity.states)
+                        entity.evict(len(entity.states))
+                entity.append(pending)
+                self._rows += 1
+                if len(entity.states) > RECENT_STATES_MAX_ROWS:
+                    entity.evict(RECENT_STATES_EVICT_ROWS)
+                    self._rows -= RECENT_STATES_EVICT_ROWS
+            while self._rows > RECENT_STATES_MAX_TOTAL_ROWS:
+                self._rows -= len(entities.popitem(last=False)[1].states)
+        self._pending.clear()
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.clear()
+        with self._lock:
+            self._entities.clear()
+            self._rows = 0
+
+    def evict_before(
+        self,
+        timestamp: float,
+        entity_filter: Callable[[str], bool] | None = None,
+    ) -> None:
+        """Evict states older than timestamp before they are purged."""
+        with self._lock:
+            for entity_id, entity in list(self._entities.items()):
+                if entity_filter is not None and not entity_filter(entity_id):
+                    continue
+                if (end := bisect_left(entity.last_updated_ts, timestamp)) == len(
+                    entity.states
+                ):
+                    del self._entities[entity_id]
+                    self._rows -= len(entity.states)
+                elif end:
+                    entity.evict(end)
+                    self._rows -= end
+
+    def evict_entity_ids(self, entity_ids: set[str]) -> None:
+        """Evict the states of entities."""
+        with self._lock:
+            for entity_id in entity_ids:
+                if (entity := self._entities.pop(entity_id, None)) is not None:
+                    self._rows -= len(entity.states)
+
+    def get_rows(
+        self,
+        entity_id: str,
+        metadata_id: int,
+        start_time_ts: float,
+        end_time_ts: float | None,
+        start_time_state_after_ts: float | None,
+        include_start_time_state: bool,
+        significant_changes_only: bool,
+        include_last_changed: bool,
+        include_last_reported: bool,
+        limit: int | None = None,
+    ) -> list[RecentStateRow] | None:
+        """Return the rows a history query returns for an entity.
+
+        Returns None if the query needs states older than the ones in memory.
+
+        start_time_state_after_ts limits the state at the start time to states
+        updated at or after it, like the start time state query of
+        multiple entities limits it to the current recorder run.
+        """
+        with self._lock:
+            if (entity := self._entities.get(entity_id)) is None:
+                return None
+            last_updated_ts = entity.last_updated_ts
+            if include_start_time_state:
+                if last_updated_ts[0] >= start_time_ts:
+                    return None
+            elif last_updated_ts[0] > start_time_ts:
+                return None
+            self._entities.move_to_end(entity_id)
+            states = entity.states
+            last_changed_ts = entity.last_changed_ts
+            last_reported_ts = entity.last_reported_ts
+            rows: list[RecentStateRow] = []
+            if include_start_time_state and (
+                (idx := bisect_left(last_updated_ts, start_time_ts) - 1) >= 0
+                and (
+                    start_time_state_after_ts is None
+                    or last_updated_ts[idx] >= start_time_state_after_ts
+                )
+            ):
+                rows.append(
+                    RecentStateRow(
+                        metadata_id,
+                        states[idx],
+                        0,
+                        0 if include_last_changed else None,
+                        0 if include_last_reported else None,
+                    )
+                )
+            end = (
+                bisect_left(last_updated_ts, end_time_ts)
+                if end_time_ts
+                else len(states)
+            )
+            count = 0
+            for idx in range(bisect_right(last_updated_ts, start_time_ts), end):
+                updated_ts = last_updated_ts[idx]
+                changed_ts = last_changed_ts[idx]
+                if significant_changes_only and changed_ts and changed_ts != updated_ts:
+                    continue
+                rows.append(
+                    RecentStateRow(
+                        metadata_id,
+                        states[idx],
+                        updated_ts,
+                        (changed_ts or None) if include_last_changed else None,
+                        (last_reported_ts[idx] or None)
+                        if include_last_reported
+                        else None,
+                    )
+                )
+                count += 1
+                if count == limit:
+                    break
+            return rows
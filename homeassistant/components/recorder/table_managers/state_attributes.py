@@ -12,10 +12,11 @@ from homeassistant.core import Event, EventStateChangedData
 from homeassistant.util.collection import chunked_or_all
 from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS
 
+from ..compression import shared_json_text
 from ..db_schema import StateAttributes
 from ..queries import get_shared_attributes
 from ..util import execute_stmt_lambda_element
-from . import BaseLRUTableManager
+from . import BaseReferenceCountedTableManager
 
 if TYPE_CHECKING:
     from ..core import Recorder
@@ -31,7 +32,7 @@ CACHE_SIZE = 2048
 _LOGGER = logging.getLogger(__name__)
 
 
-class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
+class StateAttributesManager(BaseReferenceCountedTableManager[StateAttributes]):
     """Manage the StateAttributes table."""
 
     def __init__(self, recorder: Recorder) -> None:
@@ -107,23 +108,24 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         results: dict[str, int | None] = {}
         with session.no_autoflush:
             for hashs_chunk in chunked_or_all(hashes, self.recorder.max_bind_vars):
-                for attributes_id, shared_attrs in execute_stmt_lambda_element(
+                for attributes_id, shared_attrs_source in execute_stmt_lambda_element(
                     session, get_shared_attributes(hashs_chunk), orm_rows=False
                 ):
+                    shared_attrs = shared_json_text(shared_attrs_source)
                     results[shared_attrs] = self._id_map[shared_attrs] = cast(
                         int, attributes_id
                     )
 
         return results
 
-    def add_pending(self, db_state_attributes: StateAttributes) -> None:
+    def add_pending(
+        self, db_state_attributes: StateAttributes, shared_attrs: str
+    ) -> None:
         """Add a pending StateAttributes that will be committed at the next interval.
 
         This call is not thread-safe and must be called from the
         recorder thread.
         """
-        assert db_state_attributes.shared_attrs is not None
-        shared_attrs: str = db_state_attributes.shared_attrs
         self._pending[shared_attrs] = db_state_attributes
 
     def post_commit_pending(self) -> None:
@@ -134,7 +136,11 @@ class StateAttributesManager(BaseLRUTableManager[StateAttributes]):
         """
         for shared_attrs, db_state_attributes in self._pending.items():
             self._id_map[shared_attrs] = db_state_attributes.attributes_id
+            self._post_commit_pending_references(
+                shared_attrs, db_state_attributes.attributes_id
+            )
         self._pending.clear()
+        self._pending_ref_counts.clear()
 
     def evict_purged(self, attributes_ids: set[int]) -> None:
         """Evict purged attributes_ids from the cache when they are no longer used.
@@ -93,6 +93,21 @@ class StatesManager:
         ):
             last_committed_ids.pop(last_committed_ids_reversed[purged_state_id], None)
 
+    def evict_purged_state_ids_up_to(self, max_state_id: int) -> None:
+        """Evict the committed states with a state_id up to max_state_id.
+
+        Used when the purged states are dropped in bulk and their state ids
+        are not known. Evicting newer committed states as well is harmless,
+        the next state of the entity is then recorded without old_state_id.
+        """
+        last_committed_ids = self._last_committed_id
+        for entity_id in [
+            entity_id
+            for entity_id, state_id in last_committed_ids.items()
+            if state_id <= max_state_id
+        ]:
+            del last_committed_ids[entity_id]
+
     def evict_purged_entity_ids(self, purged_entity_ids: set[str]) -> None:
         """Evict purged entity_ids from the committed states.
 
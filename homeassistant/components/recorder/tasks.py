@@ -17,6 +17,11 @@ from homeassistant.util.event_type import EventType
 from . import entity_registry, purge, statistics
 from .const import DOMAIN
 from .db_schema import Statistics, StatisticsShortTerm
+from .incremental_purge import (
+    INCREMENTAL_PURGE_MAX_ROWS,
+    INCREMENTAL_PURGE_MAX_SECONDS,
+    PurgeBudget,
+)
 from .models import StatisticData, StatisticMetaData
 from .util import periodic_db_cleanups, session_scope
 
@@ -133,6 +138,51 @@ class PurgeTask(RecorderTask):
         )
 
 
+@dataclass(slots=True)
+class IncrementalPurgeTask(RecorderTask):
+    """Object to store information about a slice of an incremental purge.
+
+    Each slice deletes rows until its budget is exhausted and commits,
+    the next slice is queued from the event loop after a pause so the
+    recording isn't held up by the purge.
+    """
+
+    purge_before: datetime
+    repack: bool
+    apply_filter: bool
+
+    def run(self, instance: Recorder) -> None:
+        """Purge a slice of the database."""
+        budget = PurgeBudget(INCREMENTAL_PURGE_MAX_ROWS, INCREMENTAL_PURGE_MAX_SECONDS)
+        done = False
+        failed = True
+        try:
+            done = purge.purge_old_data(
+                instance,
+                self.purge_before,
+                self.repack,
+                self.apply_filter,
+                budget=budget,
+            )
+            instance.purge_progress.slice_finished(budget, done)
+            if done:
+                with instance.get_session() as session:
+                    instance.recorder_runs_manager.load_from_db(session)
+                periodic_db_cleanups(instance)
+            failed = False
+        finally:
+            # The loop is always notified so a failed slice
+            # does not leave the purge in progress forever
+            instance.hass.loop.call_soon_threadsafe(
+                instance.async_incremental_purge_slice_done,
+                self,
+                instance.purge_progress.as_dict(),
+                done,
+                budget.duration,
+                failed,
+            )
+
+
 @dataclass(slots=True)
 class PurgeEntitiesTask(RecorderTask):
     """Object to store entity information about purge task."""
@@ -36,6 +36,7 @@ from homeassistant.helpers.recorder import (  # noqa: F401
 )
 import homeassistant.util.dt as dt_util
 
+from .compression import SQLITE_DECOMPRESS_FUNCTION, sqlite_decompress
 from .const import (
     DEFAULT_MAX_BIND_VARS,
     DOMAIN,
@@ -57,6 +58,7 @@ from .models import (
     UnsupportedDialect,
     process_timestamp,
 )
+from .partitions import PartitionInterval, create_partitions
 
 if TYPE_CHECKING:
     from sqlite3.dbapi2 import Cursor as SQLiteCursor
@@ -555,6 +557,13 @@ def setup_connection_for_dialect(
         # enable support for foreign keys
         execute_on_connection(dbapi_connection, "PRAGMA foreign_keys=ON")
 
+        # Queries looking into the shared attributes and event data decompress
+        # the compressed rows with this function, it is needed even when
+        # compressed storage is turned off since earlier rows may be compressed
+        dbapi_connection.create_function(  # type: ignore[attr-defined]
+            SQLITE_DECOMPRESS_FUNCTION, 1, sqlite_decompress, deterministic=True
+        )
+
     elif dialect_name == SupportedDialect.MYSQL:
         max_bind_vars = DEFAULT_MAX_BIND_VARS
         execute_on_connection(dbapi_connection, "SET session wait_timeout=28800")
@@ -755,6 +764,15 @@ def periodic_db_cleanups(instance: Recorder) -> None:
         with instance.engine.connect() as connection:
             connection.execute(text("PRAGMA wal_checkpoint(TRUNCATE);"))
             connection.execute(text("PRAGMA OPTIMIZE;"))
+    if instance.partitioned_tables:
+        # Create the partitions ahead of time so rows are never written
+        # to the default partition
+        with session_scope(session=instance.get_session()) as session:
+            create_partitions(
+                session,
+                instance.partition_interval or PartitionInterval.DAY,
+                time.time(),
+            )
 
 
 @contextmanager
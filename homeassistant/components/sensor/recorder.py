@@ -9,6 +9,7 @@ import datetime
 import itertools
 import logging
 import math
+import time
 from typing import Any
 
 from sqlalchemy.orm.session import Session
@@ -18,12 +19,14 @@ from homeassistant.components.recorder import (
     get_instance,
     history,
     statistics,
+    statistics_math,
 )
 from homeassistant.components.recorder.models import (
     StatisticData,
     StatisticMetaData,
     StatisticResult,
 )
+from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
     REVOLUTIONS_PER_MINUTE,
@@ -78,6 +81,8 @@ WARN_UNSUPPORTED_UNIT: HassKey[set[str]] = HassKey(f"{DOMAIN}_warn_unsupported_u
 WARN_UNSTABLE_UNIT: HassKey[set[str]] = HassKey(f"{DOMAIN}_warn_unstable_unit")
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
+# Sensors are compiled in parallel in chunks of this size if there are more
+PARALLEL_COMPILE_CHUNK_SIZE = 250
 
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
@@ -108,42 +113,12 @@ def _time_weighted_average(
     state changes.
     Note: there's no interpolation of values between state changes.
     """
-    old_fstate: float | None = None
-    old_start_time: datetime.datetime | None = None
-    accumulated = 0.0
-
-    for fstate, state in fstates:
-        # The recorder will give us the last known state, which may be well
-        # before the requested start time for the statistics
-        start_time = max(state.last_updated, start)
-        if old_start_time is None:
-            # Adjust start time, if there was no last known state
-            start = start_time
-        else:
-            duration = start_time - old_start_time
-            # Accumulate the value, weighted by duration until next state change
-            assert old_fstate is not None
-            accumulated += old_fstate * duration.total_seconds()
-
-        old_fstate = fstate
-        old_start_time = start_time
-
-    if old_fstate is not None:
-        # Accumulate the value, weighted by duration until end of the period
-        assert old_start_time is not None
-        duration = end - old_start_time
-        accumulated += old_fstate * duration.total_seconds()
-
-    period_seconds = (end - start).total_seconds()
-    if period_seconds == 0:
-        # If the only state changed that happened was at the exact moment
-        # at the end of the period, we can't calculate a meaningful average
-        # so we return 0.0 since it represents a time duration smaller than
-        # we can measure. This probably means the precision of statistics
-        # column schema in the database is incorrect but it is actually possible
-        # to happen if the state change event fired at the exact microsecond
-        return 0.0
-    return accumulated / period_seconds
+    return statistics_math.time_weighted_average(
+        [state.last_updated_timestamp for _, state in fstates],
+        [fstate for fstate, _ in fstates],
+        start.timestamp(),
+        end.timestamp(),
+    )
 
 
 def _get_units(fstates: list[tuple[float, State]]) -> set[str | None]:
@@ -402,17 +377,94 @@ def _timestamp_to_isoformat_or_none(timestamp: float | None) -> str | None:
     return dt_util.utc_from_timestamp(timestamp).isoformat()
 
 
-def compile_statistics(  # noqa: C901
+def compile_statistics(
     hass: HomeAssistant,
     session: Session,
     start: datetime.datetime,
     end: datetime.datetime,
 ) -> statistics.PlatformCompiledStatistics:
-    """Compile statistics for all entities during start-end."""
-    result: list[StatisticResult] = []
+    """Compile statistics for all entities during start-end.
 
+    When there are many sensors, they are split in chunks which are read
+    and reduced in parallel in the database executor, each with its own
+    read only session. The recorder writes the results in one batch.
+    """
     sensor_states = _get_sensor_states(hass)
     wanted_statistics = _wanted_statistics(sensor_states)
+    timings: defaultdict[str, float] = defaultdict(float)
+    compile_start = time.perf_counter()
+    instance = get_instance(hass)
+    if (
+        len(sensor_states) <= PARALLEL_COMPILE_CHUNK_SIZE
+        or not instance.supports_parallel_reads
+    ):
+        result, old_metadatas = _compile_statistics_for_states(
+            hass, session, sensor_states, wanted_statistics, start, end, timings
+        )
+    else:
+
+        def _compile_chunk(
+            chunk: list[State],
+        ) -> tuple[
+            list[StatisticResult],
+            dict[str, tuple[int, StatisticMetaData]],
+            defaultdict[str, float],
+        ]:
+            """Compile statistics for a chunk of sensors in a worker."""
+            chunk_timings: defaultdict[str, float] = defaultdict(float)
+            with session_scope(hass=hass, read_only=True) as worker_session:
+                return (
+                    *_compile_statistics_for_states(
+                        hass,
+                        worker_session,
+                        chunk,
+                        wanted_statistics,
+                        start,
+                        end,
+                        chunk_timings,
+                    ),
+                    chunk_timings,
+                )
+
+        result = []
+        old_metadatas = {}
+        for chunk_result, chunk_metadatas, chunk_timings in instance.executor_map(
+            _compile_chunk,
+            [
+                sensor_states[idx : idx + PARALLEL_COMPILE_CHUNK_SIZE]
+                for idx in range(0, len(sensor_states), PARALLEL_COMPILE_CHUNK_SIZE)
+            ],
+        ):
+            result.extend(chunk_result)
+            old_metadatas.update(chunk_metadatas)
+            for phase, timing in chunk_timings.items():
+                timings[phase] += timing
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "Compiled statistics of %s sensors in %.3fs (%s)",
+            len(sensor_states),
+            time.perf_counter() - compile_start,
+            ", ".join(f"{phase}: {timing:.3f}s" for phase, timing in timings.items()),
+        )
+    return statistics.PlatformCompiledStatistics(result, old_metadatas)
+
+
+def _compile_statistics_for_states(  # noqa: C901
+    hass: HomeAssistant,
+    session: Session,
+    sensor_states: list[State],
+    wanted_statistics: dict[str, set[str]],
+    start: datetime.datetime,
+    end: datetime.datetime,
+    timings: defaultdict[str, float],
+) -> tuple[list[StatisticResult], dict[str, tuple[int, StatisticMetaData]]]:
+    """Compile statistics for sensors during start-end.
+
+    The time spent reading the history, reading the metadata and last
+    statistics, and reducing the states is added to timings.
+    """
+    result: list[StatisticResult] = []
+    phase_start = time.perf_counter()
     # Get history between start and end
     entities_full_history = [
         i.entity_id for i in sensor_states if "sum" in wanted_statistics[i.entity_id]
@@ -442,6 +494,9 @@ def compile_statistics(  # noqa: C901
         )
         history_list = {**history_list, **_history_list}
 
+    timings["history"] += (now := time.perf_counter()) - phase_start
+    phase_start = now
+
     entities_with_float_states: dict[str, list[tuple[float, State]]] = {}
     for _state in sensor_states:
         entity_id = _state.entity_id
@@ -482,6 +537,9 @@ def compile_statistics(  # noqa: C901
     last_stats = statistics.get_latest_short_term_statistics_with_session(
         hass, session, to_query, {"last_reset", "state", "sum"}, metadata=old_metadatas
     )
+    timings["metadata"] += (now := time.perf_counter()) - phase_start
+    phase_start = now
+
     for (  # pylint: disable=too-many-nested-blocks
         entity_id,
         statistics_unit,
@@ -640,7 +698,8 @@ def compile_statistics(  # noqa: C901
 
         result.append({"meta": meta, "stat": stat})
 
-    return statistics.PlatformCompiledStatistics(result, old_metadatas)
+    timings["reduce"] += time.perf_counter() - phase_start
+    return result, old_metadatas
 
 
 def list_statistic_ids(
@@ -34,7 +34,10 @@ from homeassistant.helpers import config_validation as cv, entity_registry as er
 from homeassistant.helpers.device import async_device_info_to_link_from_entity
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    StateChangeFilter,
+    async_track_state_change_event,
+)
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 from .const import (
@@ -224,7 +227,11 @@ class ThresholdSensor(BinarySensorEntity):
 
         self.async_on_remove(
             async_track_state_change_event(
-                self.hass, [self._entity_id], async_threshold_sensor_state_listener
+                self.hass,
+                [self._entity_id],
+                async_threshold_sensor_state_listener,
+                # Only the state of the sensor is used, skip attribute updates
+                state_filter=StateChangeFilter(),
             )
         )
         _update_sensor_state()
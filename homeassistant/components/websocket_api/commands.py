@@ -64,6 +64,7 @@ from homeassistant.util.json import format_unserializable_data
 
 from . import const, decorators, messages
 from .connection import ActiveConnection
+from .entity_subscriptions import EntitySubscription, async_get_entity_subscription_hub
 from .messages import construct_result_message
 
 ALL_SERVICE_DESCRIPTIONS_JSON_CACHE = "websocket_api_all_service_descriptions_json"
@@ -367,66 +368,79 @@ def _send_handle_get_states_response(
     )
 
 
-@callback
-def _forward_entity_changes(
-    send_message: Callable[[str | bytes | dict[str, Any]], None],
-    entity_ids: set[str] | None,
-    entity_filter: Callable[[str], bool] | None,
-    user: User,
-    message_id_as_bytes: bytes,
-    event: Event[EventStateChangedData],
-) -> None:
-    """Forward entity state changed events to websocket."""
-    entity_id = event.data["entity_id"]
-    if (entity_ids and entity_id not in entity_ids) or (
-        entity_filter and not entity_filter(entity_id)
-    ):
-        return
-    # We have to lookup the permissions again because the user might have
-    # changed since the subscription was created.
-    permissions = user.permissions
-    if (
-        not user.is_admin
-        and not permissions.access_all_entities(POLICY_READ)
-        and not permissions.check_entity(entity_id, POLICY_READ)
-    ):
-        return
-    send_message(messages.cached_state_diff_message(message_id_as_bytes, event))
-
-
 @callback
 @decorators.websocket_command(
     {
         vol.Required("type"): "subscribe_entities",
         vol.Optional("entity_ids"): cv.entity_ids,
+        vol.Optional("resumable", default=False): bool,
+        vol.Optional("since"): {
+            vol.Required("changelog_id"): str,
+            vol.Required("sequence"): int,
+        },
         **INCLUDE_EXCLUDE_BASE_FILTER_SCHEMA.schema,
     }
 )
 def handle_subscribe_entities(
     hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
 ) -> None:
-    """Handle subscribe entities command."""
+    """Handle subscribe entities command.
+
+    Messages of resumable subscriptions carry a sequence number. A client
+    which passes the changelog id and the last sequence number it got as
+    since only gets the entities changed or removed since then, unless the
+    changelog no longer covers them and all entities are sent again.
+    """
     entity_ids = set(msg.get("entity_ids", [])) or None
     _filter = convert_include_exclude_filter(msg)
     entity_filter = None if _filter.empty_filter else _filter.get_filter()
-    # We must never await between sending the states and listening for
-    # state changed events or we will introduce a race condition
-    # where some states are missed
-    states = _async_get_allowed_states(hass, connection)
     msg_id = msg["id"]
     message_id_as_bytes = str(msg_id).encode()
-    connection.subscriptions[msg_id] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED,
-        partial(
-            _forward_entity_changes,
-            connection.send_message,
-            entity_ids,
-            entity_filter,
-            connection.user,
-            message_id_as_bytes,
-        ),
+    since = msg.get("since")
+    resumable = msg["resumable"] or since is not None
+    subscription = EntitySubscription(
+        connection.send_state_diff,
+        entity_ids,
+        entity_filter,
+        connection.user,
+        message_id_as_bytes,
+        resumable,
     )
-    connection.send_result(msg_id)
+    # We must never await between sending the states and listening for
+    # state changed events or we will introduce a race condition
+    # where some states are missed
+    changed_entity_ids: list[str] | None = None
+    if since is not None and since["changelog_id"] == hass.states.changelog_id:
+        changed_entity_ids = hass.states.async_changed_since(since["sequence"])
+    removed_entity_ids: list[str] = []
+    if changed_entity_ids is None:
+        states = _async_get_allowed_states(hass, connection)
+    else:
+        states = []
+        for entity_id in changed_entity_ids:
+            if not subscription.wants(entity_id) or not subscription.permitted(
+                entity_id
+            ):
+                continue
+            if (state := hass.states.get(entity_id)) is None:
+                removed_entity_ids.append(entity_id)
+            else:
+                states.append(state)
+    connection.subscriptions[msg_id] = async_get_entity_subscription_hub(
+        hass
+    ).async_add(subscription)
+    sequence_as_bytes: bytes | None = None
+    if resumable:
+        sequence_as_bytes = str(hass.states.async_resume_sequence()).encode()
+        connection.send_result(
+            msg_id,
+            {
+                "changelog_id": hass.states.changelog_id,
+                "resumed": changed_entity_ids is not None,
+            },
+        )
+    else:
+        connection.send_result(msg_id)
 
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
@@ -446,7 +460,11 @@ def handle_subscribe_entities(
         pass
     else:
         _send_handle_entities_init_response(
-            connection, message_id_as_bytes, serialized_states
+            connection,
+            message_id_as_bytes,
+            serialized_states,
+            removed_entity_ids,
+            sequence_as_bytes,
         )
         return
 
@@ -463,7 +481,11 @@ def handle_subscribe_entities(
             )
 
     _send_handle_entities_init_response(
-        connection, message_id_as_bytes, serialized_states
+        connection,
+        message_id_as_bytes,
+        serialized_states,
+        removed_entity_ids,
+        sequence_as_bytes,
     )
 
 
@@ -471,19 +493,24 @@ def _send_handle_entities_init_response(
     connection: ActiveConnection,
     message_id_as_bytes: bytes,
     serialized_states: list[bytes],
+    removed_entity_ids: list[str],
+    sequence_as_bytes: bytes | None,
 ) -> None:
     """Send handle entities init response."""
-    connection.send_message(
-        b"".join(
-            (
-                b'{"id":',
-                message_id_as_bytes,
-                b',"type":"event","event":{"a":{',
-                b",".join(serialized_states),
-                b"}}}",
-            )
-        )
-    )
+    parts = [
+        b'{"id":',
+        message_id_as_bytes,
+        b',"type":"event","event":{"a":{',
+        b",".join(serialized_states),
+        b"}",
+    ]
+    if removed_entity_ids:
+        parts.extend((b',"r":', json_bytes(removed_entity_ids)))
+    parts.append(b"}")
+    if sequence_as_bytes is not None:
+        parts.extend((b',"sequence":', sequence_as_bytes))
+    parts.append(b"}")
+    connection.send_message(b"".join(parts))
 
 
 async def _async_get_all_descriptions_json(hass: HomeAssistant) -> bytes:
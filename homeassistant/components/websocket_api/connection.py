@@ -2,15 +2,22 @@
 
 from __future__ import annotations
 
-from collections.abc import Callable, Hashable
+from collections.abc import Callable, Coroutine, Hashable
 from contextvars import ContextVar
+from functools import partial
 from typing import TYPE_CHECKING, Any, Literal
 
 from aiohttp import web
 import voluptuous as vol
 
 from homeassistant.auth.models import RefreshToken, User
-from homeassistant.core import Context, HomeAssistant, callback
+from homeassistant.core import (
+    Context,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
 from homeassistant.exceptions import HomeAssistantError, Unauthorized
 from homeassistant.helpers.http import current_request
 from homeassistant.util.json import JsonValueType
@@ -30,6 +37,22 @@ type MessageHandler = Callable[[HomeAssistant, ActiveConnection, dict[str, Any]]
 type BinaryHandler = Callable[[HomeAssistant, ActiveConnection, bytes], None]
 
 
+async def _async_send_queue_ready(max_pending: int) -> None:
+    """Return immediately when there is no send queue to wait for."""
+
+
+@callback
+def _send_state_diff_message(
+    send_message: Callable[[bytes | str | dict[str, Any]], None],
+    message_id_as_bytes: bytes,
+    event: Event[EventStateChangedData],
+    message_prefix: bytes,
+    message_suffix: bytes,
+) -> None:
+    """Send a state diff message when there is no send queue to coalesce it in."""
+    send_message(message_prefix + message_suffix)
+
+
 class ActiveConnection:
     """Handle an active websocket client connection."""
 
@@ -37,11 +60,14 @@ class ActiveConnection:
         "logger",
         "hass",
         "send_message",
+        "async_wait_send_queue",
+        "send_state_diff",
         "user",
         "refresh_token_id",
         "subscriptions",
         "last_id",
         "can_coalesce",
+        "compress_message",
         "supported_features",
         "handlers",
         "binary_handlers",
@@ -59,11 +85,22 @@ class ActiveConnection:
         self.logger = logger
         self.hass = hass
         self.send_message = send_message
+        # Set by the websocket handler once the connection is authenticated
+        self.async_wait_send_queue: Callable[[int], Coroutine[Any, Any, None]] = (
+            _async_send_queue_ready
+        )
+        # Set by the websocket handler once the connection is authenticated
+        self.send_state_diff: Callable[
+            [bytes, Event[EventStateChangedData], bytes, bytes], None
+        ] = partial(_send_state_diff_message, send_message)
         self.user = user
         self.refresh_token_id = refresh_token.id
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
         self.last_id = 0
         self.can_coalesce = False
+        # Compression can't be turned off once enabled since the client
+        # decompresses all messages with the same stream
+        self.compress_message: Callable[[bytes], bytes] | None = None
         self.supported_features: dict[str, float] = {}
         self.handlers: dict[str, tuple[MessageHandler, vol.Schema | Literal[False]]] = (
             self.hass.data[const.DOMAIN]
@@ -79,6 +116,11 @@ class ActiveConnection:
         """Set supported features."""
         self.supported_features = features
         self.can_coalesce = const.FEATURE_COALESCE_MESSAGES in features
+        if (
+            const.FEATURE_COMPRESSED_MESSAGES in features
+            and self.compress_message is None
+        ):
+            self.compress_message = messages.message_compressor()
 
     def get_description(self, request: web.Request | None) -> str:
         """Return a description of the connection."""
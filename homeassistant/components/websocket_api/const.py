@@ -34,6 +34,10 @@ MAX_PENDING_MSG: Final = 4096
 # resolve the ready future.
 PENDING_MSG_MAX_FORCE_READY: Final = 256
 
+# Number of pending messages above which state diffs of subscribe_entities
+# are coalesced per entity until they are written to the client.
+PENDING_MSG_COALESCE_STATE_DIFFS: Final = 256
+
 ERR_ID_REUSE: Final = "id_reuse"
 ERR_INVALID_FORMAT: Final = "invalid_format"
 ERR_NOT_ALLOWED: Final = "not_allowed"
@@ -58,3 +62,17 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
 
 FEATURE_COALESCE_MESSAGES = "coalesce_messages"
+FEATURE_COMPRESSED_MESSAGES = "compressed_messages"
+
+# Preset dictionary for compressed messages. Clients must decompress with
+# the same dictionary, so it can never change once released. Fragments
+# that are most common in messages are at the end since they are found
+# at a shorter distance.
+COMPRESSED_MESSAGES_DICTIONARY: Final = (
+    b'"unit_of_measurement":"friendly_name":"device_class":"state_class":'
+    b'"supported_features":"icon":"mdi:"entity_picture":"attribution":'
+    b'"measurement","total_increasing","unavailable","unknown","on","off",'
+    b'"type":"result","success":true,"result":null,"type":"event","event":'
+    b'{"a":{"sensor.","binary_sensor.","light.","switch.","automation.",'
+    b'"lc":"lu":"c":{"+":{"-":{"s":"a":{"c":"'
+)
@@ -0,0 +1,180 @@
+"""Fan out state changes to subscribe_entities subscriptions."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.auth.models import User
+from homeassistant.auth.permissions import AbstractPermissions
+from homeassistant.auth.permissions.const import POLICY_READ
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.hass_dict import HassKey
+
+from . import messages
+from .const import DOMAIN
+
+DATA_ENTITY_SUBSCRIPTION_HUB: HassKey[EntitySubscriptionHub] = HassKey(
+    f"{DOMAIN}.entity_subscription_hub"
+)
+
+
+class EntitySubscription:
+    """A subscribe_entities subscription of a connection."""
+
+    __slots__ = (
+        "_allow_all",
+        "_permissions",
+        "entity_filter",
+        "entity_ids",
+        "message_id_as_bytes",
+        "resumable",
+        "send_state_diff",
+        "user",
+    )
+
+    def __init__(
+        self,
+        send_state_diff: Callable[
+            [bytes, Event[EventStateChangedData], bytes, bytes], None
+        ],
+        entity_ids: set[str] | None,
+        entity_filter: Callable[[str], bool] | None,
+        user: User,
+        message_id_as_bytes: bytes,
+        resumable: bool = False,
+    ) -> None:
+        """Initialize the subscription.
+
+        State diffs of resumable subscriptions carry the sequence number
+        the client can resume the subscription from.
+        """
+        self.send_state_diff = send_state_diff
+        self.entity_ids = entity_ids
+        self.entity_filter = entity_filter
+        self.user = user
+        self.message_id_as_bytes = message_id_as_bytes
+        self.resumable = resumable
+        self._permissions: AbstractPermissions | None = None
+        self._allow_all = False
+
+    def wants(self, entity_id: str) -> bool:
+        """Return if the subscription wants changes of an entity."""
+        return (not self.entity_ids or entity_id in self.entity_ids) and (
+            not self.entity_filter or self.entity_filter(entity_id)
+        )
+
+    def permitted(self, entity_id: str) -> bool:
+        """Return if the user may read an entity.
+
+        Only whether the user may read all entities is cached for each
+        permissions object of the user. Other entities are checked on
+        every call since area and device policies depend on the registries.
+        """
+        if (permissions := self.user.permissions) is not self._permissions:
+            self._permissions = permissions
+            self._allow_all = self.user.is_admin or permissions.access_all_entities(
+                POLICY_READ
+            )
+        return self._allow_all or permissions.check_entity(entity_id, POLICY_READ)
+
+
+class EntitySubscriptionHub:
+    """Forward state changes to all subscribe_entities subscriptions.
+
+    A single state changed listener serves every subscription. The
+    subscriptions interested in an entity are looked up once per entity
+    and kept until subscriptions are added or removed, and the state diff
+    message is serialized once per event.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self._hass = hass
+        # Ordered so subscriptions are served in the order they were added
+        self._subscriptions: dict[EntitySubscription, None] = {}
+        # Routes are replaced rather than modified so subscriptions can be
+        # removed while a state change is forwarded
+        self._routes: dict[str, tuple[EntitySubscription, ...]] = {}
+        self._unsub_state_changed: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_add(self, subscription: EntitySubscription) -> CALLBACK_TYPE:
+        """Add a subscription and return a callback to remove it."""
+        self._subscriptions[subscription] = None
+        for entity_id, route in self._routes.items():
+            if subscription.wants(entity_id):
+                self._routes[entity_id] = (*route, subscription)
+        if self._unsub_state_changed is None:
+            self._unsub_state_changed = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_forward_state_changed
+            )
+        return callback(lambda: self._async_remove(subscription))
+
+    @callback
+    def _async_remove(self, subscription: EntitySubscription) -> None:
+        """Remove a subscription."""
+        del self._subscriptions[subscription]
+        if not self._subscriptions:
+            self._routes.clear()
+            if self._unsub_state_changed is not None:
+                self._unsub_state_changed()
+                self._unsub_state_changed = None
+            return
+        for entity_id, route in self._routes.items():
+            if subscription in route:
+                self._routes[entity_id] = tuple(
+                    other for other in route if other is not subscription
+                )
+
+    @callback
+    def _async_forward_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Forward a state change to the interested subscriptions."""
+        entity_id = event.data["entity_id"]
+        if (route := self._routes.get(entity_id)) is None:
+            route = self._routes[entity_id] = tuple(
+                subscription
+                for subscription in self._subscriptions
+                if subscription.wants(entity_id)
+            )
+        message_prefix: bytes | None = None
+        sequence_as_bytes: bytes | None = None
+        for subscription in route:
+            if not subscription.permitted(entity_id):
+                continue
+            if message_prefix is None:
+                message_prefix = messages.cached_state_diff_message_prefix(event)
+            message_id_as_bytes = subscription.message_id_as_bytes
+            if not subscription.resumable:
+                message_suffix = b"".join((b',"id":', message_id_as_bytes, b"}"))
+            else:
+                if sequence_as_bytes is None:
+                    sequence_as_bytes = str(
+                        self._hass.states.async_resume_sequence()
+                    ).encode()
+                message_suffix = b"".join(
+                    (
+                        b',"id":',
+                        message_id_as_bytes,
+                        b',"sequence":',
+                        sequence_as_bytes,
+                        b"}",
+                    )
+                )
+            subscription.send_state_diff(
+                message_id_as_bytes, event, message_prefix, message_suffix
+            )
+
+
+@callback
+@singleton(DATA_ENTITY_SUBSCRIPTION_HUB)
+def async_get_entity_subscription_hub(hass: HomeAssistant) -> EntitySubscriptionHub:
+    """Return the entity subscription hub."""
+    return EntitySubscriptionHub(hass)
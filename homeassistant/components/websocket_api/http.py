@@ -15,7 +15,7 @@ from aiohttp.http_websocket import WebSocketWriter
 
 from homeassistant.components.http import KEY_HASS, HomeAssistantView
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_call_later
 from homeassistant.util.async_ import create_eager_task
@@ -25,6 +25,7 @@ from .auth import AUTH_REQUIRED_MESSAGE, AuthPhase
 from .const import (
     DATA_CONNECTIONS,
     MAX_PENDING_MSG,
+    PENDING_MSG_COALESCE_STATE_DIFFS,
     PENDING_MSG_MAX_FORCE_READY,
     PENDING_MSG_PEAK,
     PENDING_MSG_PEAK_TIME,
@@ -33,7 +34,7 @@ from .const import (
     URL,
 )
 from .error import Disconnect
-from .messages import message_to_json_bytes
+from .messages import coalesced_state_diff_message, message_to_json_bytes
 from .util import describe_request
 
 if TYPE_CHECKING:
@@ -55,6 +56,55 @@ class WebsocketAPIView(HomeAssistantView):
         return await WebSocketHandler(request.app[KEY_HASS], request).async_handle()
 
 
+async def _send_compressed(
+    send_bytes_binary: Callable[[bytes], Coroutine[Any, Any, None]],
+    compress_message: Callable[[bytes], bytes],
+    message: bytes,
+) -> None:
+    """Compress a message and send it as a binary frame."""
+    await send_bytes_binary(compress_message(message))
+
+
+class _PendingStateDiff:
+    """State diffs of an entity queued as a single message."""
+
+    __slots__ = (
+        "entity_id",
+        "first_event",
+        "last_event",
+        "message_prefix",
+        "message_suffix",
+        "message_id_as_bytes",
+    )
+
+    def __init__(
+        self,
+        message_id_as_bytes: bytes,
+        event: Event[EventStateChangedData],
+        message_prefix: bytes,
+        message_suffix: bytes,
+    ) -> None:
+        """Initialize the pending state diff."""
+        self.message_id_as_bytes = message_id_as_bytes
+        self.entity_id = event.data["entity_id"]
+        self.first_event = event
+        self.last_event = event
+        self.message_prefix = message_prefix
+        self.message_suffix = message_suffix
+
+    def __repr__(self) -> str:
+        """Return the representation."""
+        return f"<PendingStateDiff {self.entity_id}>"
+
+    def as_bytes(self) -> bytes:
+        """Return the message to send."""
+        if self.last_event is self.first_event:
+            return self.message_prefix + self.message_suffix
+        return coalesced_state_diff_message(
+            self.first_event, self.last_event, self.message_suffix
+        )
+
+
 class WebSocketAdapter(logging.LoggerAdapter):
     """Add connection id to websocket messages."""
 
@@ -80,8 +130,10 @@ class WebSocketHandler:
         "_peak_checker_unsub",
         "_connection",
         "_message_queue",
+        "_pending_state_diffs",
         "_ready_future",
         "_release_ready_queue_size",
+        "_drain_future",
     )
 
     def __init__(self, hass: HomeAssistant, request: web.Request) -> None:
@@ -102,9 +154,15 @@ class WebSocketHandler:
         # to where messages are queued. This allows the implementation
         # to use a deque and an asyncio.Future to avoid the overhead of
         # an asyncio.Queue.
-        self._message_queue: deque[bytes] = deque()
+        self._message_queue: deque[bytes | _PendingStateDiff] = deque()
+        # State diffs in the message queue which later diffs of
+        # the same subscription and entity are merged into.
+        self._pending_state_diffs: dict[tuple[bytes, str], _PendingStateDiff] = {}
         self._ready_future: asyncio.Future[int] | None = None
         self._release_ready_queue_size: int = 0
+        # Resolved when the writer sends messages so producers waiting
+        # for the queue to drain can check the queue size again.
+        self._drain_future: asyncio.Future[None] | None = None
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -128,6 +186,7 @@ class WebSocketHandler:
         self,
         connection: ActiveConnection,
         send_bytes_text: Callable[[bytes], Coroutine[Any, Any, None]],
+        send_bytes_binary: Callable[[bytes], Coroutine[Any, Any, None]],
     ) -> None:
         """Write outgoing messages."""
         # Variables are set locally to avoid lookups in the loop
@@ -138,6 +197,8 @@ class WebSocketHandler:
         is_debug_log_enabled = partial(logger.isEnabledFor, logging.DEBUG)
         debug = logger.debug
         can_coalesce = connection.can_coalesce
+        compress_message = connection.compress_message
+        send_bytes = send_bytes_text
         ready_message_count = len(message_queue)
         # Exceptions if Socket disconnected or cancelled by connection handler
         try:
@@ -153,18 +214,47 @@ class WebSocketHandler:
                     # coalesce may be enabled later in the connection
                     can_coalesce = connection.can_coalesce
 
+                if compress_message is None:
+                    # compression may be enabled later in the connection
+                    compress_message = connection.compress_message
+                if compress_message is not None and send_bytes is send_bytes_text:
+                    send_bytes = partial(
+                        _send_compressed, send_bytes_binary, compress_message
+                    )
+
                 if not can_coalesce or ready_message_count == 1:
                     message = message_queue.popleft()
+                    if type(message) is not bytes:
+                        message = self._pop_pending_state_diff(message)
                     if is_debug_log_enabled():
                         debug("%s: Sending %s", self.description, message)
-                    await send_bytes_text(message)
+                    await send_bytes(message)
+                    self._release_drain_future()
                     continue
 
-                coalesced_messages = b"".join((b"[", b",".join(message_queue), b"]"))
+                if self._pending_state_diffs:
+                    self._pending_state_diffs.clear()
+                    coalesced_messages = b"".join(
+                        (
+                            b"[",
+                            b",".join(
+                                message
+                                if type(message) is bytes
+                                else message.as_bytes()
+                                for message in message_queue
+                            ),
+                            b"]",
+                        )
+                    )
+                else:
+                    coalesced_messages = b"".join(
+                        (b"[", b",".join(message_queue), b"]")  # type: ignore[arg-type]
+                    )
                 message_queue.clear()
                 if is_debug_log_enabled():
                     debug("%s: Sending %s", self.description, coalesced_messages)
-                await send_bytes_text(coalesced_messages)
+                await send_bytes(coalesced_messages)
+                self._release_drain_future()
         except asyncio.CancelledError:
             debug("%s: Writer cancelled", self.description)
             raise
@@ -174,6 +264,12 @@ class WebSocketHandler:
             debug("%s: Writer done", self.description)
             # Clean up the peak checker when we shut down the writer
             self._cancel_peak_checker()
+            self._release_drain_future()
+
+    def _pop_pending_state_diff(self, pending: _PendingStateDiff) -> bytes:
+        """Stop merging into a pending state diff and return its message."""
+        del self._pending_state_diffs[(pending.message_id_as_bytes, pending.entity_id)]
+        return pending.as_bytes()
 
     @callback
     def _cancel_peak_checker(self) -> None:
@@ -183,7 +279,56 @@ class WebSocketHandler:
             self._peak_checker_unsub = None
 
     @callback
-    def _send_message(self, message: str | bytes | dict[str, Any]) -> None:
+    def _release_drain_future(self) -> None:
+        """Wake up producers waiting for the queue to drain."""
+        if (drain_future := self._drain_future) is not None:
+            self._drain_future = None
+            if not drain_future.done():
+                drain_future.set_result(None)
+
+    async def _async_wait_send_queue(self, max_pending: int) -> None:
+        """Wait until no more than max_pending messages are queued.
+
+        Lets producers of large responses send them in chunks without
+        exceeding the pending message limits of slow clients. Returns
+        right away if the connection is closing.
+        """
+        while not self._closing and len(self._message_queue) > max_pending:
+            if self._drain_future is None:
+                self._drain_future = self._loop.create_future()
+            await asyncio.shield(self._drain_future)
+
+    @callback
+    def _send_state_diff(
+        self,
+        message_id_as_bytes: bytes,
+        event: Event[EventStateChangedData],
+        message_prefix: bytes,
+        message_suffix: bytes,
+    ) -> None:
+        """Queue sending a subscribe_entities state diff to the client.
+
+        While the client is behind, the diffs of an entity are merged until
+        they are written, so only the latest state of each entity is queued.
+        """
+        if self._closing:
+            return
+        key = (message_id_as_bytes, event.data["entity_id"])
+        if (pending := self._pending_state_diffs.get(key)) is not None:
+            pending.last_event = event
+            return
+        if len(self._message_queue) < PENDING_MSG_COALESCE_STATE_DIFFS:
+            self._send_message(message_prefix + message_suffix)
+            return
+        pending = self._pending_state_diffs[key] = _PendingStateDiff(
+            message_id_as_bytes, event, message_prefix, message_suffix
+        )
+        self._send_message(pending)
+
+    @callback
+    def _send_message(
+        self, message: str | bytes | dict[str, Any] | _PendingStateDiff
+    ) -> None:
         """Queue sending a message to the client.
 
         Closes connection if the client is not reading the messages.
@@ -286,6 +431,7 @@ class WebSocketHandler:
         """Cancel the connection."""
         self._closing = True
         self._cancel_peak_checker()
+        self._release_drain_future()
         if self._handle_task is not None:
             self._handle_task.cancel()
         if self._writer_task is not None:
@@ -335,6 +481,7 @@ class WebSocketHandler:
             send_frame = writer._send_frame  # noqa: SLF001
 
         send_bytes_text = partial(send_frame, opcode=WSMsgType.TEXT)
+        send_bytes_binary = partial(send_frame, opcode=WSMsgType.BINARY)
         auth = AuthPhase(
             logger, hass, self._send_message, self._cancel, request, send_bytes_text
         )
@@ -342,7 +489,9 @@ class WebSocketHandler:
         disconnect_warn: str | None = None
 
         try:
-            connection = await self._async_handle_auth_phase(auth, send_bytes_text)
+            connection = await self._async_handle_auth_phase(
+                auth, send_bytes_text, send_bytes_binary
+            )
             self._async_increase_writer_limit(writer)
             await self._async_websocket_command_phase(connection, send_bytes_text)
         except asyncio.CancelledError:
@@ -368,6 +517,7 @@ class WebSocketHandler:
             self._closing = True
             if self._ready_future and not self._ready_future.done():
                 self._ready_future.set_result(len(self._message_queue))
+            self._release_drain_future()
 
             await self._async_cleanup_writer_and_close(disconnect_warn, connection)
 
@@ -377,6 +527,7 @@ class WebSocketHandler:
         self,
         auth: AuthPhase,
         send_bytes_text: Callable[[bytes], Coroutine[Any, Any, None]],
+        send_bytes_binary: Callable[[bytes], Coroutine[Any, Any, None]],
     ) -> ActiveConnection:
         """Handle the auth phase of the websocket connection."""
         await send_bytes_text(AUTH_REQUIRED_MESSAGE)
@@ -407,7 +558,11 @@ class WebSocketHandler:
         # We only start the writer queue after the auth phase is completed
         # since there is no need to queue messages before the auth phase
         self._connection = connection
-        self._writer_task = create_eager_task(self._writer(connection, send_bytes_text))
+        connection.async_wait_send_queue = self._async_wait_send_queue
+        connection.send_state_diff = self._send_state_diff
+        self._writer_task = create_eager_task(
+            self._writer(connection, send_bytes_text, send_bytes_binary)
+        )
         self._hass.data[DATA_CONNECTIONS] = self._hass.data.get(DATA_CONNECTIONS, 0) + 1
         async_dispatcher_send(self._hass, SIGNAL_WEBSOCKET_CONNECTED)
 
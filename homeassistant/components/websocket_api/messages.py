@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
 from functools import lru_cache
 import logging
 from typing import Any, Final
+import zlib
 
 import voluptuous as vol
 
@@ -14,6 +16,7 @@ from homeassistant.const import (
     COMPRESSED_STATE_LAST_CHANGED,
     COMPRESSED_STATE_LAST_UPDATED,
     COMPRESSED_STATE_STATE,
+    EVENT_STATE_CHANGED,
 )
 from homeassistant.core import CompressedState, Event, EventStateChangedData
 from homeassistant.helpers import config_validation as cv
@@ -154,7 +157,7 @@ def cached_state_diff_message(
     """
     return b"".join(
         (
-            _partial_cached_state_diff_message(event)[:-1],
+            cached_state_diff_message_prefix(event),
             b',"id":',
             message_id_as_bytes,
             b"}",
@@ -162,6 +165,47 @@ def cached_state_diff_message(
     )
 
 
+def cached_state_diff_message_prefix(event: Event[EventStateChangedData]) -> bytes:
+    """Return the serialized state diff message without the id and closing brace.
+
+    Used to send the same state diff to many subscriptions, each only
+    appending its own id.
+    """
+    return _partial_cached_state_diff_message(event)[:-1]
+
+
+def coalesced_state_diff_message(
+    first_event: Event[EventStateChangedData],
+    last_event: Event[EventStateChangedData],
+    message_suffix: bytes,
+) -> bytes:
+    """Return a state diff message covering multiple changes of an entity.
+
+    The diff is from the old state of the first change to the new state
+    of the last change, as if there were no changes in between. The
+    message suffix holds the id and closes the message.
+    """
+    event = Event(
+        EVENT_STATE_CHANGED,
+        EventStateChangedData(
+            entity_id=first_event.data["entity_id"],
+            old_state=first_event.data["old_state"],
+            new_state=last_event.data["new_state"],
+        ),
+    )
+    return b"".join(
+        (
+            (
+                _message_to_json_bytes_or_none(
+                    {"type": "event", "event": _state_diff_event(event)}
+                )
+                or INVALID_JSON_PARTIAL_MESSAGE
+            )[:-1],
+            message_suffix,
+        )
+    )
+
+
 @lru_cache(maxsize=128)
 def _partial_cached_state_diff_message(event: Event[EventStateChangedData]) -> bytes:
     """Cache and serialize the event to json.
@@ -259,3 +303,22 @@ def message_to_json_bytes(message: dict[str, Any]) -> bytes:
             message["id"], const.ERR_UNKNOWN_ERROR, "Invalid JSON in response"
         )
     )
+
+
+def message_compressor() -> Callable[[bytes], bytes]:
+    """Return a function which compresses the messages of a connection.
+
+    Messages are raw deflate blocks of a single stream primed with
+    the preset dictionary, so later messages reference earlier ones.
+    Each message is flushed so the client can decompress it on arrival.
+    """
+    compressor = zlib.compressobj(
+        wbits=-zlib.MAX_WBITS, zdict=const.COMPRESSED_MESSAGES_DICTIONARY
+    )
+    compress = compressor.compress
+    flush = compressor.flush
+
+    def _compress_message(message: bytes) -> bytes:
+        return compress(message) + flush(zlib.Z_SYNC_FLUSH)
+
+    return _compress_message
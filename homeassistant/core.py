@@ -24,6 +24,7 @@ import datetime
 import enum
 import functools
 import inspect
+from itertools import chain
 import logging
 import os
 import pathlib
@@ -195,6 +196,10 @@ _DEPRECATED_SOURCE_YAML = DeprecatedConstantEnum(ConfigSource.YAML, "2025.1")
 # How long to wait until things that run on startup have to finish.
 TIMEOUT_EVENT_START = 15
 
+# The maximum number of entities the state machine remembers the last
+# change of, see StateMachine.async_changed_since
+MAX_STATE_CHANGELOG_SIZE = 16384
+
 
 EVENTS_EXCLUDED_FROM_MATCH_ALL = {
     EVENT_HOMEASSISTANT_CLOSE,
@@ -1449,6 +1454,37 @@ class _OneTimeListener(Generic[_DataT]):
 # Empty list, used by EventBus.async_fire_internal
 EMPTY_LIST: list[Any] = []
 
+# Listeners grouped by event filter, used by EventBus.async_fire_internal
+_DispatchType = tuple[
+    tuple[
+        Callable[[Any], bool] | None,  # event_filter
+        tuple[HassJob[[Event[Any]], Coroutine[Any, Any, None] | None], ...],  # jobs
+    ],
+    ...,
+]
+
+
+def _build_dispatch(
+    filterable_jobs: Iterable[_FilterableJobType[Any]],
+) -> _DispatchType:
+    """Group listeners by event filter so a shared filter runs once per event.
+
+    Only consecutive listeners sharing a filter are grouped, so the listeners
+    still run in the order they were added.
+    """
+    groups: list[
+        tuple[
+            Callable[[Any], bool] | None,
+            list[HassJob[[Event[Any]], Coroutine[Any, Any, None] | None]],
+        ]
+    ] = []
+    for job, event_filter in filterable_jobs:
+        if groups and groups[-1][0] == event_filter:
+            groups[-1][1].append(job)
+        else:
+            groups.append((event_filter, [job]))
+    return tuple((event_filter, tuple(jobs)) for event_filter, jobs in groups)
+
 
 @functools.lru_cache
 def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> None:
@@ -1460,7 +1496,14 @@ def _verify_event_type_length_or_raise(event_type: EventType[_DataT] | str) -> N
 class EventBus:
     """Allow the firing of and listening for events."""
 
-    __slots__ = ("_debug", "_hass", "_listeners", "_match_all_listeners")
+    __slots__ = (
+        "_debug",
+        "_dispatch",
+        "_hass",
+        "_listeners",
+        "_match_all_dispatch",
+        "_match_all_listeners",
+    )
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
@@ -1469,6 +1512,11 @@ class EventBus:
         ] = defaultdict(list)
         self._match_all_listeners: list[_FilterableJobType[Any]] = []
         self._listeners[MATCH_ALL] = self._match_all_listeners
+        # The listeners of an event type combined with the listeners of all
+        # events, grouped by event filter. They are combined again the next
+        # time the event type is fired after listeners are added or removed.
+        self._dispatch: dict[EventType[Any] | str, _DispatchType] = {}
+        self._match_all_dispatch: _DispatchType | None = None
         self._hass = hass
         self._async_logging_changed()
         self.async_listen(EVENT_LOGGING_CHANGED, self._async_logging_changed)
@@ -1549,14 +1597,11 @@ class EventBus:
                 "Bus:Handling %s", _event_repr(event_type, origin, event_data)
             )
 
-        listeners = self._listeners.get(event_type, EMPTY_LIST)
-        if event_type not in EVENTS_EXCLUDED_FROM_MATCH_ALL:
-            match_all_listeners = self._match_all_listeners
-        else:
-            match_all_listeners = EMPTY_LIST
+        if (dispatch := self._dispatch.get(event_type)) is None:
+            dispatch = self._async_get_dispatch(event_type)
 
         event: Event[_DataT] | None = None
-        for job, event_filter in listeners + match_all_listeners:
+        for event_filter, jobs in dispatch:
             if event_filter is not None:
                 try:
                     if event_data is None or not event_filter(event_data):
@@ -1574,10 +1619,41 @@ class EventBus:
                     context,
                 )
 
-            try:
-                self._hass.async_run_hass_job(job, event)
-            except Exception:
-                _LOGGER.exception("Error running job: %s", job)
+            for job in jobs:
+                try:
+                    self._hass.async_run_hass_job(job, event)
+                except Exception:
+                    _LOGGER.exception("Error running job: %s", job)
+
+    @callback
+    def _async_get_dispatch(self, event_type: EventType[Any] | str) -> _DispatchType:
+        """Return the listeners of an event type grouped by event filter."""
+        if event_type in EVENTS_EXCLUDED_FROM_MATCH_ALL:
+            match_all_listeners = EMPTY_LIST
+        else:
+            match_all_listeners = self._match_all_listeners
+
+        if event_type not in self._listeners:
+            # Only event types with listeners are kept, any event type can be fired
+            if not match_all_listeners:
+                return ()
+            if self._match_all_dispatch is None:
+                self._match_all_dispatch = _build_dispatch(match_all_listeners)
+            return self._match_all_dispatch
+
+        dispatch = self._dispatch[event_type] = _build_dispatch(
+            chain(self._listeners[event_type], match_all_listeners)
+        )
+        return dispatch
+
+    @callback
+    def _async_listeners_changed(self, event_type: EventType[Any] | str) -> None:
+        """Drop the combined listeners changed by adding or removing a listener."""
+        if event_type == MATCH_ALL:
+            self._dispatch.clear()
+            self._match_all_dispatch = None
+        else:
+            self._dispatch.pop(event_type, None)
 
     def listen(
         self,
@@ -1650,6 +1726,7 @@ class EventBus:
     ) -> CALLBACK_TYPE:
         """Listen for all events or events of a specific type."""
         self._listeners[event_type].append(filterable_job)
+        self._async_listeners_changed(event_type)
         return functools.partial(
             self._async_remove_listener, event_type, filterable_job
         )
@@ -1731,6 +1808,7 @@ class EventBus:
         """
         try:
             self._listeners[event_type].remove(filterable_job)
+            self._async_listeners_changed(event_type)
 
             # delete event_type list if empty
             if not self._listeners[event_type] and event_type != MATCH_ALL:
@@ -2067,7 +2145,19 @@ class States(UserDict[str, State]):
 class StateMachine:
     """Helper class that tracks the state of different entities."""
 
-    __slots__ = ("_states", "_states_data", "_reservations", "_bus", "_loop")
+    __slots__ = (
+        "_states",
+        "_states_data",
+        "_reservations",
+        "_bus",
+        "_loop",
+        "changelog_id",
+        "_change_sequence",
+        "_changelog",
+        "_changelog_start",
+        "_firing_sequence",
+        "_firing_depth",
+    )
 
     def __init__(self, bus: EventBus, loop: asyncio.events.AbstractEventLoop) -> None:
         """Initialize state machine."""
@@ -2078,6 +2168,21 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        # Every state change gets the next sequence number. The sequence
+        # numbers are only comparable within the same changelog_id.
+        self.changelog_id = ulid_now()
+        self._change_sequence = 0
+        # The sequence number of the last change of each entity, ordered
+        # from the oldest to the newest change
+        self._changelog: dict[str, int] = {}
+        # Changes up to this sequence number may have been dropped
+        # from the changelog
+        self._changelog_start = 0
+        # The sequence number of the outermost change being fired and how many
+        # changes are being fired, since listeners may change states while
+        # a state changed event is fired
+        self._firing_sequence = 0
+        self._firing_depth = 0
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -2195,11 +2300,7 @@ class StateMachine:
             "old_state": old_state,
             "new_state": None,
         }
-        self._bus.async_fire_internal(
-            EVENT_STATE_CHANGED,
-            state_changed_data,
-            context=context,
-        )
+        self._async_fire_state_changed(state_changed_data, context, None)
         return True
 
     def set(
@@ -2381,12 +2482,72 @@ class StateMachine:
             "old_state": old_state,
             "new_state": state,
         }
-        self._bus.async_fire_internal(
-            EVENT_STATE_CHANGED,
-            state_changed_data,
-            context=context,
-            time_fired=timestamp,
-        )
+        self._async_fire_state_changed(state_changed_data, context, timestamp)
+
+    @callback
+    def _async_fire_state_changed(
+        self,
+        state_changed_data: EventStateChangedData,
+        context: Context | None,
+        time_fired: float | None,
+    ) -> None:
+        """Record a state change in the changelog and fire the event."""
+        self._change_sequence = sequence = self._change_sequence + 1
+        changelog = self._changelog
+        entity_id = state_changed_data["entity_id"]
+        # Move the entity to the end to keep the changelog ordered
+        changelog.pop(entity_id, None)
+        changelog[entity_id] = sequence
+        if len(changelog) > MAX_STATE_CHANGELOG_SIZE:
+            self._changelog_start = changelog.pop(next(iter(changelog)))
+        if not self._firing_depth:
+            self._firing_sequence = sequence
+        self._firing_depth += 1
+        try:
+            self._bus.async_fire_internal(
+                EVENT_STATE_CHANGED,
+                state_changed_data,
+                context=context,
+                time_fired=time_fired,
+            )
+        finally:
+            self._firing_depth -= 1
+
+    @callback
+    def async_resume_sequence(self) -> int:
+        """Return the sequence number of the changes seen by listeners.
+
+        When called from a state changed listener, all changes up to the
+        returned sequence number have been passed to the listener or are
+        being passed to it. Listeners may change states while a state
+        changed event is fired, which fires nested state changed events
+        before the outer event reaches the remaining listeners, so within
+        a nested event the outer change may not have been seen yet.
+
+        This method must be run in the event loop.
+        """
+        if not self._firing_depth:
+            return self._change_sequence
+        if self._firing_depth == 1:
+            return self._firing_sequence
+        return self._firing_sequence - 1
+
+    @callback
+    def async_changed_since(self, sequence: int) -> list[str] | None:
+        """Return the entity ids changed or removed after a sequence number.
+
+        Returns None if the changelog no longer covers the sequence number.
+
+        This method must be run in the event loop.
+        """
+        if sequence < self._changelog_start or sequence > self._change_sequence:
+            return None
+        changed: list[str] = []
+        for entity_id in reversed(self._changelog):
+            if self._changelog[entity_id] <= sequence:
+                break
+            changed.append(entity_id)
+        return changed
 
 
 class SupportsResponse(enum.StrEnum):
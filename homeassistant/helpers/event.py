@@ -54,7 +54,7 @@ from .entity_registry import (
 )
 from .ratelimit import KeyedRateLimit
 from .sun import get_astral_event_next
-from .template import RenderInfo, Template, result_as_boolean
+from .template import DomainStatesAggregate, RenderInfo, Template, result_as_boolean
 from .typing import TemplateVarsType
 
 _TRACK_STATE_CHANGE_DATA: HassKey[_KeyedEventData[EventStateChangedData]] = HassKey(
@@ -172,6 +172,79 @@ class TrackTemplateResult:
     result: Any
 
 
+@dataclass(slots=True, frozen=True, kw_only=True)
+class StateChangeFilter:
+    """Class for filtering state changes before a callback is scheduled.
+
+    state: Pass state changes where the state changed
+    attributes: Pass state changes where one of these attributes changed
+    numeric_delta: Only pass a changed numeric state when it moved more than
+    this delta from the state of the last change that was passed
+
+    State changes where the entity is added or removed are always passed.
+    """
+
+    state: bool = True
+    attributes: Iterable[str] = ()
+    numeric_delta: float | None = None
+
+
+class _FilteredStateChangeListener:
+    """Run a job only for the state changes passing a StateChangeFilter."""
+
+    __slots__ = ("_attributes", "_filter", "_hass", "_job", "_last_numeric_state")
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        job: HassJob[[Event[EventStateChangedData]], Any],
+        state_filter: StateChangeFilter,
+    ) -> None:
+        """Initialize the filtered listener."""
+        self._hass = hass
+        self._job = job
+        self._filter = state_filter
+        self._attributes = tuple(state_filter.attributes)
+        self._last_numeric_state: dict[str, float] = {}
+
+    def __call__(self, event: Event[EventStateChangedData]) -> None:
+        """Run the job if the state change passes the filter."""
+        if self._passes(event.data):
+            self._hass.async_run_hass_job(self._job, event)
+
+    def _passes(self, data: EventStateChangedData) -> bool:
+        """Return True if the state change passes the filter."""
+        old_state = data["old_state"]
+        new_state = data["new_state"]
+        if old_state is None or new_state is None:
+            self._last_numeric_state.pop(data["entity_id"], None)
+            return True
+        state_filter = self._filter
+        if state_filter.state and old_state.state != new_state.state:
+            if (delta := state_filter.numeric_delta) is None:
+                return True
+            entity_id = data["entity_id"]
+            try:
+                new_value = float(new_state.state)
+                if (last_value := self._last_numeric_state.get(entity_id)) is None:
+                    last_value = float(old_state.state)
+            except ValueError:
+                # Moving to or from a non numeric state always passes
+                self._last_numeric_state.pop(entity_id, None)
+                return True
+            if abs(new_value - last_value) > delta:
+                self._last_numeric_state[entity_id] = new_value
+                return True
+            self._last_numeric_state[entity_id] = last_value
+        if attributes := self._attributes:
+            old_attributes = old_state.attributes
+            new_attributes = new_state.attributes
+            for attribute in attributes:
+                if old_attributes.get(attribute) != new_attributes.get(attribute):
+                    return True
+        return False
+
+
 def threaded_listener_factory[**_P](
     async_factory: Callable[Concatenate[HomeAssistant, _P], Any],
 ) -> Callable[Concatenate[HomeAssistant, _P], CALLBACK_TYPE]:
@@ -311,6 +384,8 @@ def async_track_state_change_event(
     entity_ids: str | Iterable[str],
     action: Callable[[Event[EventStateChangedData]], Any],
     job_type: HassJobType | None = None,
+    *,
+    state_filter: StateChangeFilter | None = None,
 ) -> CALLBACK_TYPE:
     """Track specific state change events indexed by entity_id.
 
@@ -322,9 +397,17 @@ def async_track_state_change_event(
     for each one, we keep a dict of entity ids that
     care about the state change events so we can
     do a fast dict lookup to route events.
+
+    If a state_filter is passed, it is evaluated when the event is
+    dispatched and the action is only scheduled for the state changes
+    passing the filter.
     """
     if not (entity_ids := _async_string_to_lower_list(entity_ids)):
         return _remove_empty_listener
+    if state_filter is not None:
+        job = HassJob(action, job_type=job_type)
+        action = _FilteredStateChangeListener(hass, job, state_filter)
+        job_type = HassJobType.Callback
     return _async_track_state_change_event(hass, entity_ids, action, job_type)
 
 
@@ -1001,6 +1084,9 @@ class TrackTemplateResultInfo:
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
+        # None marks templates which can not be maintained incrementally
+        self._aggregates: dict[Template, DomainStatesAggregate | None] = {}
+        self._aggregate_listeners: list[Callable[[], None]] = []
 
     def __repr__(self) -> str:
         """Return the representation."""
@@ -1043,6 +1129,7 @@ class TrackTemplateResultInfo:
             self._info[template] = info = template.async_render_to_info(
                 variables, strict=strict, log_fn=log_fn
             )
+            self._setup_aggregate(track_template_, info)
 
             if info.exception:
                 if not log_fn:
@@ -1107,6 +1194,32 @@ class TrackTemplateResultInfo:
         for template, info in self._info.items():
             self._setup_time_listener(template, info.has_time)
 
+    @callback
+    def _setup_aggregate(
+        self, track_template_: TrackTemplate, info: RenderInfo
+    ) -> None:
+        """Maintain the result of the template incrementally if supported."""
+        template = track_template_.template
+        if template in self._aggregates or info.exception:
+            return
+
+        aggregate = DomainStatesAggregate.async_from_render_info(
+            info, track_template_.variables
+        )
+        self._aggregates[template] = aggregate
+        if aggregate is None:
+            return
+
+        aggregate.async_setup()
+        self._aggregate_listeners.append(
+            async_track_state_change_filtered(
+                self.hass,
+                TrackStates(False, set(), {aggregate.domain}),
+                aggregate.async_update,
+            ).async_remove
+        )
+        _LOGGER.debug("Template %s is maintained incrementally", template.template)
+
     @callback
     def async_remove(self) -> None:
         """Cancel the listener."""
@@ -1115,6 +1228,8 @@ class TrackTemplateResultInfo:
         self._rate_limit.async_remove()
         for template in list(self._time_listeners):
             self._time_listeners.pop(template)()
+        while self._aggregate_listeners:
+            self._aggregate_listeners.pop()()
 
     @callback
     def async_refresh(self) -> None:
@@ -1165,9 +1280,14 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
-        )
+        if (aggregate := self._aggregates.get(template)) is None or (
+            info := aggregate.async_render_to_info(
+                event.data["entity_id"] if event else None
+            )
+        ) is None:
+            info = template.async_render_to_info(track_template_.variables)
+            self._setup_aggregate(track_template_, info)
+        self._info[template] = info
 
         try:
             result: str | TemplateError = info.result()
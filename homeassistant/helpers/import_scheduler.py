@@ -0,0 +1,152 @@
+"""Prefetch the integrations which take long to import during startup.
+
+The import executor imports one integration at a time, so every import
+queued behind an integration which takes long to import has to wait for
+it. The scheduler prefetches the integrations which took long to import
+on the previous start in a small pool of threads. The integrations are
+prefetched in the order of the longest path of import time through the
+integrations depending on them, so the integrations holding up the most
+are imported first.
+
+Integrations depending on each other import the same modules, and the
+threads would only wait on each other for the import lock of those
+modules. An integration is therefore not prefetched while one of its
+dependencies or one of the integrations depending on it is prefetched.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+import logging
+
+from homeassistant.core import HomeAssistant
+from homeassistant.loader import Integration
+from homeassistant.util.async_ import create_eager_task
+
+_LOGGER = logging.getLogger(__name__)
+
+# Integrations taking longer than this to import are prefetched
+PREFETCH_MIN_IMPORT_TIME = 0.05
+# The threads share the GIL, more threads only add lock contention
+PREFETCH_WORKERS = 2
+
+
+def critical_path_priorities(
+    dependencies: Mapping[str, set[str]], import_times: Mapping[str, float]
+) -> dict[str, float]:
+    """Return the priority of importing each domain.
+
+    The priority is the import time of the domain plus the highest priority
+    of the domains depending on it, which is the import time of the longest
+    path of imports waiting on the domain.
+    """
+    dependents: dict[str, set[str]] = {domain: set() for domain in dependencies}
+    for domain, domain_dependencies in dependencies.items():
+        for dependency in domain_dependencies:
+            if dependency in dependents:
+                dependents[dependency].add(domain)
+
+    priorities: dict[str, float] = {}
+
+    def _priority(domain: str) -> float:
+        """Return the priority of a domain."""
+        if (priority := priorities.get(domain)) is None:
+            priority = priorities[domain] = import_times.get(domain, 0) + max(
+                (_priority(dependent) for dependent in dependents[domain]),
+                default=0,
+            )
+        return priority
+
+    for domain in dependencies:
+        _priority(domain)
+    return priorities
+
+
+class ImportScheduler:
+    """Prefetch integrations in a small pool of threads."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        integrations: Mapping[str, Integration],
+        platforms: Mapping[str, list[str]],
+        import_times: Mapping[str, float],
+    ) -> None:
+        """Initialize the scheduler.
+
+        The integrations are all integrations which will be set up, with
+        the import times of the previous start. Only the integrations which
+        took long to import are prefetched, the others are used to find the
+        integrations depending on them.
+        """
+        self.hass = hass
+        self._integrations = integrations
+        self._platforms = platforms
+        self._dependencies: dict[str, set[str]] = {}
+        for domain, integration in integrations.items():
+            self._dependencies[domain] = set()
+            # Integration.all_dependencies raises RuntimeError if
+            # dependencies are not or could not be resolved
+            with suppress(RuntimeError):
+                self._dependencies[domain] = integration.all_dependencies
+        priorities = critical_path_priorities(self._dependencies, import_times)
+        self.queue = sorted(
+            (
+                domain
+                for domain in integrations
+                if import_times.get(domain, 0) >= PREFETCH_MIN_IMPORT_TIME
+            ),
+            key=priorities.__getitem__,
+            reverse=True,
+        )
+
+    def _conflicts(self, domain: str, running: set[str]) -> bool:
+        """Return if a domain shares modules with the running domains."""
+        dependencies = self._dependencies[domain]
+        return any(
+            other in dependencies or domain in self._dependencies[other]
+            for other in running
+        )
+
+    async def async_run(self) -> None:
+        """Prefetch the integrations."""
+        if not self.queue:
+            return
+        executor = ThreadPoolExecutor(
+            max_workers=PREFETCH_WORKERS, thread_name_prefix="ImportPrefetch"
+        )
+        try:
+            await self._async_prefetch(executor)
+        except BaseException:
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        await self.hass.async_add_executor_job(executor.shutdown)
+
+    async def _async_prefetch(self, executor: ThreadPoolExecutor) -> None:
+        """Prefetch the integrations in the executor."""
+        queue = self.queue.copy()
+        running: dict[asyncio.Task[None], str] = {}
+        while queue or running:
+            running_domains = set(running.values())
+            for domain in queue.copy():
+                if len(running) >= PREFETCH_WORKERS:
+                    break
+                if self._conflicts(domain, running_domains):
+                    continue
+                queue.remove(domain)
+                running_domains.add(domain)
+                _LOGGER.debug("Prefetching %s", domain)
+                task = create_eager_task(
+                    self._integrations[domain].async_prefetch(
+                        executor, self._platforms.get(domain, [])
+                    ),
+                    name=f"prefetch {domain}",
+                    loop=self.hass.loop,
+                )
+                running[task] = domain
+            done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                del running[task]
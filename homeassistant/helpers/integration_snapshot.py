@@ -0,0 +1,269 @@
+"""Snapshot of the integrations resolved and imported during startup.
+
+Resolving the integrations reads the manifests and lists the files of
+hundreds of integrations on every start. The snapshot keeps the resolved
+built-in integrations with their dependencies, and the integrations and
+platforms imported in the order they were imported with how long the
+imports took, so the next start can skip resolving the manifests and
+start importing right away.
+
+The snapshot is only used with the same version of Home Assistant and
+as long as the custom integrations and the manifests and files of the
+integrations in the snapshot have not been modified.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from contextlib import suppress
+import logging
+import os
+import pathlib
+import sys
+from typing import Any
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.loader import (
+    Integration,
+    IntegrationNotLoaded,
+    async_add_integrations,
+    async_get_import_times,
+    async_get_imported_modules,
+    async_get_loaded_integration,
+    async_get_resolved_integrations,
+)
+
+from .import_scheduler import PREFETCH_MIN_IMPORT_TIME, ImportScheduler
+from .storage import Store
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY = "core.integration_snapshot"
+STORAGE_VERSION = 1
+SAVE_DELAY = 60
+
+
+class IntegrationSnapshot:
+    """Snapshot of the integrations of the previous start."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the snapshot."""
+        self.hass = hass
+        self._store = Store[dict[str, Any]](
+            hass, STORAGE_VERSION, STORAGE_KEY, private=True, atomic_writes=True
+        )
+        self._data: dict[str, Any] | None = None
+        self.imports: list[str] = []
+        self.platforms: dict[str, list[str]] = {}
+        self.import_times: dict[str, float] = {}
+
+    async def async_load(self) -> bool:
+        """Load the snapshot and add its integrations to the loader.
+
+        Returns if the snapshot was still valid.
+        """
+        hass = self.hass
+        if hass.config.recovery_mode or hass.config.safe_mode:
+            return False
+        if not (data := await self._store.async_load()) or (
+            data["ha_version"] != HA_VERSION
+        ):
+            return False
+        integrations: dict[str, dict[str, Any]] = data["integrations"]
+        fingerprint = await hass.async_add_executor_job(
+            _get_fingerprint, integrations.values()
+        )
+        if fingerprint != data["fingerprint"]:
+            _LOGGER.debug("Integrations changed since the snapshot was saved")
+            return False
+
+        resolved: list[Integration] = []
+        for info in integrations.values():
+            integration = Integration(
+                hass,
+                info["pkg_path"],
+                pathlib.Path(info["file_path"]),
+                info["manifest"],
+                set(info["top_level_files"]),
+            )
+            if (all_dependencies := info["all_dependencies"]) is not None:
+                integration.set_resolved_dependencies(set(all_dependencies))
+            resolved.append(integration)
+        async_add_integrations(hass, resolved)
+
+        self._data = data
+        self.imports = data["imports"]
+        self.platforms = data["platforms"]
+        self.import_times = data["import_times"]
+        _LOGGER.debug("Loaded the snapshot of %s integrations", len(resolved))
+        return True
+
+    @callback
+    def async_preimport(self, domains: set[str]) -> None:
+        """Start importing the integrations which will be set up.
+
+        The integrations are imported together with the platforms which
+        were imported on the previous start. The integrations which took
+        long to import are prefetched in parallel by the import scheduler,
+        the others are imported in the import executor in the order of the
+        previous start. Only integrations which can be imported in the
+        import executor are imported ahead of their setup.
+        """
+        hass = self.hass
+        integrations: dict[str, Integration] = {}
+        for domain in self.imports:
+            if domain not in domains:
+                continue
+            try:
+                integration = async_get_loaded_integration(hass, domain)
+            except IntegrationNotLoaded:
+                continue
+            if integration.import_executor:
+                integrations[domain] = integration
+
+        scheduler = ImportScheduler(
+            hass, integrations, self.platforms, self.import_times
+        )
+        hass.async_create_background_task(
+            scheduler.async_run(), "prefetch integrations", eager_start=True
+        )
+        prefetched = set(scheduler.queue)
+        for domain, integration in integrations.items():
+            if domain in prefetched:
+                continue
+            hass.async_create_background_task(
+                _async_preimport(integration, self.platforms.get(domain, [])),
+                f"preimport {domain}",
+                eager_start=True,
+            )
+
+    @callback
+    def async_schedule_save(self) -> None:
+        """Schedule saving the snapshot of this start if it changed."""
+        hass = self.hass
+        if hass.config.recovery_mode or hass.config.safe_mode:
+            return
+
+        integrations: dict[str, dict[str, Any]] = {}
+        for integration in async_get_resolved_integrations(hass):
+            if not integration.is_built_in:
+                continue
+            all_dependencies: list[str] | None = None
+            # Integration.all_dependencies raises RuntimeError if
+            # dependencies are not or could not be resolved
+            with suppress(RuntimeError):
+                all_dependencies = sorted(integration.all_dependencies)
+            integrations[integration.domain] = {
+                "pkg_path": integration.pkg_path,
+                "file_path": str(integration.file_path),
+                "manifest": integration.manifest,
+                "top_level_files": sorted(integration.top_level_files),
+                "all_dependencies": all_dependencies,
+            }
+
+        imports: list[str] = []
+        platforms: dict[str, list[str]] = {}
+        for module in async_get_imported_modules(hass):
+            domain, _, platform = module.partition(".")
+            if domain not in integrations:
+                continue
+            if not platform:
+                imports.append(domain)
+            else:
+                platforms.setdefault(domain, []).append(platform)
+
+        import_times: dict[str, float] = {}
+        for module, import_time in async_get_import_times(hass).items():
+            domain = module.partition(".")[0]
+            if domain in integrations:
+                import_times[domain] = import_times.get(domain, 0) + import_time
+
+        hass.async_create_background_task(
+            self._async_save(
+                {
+                    "integrations": integrations,
+                    "imports": imports,
+                    "platforms": platforms,
+                    "import_times": {
+                        domain: round(import_time, 3)
+                        for domain, import_time in import_times.items()
+                    },
+                }
+            ),
+            "save integration snapshot",
+        )
+
+    async def _async_save(self, snapshot: dict[str, Any]) -> None:
+        """Save the snapshot if it changed."""
+        fingerprint = await self.hass.async_add_executor_job(
+            _get_fingerprint, snapshot["integrations"].values()
+        )
+        data = {"ha_version": HA_VERSION, "fingerprint": fingerprint, **snapshot}
+        if self._data is not None and _is_unchanged(data, self._data):
+            return
+        self._data = data
+        self._store.async_delay_save(lambda: data, SAVE_DELAY)
+
+
+async def _async_preimport(integration: Integration, platforms: list[str]) -> None:
+    """Import an integration and its platforms."""
+    try:
+        await integration.async_get_component()
+        if platforms:
+            await integration.async_get_platforms(platforms)
+    except Exception:  # noqa: BLE001
+        # Import errors are reported when setting up the integration
+        _LOGGER.debug("Unable to import %s ahead of setup", integration.domain)
+
+
+def _is_unchanged(data: dict[str, Any], previous: dict[str, Any]) -> bool:
+    """Return if a snapshot is the same as the previous snapshot.
+
+    The import times differ on every start, they are only considered
+    changed when other integrations took long to import.
+    """
+
+    def _slow_imports(data: dict[str, Any]) -> set[str]:
+        """Return the integrations which took long to import."""
+        return {
+            domain
+            for domain, import_time in data["import_times"].items()
+            if import_time >= PREFETCH_MIN_IMPORT_TIME
+        }
+
+    return {key: value for key, value in data.items() if key != "import_times"} == {
+        key: value for key, value in previous.items() if key != "import_times"
+    } and _slow_imports(data) == _slow_imports(previous)
+
+
+def _get_fingerprint(integrations: Iterable[dict[str, Any]]) -> dict[str, int]:
+    """Return the modification times the snapshot depends on.
+
+    These are the custom integrations, which can replace or be dependencies
+    of built-in integrations, and the manifests and directories of the
+    integrations in the snapshot.
+    """
+    paths: list[str] = []
+    if custom_components := sys.modules.get("custom_components"):
+        for path in custom_components.__path__:
+            paths.append(path)
+            try:
+                entries = list(os.scandir(path))
+            except OSError:
+                continue
+            for entry in entries:
+                if entry.is_dir():
+                    paths.append(entry.path)
+                    paths.append(os.path.join(entry.path, "manifest.json"))
+    for info in integrations:
+        paths.append(info["file_path"])
+        paths.append(os.path.join(info["file_path"], "manifest.json"))
+
+    fingerprint: dict[str, int] = {}
+    for path in paths:
+        try:
+            fingerprint[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            fingerprint[path] = 0
+    return fingerprint
@@ -0,0 +1,325 @@
+"""Trace of how Home Assistant spent its time starting up.
+
+The trace records spans for the integrations set up during startup, the
+dependencies between them and the stages they were set up in. It is only
+recorded when enabled since it is only needed to find out why a startup
+is slow.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from collections.abc import Generator, Iterable
+import contextlib
+from dataclasses import dataclass
+from enum import StrEnum
+import threading
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.hass_dict import HassKey
+
+DATA_STARTUP_TRACE: HassKey[StartupTrace] = HassKey("startup_trace")
+
+STARTUP_TRACE_FILE = "startup_trace.json"
+
+# Dependencies ending this close after an integration started are
+# still considered to have blocked it
+_BLOCKED_TOLERANCE = 0.001
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class TracePhases(StrEnum):
+    """Phases of setting up an integration traced besides the setup phases."""
+
+    MANIFEST = "manifest"
+    """Resolving the manifest of the integration and its dependencies."""
+    REQUIREMENTS = "requirements"
+    """Checking and installing the requirements of the integration."""
+    IMPORT_EXECUTOR = "import_executor"
+    """Importing the integration or a platform in the import executor."""
+    IMPORT_LOOP = "import_loop"
+    """Importing the integration or a platform in the event loop."""
+
+
+@dataclass(slots=True, frozen=True)
+class TraceSpan:
+    """A span of time spent on an integration."""
+
+    domain: str
+    phase: str
+    group: str | None
+    start: float
+    end: float
+    thread: str
+
+
+@dataclass(slots=True, frozen=True)
+class CriticalPathEntry:
+    """An integration on the critical path of the startup."""
+
+    domain: str
+    start: float
+    end: float
+
+
+class StartupTrace:
+    """Record the spans of the integrations set up during startup."""
+
+    def __init__(self) -> None:
+        """Initialize the trace."""
+        self.started = monotonic()
+        self.finished: float | None = None
+        self.spans: list[TraceSpan] = []
+        self.dependencies: dict[str, set[str]] = {}
+        self.stages: list[tuple[str, set[str]]] = []
+
+    def add_span(
+        self,
+        domain: str,
+        phase: str,
+        group: str | None,
+        start: float,
+        end: float,
+    ) -> None:
+        """Add a span, this method is thread-safe."""
+        if self.finished is None:
+            self.spans.append(
+                TraceSpan(
+                    domain, phase, group, start, end, threading.current_thread().name
+                )
+            )
+
+    @contextlib.contextmanager
+    def span(
+        self, domain: str, phase: str, group: str | None = None
+    ) -> Generator[None]:
+        """Record a span, this method is thread-safe."""
+        start = monotonic()
+        try:
+            yield
+        finally:
+            self.add_span(domain, phase, group, start, monotonic())
+
+    @callback
+    def async_add_dependencies(self, domain: str, dependencies: Iterable[str]) -> None:
+        """Add the dependencies and after dependencies of an integration."""
+        self.dependencies.setdefault(domain, set()).update(dependencies)
+
+    @callback
+    def async_add_stage(self, name: str, domains: set[str]) -> None:
+        """Add a stage, stages are set up one after another."""
+        self.stages.append((name, domains))
+
+    @callback
+    def async_finish(self) -> None:
+        """Stop recording spans."""
+        self.finished = monotonic()
+
+    def _domain_spans(self) -> dict[str, list[TraceSpan]]:
+        """Return the spans of each domain ordered by start."""
+        domain_spans: defaultdict[str, list[TraceSpan]] = defaultdict(list)
+        for span in sorted(self.spans, key=lambda span: span.start):
+            domain_spans[span.domain].append(span)
+        return domain_spans
+
+    def critical_path(self) -> list[CriticalPathEntry]:
+        """Return the integrations the startup waited on one after another.
+
+        The path starts at the integration which finished last and
+        goes back to the dependency, or the integration of an earlier
+        stage, which finished last before the integration started to
+        be set up.
+        """
+        domain_spans = self._domain_spans()
+        if not domain_spans:
+            return []
+        starts: dict[str, float] = {}
+        ends: dict[str, float] = {}
+        for domain, spans in domain_spans.items():
+            ends[domain] = max(span.end for span in spans)
+            # Manifests are resolved before waiting for the dependencies
+            starts[domain] = next(
+                (span.start for span in spans if span.phase != TracePhases.MANIFEST),
+                ends[domain],
+            )
+        stage_index = {
+            domain: index
+            for index, (_, domains) in enumerate(self.stages)
+            for domain in domains
+        }
+
+        current = max(ends, key=ends.__getitem__)
+        path = [current]
+        while True:
+            blocked_until = starts[current] + _BLOCKED_TOLERANCE
+            candidates = {
+                dependency
+                for dependency in self.dependencies.get(current, ())
+                if dependency in ends
+            }
+            if (index := stage_index.get(current)) is not None:
+                candidates.update(
+                    domain
+                    for domain, domain_index in stage_index.items()
+                    if domain_index < index and domain in ends
+                )
+            blocking = [
+                domain
+                for domain in candidates
+                if ends[domain] <= blocked_until and domain not in path
+            ]
+            if not blocking:
+                break
+            current = max(blocking, key=ends.__getitem__)
+            path.append(current)
+
+        path.reverse()
+        return [
+            CriticalPathEntry(domain, domain_spans[domain][0].start, ends[domain])
+            for domain in path
+        ]
+
+    def as_chrome_trace(self) -> dict[str, Any]:
+        """Return the trace in the Chrome trace event format.
+
+        Each integration gets its own track, the dependencies are added as
+        flow events from the end of the dependency to the start of the
+        integration depending on it.
+        """
+        domain_spans = self._domain_spans()
+        critical_path = self.critical_path()
+        on_critical_path = {entry.domain for entry in critical_path}
+        tids = {domain: tid for tid, domain in enumerate(sorted(domain_spans), 1)}
+
+        def _timestamp(time: float) -> int:
+            """Return the trace timestamp in microseconds of a time."""
+            return round((time - self.started) * 1_000_000)
+
+        events: list[dict[str, Any]] = [
+            {
+                "ph": "M",
+                "name": "process_name",
+                "pid": 1,
+                "args": {"name": "Home Assistant startup"},
+            }
+        ]
+        for domain, tid in tids.items():
+            events.append(
+                {
+                    "ph": "M",
+                    "name": "thread_name",
+                    "pid": 1,
+                    "tid": tid,
+                    "args": {"name": domain},
+                }
+            )
+            events.extend(
+                {
+                    "ph": "X",
+                    "name": span.phase
+                    if span.group is None
+                    else f"{span.phase} {span.group}",
+                    "cat": span.phase,
+                    "pid": 1,
+                    "tid": tid,
+                    "ts": _timestamp(span.start),
+                    "dur": _timestamp(span.end) - _timestamp(span.start),
+                    "args": {
+                        "domain": domain,
+                        "group": span.group,
+                        "thread": span.thread,
+                        "critical_path": domain in on_critical_path,
+                    },
+                }
+                for span in domain_spans[domain]
+            )
+
+        flow_id = 0
+        for domain, dependencies in sorted(self.dependencies.items()):
+            if domain not in domain_spans:
+                continue
+            for dependency in sorted(dependencies):
+                if dependency not in domain_spans:
+                    continue
+                flow_id += 1
+                dependency_end = max(span.end for span in domain_spans[dependency])
+                events.append(
+                    {
+                        "ph": "s",
+                        "name": "dependency",
+                        "cat": "dependency",
+                        "id": flow_id,
+                        "pid": 1,
+                        "tid": tids[dependency],
+                        "ts": _timestamp(dependency_end) - 1,
+                    }
+                )
+                events.append(
+                    {
+                        "ph": "f",
+                        "bp": "e",
+                        "name": "dependency",
+                        "cat": "dependency",
+                        "id": flow_id,
+                        "pid": 1,
+                        "tid": tids[domain],
+                        "ts": _timestamp(domain_spans[domain][0].start),
+                    }
+                )
+
+        return {
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {
+                "stages": [
+                    {"name": name, "domains": sorted(domains)}
+                    for name, domains in self.stages
+                ],
+                "dependencies": {
+                    domain: sorted(dependencies)
+                    for domain, dependencies in sorted(self.dependencies.items())
+                },
+                "critical_path": [
+                    {
+                        "domain": entry.domain,
+                        "start": entry.start - self.started,
+                        "end": entry.end - self.started,
+                    }
+                    for entry in critical_path
+                ],
+            },
+        }
+
+
+@callback
+def async_enable_startup_trace(hass: HomeAssistant) -> StartupTrace:
+    """Start recording the startup trace."""
+    trace = hass.data[DATA_STARTUP_TRACE] = StartupTrace()
+    return trace
+
+
+def get_startup_trace(hass: HomeAssistant) -> StartupTrace | None:
+    """Return the startup trace if it is being recorded.
+
+    This method is thread-safe.
+    """
+    if (
+        trace := hass.data.get(DATA_STARTUP_TRACE)
+    ) is None or trace.finished is not None:
+        return None
+    return trace
+
+
+def startup_span(
+    hass: HomeAssistant, domain: str, phase: str, group: str | None = None
+) -> contextlib.AbstractContextManager[None]:
+    """Record a span of the startup trace if it is being recorded.
+
+    This method is thread-safe.
+    """
+    if (trace := get_startup_trace(hass)) is None:
+        return _NULL_CONTEXT
+    return trace.span(domain, phase, group)
@@ -12,8 +12,11 @@ from contextvars import ContextVar
 from copy import deepcopy
 from datetime import date, datetime, time, timedelta
 from functools import cache, lru_cache, partial, wraps
+import hashlib
+from importlib.util import MAGIC_NUMBER
 import json
 import logging
+import marshal
 import math
 from operator import contains
 import pathlib
@@ -22,6 +25,7 @@ import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+import threading
 from types import CodeType, TracebackType
 from typing import Any, Concatenate, Literal, NoReturn, Self, cast, overload
 from urllib.parse import urlencode as urllib_urlencode
@@ -29,7 +33,8 @@ import weakref
 
 from awesomeversion import AwesomeVersion
 import jinja2
-from jinja2 import pass_context, pass_environment, pass_eval_context
+from jinja2 import nodes, pass_context, pass_environment, pass_eval_context
+from jinja2.filters import make_attrgetter
 from jinja2.runtime import AsyncLoopContext, LoopContext
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
@@ -49,9 +54,12 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__ as HA_VERSION,
 )
 from homeassistant.core import (
     Context,
+    Event,
+    EventStateChangedData,
     HomeAssistant,
     ServiceResponse,
     State,
@@ -85,6 +93,7 @@ from . import (
 )
 from .deprecation import deprecated_function
 from .singleton import singleton
+from .storage import Store
 from .translation import async_translate_state
 from .typing import TemplateVarsType
 
@@ -102,6 +111,12 @@ _ENVIRONMENT_STRICT: HassKey[TemplateEnvironment] = HassKey(
     "template.environment_strict"
 )
 _HASS_LOADER = "template.hass_loader"
+_BYTECODE_CACHE: HassKey[TemplateBytecodeCache] = HassKey("template.bytecode_cache")
+
+BYTECODE_CACHE_STORAGE_KEY = "core.template_bytecode"
+BYTECODE_CACHE_STORAGE_VERSION = 1
+BYTECODE_CACHE_SAVE_DELAY = 300
+BYTECODE_CACHE_SIZE = 4096
 
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
 _IS_NUMERIC = re.compile(r"^[+-]?(?!0\d)\d*(?:\.\d*)?$")
@@ -155,6 +170,31 @@ EVAL_CACHE_SIZE = 512
 MAX_CUSTOM_TEMPLATE_SIZE = 5 * 1024 * 1024
 MAX_TEMPLATE_OUTPUT = 256 * 1024  # 256KiB
 
+_AGGREGATE_SKIP = object()
+_AGGREGATE_ERROR = object()
+# Reducers which can be applied to the maintained values of an aggregate
+_AGGREGATE_REDUCERS = {"average", "count", "length", "max", "median", "min", "sum"}
+# Filters and tests which only depend on their arguments
+_AGGREGATE_MAP_FILTERS = {
+    "abs",
+    "bool",
+    "float",
+    "int",
+    "lower",
+    "multiply",
+    "round",
+    "string",
+    "trim",
+    "upper",
+}
+_AGGREGATE_TESTS = {
+    *jinja2.tests.TESTS,
+    "contains",
+    "is_number",
+    "match",
+    "search",
+}
+
 CACHED_TEMPLATE_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
 CACHED_TEMPLATE_NO_COLLECT_LRU: LRU[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
 ENTITY_COUNT_GROWTH_FACTOR = 1.2
@@ -1022,6 +1062,273 @@ class DomainStates:
         return f"<template DomainStates('{self._domain}')>"
 
 
+class DomainStatesAggregate:
+    """Maintain the result of a template reducing the states of a domain.
+
+    Templates of the form ``{{ states.<domain> | ... | <reducer> }}`` are
+    supported, where the filters before the reducer are ``select``,
+    ``reject``, ``selectattr``, ``rejectattr``, ``map`` or ``list`` and
+    all filter arguments are constants.
+
+    The value each state contributes after the filters is kept per entity,
+    so a state change only runs the filters for the changed entity. The
+    reducer is then applied to the kept values, which are in the same order
+    as the states of the domain, so the result matches a full render.
+    """
+
+    __slots__ = (
+        "template",
+        "domain",
+        "_prefix",
+        "_env",
+        "_ops",
+        "_reducer",
+        "_reducer_args",
+        "_reducer_kwargs",
+        "_domains_lifecycle",
+        "_entries",
+        "_count",
+        "_errors",
+    )
+
+    def __init__(
+        self,
+        template: Template,
+        domain: str,
+        ops: list[tuple[bool | None, Callable[[Any], Any]]],
+        reducer: nodes.Filter,
+        domains_lifecycle: collections.abc.Set[str],
+    ) -> None:
+        """Initialize the aggregate."""
+        self.template = template
+        self.domain = domain
+        self._prefix = f"{domain}."
+        self._env = template._env  # noqa: SLF001
+        self._ops = ops
+        self._reducer = reducer.name
+        self._reducer_args = [arg.as_const() for arg in reducer.args]
+        self._reducer_kwargs = {
+            kwarg.key: kwarg.value.as_const() for kwarg in reducer.kwargs
+        }
+        self._domains_lifecycle = domains_lifecycle
+        # The state and the value it contributes for each entity of the domain
+        self._entries: dict[str, tuple[State, Any]] = {}
+        self._count = 0
+        self._errors = 0
+
+    @classmethod
+    def async_from_render_info(
+        cls, info: RenderInfo, variables: TemplateVarsType
+    ) -> DomainStatesAggregate | None:
+        """Return an aggregate for a rendered template if it is supported."""
+        template = info.template
+        if (
+            template.hass is None
+            or info.exception is not None
+            or info.all_states
+            or info.entities
+            or info.has_time
+            or len(info.domains) != 1
+            or (variables and "states" in variables)
+        ):
+            return None
+        env = template._env  # noqa: SLF001
+        try:
+            parsed = env.parse(template.template)
+        except jinja2.TemplateSyntaxError:
+            return None
+        if len(parsed.body) != 1 or not isinstance(
+            output := parsed.body[0], nodes.Output
+        ):
+            return None
+        exprs = [
+            node
+            for node in output.nodes
+            if not isinstance(node, nodes.TemplateData) or node.data.strip()
+        ]
+        if len(exprs) != 1:
+            return None
+        node = exprs[0]
+        filters: list[nodes.Filter] = []
+        while isinstance(node, nodes.Filter):
+            filters.append(node)
+            node = node.node
+        if (
+            len(filters) < 2
+            or not isinstance(node, nodes.Getattr)
+            or not isinstance(node.node, nodes.Name)
+            or node.node.name != "states"
+            or info.domains != {node.attr}
+            or not info.domains_lifecycle <= info.domains
+            or (reducer := filters[0]).name not in _AGGREGATE_REDUCERS
+        ):
+            return None
+        ops: list[tuple[bool | None, Callable[[Any], Any]]] = []
+        try:
+            for filter_ in reversed(filters[1:]):
+                if filter_.dyn_args or filter_.dyn_kwargs:
+                    return None
+                args = [arg.as_const() for arg in filter_.args]
+                kwargs = {kwarg.key: kwarg.value.as_const() for kwarg in filter_.kwargs}
+                if filter_.name == "list":
+                    continue
+                if filter_.name == "map":
+                    if (func := _aggregate_map(env, args, kwargs)) is None:
+                        return None
+                    ops.append((None, func))
+                elif filter_.name in ("select", "reject", "selectattr", "rejectattr"):
+                    lookup_attr = filter_.name.endswith("attr")
+                    if (
+                        func := _aggregate_test(env, args, kwargs, lookup_attr)
+                    ) is None:
+                        return None
+                    ops.append((filter_.name.startswith("select"), func))
+                else:
+                    return None
+            if reducer.dyn_args or reducer.dyn_kwargs:
+                return None
+            return cls(template, node.attr, ops, reducer, info.domains_lifecycle)
+        except nodes.Impossible:
+            return None
+
+    @callback
+    def async_setup(self) -> None:
+        """Evaluate all states of the domain."""
+        for state in self.template.hass.states.async_all(self.domain):  # type: ignore[union-attr]
+            self._async_set(state.entity_id, state)
+
+    @callback
+    def async_update(self, event: Event[EventStateChangedData]) -> None:
+        """Update the aggregate from a state changed event."""
+        self._async_set(event.data["entity_id"], event.data["new_state"])
+
+    def _evaluate(self, state: State) -> Any:
+        """Return the value a state contributes to the reducer."""
+        value: Any = _template_state_no_collect(self.template.hass, state)  # type: ignore[arg-type]
+        try:
+            for select, func in self._ops:
+                if select is None:
+                    value = func(value)
+                elif bool(func(value)) is not select:
+                    return _AGGREGATE_SKIP
+        except Exception:  # noqa: BLE001
+            # The full render will raise the error
+            return _AGGREGATE_ERROR
+        return value
+
+    @callback
+    def _async_set(self, entity_id: str, new_state: State | None) -> None:
+        """Update the value an entity contributes."""
+        entries = self._entries
+        old_value = _AGGREGATE_SKIP
+        if (entry := entries.get(entity_id)) is not None:
+            if entry[0] is new_state:
+                return
+            old_value = entry[1]
+        if new_state is None:
+            new_value = _AGGREGATE_SKIP
+            entries.pop(entity_id, None)
+        else:
+            new_value = self._evaluate(new_state)
+            entries[entity_id] = (new_state, new_value)
+        for value, change in ((old_value, -1), (new_value, 1)):
+            if value is _AGGREGATE_ERROR:
+                self._errors += change
+            elif value is not _AGGREGATE_SKIP:
+                self._count += change
+
+    @callback
+    def async_render_to_info(self, entity_id: str | None = None) -> RenderInfo | None:
+        """Render the aggregate.
+
+        If entity_id is set, its state is synced from the state machine first.
+
+        Returns None if the template must be rendered instead, which is the
+        case when an entity raised an error or when the domain is empty.
+        """
+        hass = self.template.hass
+        assert hass is not None
+        if entity_id is not None and entity_id.startswith(self._prefix):
+            self._async_set(entity_id, hass.states.get(entity_id))
+        if self._errors or not self._entries:
+            return None
+        if self._reducer in ("count", "length"):
+            value: Any = self._count
+        else:
+            try:
+                value = self._env.call_filter(
+                    self._reducer,
+                    [
+                        value
+                        for _, value in self._entries.values()
+                        if value is not _AGGREGATE_SKIP
+                    ],
+                    self._reducer_args,
+                    self._reducer_kwargs,
+                )
+            except Exception:  # noqa: BLE001
+                return None
+
+        render_info = RenderInfo(self.template)
+        render_info.domains = {self.domain}
+        render_info.domains_lifecycle = self._domains_lifecycle
+        render_result = str(value).strip()
+        if hass.config.legacy_templates:
+            render_info._result = render_result  # noqa: SLF001
+        else:
+            render_info._result = self.template._parse_result(render_result)  # noqa: SLF001
+        render_info._freeze()  # noqa: SLF001
+        return render_info
+
+
+def _aggregate_map(
+    env: TemplateEnvironment, args: list[Any], kwargs: dict[str, Any]
+) -> Callable[[Any], Any] | None:
+    """Return the function applied by the map filter."""
+    if not args and "attribute" in kwargs:
+        if not kwargs.keys() <= {"attribute", "default"}:
+            return None
+        return make_attrgetter(env, kwargs["attribute"], default=kwargs.get("default"))
+    if not args or args[0] not in _AGGREGATE_MAP_FILTERS:
+        return None
+    name = args[0]
+    filter_args = args[1:]
+
+    def _map(value: Any) -> Any:
+        return env.call_filter(name, value, filter_args, kwargs)
+
+    return _map
+
+
+def _aggregate_test(
+    env: TemplateEnvironment,
+    args: list[Any],
+    kwargs: dict[str, Any],
+    lookup_attr: bool,
+) -> Callable[[Any], Any] | None:
+    """Return the function applied by the select and reject filters."""
+    getter: Callable[[Any], Any] | None = None
+    if lookup_attr:
+        if not args:
+            return None
+        getter = make_attrgetter(env, args[0])
+        args = args[1:]
+    if not args:
+        if kwargs:
+            return None
+        return bool if getter is None else getter
+    if (name := args[0]) not in _AGGREGATE_TESTS:
+        return None
+    test_args = args[1:]
+
+    def _test(value: Any) -> Any:
+        if getter is not None:
+            value = getter(value)
+        return env.call_test(name, value, test_args, kwargs)
+
+    return _test
+
+
 class TemplateStateBase(State):
     """Class to represent a state object in a template."""
 
@@ -2787,6 +3094,99 @@ def make_logging_undefined(
     return LoggingUndefined
 
 
+class TemplateBytecodeCache:
+    """Persist the compiled code of templates across restarts.
+
+    The code is stored marshalled and keyed by the hash of the template
+    source. The cache is discarded when the Python bytecode, Jinja or
+    Home Assistant version changes as they all affect the compiled code.
+    Entries are only unmarshalled when a template is first compiled and the
+    least recently used entries are evicted once the cache is full.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the bytecode cache."""
+        self.hass = hass
+        self._store = Store[dict[str, Any]](
+            hass,
+            BYTECODE_CACHE_STORAGE_VERSION,
+            BYTECODE_CACHE_STORAGE_KEY,
+            private=True,
+            atomic_writes=True,
+        )
+        self._cache_version = f"{MAGIC_NUMBER.hex()}-{jinja2.__version__}-{HA_VERSION}"
+        self._entries: dict[str, str] = {}
+        # Templates are compiled in the event loop and in executor threads
+        self._lock = threading.Lock()
+        self._save_scheduled = False
+
+    async def async_load(self) -> None:
+        """Load the cache from storage."""
+        if (data := await self._store.async_load()) and data[
+            "cache_version"
+        ] == self._cache_version:
+            self._entries = data["templates"]
+
+    @staticmethod
+    def _key(source: str) -> str:
+        """Return the cache key of a template source."""
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    def get(self, source: str) -> CodeType | None:
+        """Return the compiled code of a template source."""
+        key = self._key(source)
+        with self._lock:
+            if (encoded := self._entries.pop(key, None)) is None:
+                return None
+            # Mark the entry as most recently used
+            self._entries[key] = encoded
+        try:
+            code = marshal.loads(base64.b64decode(encoded))
+        except (ValueError, EOFError, TypeError):
+            _LOGGER.debug("Discarding invalid bytecode cache entry %s", key)
+            with self._lock:
+                self._entries.pop(key, None)
+            return None
+        return cast(CodeType, code)
+
+    def add(self, source: str, code: CodeType) -> None:
+        """Add the compiled code of a template source.
+
+        This method may be called from any thread.
+        """
+        key = self._key(source)
+        encoded = base64.b64encode(marshal.dumps(code)).decode()
+        with self._lock:
+            entries = self._entries
+            entries[key] = encoded
+            while len(entries) > BYTECODE_CACHE_SIZE:
+                del entries[next(iter(entries))]
+            if self._save_scheduled:
+                return
+            self._save_scheduled = True
+        self.hass.loop.call_soon_threadsafe(self._async_schedule_save)
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        """Schedule saving the cache."""
+        self._store.async_delay_save(self._data_to_save, BYTECODE_CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to save."""
+        with self._lock:
+            self._save_scheduled = False
+            templates = dict(self._entries)
+        return {"cache_version": self._cache_version, "templates": templates}
+
+
+async def async_load_bytecode_cache(hass: HomeAssistant) -> None:
+    """Load the compiled code of templates from storage."""
+    bytecode_cache = TemplateBytecodeCache(hass)
+    await bytecode_cache.async_load()
+    hass.data[_BYTECODE_CACHE] = bytecode_cache
+
+
 async def async_load_custom_templates(hass: HomeAssistant) -> None:
     """Load all custom jinja files under 5MiB into memory."""
     custom_templates = await hass.async_add_executor_job(_load_custom_templates, hass)
@@ -3209,8 +3609,19 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
                 defer_init,
             )
 
+        bytecode_cache = (
+            self.hass.data.get(_BYTECODE_CACHE)
+            if self.hass is not None and isinstance(source, str)
+            else None
+        )
+        if bytecode_cache is not None and (compiled := bytecode_cache.get(source)):
+            self.template_cache[source] = compiled
+            return compiled
+
         compiled = super().compile(source)
         self.template_cache[source] = compiled
+        if bytecode_cache is not None:
+            bytecode_cache.add(source, compiled)
         return compiled
 
 
@@ -8,7 +8,8 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Callable, Iterable
-from contextlib import suppress
+from concurrent.futures import Executor
+from contextlib import AbstractContextManager, nullcontext, suppress
 from dataclasses import dataclass
 import functools as ft
 import importlib
@@ -16,6 +17,7 @@ import logging
 import os
 import pathlib
 import sys
+import threading
 import time
 from types import ModuleType
 from typing import TYPE_CHECKING, Any, Literal, Protocol, TypedDict, cast
@@ -40,6 +42,7 @@ from .generated.ssdp import SSDP
 from .generated.usb import USB
 from .generated.zeroconf import HOMEKIT, ZEROCONF
 from .helpers.json import json_bytes, json_fragment
+from .helpers.startup_trace import TracePhases, get_startup_trace
 from .helpers.typing import UNDEFINED
 from .util.hass_dict import HassKey
 from .util.json import JSON_DECODE_EXCEPTIONS, json_loads
@@ -132,6 +135,7 @@ DATA_CUSTOM_COMPONENTS: HassKey[
     dict[str, Integration] | asyncio.Future[dict[str, Integration]]
 ] = HassKey("custom_components")
 DATA_PRELOAD_PLATFORMS: HassKey[list[str]] = HassKey("preload_platforms")
+DATA_IMPORT_TIMES: HassKey[dict[str, float]] = HassKey("import_times")
 PACKAGE_CUSTOM_COMPONENTS = "custom_components"
 PACKAGE_BUILTIN = "homeassistant.components"
 CUSTOM_WARNING = (
@@ -270,6 +274,7 @@ def async_setup(hass: HomeAssistant) -> None:
     hass.data[DATA_INTEGRATIONS] = {}
     hass.data[DATA_MISSING_PLATFORMS] = {}
     hass.data[DATA_PRELOAD_PLATFORMS] = BASE_PRELOAD_PLATFORMS.copy()
+    hass.data[DATA_IMPORT_TIMES] = {}
 
 
 def manifest_from_legacy_module(domain: str, module: ModuleType) -> Manifest:
@@ -776,7 +781,9 @@ class Integration:
         self._platforms_to_preload = hass.data[DATA_PRELOAD_PLATFORMS]
         self._component_future: asyncio.Future[ComponentProtocol] | None = None
         self._import_futures: dict[str, asyncio.Future[ModuleType]] = {}
+        self._prefetch_future: asyncio.Future[None] | None = None
         self._cache = hass.data[DATA_COMPONENTS]
+        self._import_times = hass.data[DATA_IMPORT_TIMES]
         self._missing_platforms_cache = hass.data[DATA_MISSING_PLATFORMS]
         self._top_level_files = top_level_files or set()
         _LOGGER.info("Loaded %s from %s", self.domain, pkg_path)
@@ -947,6 +954,16 @@ class Integration:
         """Return if all dependencies have been resolved."""
         return self._all_dependencies_resolved is not None
 
+    @property
+    def top_level_files(self) -> set[str]:
+        """Return the files and directories in the integration directory."""
+        return self._top_level_files
+
+    def set_resolved_dependencies(self, all_dependencies: set[str]) -> None:
+        """Set all dependencies when they were resolved before."""
+        self._all_dependencies = all_dependencies
+        self._all_dependencies_resolved = True
+
     async def resolve_dependencies(self) -> bool:
         """Resolve all dependencies."""
         if self._all_dependencies_resolved is not None:
@@ -995,6 +1012,11 @@ class Integration:
         if self._component_future:
             return await self._component_future
 
+        if self._prefetch_future:
+            await self._prefetch_future
+            if domain in cache:
+                return cache[domain]
+
         if debug := _LOGGER.isEnabledFor(logging.DEBUG):
             start = time.perf_counter()
 
@@ -1076,9 +1098,12 @@ class Integration:
         cache = self._cache
         domain = self.domain
         try:
-            cache[domain] = cast(
-                ComponentProtocol, importlib.import_module(self.pkg_path)
-            )
+            start = time.perf_counter()
+            with self._trace_import():
+                cache[domain] = cast(
+                    ComponentProtocol, importlib.import_module(self.pkg_path)
+                )
+            self._import_times[domain] = time.perf_counter() - start
         except ImportError:
             raise
         except RuntimeError as err:
@@ -1097,6 +1122,46 @@ class Integration:
 
         return cache[domain]
 
+    async def async_prefetch(
+        self, executor: Executor, platform_names: Iterable[str]
+    ) -> None:
+        """Import the component and platforms in an executor ahead of their use.
+
+        Calls to async_get_component and async_get_platforms wait for the
+        prefetch to finish. Import errors are not raised, they are raised
+        when the component or platform is used.
+        """
+        if (
+            self._prefetch_future
+            or self._component_future
+            or self._import_futures
+            or (
+                self.domain in self._cache and self.platforms_are_loaded(platform_names)
+            )
+        ):
+            return
+
+        future = self._prefetch_future = self.hass.loop.create_future()
+        try:
+            await self.hass.loop.run_in_executor(
+                executor, self._prefetch, platform_names
+            )
+        finally:
+            self._prefetch_future = None
+            future.set_result(None)
+
+    def _prefetch(self, platform_names: Iterable[str]) -> None:
+        """Import the component and platforms.
+
+        This method runs in an executor.
+        """
+        with suppress(ImportError):
+            if self.domain not in self._cache:
+                self._get_component(preload_platforms=True)
+            for platform_name in platform_names:
+                with suppress(ImportError):
+                    self.get_platform(platform_name)
+
     def _load_platforms(self, platform_names: Iterable[str]) -> dict[str, ModuleType]:
         """Load platforms for an integration."""
         return {
@@ -1120,6 +1185,9 @@ class Integration:
         domain = self.domain
         platforms: dict[str, ModuleType] = {}
 
+        if self._prefetch_future:
+            await self._prefetch_future
+
         load_executor_platforms: list[str] = []
         load_event_loop_platforms: list[str] = []
         in_progress_imports: dict[str, asyncio.Future[ModuleType]] = {}
@@ -1306,7 +1374,27 @@ class Integration:
         This method must be thread-safe as it's called from the executor
         and the event loop.
         """
-        return importlib.import_module(f"{self.pkg_path}.{platform_name}")
+        start = time.perf_counter()
+        with self._trace_import(platform_name):
+            platform = importlib.import_module(f"{self.pkg_path}.{platform_name}")
+        self._import_times[f"{self.domain}.{platform_name}"] = (
+            time.perf_counter() - start
+        )
+        return platform
+
+    def _trace_import(
+        self, platform_name: str | None = None
+    ) -> AbstractContextManager[None]:
+        """Record an import in the startup trace if it is being recorded.
+
+        This method must be thread-safe as it's called from the executor
+        and the event loop.
+        """
+        if (trace := get_startup_trace(self.hass)) is None:
+            return nullcontext()
+        if self.hass.loop_thread_id == threading.get_ident():
+            return trace.span(self.domain, TracePhases.IMPORT_LOOP, platform_name)
+        return trace.span(self.domain, TracePhases.IMPORT_EXECUTOR, platform_name)
 
     def __repr__(self) -> str:
         """Text representation of class."""
@@ -1357,6 +1445,29 @@ def async_get_loaded_integration(hass: HomeAssistant, domain: str) -> Integratio
     raise IntegrationNotLoaded(domain)
 
 
+@callback
+def async_get_resolved_integrations(hass: HomeAssistant) -> list[Integration]:
+    """Return the integrations which are resolved."""
+    return [
+        int_or_fut
+        for int_or_fut in hass.data[DATA_INTEGRATIONS].values()
+        if type(int_or_fut) is Integration
+    ]
+
+
+@callback
+def async_add_integrations(
+    hass: HomeAssistant, integrations: Iterable[Integration]
+) -> None:
+    """Add integrations resolved before, such as on a previous start.
+
+    Integrations which are already resolved or being resolved are kept.
+    """
+    cache = hass.data[DATA_INTEGRATIONS]
+    for integration in integrations:
+        cache.setdefault(integration.domain, integration)
+
+
 async def async_get_integration(hass: HomeAssistant, domain: str) -> Integration:
     """Get integration."""
     cache = hass.data[DATA_INTEGRATIONS]
@@ -1685,6 +1796,18 @@ def _lookup_path(hass: HomeAssistant) -> list[str]:
     return [PACKAGE_CUSTOM_COMPONENTS, PACKAGE_BUILTIN]
 
 
+@callback
+def async_get_imported_modules(hass: HomeAssistant) -> list[str]:
+    """Return the integrations and platforms imported in the order of import."""
+    return list(hass.data[DATA_COMPONENTS])
+
+
+@callback
+def async_get_import_times(hass: HomeAssistant) -> dict[str, float]:
+    """Return how long importing the integrations and platforms took."""
+    return hass.data[DATA_IMPORT_TIMES].copy()
+
+
 def is_component_module_loaded(hass: HomeAssistant, module: str) -> bool:
     """Test if a component module is loaded."""
     return module in hass.data[DATA_COMPONENTS]
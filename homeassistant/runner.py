@@ -54,6 +54,7 @@ class RuntimeConfig:
 
     debug: bool = False
     open_ui: bool = False
+    startup_trace: bool = False
 
     safe_mode: bool = False
 
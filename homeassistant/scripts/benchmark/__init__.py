@@ -6,11 +6,13 @@ import argparse
 import asyncio
 from collections.abc import Callable
 from contextlib import suppress
+from functools import partial
 import logging
+import time
 from timeit import default_timer as timer
 
 from homeassistant import core
-from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.const import EVENT_STATE_CHANGED, MATCH_ALL
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
     async_track_state_change,
@@ -23,6 +25,9 @@ from homeassistant.helpers.json import JSON_DUMP
 
 BENCHMARKS: dict[str, Callable] = {}
 
+DATA_DB_URL = "benchmark_db_url"
+DEFAULT_DB_URL = "sqlite://"
+
 
 def run(args):
     """Handle benchmark commandline script."""
@@ -32,6 +37,11 @@ def run(args):
     parser = argparse.ArgumentParser(description="Run a Home Assistant benchmark.")
     parser.add_argument("name", choices=BENCHMARKS)
     parser.add_argument("--script", choices=["benchmark"])
+    parser.add_argument(
+        "--db-url",
+        default=DEFAULT_DB_URL,
+        help="Database used by the recorder benchmarks, use an empty database",
+    )
 
     args = parser.parse_args()
 
@@ -40,12 +50,13 @@ def run(args):
 
     with suppress(KeyboardInterrupt):
         while True:
-            asyncio.run(run_benchmark(bench))
+            asyncio.run(run_benchmark(bench, args.db_url))
 
 
-async def run_benchmark(bench):
+async def run_benchmark(bench, db_url=DEFAULT_DB_URL):
     """Run a benchmark."""
     hass = core.HomeAssistant("")
+    hass.data[DATA_DB_URL] = db_url
     runtime = await bench(hass)
     print(f"Benchmark {bench.__name__} done in {runtime}s")
     await hass.async_stop()
@@ -116,6 +127,55 @@ async def fire_events_with_filter(hass):
     return timer() - start
 
 
+@benchmark
+async def fire_events_shared_filters(hass):
+    """Fire a million events to listeners sharing filters.
+
+    Each event goes to 10 listeners sharing a filter that accepts it,
+    10 listeners sharing a filter that rejects it, 5 listeners without
+    a filter and 2 listeners of all events.
+    """
+    count = 0
+    event_name = "benchmark_event"
+    events_to_fire = 10**6
+
+    @core.callback
+    def accept_filter(event_data):
+        """Filter event."""
+        return True
+
+    @core.callback
+    def reject_filter(event_data):
+        """Filter event."""
+        return False
+
+    @core.callback
+    def listener(_):
+        """Handle event."""
+        nonlocal count
+        count += 1
+
+    for _ in range(10):
+        hass.bus.async_listen(event_name, listener, event_filter=accept_filter)
+        hass.bus.async_listen(event_name, listener, event_filter=reject_filter)
+    for _ in range(5):
+        hass.bus.async_listen(event_name, listener)
+    for _ in range(2):
+        hass.bus.async_listen(MATCH_ALL, listener)
+
+    event_data = {"entity_id": "light.kitchen"}
+    start = timer()
+
+    for _ in range(events_to_fire):
+        hass.bus.async_fire_internal(event_name, event_data)
+
+    await hass.async_block_till_done()
+
+    assert count == events_to_fire * 17
+
+    return timer() - start
+
+
 @benchmark
 async def state_changed_helper(hass):
     """Run a million events through state changed helper with 1000 entities."""
@@ -308,3 +368,317 @@ async def json_serialize_states(hass):
     start = timer()
     JSON_DUMP(states)
     return timer() - start
+
+
+@benchmark
+async def recorder_bulk_insert(hass):
+    """Write 80k states with session flushes and with bulk inserts.
+
+    The states of 4000 entities are written in 10 commits with
+    2 changes per entity each, which prints the rows per second
+    of both write paths for the database passed with --db-url.
+    """
+    # pylint: disable=import-outside-toplevel
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import Session
+
+    from homeassistant.components.recorder.bulk_insert import BulkInsertQueue
+    from homeassistant.components.recorder.db_schema import (
+        Base,
+        StateAttributes,
+        States,
+        StatesMeta,
+    )
+
+    entities = 4000
+    changes_per_commit = 2
+    commits = 10
+
+    def _batches(prefix):
+        """Yield the rows of each commit as linked ORM objects."""
+        metas = [
+            StatesMeta(entity_id=f"sensor.{prefix}_{idx}") for idx in range(entities)
+        ]
+        old_states = {}
+        for commit in range(commits):
+            rows = [*metas] if commit == 0 else []
+            for change in range(changes_per_commit):
+                for idx, meta in enumerate(metas):
+                    shared_attrs = (
+                        f'{{"commit":{commit},"change":{change},"idx":{idx}}}'
+                    )
+                    attrs = StateAttributes(shared_attrs=shared_attrs, hash=idx)
+                    state = States(
+                        state=str(change),
+                        last_updated_ts=time.time(),
+                        origin_idx=0,
+                    )
+                    if commit == 0:
+                        state.states_meta_rel = meta
+                    else:
+                        state.metadata_id = meta.metadata_id
+                    state.state_attributes = attrs
+                    if (old_state := old_states.get(idx)) is not None:
+                        if old_state.state_id is None:
+                            state.old_state = old_state
+                        else:
+                            state.old_state_id = old_state.state_id
+                    old_states[idx] = state
+                    rows.append(attrs)
+                    rows.append(state)
+            yield rows
+
+    engine = create_engine(hass.data[DATA_DB_URL])
+    Base.metadata.create_all(engine)
+    results = {}
+    try:
+        with Session(engine, expire_on_commit=False) as session:
+            rows_written = 0
+            start = timer()
+            for rows in _batches("session"):
+                session.add_all(rows)
+                session.commit()
+                rows_written += len(rows)
+            results["session"] = (rows_written, timer() - start)
+
+        bulk_insert_queue = BulkInsertQueue()
+        with Session(engine, expire_on_commit=False) as session:
+            rows_written = 0
+            start = timer()
+            for rows in _batches("bulk"):
+                for row in rows:
+                    bulk_insert_queue.add(row)
+                rows_written += bulk_insert_queue.write(session)
+                session.commit()
+            results["bulk"] = (rows_written, timer() - start)
+    finally:
+        engine.dispose()
+
+    for name, (rows_written, runtime) in results.items():
+        print(
+            f"{engine.dialect.name} {name}: {rows_written} rows in {runtime:.3f}s,"
+            f" {rows_written / runtime:.0f} rows/sec"
+        )
+    return results["bulk"][1]
+
+
+@benchmark
+async def statistics_reduce(hass):
+    """Reduce a year of synthetic hourly statistics and states.
+
+    Hourly statistics of 100 sensors are reduced to days and months, and
+    the time weighted average of a year of minutely states is calculated,
+    with the per row loops the array kernels replaced and with the pure
+    Python and NumPy kernels.
+    """
+    # pylint: disable=import-outside-toplevel
+    from unittest.mock import patch
+
+    from homeassistant.components.recorder import statistics, statistics_math
+    from homeassistant.util import dt as dt_util
+
+    types = {"last_reset", "max", "mean", "min", "state", "sum"}
+    year_start = dt_util.start_of_local_day(dt_util.now().replace(month=1, day=1))
+    year_start_ts = year_start.timestamp()
+    stats = {
+        f"sensor.test_{sensor}": [
+            {
+                "start": year_start_ts + hour * 3600,
+                "end": year_start_ts + (hour + 1) * 3600,
+                "mean": (hour + sensor) % 50 + 0.5,
+                "min": (hour + sensor) % 50,
+                "max": (hour + sensor) % 50 + 1.0,
+                "last_reset": None,
+                "state": float(hour),
+                "sum": float(hour * 2),
+            }
+            for hour in range(365 * 24)
+        ]
+        for sensor in range(100)
+    }
+    state_timestamps = [year_start_ts + minute * 60 for minute in range(365 * 24 * 60)]
+    state_values = [float(minute % 1000) for minute in range(365 * 24 * 60)]
+    year_end_ts = state_timestamps[-1] + 60
+
+    def _reduce_per_row(stats, factory):
+        """Reduce statistics with the per row loop the kernels replaced."""
+        same_period, period_start_end = factory()
+        result = {}
+        for statistic_id, stat_list in stats.items():
+            rows = result[statistic_id] = []
+            means, mins, maxes = [], [], []
+            prev_stat = stat_list[0]
+            fake_entry = {"start": stat_list[-1]["start"] + 31 * 86400}
+            for statistic in (*stat_list, fake_entry):
+                if not same_period(prev_stat["start"], statistic["start"]):
+                    start, end = period_start_end(prev_stat["start"])
+                    rows.append(
+                        {
+                            "start": start,
+                            "end": end,
+                            "mean": sum(means) / len(means) if means else None,
+                            "min": min(mins) if mins else None,
+                            "max": max(maxes) if maxes else None,
+                            "last_reset": prev_stat.get("last_reset"),
+                            "state": prev_stat.get("state"),
+                            "sum": prev_stat["sum"],
+                        }
+                    )
+                    means.clear()
+                    mins.clear()
+                    maxes.clear()
+                if (value := statistic.get("mean")) is not None:
+                    means.append(value)
+                if (value := statistic.get("min")) is not None:
+                    mins.append(value)
+                if (value := statistic.get("max")) is not None:
+                    maxes.append(value)
+                prev_stat = statistic
+        return result
+
+    def _time_weighted_average_per_row():
+        """Calculate the time weighted average with datetimes per state."""
+        start = dt_util.utc_from_timestamp(year_start_ts)
+        end = dt_util.utc_from_timestamp(year_end_ts)
+        accumulated = 0.0
+        old_value = old_start_time = None
+        for timestamp, value in zip(state_timestamps, state_values, strict=True):
+            start_time = max(dt_util.utc_from_timestamp(timestamp), start)
+            if old_start_time is None:
+                start = start_time
+            else:
+                accumulated += old_value * (start_time - old_start_time).total_seconds()
+            old_value = value
+            old_start_time = start_time
+        accumulated += old_value * (end - old_start_time).total_seconds()
+        return accumulated / (end - start).total_seconds()
+
+    def _time_weighted_average():
+        """Calculate the time weighted average with the kernel."""
+        statistics_math.time_weighted_average(
+            state_timestamps, state_values, year_start_ts, year_end_ts
+        )
+
+    def _run(name, reduce_day, reduce_month, time_weighted_average):
+        """Time each reduction."""
+        for kernel, func in (
+            ("reduce day", reduce_day),
+            ("reduce month", reduce_month),
+            ("time weighted average", time_weighted_average),
+        ):
+            start = timer()
+            func()
+            results[name] = results.get(name, 0.0) + (runtime := timer() - start)
+            print(f"{name} {kernel}: {runtime:.3f}s")
+
+    results = {}
+    _run(
+        "per row",
+        partial(_reduce_per_row, stats, statistics.reduce_day_ts_factory),
+        partial(_reduce_per_row, stats, statistics.reduce_month_ts_factory),
+        _time_weighted_average_per_row,
+    )
+    kernels = (
+        partial(statistics._reduce_statistics_per_day, stats, types),  # noqa: SLF001
+        partial(statistics._reduce_statistics_per_month, stats, types),  # noqa: SLF001
+        _time_weighted_average,
+    )
+    with patch.object(statistics_math, "np", None):
+        _run("python", *kernels)
+    if statistics_math.np is not None:
+        _run("numpy", *kernels)
+
+    for name, runtime in results.items():
+        print(f"{name}: {runtime:.3f}s")
+    return results.get("numpy", results["python"])
+
+
+@benchmark
+async def websocket_message_formats(hass):
+    """Encode subscribe_entities messages of 5000 entities in each format.
+
+    The initial message and 10000 state diffs are encoded as JSON text,
+    as JSON deflated per connection like permessage-deflate, as the
+    compressed messages of the websocket API and, when installed, as
+    MessagePack and CBOR, which prints the size and encode time of each.
+    """
+    # pylint: disable=import-outside-toplevel
+    import zlib
+
+    from homeassistant.components.websocket_api import messages
+    from homeassistant.helpers.json import json_bytes
+
+    states = [
+        core.State(
+            f"sensor.room_{idx}_temperature",
+            str(20 + idx % 10),
+            {
+                "state_class": "measurement",
+                "unit_of_measurement": "°C",
+                "device_class": "temperature",
+                "friendly_name": f"Room {idx} Temperature",
+            },
+        )
+        for idx in range(5000)
+    ]
+    init_message = {
+        "id": 1,
+        "type": "event",
+        "event": {
+            "a": {state.entity_id: state.as_compressed_state for state in states}
+        },
+    }
+    diff_messages = [
+        {
+            "id": 1,
+            "type": "event",
+            "event": {
+                "c": {
+                    states[idx % 5000].entity_id: {
+                        "+": {"s": str(idx % 30), "lc": 1700000000.0 + idx}
+                    }
+                }
+            },
+        }
+        for idx in range(10000)
+    ]
+
+    def _json():
+        return json_bytes
+
+    def _json_deflate():
+        compressor = zlib.compressobj(wbits=-zlib.MAX_WBITS)
+        return lambda message: compressor.compress(
+            json_bytes(message)
+        ) + compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def _json_compressed_messages():
+        compress_message = messages.message_compressor()
+        return lambda message: compress_message(json_bytes(message))
+
+    encoders = {
+        "json": _json,
+        "json deflate": _json_deflate,
+        "json compressed messages": _json_compressed_messages,
+    }
+    with suppress(ImportError):
+        import msgpack
+
+        encoders["msgpack"] = lambda: msgpack.packb
+    with suppress(ImportError):
+        import cbor2
+
+        encoders["cbor"] = lambda: cbor2.dumps
+
+    results = {}
+    for name, create_encoder in encoders.items():
+        encode = create_encoder()
+        start = timer()
+        init_size = len(encode(init_message))
+        diffs_size = sum(len(encode(message)) for message in diff_messages)
+        results[name] = runtime = timer() - start
+        print(
+            f"{name}: initial message {init_size} bytes,"
+            f" {diffs_size / len(diff_messages):.1f} bytes per diff, {runtime:.3f}s"
+        )
+    return results["json compressed messages"]
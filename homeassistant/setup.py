@@ -31,6 +31,7 @@ from .core import (
 from .exceptions import DependencyError, HomeAssistantError
 from .helpers import issue_registry as ir, singleton, translation
 from .helpers.issue_registry import IssueSeverity, async_create_issue
+from .helpers.startup_trace import TracePhases, get_startup_trace, startup_span
 from .helpers.typing import ConfigType
 from .util.async_ import create_eager_task
 from .util.hass_dict import HassKey
@@ -278,7 +279,8 @@ async def _async_setup_component(
     This method is a coroutine.
     """
     try:
-        integration = await loader.async_get_integration(hass, domain)
+        with startup_span(hass, domain, TracePhases.MANIFEST):
+            integration = await loader.async_get_integration(hass, domain)
     except loader.IntegrationNotFound:
         _log_error_setup_error(hass, domain, None, "Integration not found.")
         if not hass.config.safe_mode and hass.config_entries.async_entries(domain):
@@ -317,8 +319,9 @@ async def _async_setup_component(
             translation.async_load_integrations(hass, integration_set), loop=hass.loop
         )
     # Validate all dependencies exist and there are no circular dependencies
-    if not await integration.resolve_dependencies():
-        return False
+    with startup_span(hass, domain, TracePhases.MANIFEST):
+        if not await integration.resolve_dependencies():
+            return False
 
     # Process requirements as soon as possible, so we can import the component
     # without requiring imports to be in functions.
@@ -568,13 +571,20 @@ async def async_process_deps_reqs(
     elif integration.domain in processed:
         return
 
+    if (trace := get_startup_trace(hass)) is not None:
+        trace.async_add_dependencies(
+            integration.domain,
+            (*integration.dependencies, *integration.after_dependencies),
+        )
+
     if failed_deps := await _async_process_dependencies(hass, config, integration):
         raise DependencyError(failed_deps)
 
-    async with hass.timeout.async_freeze(integration.domain):
-        await requirements.async_get_integration_with_requirements(
-            hass, integration.domain
-        )
+    with startup_span(hass, integration.domain, TracePhases.REQUIREMENTS):
+        async with hass.timeout.async_freeze(integration.domain):
+            await requirements.async_get_integration_with_requirements(
+                hass, integration.domain
+            )
 
     processed.add(integration.domain)
 
@@ -770,8 +780,11 @@ def async_start_setup(
     try:
         yield
     finally:
-        time_taken = time.monotonic() - started
+        finished = time.monotonic()
+        time_taken = finished - started
         del setup_started[current]
+        if (trace := get_startup_trace(hass)) is not None:
+            trace.add_span(integration, phase, group, started, finished)
         group_setup_times = _setup_times(hass)[integration][group]
         # We may see the phase multiple times if there are multiple
         # platforms, but we only care about the longest time.
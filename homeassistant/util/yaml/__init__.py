@@ -5,6 +5,7 @@ from .dumper import dump, save_yaml
 from .input import UndefinedSubstitution, extract_inputs, substitute
 from .loader import (
     Secrets,
+    YamlCache,
     YamlTypeError,
     load_yaml,
     load_yaml_dict,
@@ -19,6 +20,7 @@ __all__ = [
     "dump",
     "save_yaml",
     "Secrets",
+    "YamlCache",
     "YamlTypeError",
     "load_yaml",
     "load_yaml_dict",
@@ -3,11 +3,14 @@
 from __future__ import annotations
 
 from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
 import fnmatch
+import hashlib
 from io import StringIO, TextIOWrapper
 import logging
 import os
 from pathlib import Path
+import time
 from typing import Any, TextIO, overload
 
 import yaml
@@ -36,6 +39,11 @@ JSON_TYPE = list | dict | str
 
 _LOGGER = logging.getLogger(__name__)
 
+# Files modified this close to when they were checked are hashed even if their
+# modification time and size didn't change since the modification time may be
+# too coarse to notice a change
+_MODIFIED_CHECK_MARGIN_NS = 2_000_000_000
+
 
 class YamlTypeError(HomeAssistantError):
     """Raised by load_yaml_dict if top level data is not a dict."""
@@ -108,6 +116,125 @@ class Secrets:
         return secrets
 
 
+@dataclass(slots=True)
+class _YamlDependencies:
+    """What a parsed YAML file depends on besides its own content."""
+
+    cache: YamlCache
+    files: list[str] = field(default_factory=list)
+    directories: dict[str, list[str]] = field(default_factory=dict)
+    secrets: dict[str, str] = field(default_factory=dict)
+    env_vars: dict[str, str] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class _CachedYaml:
+    """A parsed YAML file."""
+
+    data: JSON_TYPE | None
+    digest: bytes
+    dependencies: _YamlDependencies
+    stat: tuple[int, int] | None = None
+    checked_ns: int = 0
+
+    def is_unmodified(self, stat: os.stat_result | None) -> bool:
+        """Return if the file is unmodified according to its stat."""
+        return (
+            stat is not None
+            and self.stat == (stat.st_mtime_ns, stat.st_size)
+            and stat.st_mtime_ns < self.checked_ns - _MODIFIED_CHECK_MARGIN_NS
+        )
+
+    def set_stat(self, stat: os.stat_result | None) -> None:
+        """Store the stat of the file its content was checked with."""
+        self.stat = (stat.st_mtime_ns, stat.st_size) if stat is not None else None
+        self.checked_ns = time.time_ns()
+
+
+class YamlCache:
+    """Cache parsed YAML files between loads.
+
+    A file is parsed again when its content changed or when a file it
+    includes, an included directory, a secret or an environment variable
+    it uses changed. Files which include a changed file are parsed again
+    as well, everything else is copied from the cache.
+
+    The cache is only kept in memory, so only reloading the configuration
+    benefits from it; the first load after a start parses every file.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._files: dict[str, _CachedYaml] = {}
+
+    def load(self, fname: str, secrets: Secrets | None = None) -> JSON_TYPE | None:
+        """Load a YAML file, parsing it only if it changed."""
+        cached = self._files.get(fname)
+        stat = _stat(fname)
+
+        content: str | None = None
+        if cached is not None and not cached.is_unmodified(stat):
+            content = _read_yaml_file(fname)
+            if _digest(content) == cached.digest:
+                cached.set_stat(stat)
+            else:
+                cached = None
+
+        if cached is not None and self._dependencies_unchanged(
+            fname, cached.dependencies, secrets
+        ):
+            return _copy_yaml(cached.data)
+
+        if content is None:
+            content = _read_yaml_file(fname)
+        dependencies = _YamlDependencies(self)
+        with StringIO(content) as stream:
+            # The loaders use the name of the stream as the file name
+            stream.name = fname  # type: ignore[misc]
+            data = parse_yaml(stream, secrets, dependencies)
+        cached = _CachedYaml(data, _digest(content), dependencies)
+        cached.set_stat(stat)
+        self._files[fname] = cached
+        return _copy_yaml(data)
+
+    def _dependencies_unchanged(
+        self, fname: str, dependencies: _YamlDependencies, secrets: Secrets | None
+    ) -> bool:
+        """Return if the dependencies of a file are unchanged."""
+        for name, value in dependencies.env_vars.items():
+            try:
+                if _get_env_var(name) != value:
+                    return False
+            except HomeAssistantError:
+                return False
+        for secret, value in dependencies.secrets.items():
+            try:
+                if secrets is None or secrets.get(fname, secret) != value:
+                    return False
+            except HomeAssistantError:
+                return False
+        for loc, files in dependencies.directories.items():
+            if list(_find_files(loc, "*.yaml")) != files:
+                return False
+        for included in dependencies.files:
+            if (cached := self._files.get(included)) is None:
+                return False
+            if not cached.is_unmodified(stat := _stat(included)):
+                try:
+                    if _digest(_read_yaml_file(included)) != cached.digest:
+                        return False
+                except (FileNotFoundError, HomeAssistantError):
+                    return False
+                cached.set_stat(stat)
+            if not self._dependencies_unchanged(included, cached.dependencies, secrets):
+                return False
+        return True
+
+    def clear(self) -> None:
+        """Remove all files from the cache."""
+        self._files.clear()
+
+
 class _LoaderMixin:
     """Mixin class with extensions for YAML loader."""
 
@@ -128,7 +255,12 @@ class _LoaderMixin:
 class FastSafeLoader(FastestAvailableSafeLoader, _LoaderMixin):
     """The fastest available safe loader, either C or Python."""
 
-    def __init__(self, stream: Any, secrets: Secrets | None = None) -> None:
+    def __init__(
+        self,
+        stream: Any,
+        secrets: Secrets | None = None,
+        dependencies: _YamlDependencies | None = None,
+    ) -> None:
         """Initialize a safe line loader."""
         self.stream = stream
 
@@ -142,6 +274,7 @@ class FastSafeLoader(FastestAvailableSafeLoader, _LoaderMixin):
 
         super().__init__(stream)
         self.secrets = secrets
+        self.dependencies = dependencies
 
 
 class SafeLoader(FastSafeLoader):
@@ -178,10 +311,16 @@ class SafeLoader(FastSafeLoader):
 class PythonSafeLoader(yaml.SafeLoader, _LoaderMixin):
     """Python safe loader."""
 
-    def __init__(self, stream: Any, secrets: Secrets | None = None) -> None:
+    def __init__(
+        self,
+        stream: Any,
+        secrets: Secrets | None = None,
+        dependencies: _YamlDependencies | None = None,
+    ) -> None:
         """Initialize a safe line loader."""
         super().__init__(stream)
         self.secrets = secrets
+        self.dependencies = dependencies
 
 
 class SafeLineLoader(PythonSafeLoader):
@@ -219,13 +358,17 @@ type LoaderType = FastSafeLoader | PythonSafeLoader
 
 
 def load_yaml(
-    fname: str | os.PathLike[str], secrets: Secrets | None = None
+    fname: str | os.PathLike[str],
+    secrets: Secrets | None = None,
+    cache: YamlCache | None = None,
 ) -> JSON_TYPE | None:
     """Load a YAML file.
 
     If opening the file raises an OSError it will be wrapped in a HomeAssistantError,
     except for FileNotFoundError which will be re-raised.
     """
+    if cache is not None:
+        return cache.load(os.fspath(fname), secrets)
     try:
         with open(fname, encoding="utf-8") as conf_file:
             return parse_yaml(conf_file, secrets)
@@ -238,15 +381,80 @@ def load_yaml(
         raise HomeAssistantError(exc) from exc
 
 
+def _read_yaml_file(fname: str) -> str:
+    """Read a YAML file, raising the same errors as load_yaml."""
+    try:
+        with open(fname, encoding="utf-8") as conf_file:
+            return conf_file.read()
+    except UnicodeDecodeError as exc:
+        _LOGGER.error("Unable to read file %s: %s", fname, exc)
+        raise HomeAssistantError(exc) from exc
+    except FileNotFoundError:
+        raise
+    except OSError as exc:
+        raise HomeAssistantError(exc) from exc
+
+
+def _stat(fname: str) -> os.stat_result | None:
+    """Return the stat of a YAML file, reading the file reports errors."""
+    try:
+        return os.stat(fname)
+    except OSError:
+        return None
+
+
+def _digest(content: str) -> bytes:
+    """Return the digest of the content of a YAML file."""
+    return hashlib.sha1(content.encode("utf-8"), usedforsecurity=False).digest()
+
+
+def _copy_yaml(obj: Any) -> Any:
+    """Copy parsed YAML so changes to the copy don't change the cache.
+
+    Of the strings only the top level one is copied since including a file
+    sets its file reference, other strings are never changed.
+    """
+    if isinstance(obj, NodeStrClass):
+        return _copy_reference(NodeStrClass(obj), obj)
+    return _copy_containers(obj)
+
+
+def _copy_containers(obj: Any) -> Any:
+    """Copy the dicts and lists of parsed YAML."""
+    if isinstance(obj, dict):
+        return _copy_reference(
+            type(obj)((key, _copy_containers(value)) for key, value in obj.items()),
+            obj,
+        )
+    if isinstance(obj, list):
+        return _copy_reference(type(obj)(_copy_containers(value) for value in obj), obj)
+    return obj
+
+
+def _copy_reference[_T](copy: _T, obj: Any) -> _T:
+    """Copy the file reference information of an object."""
+    try:  # suppress is much slower
+        copy.__config_file__ = obj.__config_file__  # type: ignore[attr-defined]
+        copy.__line__ = obj.__line__  # type: ignore[attr-defined]
+    except AttributeError:
+        pass
+    return copy
+
+
 def load_yaml_dict(
-    fname: str | os.PathLike[str], secrets: Secrets | None = None
+    fname: str | os.PathLike[str],
+    secrets: Secrets | None = None,
+    cache: YamlCache | None = None,
 ) -> dict:
     """Load a YAML file and ensure the top level is a dict.
 
     Raise if the top level is not a dict.
     Return an empty dict if the file is empty.
     """
-    loaded_yaml = load_yaml(fname, secrets)
+    if cache is None:
+        loaded_yaml = load_yaml(fname, secrets)
+    else:
+        loaded_yaml = load_yaml(fname, secrets, cache)
     if loaded_yaml is None:
         loaded_yaml = {}
     if not isinstance(loaded_yaml, dict):
@@ -255,28 +463,32 @@ def load_yaml_dict(
 
 
 def parse_yaml(
-    content: str | TextIO | StringIO, secrets: Secrets | None = None
+    content: str | TextIO | StringIO,
+    secrets: Secrets | None = None,
+    dependencies: _YamlDependencies | None = None,
 ) -> JSON_TYPE:
     """Parse YAML with the fastest available loader."""
     if not HAS_C_LOADER:
-        return _parse_yaml_python(content, secrets)
+        return _parse_yaml_python(content, secrets, dependencies)
     try:
-        return _parse_yaml(FastSafeLoader, content, secrets)
+        return _parse_yaml(FastSafeLoader, content, secrets, dependencies)
     except yaml.YAMLError:
         # Loading failed, so we now load with the Python loader which has more
         # readable exceptions
         if isinstance(content, (StringIO, TextIO, TextIOWrapper)):
             # Rewind the stream so we can try again
             content.seek(0, 0)
-        return _parse_yaml_python(content, secrets)
+        return _parse_yaml_python(content, secrets, dependencies)
 
 
 def _parse_yaml_python(
-    content: str | TextIO | StringIO, secrets: Secrets | None = None
+    content: str | TextIO | StringIO,
+    secrets: Secrets | None = None,
+    dependencies: _YamlDependencies | None = None,
 ) -> JSON_TYPE:
     """Parse YAML with the python loader (this is very slow)."""
     try:
-        return _parse_yaml(PythonSafeLoader, content, secrets)
+        return _parse_yaml(PythonSafeLoader, content, secrets, dependencies)
     except yaml.YAMLError as exc:
         _LOGGER.error(str(exc))
         raise HomeAssistantError(exc) from exc
@@ -286,9 +498,13 @@ def _parse_yaml(
     loader: type[FastSafeLoader | PythonSafeLoader],
     content: str | TextIO,
     secrets: Secrets | None = None,
+    dependencies: _YamlDependencies | None = None,
 ) -> JSON_TYPE:
     """Load a YAML file."""
-    return yaml.load(content, Loader=lambda stream: loader(stream, secrets))  # type: ignore[arg-type]
+    return yaml.load(
+        content,
+        Loader=lambda stream: loader(stream, secrets, dependencies),  # type: ignore[arg-type]
+    )
 
 
 @overload
@@ -379,7 +595,7 @@ def _include_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     """
     fname = os.path.join(os.path.dirname(loader.get_name), node.value)
     try:
-        loaded_yaml = load_yaml(fname, loader.secrets)
+        loaded_yaml = _load_included_yaml(loader, fname)
         if loaded_yaml is None:
             loaded_yaml = NodeDictClass()
         return _add_reference(loaded_yaml, loader, node)
@@ -389,6 +605,22 @@ def _include_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
         ) from exc
 
 
+def _load_included_yaml(loader: LoaderType, fname: str) -> JSON_TYPE | None:
+    """Load an included YAML file, from the cache if the loader has one."""
+    if (dependencies := loader.dependencies) is None:
+        return load_yaml(fname, loader.secrets)
+    dependencies.files.append(fname)
+    return dependencies.cache.load(fname, loader.secrets)
+
+
+def _find_included_files(loader: LoaderType, loc: str) -> list[str]:
+    """Find the YAML files in an included directory."""
+    files = list(_find_files(loc, "*.yaml"))
+    if (dependencies := loader.dependencies) is not None:
+        dependencies.directories[loc] = files
+    return files
+
+
 def _is_file_valid(name: str) -> bool:
     """Decide if a file is valid."""
     return not name.startswith(".")
@@ -409,11 +641,11 @@ def _include_dir_named_yaml(loader: LoaderType, node: yaml.nodes.Node) -> NodeDi
     """Load multiple files from directory as a dictionary."""
     mapping = NodeDictClass()
     loc = os.path.join(os.path.dirname(loader.get_name), node.value)
-    for fname in _find_files(loc, "*.yaml"):
+    for fname in _find_included_files(loader, loc):
         filename = os.path.splitext(os.path.basename(fname))[0]
         if os.path.basename(fname) == SECRET_YAML:
             continue
-        loaded_yaml = load_yaml(fname, loader.secrets)
+        loaded_yaml = _load_included_yaml(loader, fname)
         if loaded_yaml is None:
             # Special case, an empty file included by !include_dir_named is treated
             # as an empty dictionary
@@ -429,10 +661,10 @@ def _include_dir_merge_named_yaml(
     """Load multiple files from directory as a merged dictionary."""
     mapping = NodeDictClass()
     loc = os.path.join(os.path.dirname(loader.get_name), node.value)
-    for fname in _find_files(loc, "*.yaml"):
+    for fname in _find_included_files(loader, loc):
         if os.path.basename(fname) == SECRET_YAML:
             continue
-        loaded_yaml = load_yaml(fname, loader.secrets)
+        loaded_yaml = _load_included_yaml(loader, fname)
         if isinstance(loaded_yaml, dict):
             mapping.update(loaded_yaml)
     return _add_reference_to_node_class(mapping, loader, node)
@@ -446,9 +678,9 @@ def _include_dir_list_yaml(
     loc = os.path.join(os.path.dirname(loader.get_name), node.value)
     return [
         loaded_yaml
-        for f in _find_files(loc, "*.yaml")
+        for f in _find_included_files(loader, loc)
         if os.path.basename(f) != SECRET_YAML
-        and (loaded_yaml := load_yaml(f, loader.secrets)) is not None
+        and (loaded_yaml := _load_included_yaml(loader, f)) is not None
     ]
 
 
@@ -459,10 +691,10 @@ def _include_dir_merge_list_yaml(
     """Load multiple files from directory as a merged list."""
     loc: str = os.path.join(os.path.dirname(loader.get_name), node.value)
     merged_list: list[JSON_TYPE] = []
-    for fname in _find_files(loc, "*.yaml"):
+    for fname in _find_included_files(loader, loc):
         if os.path.basename(fname) == SECRET_YAML:
             continue
-        loaded_yaml = load_yaml(fname, loader.secrets)
+        loaded_yaml = _load_included_yaml(loader, fname)
         if isinstance(loaded_yaml, list):
             merged_list.extend(loaded_yaml)
     return _add_reference(merged_list, loader, node)
@@ -527,15 +759,23 @@ def _handle_scalar_tag(
 
 def _env_var_yaml(loader: LoaderType, node: yaml.nodes.Node) -> str:
     """Load environment variables and embed it into the configuration YAML."""
-    args = node.value.split()
+    value = _get_env_var(node.value)
+    if (dependencies := loader.dependencies) is not None:
+        dependencies.env_vars[node.value] = value
+    return value
+
+
+def _get_env_var(name: str) -> str:
+    """Return the value of an environment variable or its default."""
+    args = name.split()
 
     # Check for a default value
     if len(args) > 1:
         return os.getenv(args[0], " ".join(args[1:]))
     if args[0] in os.environ:
         return os.environ[args[0]]
-    _LOGGER.error("Environment variable %s not defined", node.value)
-    raise HomeAssistantError(node.value)
+    _LOGGER.error("Environment variable %s not defined", name)
+    raise HomeAssistantError(name)
 
 
 def secret_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
@@ -543,7 +783,10 @@ def secret_yaml(loader: LoaderType, node: yaml.nodes.Node) -> JSON_TYPE:
     if loader.secrets is None:
         raise HomeAssistantError("Secrets not supported in this YAML file")
 
-    return loader.secrets.get(loader.get_name, node.value)
+    value = loader.secrets.get(loader.get_name, node.value)
+    if (dependencies := loader.dependencies) is not None:
+        dependencies.secrets[node.value] = value
+    return value
 
 
 def add_constructor(tag: Any, constructor: Any) -> None:
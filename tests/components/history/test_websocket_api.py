@@ -403,6 +403,123 @@ async def test_history_during_period_significant_domain(
     assert "lc" not in sensor_test_history[0]  # skipped if the same a last_updated (lu)
 
 
+@pytest.mark.parametrize("no_attributes", [True, False])
+async def test_history_during_period_chunked(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+    no_attributes: bool,
+) -> None:
+    """Test history_during_period sends the same history in chunks."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    for state in ("on", "off", "on"):
+        for entity_id in ("sensor.one", "sensor.two", "sensor.three"):
+            hass.states.async_set(entity_id, state, attributes={"any": "attr"})
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    request = {
+        "type": "history/history_during_period",
+        "start_time": now.isoformat(),
+        "entity_ids": ["sensor.one", "sensor.two", "sensor.three"],
+        "no_attributes": no_attributes,
+    }
+    await client.send_json({"id": 1, **request})
+    response = await client.receive_json()
+    assert response["success"]
+    expected = response["result"]
+    assert len(expected) == 3
+
+    with (
+        patch.object(websocket_api, "HISTORY_CHUNK_STATES", 4),
+        # Wait for the writer to send every chunk before sending the next one
+        patch.object(websocket_api, "MAX_PENDING_HISTORY_CHUNK_MSG", 0),
+    ):
+        await client.send_json({"id": 2, "chunked": True, **request})
+        response = await client.receive_json()
+        assert response["success"]
+        assert response["result"] is None
+
+        chunks = []
+        while True:
+            response = await client.receive_json()
+            assert response["type"] == "event"
+            assert response["id"] == 2
+            if response["event"].get("done"):
+                assert response["event"]["states"] == {}
+                break
+            chunks.append(response["event"]["states"])
+
+    # Entities are never split across chunks
+    assert [len(chunk) for chunk in chunks] == [2, 1]
+    assert {
+        entity_id: states for chunk in chunks for entity_id, states in chunk.items()
+    } == expected
+
+    # Empty periods send the done message right away
+    await client.send_json(
+        {
+            "id": 3,
+            "chunked": True,
+            **request,
+            "start_time": (now + timedelta(hours=1)).isoformat(),
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    response = await client.receive_json()
+    assert response["event"] == {"states": {}, "done": True}
+
+
+async def test_history_during_period_chunked_error(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test a chunked history_during_period sends an error if fetching fails."""
+    now = dt_util.utcnow()
+
+    await async_setup_component(hass, "history", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "on")
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    with patch.object(
+        websocket_api.history,
+        "get_significant_states_chunk_with_session",
+        side_effect=ValueError,
+    ):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/history_during_period",
+                "start_time": now.isoformat(),
+                "entity_ids": ["sensor.one"],
+                "chunked": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+
+    assert response["id"] == 1
+    assert response["event"] == {
+        "states": {},
+        "done": True,
+        "error": {"code": "unknown_error", "message": "Error fetching the history"},
+    }
+
+    # The stream is no longer subscribed
+    await client.send_json({"id": 2, "type": "unsubscribe_events", "subscription": 1})
+    response = await client.receive_json()
+    assert not response["success"]
+
+
 async def test_history_during_period_bad_start_time(
     hass: HomeAssistant, recorder_mock: Recorder, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -14,7 +14,8 @@ from homeassistant.components import logbook, recorder
 from homeassistant.components.automation import ATTR_SOURCE, EVENT_AUTOMATION_TRIGGERED
 from homeassistant.components.logbook import websocket_api
 from homeassistant.components.recorder import Recorder
-from homeassistant.components.recorder.util import get_instance
+from homeassistant.components.recorder.db_schema import Events, States
+from homeassistant.components.recorder.util import get_instance, session_scope
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.components.websocket_api import TYPE_RESULT
 from homeassistant.const import (
@@ -292,6 +293,120 @@ async def test_get_events(
     assert isinstance(results[0]["when"], float)
 
 
+async def test_get_events_paged(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test paging through logbook get_events."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+
+    for idx in range(5):
+        hass.states.async_set("light.kitchen", STATE_ON if idx % 2 else STATE_OFF)
+        await hass.async_block_till_done()
+
+    await async_wait_recording_done(hass)
+    client = await hass_ws_client()
+
+    await client.send_json(
+        {
+            "id": 1,
+            "type": "logbook/get_events",
+            "start_time": now.isoformat(),
+            "entity_ids": ["light.kitchen"],
+        }
+    )
+    response = await client.receive_json()
+    assert response["success"]
+    all_results = response["result"]
+    assert len(all_results) == 4
+
+    paged_results = []
+    after = None
+    for msg_id in range(2, 20):
+        await client.send_json(
+            {
+                "id": msg_id,
+                "type": "logbook/get_events",
+                "start_time": now.isoformat(),
+                "entity_ids": ["light.kitchen"],
+                "page_size": 2,
+                **({"after": after} if after else {}),
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        paged_results.extend(response["result"]["events"])
+        if (after := response["result"]["next_page"]) is None:
+            break
+
+    assert after is None
+    assert paged_results == all_results
+
+
+async def test_get_events_paged_state_and_event_same_key(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test paging through a state and an event with the same time fired and id."""
+    now = dt_util.utcnow()
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await async_recorder_block_till_done(hass)
+
+    hass.states.async_set("light.kitchen", STATE_OFF)
+    await hass.async_block_till_done()
+    hass.states.async_set("light.kitchen", STATE_ON)
+    hass.bus.async_fire(
+        logbook.EVENT_LOGBOOK_ENTRY, {"name": "Alarm", "message": "is triggered"}
+    )
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        state = session.query(States).order_by(States.state_id.desc()).first()
+        event = session.query(Events).order_by(Events.event_id.desc()).first()
+        state.state_id = event.event_id = 1000
+        event.time_fired_ts = state.last_updated_ts
+
+    client = await hass_ws_client()
+    request = {"type": "logbook/get_events", "start_time": now.isoformat()}
+    await client.send_json({"id": 1, **request})
+    response = await client.receive_json()
+    assert response["success"]
+    all_results = response["result"]
+    state_result = {"entity_id": "light.kitchen", "state": STATE_ON, "when": ANY}
+    assert state_result in all_results
+
+    paged_results = []
+    after = None
+    for msg_id in range(2, 20):
+        await client.send_json(
+            {
+                "id": msg_id,
+                **request,
+                "page_size": 1,
+                **({"after": after} if after else {}),
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        paged_results.extend(response["result"]["events"])
+        if (after := response["result"]["next_page"]) is None:
+            break
+
+    assert len(paged_results) == len(all_results)
+    assert state_result in paged_results
+    assert any(result.get("name") == "Alarm" for result in paged_results)
+
+
 async def test_get_events_entities_filtered_away(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -13,7 +13,7 @@ import pytest
 
 from homeassistant.components import mqtt
 from homeassistant.components.mqtt.models import MessageCallbackType
-from homeassistant.components.mqtt.util import EnsureJobAfterCooldown
+from homeassistant.components.mqtt.util import EnsureJobAfterCooldown, TopicTrie
 from homeassistant.config_entries import ConfigEntryDisabler, ConfigEntryState
 from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import CoreState, HomeAssistant
@@ -373,3 +373,63 @@ async def test_waiting_for_client_with_disabled_entry(
 
     # returns False because entry is disabled
     assert not await mqtt.async_wait_for_mqtt_client(hass)
+
+
+@pytest.mark.parametrize(
+    ("topic_filter", "topic", "matches"),
+    [
+        ("test/state", "test/state", True),
+        ("test/state", "test/state/sub", False),
+        ("test/+", "test/state", True),
+        ("test/+", "test", False),
+        ("test/+", "test/state/sub", False),
+        ("test/+/sub", "test/state/sub", True),
+        ("test/+/sub", "test/state/other", False),
+        ("test/#", "test", True),
+        ("test/#", "test/state", True),
+        ("test/#", "test/state/sub", True),
+        ("test/#", "other/state", False),
+        ("+/+", "/test", True),
+        ("+/state", "/test", False),
+        ("#", "test/state", True),
+        ("#", "$SYS/broker", False),
+        ("+/broker", "$SYS/broker", False),
+        ("$SYS/#", "$SYS/broker", True),
+        ("$SYS/+", "$SYS/broker", True),
+    ],
+)
+def test_topic_trie_match(topic_filter: str, topic: str, matches: bool) -> None:
+    """Test matching topics against topic filters in the topic trie."""
+    trie: TopicTrie[str] = TopicTrie()
+    trie.add(topic_filter, "value")
+    assert trie.match(topic) == (["value"] if matches else [])
+
+
+def test_topic_trie_add_remove() -> None:
+    """Test adding and removing values from the topic trie."""
+    trie: TopicTrie[str] = TopicTrie()
+    trie.add("test/+/state", "one")
+    trie.add("test/+/state", "two")
+    trie.add("test/#", "three")
+    trie.add("test/+/state", "two")
+    assert len(trie) == 3
+    assert "test/+/state" in trie
+    assert "test/+" not in trie
+    assert sorted(trie.match("test/device/state")) == ["one", "three", "two"]
+
+    trie.remove("test/+/state", "one")
+    assert sorted(trie.match("test/device/state")) == ["three", "two"]
+    assert "test/+/state" in trie
+
+    trie.remove("test/+/state", "two")
+    assert trie.match("test/device/state") == ["three"]
+    assert "test/+/state" not in trie
+
+    with pytest.raises(KeyError):
+        trie.remove("test/+/state", "two")
+    with pytest.raises(KeyError):
+        trie.remove("other/+", "one")
+
+    trie.clear()
+    assert len(trie) == 0
+    assert trie.match("test/device/state") == []
@@ -27,6 +27,10 @@ from homeassistant.components.recorder import (
     migration,
     statistics,
 )
+from homeassistant.components.recorder.compression import (
+    SQLITE_DECOMPRESS_FUNCTION,
+    sqlite_decompress,
+)
 from homeassistant.components.recorder.db_schema import (
     Events,
     EventTypes,
@@ -420,6 +424,13 @@ def create_engine_test_for_schema_version_postfix(
             )
         )
         session.commit()
+    if engine.dialect.name == "sqlite":
+        # An in-memory database keeps using this connection, which is opened
+        # before the recorder can set up new connections
+        with engine.connect() as connection:
+            connection.connection.driver_connection.create_function(
+                SQLITE_DECOMPRESS_FUNCTION, 1, sqlite_decompress, deterministic=True
+            )
     return engine
 
 
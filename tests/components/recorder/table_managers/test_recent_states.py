@@ -0,0 +1,140 @@
+"""Test recent states manager."""
+
+from unittest.mock import patch
+
+from homeassistant.components.recorder.db_schema import States
+from homeassistant.components.recorder.table_managers.recent_states import (
+    RecentStateRow,
+    RecentStatesManager,
+)
+
+
+def _add_states(
+    manager: RecentStatesManager, entity_id: str, timestamps: list[float]
+) -> None:
+    """Add committed states."""
+    for timestamp in timestamps:
+        manager.add_pending(
+            entity_id, States(state=str(timestamp), last_updated_ts=timestamp)
+        )
+    manager.post_commit_pending()
+
+
+def _get_rows(
+    manager: RecentStatesManager, entity_id: str, start_time_ts: float
+) -> list[RecentStateRow] | None:
+    """Get the rows after a start time."""
+    return manager.get_rows(
+        entity_id, 1, start_time_ts, None, None, True, True, False, False
+    )
+
+
+def test_recent_states_get_rows() -> None:
+    """Test rows are only returned when the period is in memory."""
+    manager = RecentStatesManager()
+    _add_states(manager, "sensor.test", [10.0, 20.0, 30.0])
+
+    assert _get_rows(manager, "sensor.test", 10.0) is None
+    assert _get_rows(manager, "sensor.other", 15.0) is None
+    assert _get_rows(manager, "sensor.test", 15.0) == [
+        RecentStateRow(1, "10.0", 0, None, None),
+        RecentStateRow(1, "20.0", 20.0, None, None),
+        RecentStateRow(1, "30.0", 30.0, None, None),
+    ]
+    assert manager.get_rows(
+        "sensor.test", 1, 10.0, 30.0, None, False, True, False, False
+    ) == [RecentStateRow(1, "20.0", 20.0, None, None)]
+    # The start time state is limited to states after start_time_state_after_ts
+    assert manager.get_rows(
+        "sensor.test", 1, 25.0, None, 25.0, True, True, False, False
+    ) == [RecentStateRow(1, "30.0", 30.0, None, None)]
+
+    # Uncommitted states are not returned
+    manager.add_pending("sensor.test", States(state="40.0", last_updated_ts=40.0))
+    assert len(_get_rows(manager, "sensor.test", 15.0)) == 3
+    manager.reset()
+    assert _get_rows(manager, "sensor.test", 15.0) is None
+
+
+def test_recent_states_last_reported() -> None:
+    """Test the last reported timestamp of the last committed state is updated."""
+    manager = RecentStatesManager()
+    _add_states(manager, "sensor.test", [10.0, 20.0])
+    manager.update_pending_last_reported("sensor.test", 25.0)
+    manager.update_pending_last_reported("sensor.other", 25.0)
+    _add_states(manager, "sensor.test", [30.0])
+
+    assert manager.get_rows(
+        "sensor.test", 1, 15.0, None, None, False, True, False, True
+    ) == [
+        RecentStateRow(1, "20.0", 20.0, None, 25.0),
+        RecentStateRow(1, "30.0", 30.0, None, None),
+    ]
+
+
+def test_recent_states_eviction() -> None:
+    """Test states are evicted when an entity is full."""
+    manager = RecentStatesManager()
+    with (
+        patch(
+            "homeassistant.components.recorder.table_managers.recent_states.RECENT_STATES_MAX_ROWS",
+            4,
+        ),
+        patch(
+            "homeassistant.components.recorder.table_managers.recent_states.RECENT_STATES_EVICT_ROWS",
+            2,
+        ),
+    ):
+        _add_states(manager, "sensor.test", [10.0, 20.0, 30.0, 40.0, 50.0])
+
+    assert _get_rows(manager, "sensor.test", 25.0) is None
+    assert len(_get_rows(manager, "sensor.test", 35.0)) == 3
+
+    # A state older than the last state starts over
+    _add_states(manager, "sensor.test", [45.0])
+    assert _get_rows(manager, "sensor.test", 46.0) == [
+        RecentStateRow(1, "45.0", 0, None, None)
+    ]
+    assert _get_rows(manager, "sensor.test", 44.0) is None
+
+
+def test_recent_states_total_rows_eviction() -> None:
+    """Test the least recently used entities are evicted when all are full."""
+    manager = RecentStatesManager()
+    with patch(
+        "homeassistant.components.recorder.table_managers.recent_states.RECENT_STATES_MAX_TOTAL_ROWS",
+        5,
+    ):
+        _add_states(manager, "sensor.one", [10.0, 20.0])
+        _add_states(manager, "sensor.two", [10.0, 20.0])
+        # Reading sensor.one makes sensor.two the least recently used
+        assert _get_rows(manager, "sensor.one", 15.0) is not None
+        _add_states(manager, "sensor.three", [10.0, 20.0])
+
+        assert _get_rows(manager, "sensor.two", 15.0) is None
+        assert _get_rows(manager, "sensor.one", 15.0) is not None
+        assert _get_rows(manager, "sensor.three", 15.0) is not None
+
+        # Evicted states no longer count towards the limit
+        manager.evict_entity_ids({"sensor.three"})
+        _add_states(manager, "sensor.two", [10.0, 20.0])
+        assert _get_rows(manager, "sensor.one", 15.0) is not None
+        assert _get_rows(manager, "sensor.two", 15.0) is not None
+
+
+def test_recent_states_evict_before() -> None:
+    """Test states are evicted before they are purged."""
+    manager = RecentStatesManager()
+    _add_states(manager, "sensor.test", [10.0, 20.0, 30.0])
+    _add_states(manager, "sensor.other", [10.0])
+
+    manager.evict_before(20.0, lambda entity_id: entity_id == "sensor.test")
+    assert _get_rows(manager, "sensor.test", 15.0) is None
+    assert len(_get_rows(manager, "sensor.test", 25.0)) == 2
+    assert _get_rows(manager, "sensor.other", 15.0) is not None
+
+    manager.evict_before(20.0)
+    assert _get_rows(manager, "sensor.other", 15.0) is None
+
+    manager.evict_entity_ids({"sensor.test"})
+    assert _get_rows(manager, "sensor.test", 25.0) is None
@@ -0,0 +1,68 @@
+"""Test state attributes manager."""
+
+from unittest.mock import Mock
+
+from homeassistant.components.recorder.db_schema import StateAttributes
+from homeassistant.components.recorder.table_managers.state_attributes import (
+    StateAttributesManager,
+)
+
+
+def _add_attributes(
+    manager: StateAttributesManager, shared_attrs: str, id_: int
+) -> None:
+    """Add and commit attributes referenced by two states."""
+    db_state_attributes = StateAttributes(shared_attrs=shared_attrs)
+    manager.add_pending(db_state_attributes, shared_attrs)
+    manager.add_pending_reference(shared_attrs)
+    manager.add_pending_reference(shared_attrs)
+    db_state_attributes.attributes_id = id_
+    manager.post_commit_pending()
+
+
+def test_state_attributes_reference_counts() -> None:
+    """Test the references to attributes created by the recorder are counted."""
+    manager = StateAttributesManager(Mock())
+    _add_attributes(manager, '{"a":1}', 1)
+    _add_attributes(manager, '{"b":2}', 2)
+    manager.add_reference(2)
+    # Attributes which existed before aren't counted
+    manager.add_reference(3)
+
+    manager.remove_references([1, 1, 2, 2, 3, None])
+    assert manager.split_unused({1, 2, 3}) == ({1}, {3})
+
+    # Removed references are kept when the purge is rolled back
+    manager.discard_removed_references()
+    assert manager.split_unused({1, 2, 3}) == (set(), {3})
+
+    manager.remove_references([1, 1, 2, 2])
+    manager.post_commit_removed_references()
+    manager.remove_references([2])
+    assert manager.split_unused({1, 2}) == ({2}, {1})
+    manager.post_commit_removed_references()
+    assert manager.split_unused({1, 2}) == (set(), {1, 2})
+
+
+def test_state_attributes_reference_counts_reset() -> None:
+    """Test the references are unknown after a reset."""
+    manager = StateAttributesManager(Mock())
+    _add_attributes(manager, '{"a":1}', 1)
+    manager.add_pending_reference('{"b":2}')
+    manager.reset()
+
+    manager.remove_references([1, 1])
+    assert manager.split_unused({1}) == (set(), {1})
+
+
+def test_state_attributes_remove_reference_counts() -> None:
+    """Test removing references counted per attributes id."""
+    manager = StateAttributesManager(Mock())
+    _add_attributes(manager, '{"a":1}', 1)
+    _add_attributes(manager, '{"b":2}', 2)
+
+    manager.remove_reference_counts({1: 2, 2: 1, 3: 5})
+    assert manager.split_unused({1, 2, 3}) == ({1}, {3})
+    manager.post_commit_removed_references()
+    manager.remove_references([2])
+    assert manager.split_unused({1, 2}) == ({2}, {1})
@@ -0,0 +1,75 @@
+"""Test the recorder commit scheduler."""
+
+from homeassistant.components.recorder.commit_scheduler import (
+    COMMIT_BACKLOG_THRESHOLD,
+    IDLE_COMMITS_BEFORE_GROW,
+    MIN_AVAILABLE_MEMORY_FOR_COMMIT_BATCH,
+    CommitIntervalReason,
+    CommitScheduler,
+)
+
+PLENTY_OF_MEMORY = MIN_AVAILABLE_MEMORY_FOR_COMMIT_BATCH * 4
+
+
+def _available_memory() -> int:
+    """Return plenty of available memory."""
+    return PLENTY_OF_MEMORY
+
+
+def test_commit_scheduler_backlog() -> None:
+    """Test the interval grows with the backlog and shrinks back."""
+    scheduler = CommitScheduler(5)
+    assert scheduler.commit_finished(0.01, 100, 0, _available_memory) == 5
+    assert scheduler.reason is CommitIntervalReason.CONFIGURED
+
+    backlog = COMMIT_BACKLOG_THRESHOLD
+    assert scheduler.commit_finished(0.01, 100, backlog, _available_memory) == 10
+    assert scheduler.commit_finished(0.01, 100, backlog, _available_memory) == 20
+    # Capped at the maximum
+    assert scheduler.commit_finished(0.01, 100, backlog, _available_memory) == 20
+    assert scheduler.reason is CommitIntervalReason.BACKLOG
+    assert scheduler.as_dict() == {
+        "configured": 5,
+        "current": 20,
+        "reason": "backlog",
+        "last_commit_duration": 0.01,
+        "last_commit_writes": 100,
+        "last_backlog": backlog,
+        "last_available_memory": PLENTY_OF_MEMORY,
+    }
+
+    assert scheduler.commit_finished(0.01, 100, 0, _available_memory) == 10
+    assert scheduler.reason is CommitIntervalReason.BACKLOG
+    assert scheduler.commit_finished(0.01, 100, 0, _available_memory) == 5
+    assert scheduler.reason is CommitIntervalReason.CONFIGURED
+
+
+def test_commit_scheduler_slow_commit() -> None:
+    """Test the interval grows when commits are slow."""
+    scheduler = CommitScheduler(5)
+    assert scheduler.commit_finished(1.0, 100, 0, _available_memory) == 10
+    assert scheduler.reason is CommitIntervalReason.SLOW_COMMIT
+    # The commit is now a small enough share of the interval
+    assert scheduler.commit_finished(0.9, 100, 0, _available_memory) == 5
+
+
+def test_commit_scheduler_idle() -> None:
+    """Test the interval grows after several idle commits."""
+    scheduler = CommitScheduler(5)
+    for _ in range(IDLE_COMMITS_BEFORE_GROW - 1):
+        assert scheduler.commit_finished(0.01, 1, 0, _available_memory) == 5
+    assert scheduler.commit_finished(0.01, 1, 0, _available_memory) == 10
+    assert scheduler.reason is CommitIntervalReason.IDLE
+    assert scheduler.commit_finished(0.01, 100, 0, _available_memory) == 5
+
+
+def test_commit_scheduler_low_memory() -> None:
+    """Test the interval drops to the minimum when memory is low."""
+    scheduler = CommitScheduler(5)
+    backlog = COMMIT_BACKLOG_THRESHOLD
+    assert scheduler.commit_finished(0.01, 100, backlog, lambda: 0) == 1
+    assert scheduler.reason is CommitIntervalReason.LOW_MEMORY
+    assert scheduler.last_available_memory == 0
+
+    assert scheduler.commit_finished(0.01, 100, 0, _available_memory) == 5
+    assert scheduler.reason is CommitIntervalReason.CONFIGURED
@@ -0,0 +1,106 @@
+"""Test compressed storage of shared attributes and event data."""
+
+import pytest
+from sqlalchemy import select
+
+from homeassistant.components.recorder import CONF_COMPRESSED_STORAGE, get_instance
+from homeassistant.components.recorder.compression import (
+    compress_shared_json,
+    decompress_shared_json,
+    shared_json_text,
+)
+from homeassistant.components.recorder.db_schema import (
+    EVENT_DATA_JSON,
+    SHARED_ATTRS_JSON,
+    EventData,
+    StateAttributes,
+)
+from homeassistant.components.recorder.history import get_significant_states
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+ATTRIBUTES = {
+    "state_class": "measurement",
+    "unit_of_measurement": "°C",
+    "device_class": "temperature",
+    "friendly_name": "Living Room Temperature",
+}
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def test_compress_shared_json() -> None:
+    """Test compressing and decompressing shared JSON."""
+    shared_json = (
+        b'{"state_class":"measurement","unit_of_measurement":"\xc2\xb0C",'
+        b'"device_class":"temperature","friendly_name":"Living Room Temperature"}'
+    )
+    compressed = compress_shared_json(shared_json)
+    assert isinstance(compressed, bytes)
+    assert len(compressed) < len(shared_json) / 2
+    assert decompress_shared_json(compressed) == shared_json
+    assert shared_json_text(compressed) == shared_json.decode()
+
+    # JSON which doesn't get smaller is kept as text
+    assert compress_shared_json(b"{}") == "{}"
+    assert shared_json_text("{}") == "{}"
+
+
+async def test_compressed_storage(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test shared attributes and event data are stored compressed."""
+    instance = await async_setup_recorder_instance(
+        hass, {CONF_COMPRESSED_STORAGE: True}
+    )
+    start = dt_util.utcnow()
+    hass.states.async_set("sensor.temperature", "20", ATTRIBUTES)
+    hass.bus.async_fire("custom_event", {"entity_id": "sensor.temperature"})
+    await async_wait_recording_done(hass)
+
+    # The attributes are deduplicated against the compressed rows
+    instance.state_attributes_manager.reset()
+    hass.states.async_set("sensor.temperature", "21", ATTRIBUTES)
+    await async_wait_recording_done(hass)
+
+    def _check() -> None:
+        with session_scope(hass=hass, read_only=True) as session:
+            shared_attrs = session.execute(
+                select(StateAttributes.shared_attrs).where(
+                    StateAttributes.shared_attrs != "{}"
+                )
+            ).all()
+            assert len(shared_attrs) == 1
+            assert isinstance(shared_attrs[0][0], bytes)
+            assert session.execute(
+                select(SHARED_ATTRS_JSON["friendly_name"].as_string()).where(
+                    StateAttributes.shared_attrs != "{}"
+                )
+            ).scalar() == ("Living Room Temperature")
+            assert (
+                "sensor.temperature"
+                in session.execute(
+                    select(EVENT_DATA_JSON["entity_id"].as_string()).where(
+                        EventData.shared_data.is_not(None)
+                    )
+                ).scalars()
+            )
+
+        states = get_significant_states(hass, start, entity_ids=["sensor.temperature"])
+        assert [state.attributes for state in states["sensor.temperature"]] == [
+            ATTRIBUTES,
+            ATTRIBUTES,
+        ]
+
+    await get_instance(hass).async_add_executor_job(_check)
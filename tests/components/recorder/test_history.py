@@ -5,7 +5,7 @@ from __future__ import annotations
 from copy import copy
 from datetime import datetime, timedelta
 import json
-from unittest.mock import sentinel
+from unittest.mock import patch, sentinel
 
 from freezegun import freeze_time
 import pytest
@@ -1014,3 +1014,112 @@ async def test_get_last_state_changes_with_non_existent_entity_ids_returns_empty
 ) -> None:
     """Test get_last_state_changes returns an empty dict when entities not in the db."""
     assert history.get_last_state_changes(hass, 1, "nonexistent.entity") == {}
+
+
+@pytest.mark.parametrize("include_start_time_state", [True, False])
+@pytest.mark.parametrize("significant_changes_only", [True, False])
+@pytest.mark.parametrize("minimal_response", [True, False])
+@pytest.mark.parametrize("with_end_time", [True, False])
+async def test_get_significant_states_from_recent_states(
+    hass: HomeAssistant,
+    include_start_time_state: bool,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    with_end_time: bool,
+) -> None:
+    """Test recent states in memory give the same history as the database."""
+    instance = recorder.get_instance(hass)
+    start = dt_util.utcnow() + timedelta(minutes=1)
+    with freeze_time(start) as freezer:
+        hass.states.async_set("sensor.test", "1")
+        hass.states.async_set("media_player.test", "on")
+        freezer.tick(10)
+        hass.states.async_set("sensor.test", "2")
+        hass.states.async_set("sensor.test", "2", {"changed": True})
+        hass.states.async_set("media_player.test", "on", {"changed": True})
+        freezer.tick(10)
+        hass.states.async_set("sensor.test", "3")
+        hass.states.async_set("media_player.test", "off")
+        freezer.tick(10)
+        hass.states.async_set("sensor.test", "4")
+    await async_wait_recording_done(hass)
+
+    def _get_significant_states() -> dict[str, list[State | dict]]:
+        return history.get_significant_states(
+            hass,
+            start + timedelta(seconds=5),
+            start + timedelta(seconds=25) if with_end_time else None,
+            ["sensor.test", "media_player.test", "sensor.unknown"],
+            None,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            True,
+            True,
+        )
+
+    with patch(
+        "homeassistant.components.recorder.history.modern.execute_stmt_lambda_element",
+        side_effect=AssertionError("Database queried"),
+    ):
+        recent = await instance.async_add_executor_job(_get_significant_states)
+
+    with patch.object(instance.recent_states_manager, "get_rows", return_value=None):
+        from_database = await instance.async_add_executor_job(_get_significant_states)
+    assert recent == from_database
+    assert recent["sensor.test"]
+
+
+@pytest.mark.parametrize("include_start_time_state", [True, False])
+@pytest.mark.parametrize("descending", [True, False])
+@pytest.mark.parametrize("limit", [None, 1])
+async def test_state_changes_during_period_from_recent_states(
+    hass: HomeAssistant,
+    include_start_time_state: bool,
+    descending: bool,
+    limit: int | None,
+) -> None:
+    """Test recent states in memory give the same state changes as the database."""
+    instance = recorder.get_instance(hass)
+    start = dt_util.utcnow() + timedelta(minutes=1)
+    with freeze_time(start) as freezer:
+        hass.states.async_set("sensor.test", "1")
+        freezer.tick(10)
+        hass.states.async_set("sensor.test", "2")
+        await async_wait_recording_done(hass)
+        freezer.tick(1)
+        # Reported states update the last committed state
+        hass.states.async_set("sensor.test", "2")
+        freezer.tick(10)
+        hass.states.async_set("sensor.test", "3")
+    await async_wait_recording_done(hass)
+
+    def _state_changes_during_period() -> list[tuple]:
+        return [
+            (state.state, state.last_updated, state.last_changed, state.last_reported)
+            for state in history.state_changes_during_period(
+                hass,
+                start + timedelta(seconds=5),
+                None,
+                "sensor.test",
+                True,
+                descending,
+                limit,
+                include_start_time_state,
+            )["sensor.test"]
+        ]
+
+    with patch(
+        "homeassistant.components.recorder.history.modern.execute_stmt_lambda_element",
+        side_effect=AssertionError("Database queried"),
+    ):
+        recent = await instance.async_add_executor_job(_state_changes_during_period)
+    with patch.object(instance.recent_states_manager, "get_rows", return_value=None):
+        from_database = await instance.async_add_executor_job(
+            _state_changes_during_period
+        )
+    assert recent == from_database
+    if limit is None:
+        assert ("2", start + timedelta(seconds=11)) in [
+            (state, last_reported) for state, _, _, last_reported in recent
+        ]
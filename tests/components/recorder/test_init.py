@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import asyncio
 from collections.abc import Generator
+from contextlib import AbstractContextManager
 from datetime import datetime, timedelta
 import sqlite3
 import sys
@@ -28,6 +29,7 @@ from homeassistant.components.recorder import (
     CONFIG_SCHEMA,
     DOMAIN,
     Recorder,
+    bulk_insert,
     db_schema,
     get_instance,
     migration,
@@ -384,29 +386,56 @@ async def test_saving_state_with_intermixed_time_changes(
         assert db_states[0].event_id is None
 
 
+def _fail_inserting_states(
+    instance: Recorder, bulk_insert_enabled: bool, err: Exception
+) -> AbstractContextManager[Any]:
+    """Patch the recorder to fail inserting states.
+
+    States are inserted by the bulk insert queue when it's enabled,
+    otherwise they are flushed by the session.
+    """
+    if bulk_insert_enabled:
+        if not instance.bulk_insert:
+            pytest.skip("The database does not support bulk inserts")
+        insert_rows = bulk_insert._insert_rows
+
+        def _throw_on_states(session, cls, mapping, rows):
+            if cls is States:
+                raise err
+            return insert_rows(session, cls, mapping, rows)
+
+        return patch.object(bulk_insert, "_insert_rows", _throw_on_states)
+
+    instance.bulk_insert = False
+
+    def _throw_if_state_in_session(*args, **kwargs):
+        for obj in instance.event_session:
+            if isinstance(obj, States):
+                raise err
+
+    return patch.object(
+        instance.event_session, "flush", side_effect=_throw_if_state_in_session
+    )
+
+
+@pytest.mark.parametrize("bulk_insert_enabled", [True, False])
 async def test_saving_state_with_exception(
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
     setup_recorder: None,
+    bulk_insert_enabled: bool,
 ) -> None:
     """Test saving and restoring a state."""
     entity_id = "test.recorder"
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
-
     with (
         patch("time.sleep"),
-        patch.object(
-            get_instance(hass).event_session,
-            "flush",
-            side_effect=_throw_if_state_in_session,
+        _fail_inserting_states(
+            get_instance(hass),
+            bulk_insert_enabled,
+            OperationalError("insert the state", "fake params", "forced to fail"),
         ),
     ):
         hass.states.async_set(entity_id, "fail", attributes)
@@ -427,29 +456,24 @@ async def test_saving_state_with_exception(
     assert "Error saving events" not in caplog.text
 
 
+@pytest.mark.parametrize("bulk_insert_enabled", [True, False])
 async def test_saving_state_with_sqlalchemy_exception(
     hass: HomeAssistant,
     caplog: pytest.LogCaptureFixture,
     setup_recorder: None,
+    bulk_insert_enabled: bool,
 ) -> None:
     """Test saving state when there is an SQLAlchemyError."""
     entity_id = "test.recorder"
     state = "restoring_from_db"
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
-    def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise SQLAlchemyError(
-                    "insert the state", "fake params", "forced to fail"
-                )
-
     with (
         patch("time.sleep"),
-        patch.object(
-            get_instance(hass).event_session,
-            "flush",
-            side_effect=_throw_if_state_in_session,
+        _fail_inserting_states(
+            get_instance(hass),
+            bulk_insert_enabled,
+            SQLAlchemyError("insert the state", "fake params", "forced to fail"),
         ),
     ):
         hass.states.async_set(entity_id, "fail", attributes)
@@ -470,6 +494,53 @@ async def test_saving_state_with_sqlalchemy_exception(
     assert "SQLAlchemyError error processing task" not in caplog.text
 
 
+async def test_saving_state_with_bulk_insert_exception(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+    setup_recorder: None,
+) -> None:
+    """Test a failed bulk insert is retried with the same rows."""
+    entity_id = "test.recorder"
+    attributes = {"test_attr": 5, "test_attr_10": "nice"}
+    instance = get_instance(hass)
+    assert instance.bulk_insert is True
+    failed = False
+
+    def _throw_once_on_states(session, cls, mapping, rows):
+        nonlocal failed
+        if cls is States and not failed:
+            failed = True
+            raise OperationalError("insert the state", "fake params", "forced to fail")
+        return insert_rows(session, cls, mapping, rows)
+
+    insert_rows = bulk_insert._insert_rows
+    with (
+        patch("time.sleep"),
+        patch.object(bulk_insert, "_insert_rows", _throw_once_on_states),
+    ):
+        hass.states.async_set(entity_id, "first", attributes)
+        hass.states.async_set(entity_id, "second", attributes)
+        await async_wait_recording_done(hass)
+
+    assert failed
+    assert "Error executing query" in caplog.text
+
+    with session_scope(hass=hass, read_only=True) as session:
+        db_states = {
+            db_state.state: db_state
+            for db_state in session.query(States).outerjoin(
+                StateAttributes,
+                States.attributes_id == StateAttributes.attributes_id,
+            )
+        }
+        assert db_states.keys() == {"first", "second"}
+        assert db_states["first"].old_state_id is None
+        assert db_states["second"].old_state_id == db_states["first"].state_id
+        assert db_states["first"].attributes_id is not None
+        assert db_states["second"].attributes_id == db_states["first"].attributes_id
+        assert session.query(StateAttributes).count() == 1
+
+
 async def test_force_shutdown_with_queue_of_writes_that_generate_exceptions(
     hass: HomeAssistant,
     async_setup_recorder_instance: RecorderInstanceGenerator,
@@ -580,6 +651,49 @@ async def test_saving_state_with_commit_interval_zero(
         assert db_states[0].event_id is None
 
 
+async def test_commit_interval_adapts(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test the commit interval adapts after each commit."""
+    instance = await async_setup_recorder_instance(hass, {"commit_interval": 5})
+    scheduler = instance.commit_scheduler
+    assert scheduler.interval == 5
+
+    hass.states.async_set("test.recorder", "on")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+    with patch.object(
+        scheduler, "commit_finished", wraps=scheduler.commit_finished
+    ) as commit_finished:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+        await hass.async_add_executor_job(instance.block_till_done)
+    assert commit_finished.call_count == 1
+    assert scheduler.last_commit_writes > 0
+    assert scheduler.last_backlog is not None
+
+    # The next commit is scheduled with the adapted interval
+    scheduler.interval = 10
+    hass.states.async_set("test.recorder", "off")
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance.block_till_done)
+    with patch.object(
+        scheduler, "commit_finished", wraps=scheduler.commit_finished
+    ) as commit_finished:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=5))
+        await hass.async_add_executor_job(instance.block_till_done)
+        assert commit_finished.call_count == 1
+        hass.states.async_set("test.recorder", "on")
+        await hass.async_block_till_done()
+        await hass.async_add_executor_job(instance.block_till_done)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=9))
+        await hass.async_add_executor_job(instance.block_till_done)
+        assert commit_finished.call_count == 1
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=10))
+        await hass.async_add_executor_job(instance.block_till_done)
+        assert commit_finished.call_count == 2
+
+
 async def _add_entities(hass: HomeAssistant, entity_ids: list[str]) -> list[State]:
     """Add entities."""
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
@@ -0,0 +1,370 @@
+"""Test time partitioned states and events tables."""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import patch
+
+from freezegun import freeze_time
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import Query, Session
+
+from homeassistant.components.recorder import (
+    CONF_PARTITION_INTERVAL,
+    Recorder,
+    migration,
+    purge,
+)
+from homeassistant.components.recorder.db_schema import (
+    EventData,
+    Events,
+    EventTypes,
+    StateAttributes,
+    States,
+)
+from homeassistant.components.recorder.partitions import (
+    PARTITIONS_AHEAD,
+    PartitionInterval,
+    _parse_range_bound,
+    create_partitions,
+    find_partitions,
+    partition_bounds,
+    partition_name,
+    tables_are_partitioned,
+)
+from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.tasks import PerodicCleanupTask
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.fixture
+async def mock_recorder_before_hass(
+    async_test_recorder: RecorderInstanceGenerator,
+) -> None:
+    """Set up recorder."""
+
+
+def _timestamp(*args: int) -> float:
+    """Return the UTC timestamp of a datetime."""
+    return datetime(*args, tzinfo=UTC).timestamp()
+
+
+def test_partition_bounds_day() -> None:
+    """Test daily partitions are aligned to UTC days."""
+    start, end = partition_bounds(_timestamp(2024, 3, 6, 13, 30), PartitionInterval.DAY)
+    assert start == _timestamp(2024, 3, 6)
+    assert end == _timestamp(2024, 3, 7)
+    assert partition_bounds(end, PartitionInterval.DAY) == (
+        end,
+        _timestamp(2024, 3, 8),
+    )
+
+
+@pytest.mark.parametrize(
+    "day",
+    [4, 6, 10],
+)
+def test_partition_bounds_week(day: int) -> None:
+    """Test weekly partitions start on Monday."""
+    start, end = partition_bounds(
+        _timestamp(2024, 3, day, 23, 59), PartitionInterval.WEEK
+    )
+    assert start == _timestamp(2024, 3, 4)
+    assert end == _timestamp(2024, 3, 11)
+
+
+def test_partition_name() -> None:
+    """Test the name of a partition and parsing its bound."""
+    assert partition_name("states", 1709683200) == "states_p1709683200"
+    assert _parse_range_bound("FOR VALUES FROM ('1709683200') TO ('1709769600')") == (
+        1709683200.0,
+        1709769600.0,
+    )
+    assert _parse_range_bound("FOR VALUES FROM (1709683200) TO (1709769600)") == (
+        1709683200.0,
+        1709769600.0,
+    )
+    assert _parse_range_bound("DEFAULT") is None
+
+
+@pytest.mark.skip_on_db_engine(["postgresql"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_partitioned_tables_unsupported_dialect(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the tables aren't partitioned with an unsupported database."""
+    instance = await async_setup_recorder_instance(
+        hass, {CONF_PARTITION_INTERVAL: "day"}
+    )
+    assert instance.partition_interval is PartitionInterval.DAY
+    assert instance.partitioned_tables is False
+    assert "Partitioned tables are only supported with PostgreSQL" in caplog.text
+
+
+def _partition_names(
+    table: str, timestamp: float, interval: PartitionInterval, count: int
+) -> list[str]:
+    """Return the names of count partitions starting with the one of timestamp."""
+    names: list[str] = []
+    start, end = partition_bounds(timestamp, interval)
+    for _ in range(count):
+        names.append(partition_name(table, start))
+        start, end = partition_bounds(end, interval)
+    return names
+
+
+def _purgeme_attributes(session: Session) -> Query:
+    """Query the attributes of the states of the purge test."""
+    return session.query(StateAttributes).filter(
+        StateAttributes.shared_attrs.like("%purgeme%")
+    )
+
+
+def _purgeme_event_data(session: Session) -> Query:
+    """Query the data of the events of the purge test."""
+    return session.query(EventData).filter(EventData.shared_data.like("%purgeme%"))
+
+
+async def _async_setup_partitioned_recorder(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    interval: str = "day",
+) -> Recorder:
+    """Set up the recorder with partitioned tables."""
+    instance = await async_setup_recorder_instance(
+        hass, {CONF_PARTITION_INTERVAL: interval}
+    )
+    await async_wait_recording_done(hass)
+    assert instance.partitioned_tables is True
+    return instance
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "sqlite"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_partitioned_schema(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test a new PostgreSQL database gets partitioned tables."""
+    instance = await _async_setup_partitioned_recorder(
+        hass, async_setup_recorder_instance
+    )
+    assert instance.engine is not None
+
+    inspector = inspect(instance.engine)
+    assert inspector.get_pk_constraint("states")["constrained_columns"] == [
+        "state_id",
+        "last_updated_ts",
+    ]
+    assert inspector.get_pk_constraint("events")["constrained_columns"] == [
+        "event_id",
+        "time_fired_ts",
+    ]
+    assert {"states_state_id_seq", "events_event_id_seq"} <= set(
+        inspector.get_sequence_names()
+    )
+    # Foreign keys can't refer to partitioned tables
+    assert {
+        foreign_key["referred_table"]
+        for foreign_key in inspector.get_foreign_keys("states")
+    } == {"state_attributes", "states_meta"}
+    assert {
+        foreign_key["referred_table"]
+        for foreign_key in inspector.get_foreign_keys("events")
+    } == {"event_data", "event_types"}
+    # The tables are only created for new databases
+    assert migration.create_partitioned_schema(instance.engine) is False
+
+    hass.states.async_set("test.partitioned", "on")
+    await async_wait_recording_done(hass)
+    with session_scope(hass=hass, read_only=True) as session:
+        state = session.query(States).one()
+        assert state.state_id is not None
+        assert session.execute(
+            text("SELECT tableoid::regclass::text FROM states WHERE state_id = :id"),
+            {"id": state.state_id},
+        ).scalar() == partition_name(
+            "states", partition_bounds(state.last_updated_ts, PartitionInterval.DAY)[0]
+        )
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "sqlite"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+@pytest.mark.parametrize("interval", ["day", "week"])
+async def test_find_partitions(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    interval: str,
+) -> None:
+    """Test the partitions are found in the catalog."""
+    await _async_setup_partitioned_recorder(
+        hass, async_setup_recorder_instance, interval
+    )
+    now = dt_util.utcnow().timestamp()
+    partition_interval = PartitionInterval(interval)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert tables_are_partitioned(session)
+        for table in ("states", "events"):
+            partitions = find_partitions(session, table)
+            # The default partition is left out
+            assert [partition.name for partition in partitions] == _partition_names(
+                table, now, partition_interval, PARTITIONS_AHEAD + 1
+            )
+            for partition in partitions:
+                assert partition.table == table
+                assert partition_bounds(partition.start, partition_interval) == (
+                    partition.start,
+                    partition.end,
+                )
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "sqlite"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_create_partitions(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test partitions are created ahead, skipping periods with rows in the default partition."""
+    await _async_setup_partitioned_recorder(hass, async_setup_recorder_instance)
+    now = dt_util.utcnow().timestamp()
+    in_a_day = now + timedelta(days=1).total_seconds()
+    in_a_month = now + timedelta(days=30).total_seconds()
+
+    with session_scope(hass=hass) as session:
+        # Only the partition after the existing ones is new
+        assert [
+            partition.name
+            for partition in create_partitions(session, PartitionInterval.DAY, in_a_day)
+        ] == [
+            _partition_names("states", in_a_day, PartitionInterval.DAY, 3)[-1],
+            _partition_names("events", in_a_day, PartitionInterval.DAY, 3)[-1],
+        ]
+        assert create_partitions(session, PartitionInterval.DAY, in_a_day) == []
+        # Weekly partitions overlapping the daily partitions are skipped
+        daily = find_partitions(session, "states")
+        weekly = [
+            partition
+            for partition in create_partitions(session, PartitionInterval.WEEK, now)
+            if partition.table == "states"
+        ]
+        assert weekly
+        assert not any(
+            week.start < day.end and day.start < week.end
+            for week in weekly
+            for day in daily
+        )
+
+        session.add(Events(event_type_id=None, time_fired_ts=in_a_month))
+
+    with session_scope(hass=hass) as session:
+        assert [
+            partition.name
+            for partition in create_partitions(
+                session, PartitionInterval.DAY, in_a_month
+            )
+        ] == [
+            *_partition_names("states", in_a_month, PartitionInterval.DAY, 3),
+            *_partition_names("events", in_a_month, PartitionInterval.DAY, 3)[1:],
+        ]
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "sqlite"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_periodic_cleanup_creates_partitions(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    """Test the nightly cleanup creates the partitions ahead."""
+    instance = await _async_setup_partitioned_recorder(
+        hass, async_setup_recorder_instance
+    )
+    in_three_days = dt_util.utcnow() + timedelta(days=3)
+
+    freezer.move_to(in_three_days)
+    instance.queue_task(PerodicCleanupTask())
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        assert [partition.name for partition in find_partitions(session, "states")][
+            -(PARTITIONS_AHEAD + 1) :
+        ] == _partition_names(
+            "states",
+            in_three_days.timestamp(),
+            PartitionInterval.DAY,
+            PARTITIONS_AHEAD + 1,
+        )
+
+
+@pytest.mark.skip_on_db_engine(["mysql", "sqlite"])
+@pytest.mark.usefixtures("skip_by_db_engine")
+async def test_purge_drops_expired_partitions(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+) -> None:
+    """Test the purge drops the partitions before the purge cutoff."""
+    instance = await _async_setup_partitioned_recorder(
+        hass, async_setup_recorder_instance
+    )
+    utcnow = dt_util.utcnow()
+    eleven_days_ago = utcnow - timedelta(days=11)
+    with session_scope(hass=hass) as session:
+        old_partitions = create_partitions(
+            session, PartitionInterval.DAY, eleven_days_ago.timestamp()
+        )
+    assert len(old_partitions) == 2 * (PARTITIONS_AHEAD + 1)
+
+    with freeze_time(eleven_days_ago):
+        hass.states.async_set("test.partitioned", "old", {"purgeme": True})
+        hass.bus.async_fire("EVENT_TEST_PURGE", {"purgeme": True})
+        await async_wait_recording_done(hass)
+    hass.states.async_set("test.partitioned", "new", {"purgeme": False})
+    hass.bus.async_fire("EVENT_TEST_PURGE", {"purgeme": False})
+    await async_wait_recording_done(hass)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        old_state = session.query(States).filter(States.state == "old").one()
+        new_state = session.query(States).filter(States.state == "new").one()
+        assert new_state.old_state_id == old_state.state_id
+        assert _purgeme_attributes(session).count() == 2
+        assert _purgeme_event_data(session).count() == 2
+
+    with (
+        patch.object(
+            purge, "_drop_states_partition", wraps=purge._drop_states_partition
+        ) as drop_states_partition,
+        patch.object(
+            purge, "_drop_events_partition", wraps=purge._drop_events_partition
+        ) as drop_events_partition,
+    ):
+        assert purge_old_data(instance, utcnow - timedelta(days=4), repack=False)
+
+    assert {call.args[2] for call in drop_states_partition.mock_calls} | {
+        call.args[2] for call in drop_events_partition.mock_calls
+    } == set(old_partitions)
+
+    with session_scope(hass=hass, read_only=True) as session:
+        for table in ("states", "events"):
+            assert not {partition.name for partition in old_partitions} & {
+                partition.name for partition in find_partitions(session, table)
+            }
+        assert [state.state for state in session.query(States)] == ["new"]
+        assert session.query(States).one().old_state_id is None
+        assert _purgeme_attributes(session).count() == 1
+        assert _purgeme_event_data(session).count() == 1
+        assert (
+            session.query(Events)
+            .join(EventTypes, Events.event_type_id == EventTypes.event_type_id)
+            .filter(EventTypes.event_type == "EVENT_TEST_PURGE")
+            .count()
+            == 1
+        )
@@ -4,17 +4,19 @@ from collections.abc import Generator
 from datetime import datetime, timedelta
 import json
 import sqlite3
+from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
 import pytest
-from sqlalchemy.exc import DatabaseError, OperationalError
+from sqlalchemy.exc import DatabaseError, OperationalError, SQLAlchemyError
 from sqlalchemy.orm.session import Session
 from voluptuous.error import MultipleInvalid
 
-from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder
+from homeassistant.components.recorder import DOMAIN as RECORDER_DOMAIN, Recorder, tasks
 from homeassistant.components.recorder.const import SupportedDialect
 from homeassistant.components.recorder.db_schema import (
+    EventData,
     Events,
     EventTypes,
     RecorderRuns,
@@ -25,6 +27,7 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
+from homeassistant.components.recorder.incremental_purge import PurgeBudget
 from homeassistant.components.recorder.purge import purge_old_data
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
@@ -33,7 +36,12 @@ from homeassistant.components.recorder.services import (
 )
 from homeassistant.components.recorder.tasks import PurgeTask
 from homeassistant.components.recorder.util import session_scope
-from homeassistant.const import EVENT_STATE_CHANGED, EVENT_THEMES_UPDATED, STATE_ON
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_STATE_CHANGED,
+    EVENT_THEMES_UPDATED,
+    STATE_ON,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.util import dt as dt_util
 
@@ -45,6 +53,7 @@ from .common import (
     convert_pending_states_to_meta,
 )
 
+from tests.common import async_fire_time_changed
 from tests.typing import RecorderInstanceGenerator
 
 TEST_EVENT_TYPES = (
@@ -110,6 +119,177 @@ async def test_purge_big_database(hass: HomeAssistant, recorder_mock: Recorder)
             assert state_attributes.count() == 1
 
 
+async def test_purge_old_data_with_budget(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test a purge with a budget stops once the budget is exhausted."""
+    for _ in range(12):
+        await _add_test_states(hass, wait_recording_done=False)
+    await async_wait_recording_done(hass)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    budget = PurgeBudget(max_rows=30, max_seconds=60)
+    assert not purge_old_data(recorder_mock, purge_before, False, budget=budget)
+    assert budget.states == 30
+    assert budget.events == 0
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 42
+
+    budget = PurgeBudget(max_rows=30, max_seconds=60)
+    assert purge_old_data(recorder_mock, purge_before, False, budget=budget)
+    assert budget.states == 18
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 24
+
+    # An exhausted time budget stops after the first batch
+    await _add_test_states(hass)
+    budget = PurgeBudget(max_rows=30, max_seconds=0)
+    with patch.object(recorder_mock, "max_bind_vars", 1):
+        assert not purge_old_data(recorder_mock, purge_before, False, budget=budget)
+    assert budget.states == 1
+
+
+async def test_purge_old_data_with_reference_counts(
+    hass: HomeAssistant, recorder_mock: Recorder
+) -> None:
+    """Test the use of attributes and data recorded since start isn't looked up."""
+    await _add_test_states(hass)
+    await _add_test_events(hass)
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with (
+        patch(
+            "homeassistant.components.recorder.purge.attributes_ids_exist_in_states_with_fast_in_distinct"
+        ) as attributes_exist_mock,
+        patch(
+            "homeassistant.components.recorder.purge.data_ids_exist_in_events_with_fast_in_distinct"
+        ) as data_exist_mock,
+    ):
+        purge_old_data(recorder_mock, purge_before, repack=False)
+    attributes_exist_mock.assert_not_called()
+    data_exist_mock.assert_not_called()
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+        # The attributes of the purged states are no longer used
+        assert session.query(StateAttributes).count() == 1
+        # The data of the purged events is still used by the remaining events
+        events = (
+            session.query(Events)
+            .filter(Events.event_type_id.in_(select_event_type_ids(TEST_EVENT_TYPES)))
+            .join(EventData, Events.data_id == EventData.data_id)
+        )
+        assert events.count() == 2
+
+
+@pytest.mark.parametrize("recorder_config", [{"incremental_purge": True}])
+async def test_incremental_purge(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test purging in slices with the purge service."""
+    await _add_test_events(hass)
+    await _add_test_states(hass)
+
+    with patch.object(tasks, "INCREMENTAL_PURGE_MAX_ROWS", 1):
+        await hass.services.async_call(
+            RECORDER_DOMAIN, SERVICE_PURGE, {"keep_days": 10}, blocking=True
+        )
+        # The second purge starts once the first one is done
+        await hass.services.async_call(
+            RECORDER_DOMAIN, SERVICE_PURGE, {"keep_days": 4}, blocking=True
+        )
+        for _ in range(20):
+            await async_wait_recording_done(hass)
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+
+    progress = recorder_mock.purge_progress
+    assert progress.finished
+    assert progress.purge_before > dt_util.utcnow() - timedelta(days=5)
+    # One row is deleted in each slice, the last slice finds nothing left
+    assert progress.states == 2
+    assert progress.events == 2
+    assert progress.slices == 5
+
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+    # The progress is saved for a resume after a restart
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert hass_storage["recorder.purge_progress"]["data"] == progress.as_dict()
+
+
+@pytest.mark.parametrize("recorder_config", [{"incremental_purge": True}])
+async def test_incremental_purge_slice_fails(
+    hass: HomeAssistant,
+    recorder_mock: Recorder,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a failed slice ends the incremental purge."""
+    await _add_test_states(hass)
+
+    with patch.object(
+        tasks.purge, "purge_old_data", side_effect=SQLAlchemyError("boom")
+    ):
+        await hass.services.async_call(
+            RECORDER_DOMAIN, SERVICE_PURGE, {"keep_days": 4}, blocking=True
+        )
+        await async_wait_recording_done(hass)
+    assert "Incremental purge before" in caplog.text
+    assert "failed" in caplog.text
+    assert not recorder_mock.purge_progress.finished
+
+    # The next purge is not held up by the failed purge
+    await hass.services.async_call(
+        RECORDER_DOMAIN, SERVICE_PURGE, {"keep_days": 4}, blocking=True
+    )
+    for _ in range(5):
+        await async_wait_recording_done(hass)
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=1))
+
+    assert recorder_mock.purge_progress.finished
+    with session_scope(hass=hass) as session:
+        assert session.query(States).count() == 2
+
+
+async def test_incremental_purge_resume(
+    hass: HomeAssistant,
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test an incremental purge in progress resumes after a restart."""
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    hass_storage["recorder.purge_progress"] = {
+        "version": 1,
+        "key": "recorder.purge_progress",
+        "data": {
+            "purge_before": purge_before.isoformat(),
+            "repack": False,
+            "apply_filter": False,
+            "started": purge_before.isoformat(),
+            "finished": None,
+            "slices": 3,
+            "states": 100,
+            "events": 50,
+            "last_slice_duration": 0.1,
+            "last_slice_rows": 50,
+        },
+    }
+    instance = await async_setup_recorder_instance(hass, {"incremental_purge": True})
+    await hass.async_block_till_done()
+    await async_wait_recording_done(hass)
+
+    progress = instance.purge_progress
+    assert progress.purge_before == purge_before
+    assert progress.finished
+    assert progress.slices == 4
+    assert progress.states == 100
+
+
 async def test_purge_old_states(hass: HomeAssistant, recorder_mock: Recorder) -> None:
     """Test deleting old states."""
     await _add_test_states(hass)
@@ -9,7 +9,11 @@ from sqlalchemy import select
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder.db_schema import (
+    StatisticsDaily,
+    StatisticsMonthly,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
@@ -1844,6 +1848,137 @@ async def test_monthly_statistics_sum(
     assert stats == {}
 
 
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+async def test_statistics_rollups(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test daily and monthly statistics are served from the rollup tables."""
+    await hass.config.async_set_time_zone("Europe/Amsterdam")
+    await async_wait_recording_done(hass)
+    instance = recorder.get_instance(hass)
+    assert instance.use_statistics_rollups
+
+    statistic_id = "test:total_energy_import"
+    types = {"change", "last_reset", "max", "mean", "min", "state", "sum"}
+    start = dt_util.as_utc(dt_util.parse_datetime("2022-09-29 00:00:00"))
+    external_statistics = [
+        {
+            "start": start + timedelta(hours=hour),
+            "mean": hour % 7,
+            "min": hour % 7 - 1,
+            "max": hour % 7 + 1,
+            "last_reset": None,
+            "state": hour,
+            "sum": hour * 2,
+        }
+        for hour in range(0, 96, 5)
+    ]
+    external_metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": statistic_id,
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(hass, external_metadata, external_statistics)
+    await async_wait_recording_done(hass)
+
+    def assert_rollups_match_hourly_statistics(
+        period: str, periods: int
+    ) -> list[dict[str, Any]]:
+        rolled_up = statistics_during_period(
+            hass, start, statistic_ids={statistic_id}, period=period, types=types
+        )
+        assert instance.use_statistics_rollups
+        instance.use_statistics_rollups = False
+        reduced = statistics_during_period(
+            hass, start, statistic_ids={statistic_id}, period=period, types=types
+        )
+        instance.use_statistics_rollups = True
+        assert rolled_up == reduced
+        assert len(rolled_up[statistic_id]) == periods
+        return rolled_up[statistic_id]
+
+    assert_rollups_match_hourly_statistics("day", 4)
+    months = assert_rollups_match_hourly_statistics("month", 2)
+    assert months[0]["end"] == months[1]["start"]
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.query(StatisticsDaily).count() == 4
+        assert session.query(StatisticsMonthly).count() == 2
+
+    # Adjusting the sum updates the rollups
+    instance.async_adjust_statistics(
+        statistic_id, start + timedelta(hours=30), 100, "kWh"
+    )
+    await async_wait_recording_done(hass)
+    assert_rollups_match_hourly_statistics("day", 4)
+    adjusted_months = assert_rollups_match_hourly_statistics("month", 2)
+    assert adjusted_months[1]["sum"] == months[1]["sum"] + 100
+
+    # The rollups are rebuilt when they don't match the time zone
+    await hass.config.async_set_time_zone("America/New_York")
+    reduced = statistics_during_period(
+        hass, start, statistic_ids={statistic_id}, period="day", types=types
+    )
+    assert not instance.use_statistics_rollups
+    assert len(reduced[statistic_id]) == 5
+    for _ in range(3):
+        await async_wait_recording_done(hass)
+    assert_rollups_match_hourly_statistics("day", 5)
+    assert_rollups_match_hourly_statistics("month", 2)
+
+
+@pytest.mark.freeze_time("2022-10-01 00:00:00+00:00")
+async def test_statistics_rollups_overlapping_import(
+    hass: HomeAssistant,
+    setup_recorder: None,
+) -> None:
+    """Test importing statistics overlapping imported statistics updates the rollups."""
+    await async_wait_recording_done(hass)
+    statistic_id = "test:total_energy_import"
+    start = dt_util.as_utc(dt_util.parse_datetime("2022-09-29 00:00:00"))
+    external_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": statistic_id,
+        "unit_of_measurement": "kWh",
+    }
+
+    def _statistics(hours: range, factor: int) -> list[dict[str, Any]]:
+        return [
+            {
+                "start": start + timedelta(hours=hour),
+                "last_reset": None,
+                "state": hour,
+                "sum": hour * factor,
+            }
+            for hour in hours
+        ]
+
+    async_add_external_statistics(hass, external_metadata, _statistics(range(48), 1))
+    async_add_external_statistics(
+        hass, external_metadata, _statistics(range(36, 72), 2)
+    )
+    await async_wait_recording_done(hass)
+
+    stats = statistics_during_period(
+        hass, start, statistic_ids={statistic_id}, period="hour", types={"sum"}
+    )
+    assert len(stats[statistic_id]) == 72
+    assert stats[statistic_id][40]["sum"] == 80
+    days = statistics_during_period(
+        hass, start, statistic_ids={statistic_id}, period="day", types={"sum"}
+    )
+    assert recorder.get_instance(hass).use_statistics_rollups
+    assert [day["sum"] for day in days[statistic_id]] == [23, 94, 142]
+    with session_scope(hass=hass, read_only=True) as session:
+        assert session.query(StatisticsDaily).count() == 3
+
+
 def test_cache_key_for_generate_statistics_during_period_stmt() -> None:
     """Test cache key for _generate_statistics_during_period_stmt."""
     stmt = _generate_statistics_during_period_stmt(
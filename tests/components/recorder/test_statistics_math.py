@@ -0,0 +1,66 @@
+"""Test statistics math."""
+
+from collections.abc import Generator
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder import statistics_math
+from homeassistant.components.recorder.statistics_math import (
+    period_groups,
+    reduce_groups,
+    time_weighted_average,
+)
+
+
+@pytest.fixture(params=["python", "numpy"])
+def kernel(request: pytest.FixtureRequest) -> Generator[None]:
+    """Run the test with both the pure Python and the NumPy kernels."""
+    if request.param == "python":
+        with patch.object(statistics_math, "np", None):
+            yield
+    else:
+        with patch.object(statistics_math, "NUMPY_MIN_SIZE", 0):
+            yield
+
+
+@pytest.mark.usefixtures("kernel")
+def test_time_weighted_average() -> None:
+    """Test the time weighted average."""
+    assert time_weighted_average([], [], 0.0, 10.0) == 0.0
+    assert time_weighted_average([0.0], [5.0], 0.0, 10.0) == 5.0
+    assert time_weighted_average([0.0, 5.0], [2.0, 4.0], 0.0, 10.0) == 3.0
+    # States before the start count from the start
+    assert time_weighted_average([-10.0, 5.0], [2.0, 4.0], 0.0, 10.0) == 3.0
+    # The average starts from the first state after the start
+    assert time_weighted_average([5.0, 7.5], [2.0, 4.0], 0.0, 10.0) == 3.0
+    # A state at the end of the period can't be averaged
+    assert time_weighted_average([10.0], [5.0], 0.0, 10.0) == 0.0
+
+
+@pytest.mark.usefixtures("kernel")
+def test_reduce_groups() -> None:
+    """Test reducing groups of values."""
+    values = [1.0, None, 3.0, None, None, 6.0]
+    groups = [0, 3, 5]
+    assert reduce_groups(values, groups, "mean") == [2.0, None, 6.0]
+    assert reduce_groups(values, groups, "min") == [1.0, None, 6.0]
+    assert reduce_groups(values, groups, "max") == [3.0, None, 6.0]
+
+
+def test_period_groups() -> None:
+    """Test grouping timestamps by period."""
+    calls = []
+
+    def _period_start_end(timestamp: float) -> tuple[float, float]:
+        calls.append(timestamp)
+        start = timestamp - timestamp % 10
+        return start, start + 10
+
+    assert period_groups([], _period_start_end) == []
+    assert period_groups([1.0, 5.0, 10.0, 19.0, 35.0], _period_start_end) == [
+        (0, 0.0, 10.0),
+        (2, 10.0, 20.0),
+        (4, 30.0, 40.0),
+    ]
+    assert calls == [1.0, 10.0, 35.0]
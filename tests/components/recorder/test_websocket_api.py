@@ -2534,9 +2534,19 @@ async def test_recorder_info(
     assert response["success"]
     assert response["result"] == {
         "backlog": 0,
+        "commit_interval": {
+            "configured": 0,
+            "current": 0,
+            "reason": "configured",
+            "last_commit_duration": None,
+            "last_commit_writes": None,
+            "last_backlog": None,
+            "last_available_memory": None,
+        },
         "max_backlog": 65000,
         "migration_in_progress": False,
         "migration_is_live": False,
+        "purge_progress": None,
         "recording": True,
         "thread_running": True,
     }
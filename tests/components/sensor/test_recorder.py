@@ -35,7 +35,12 @@ from homeassistant.components.recorder.statistics import (
     list_statistic_ids,
 )
 from homeassistant.components.recorder.util import get_instance, session_scope
-from homeassistant.components.sensor import ATTR_OPTIONS, DOMAIN, SensorDeviceClass
+from homeassistant.components.sensor import (
+    ATTR_OPTIONS,
+    DOMAIN,
+    SensorDeviceClass,
+    recorder as sensor_recorder,
+)
 from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers import issue_registry as ir
@@ -2427,6 +2432,66 @@ async def test_compile_hourly_statistics_fails(
     assert "Error while processing event StatisticsTask" in caplog.text
 
 
+@pytest.mark.parametrize("persistent_database", [True])
+async def test_compile_hourly_statistics_parallel(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test compiling statistics in chunks gives the same statistics."""
+    zero = get_start_time(dt_util.utcnow())
+    await async_setup_component(hass, "sensor", {})
+    # Wait for the sensor recorder platform to be added
+    await async_recorder_block_till_done(hass)
+    with freeze_time(zero) as freezer:
+        for entity_id, attributes, seq in (
+            ("sensor.test1", POWER_SENSOR_ATTRIBUTES, [-10, 15, 30]),
+            ("sensor.test2", ENERGY_SENSOR_ATTRIBUTES, [10, 20, 5]),
+            ("sensor.test3", TEMPERATURE_SENSOR_ATTRIBUTES, [20, 25, 21]),
+        ):
+            await async_record_states(
+                hass, freezer, zero, entity_id, attributes, seq=seq
+            )
+    await async_wait_recording_done(hass)
+
+    def _compile_statistics() -> list:
+        with session_scope(hass=hass, read_only=True) as session:
+            return sensor_recorder.compile_statistics(
+                hass, session, zero, zero + timedelta(minutes=5)
+            ).platform_stats
+
+    instance = get_instance(hass)
+    expected = await instance.async_add_executor_job(_compile_statistics)
+    assert len(expected) == 3
+    with (
+        patch.object(sensor_recorder, "PARALLEL_COMPILE_CHUNK_SIZE", 1),
+        patch.object(
+            instance, "executor_map", wraps=instance.executor_map
+        ) as executor_map,
+    ):
+        do_adhoc_statistics(hass, start=zero)
+        await async_wait_recording_done(hass)
+    assert len(executor_map.mock_calls) == 1
+    assert "Error while processing event StatisticsTask" not in caplog.text
+
+    stats = await instance.async_add_executor_job(
+        statistics_during_period, hass, zero, None, None, "5minute"
+    )
+    assert {
+        statistic_id: {
+            key: value
+            for key, value in statistic_rows[0].items()
+            if key not in ("start", "end") and value is not None
+        }
+        for statistic_id, statistic_rows in stats.items()
+    } == {
+        result["meta"]["statistic_id"]: {
+            key: pytest.approx(value)
+            for key, value in result["stat"].items()
+            if key not in ("start", "last_reset")
+        }
+        for result in expected
+    }
+
+
 @pytest.mark.parametrize(
     (
         "state_class",
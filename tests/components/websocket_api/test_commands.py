@@ -10,6 +10,7 @@ import pytest
 import voluptuous as vol
 
 from homeassistant import loader
+from homeassistant.auth.permissions.models import PermissionLookup
 from homeassistant.components.device_automation import toggle_entity
 from homeassistant.components.websocket_api import const
 from homeassistant.components.websocket_api.auth import (
@@ -19,10 +20,14 @@ from homeassistant.components.websocket_api.auth import (
 )
 from homeassistant.components.websocket_api.const import FEATURE_COALESCE_MESSAGES, URL
 from homeassistant.config_entries import ConfigEntryState
-from homeassistant.const import SIGNAL_BOOTSTRAP_INTEGRATIONS
+from homeassistant.const import EVENT_STATE_CHANGED, SIGNAL_BOOTSTRAP_INTEGRATIONS
 from homeassistant.core import Context, HomeAssistant, State, SupportsResponse, callback
 from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.loader import async_get_integration
@@ -1262,6 +1267,228 @@ async def test_subscribe_unsubscribe_entities_specific_entities(
     }
 
 
+async def test_subscribe_entities_multiple_subscriptions(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test state changes are routed to each subscription of the hub."""
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.other", "off")
+    hass.states.async_set("switch.other", "off")
+
+    for msg_id, subscribe in (
+        (7, {"entity_ids": ["light.permitted"]}),
+        (8, {"include": {"domains": ["light"]}}),
+        (9, {}),
+    ):
+        await websocket_client.send_json(
+            {"id": msg_id, "type": "subscribe_entities", **subscribe}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == msg_id
+        assert msg["success"]
+        msg = await websocket_client.receive_json()
+        assert msg["id"] == msg_id
+        assert msg["type"] == "event"
+
+    listeners = hass.bus.async_listeners()[EVENT_STATE_CHANGED]
+
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.permitted", "on")
+    hass.states.async_set("switch.other", "on")
+
+    received: list[tuple[int, str]] = []
+    for _ in range(6):
+        msg = await websocket_client.receive_json()
+        received.append((msg["id"], next(iter(msg["event"]["c"]))))
+    assert received == [
+        (8, "light.other"),
+        (9, "light.other"),
+        (7, "light.permitted"),
+        (8, "light.permitted"),
+        (9, "light.permitted"),
+        (9, "switch.other"),
+    ]
+
+    # Permissions are checked for every state change
+    hass_admin_user.groups = []
+    hass_admin_user.mock_policy({"entities": {"entity_ids": {"light.other": True}}})
+    await websocket_client.send_json(
+        {"id": 10, "type": "unsubscribe_events", "subscription": 8}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 10
+    assert msg["success"]
+
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.other", "off")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 9
+    assert msg["event"]["c"] == {
+        "light.other": {"+": {"c": ANY, "lc": ANY, "s": "off"}}
+    }
+
+    # All subscriptions share a single state changed listener
+    for msg_id in (7, 9):
+        await websocket_client.send_json(
+            {"id": msg_id + 10, "type": "unsubscribe_events", "subscription": msg_id}
+        )
+        msg = await websocket_client.receive_json()
+        assert msg["success"]
+    assert hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0) == listeners - 1
+
+
+async def test_subscribe_entities_resume(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    hass_admin_user: MockUser,
+) -> None:
+    """Test resuming subscribe entities from a sequence number."""
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("light.unchanged", "off")
+    hass.states.async_set("light.removed", "off")
+    hass.states.async_set("switch.filtered", "off")
+
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "subscribe_entities",
+            "include": {"domains": ["light"]},
+            "resumable": True,
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["result"] == {
+        "changelog_id": hass.states.changelog_id,
+        "resumed": False,
+    }
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert set(msg["event"]["a"]) == {
+        "light.permitted",
+        "light.unchanged",
+        "light.removed",
+    }
+    assert msg["sequence"] == hass.states.async_resume_sequence()
+
+    hass.states.async_set("light.permitted", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert "light.permitted" in msg["event"]["c"]
+    assert msg["sequence"] == hass.states.async_resume_sequence()
+    since = {"changelog_id": hass.states.changelog_id, "sequence": msg["sequence"]}
+
+    await websocket_client.send_json(
+        {"id": 8, "type": "unsubscribe_events", "subscription": 7}
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    # Changes while the client is away
+    hass.states.async_set("light.permitted", "off")
+    hass.states.async_set("switch.filtered", "on")
+    hass.states.async_remove("light.removed")
+
+    await websocket_client.send_json(
+        {
+            "id": 9,
+            "type": "subscribe_entities",
+            "include": {"domains": ["light"]},
+            "since": since,
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 9
+    assert msg["result"] == {
+        "changelog_id": hass.states.changelog_id,
+        "resumed": True,
+    }
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 9
+    assert msg["event"] == {
+        "a": {
+            "light.permitted": {
+                "a": {},
+                "c": ANY,
+                "lc": ANY,
+                "s": "off",
+            }
+        },
+        "r": ["light.removed"],
+    }
+    assert msg["sequence"] == hass.states.async_resume_sequence()
+
+    # The changelog of another run can't be resumed from
+    await websocket_client.send_json(
+        {
+            "id": 10,
+            "type": "subscribe_entities",
+            "entity_ids": ["light.unchanged"],
+            "since": {"changelog_id": "other", "sequence": 0},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["result"] == {
+        "changelog_id": hass.states.changelog_id,
+        "resumed": False,
+    }
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 10
+    assert set(msg["event"]["a"]) == {"light.unchanged"}
+
+
+async def test_subscribe_entities_area_permission_changed(
+    hass: HomeAssistant,
+    websocket_client: MockHAClientWebSocket,
+    hass_admin_user: MockUser,
+    area_registry: ar.AreaRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test state changes stop when an entity moves out of a permitted area."""
+    config_entry = MockConfigEntry(domain="test")
+    config_entry.add_to_hass(hass)
+    permitted_area = area_registry.async_create("Permitted")
+    other_area = area_registry.async_create("Other")
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("test", "device")},
+    )
+    device_registry.async_update_device(device.id, area_id=permitted_area.id)
+    entity_registry.async_get_or_create(
+        "light", "test", "unique", device_id=device.id, suggested_object_id="area"
+    )
+    hass.states.async_set("light.area", "off")
+
+    hass_admin_user.groups = []
+    hass_admin_user.perm_lookup = PermissionLookup(entity_registry, device_registry)
+    hass_admin_user.mock_policy({"entities": {"area_ids": {permitted_area.id: True}}})
+
+    await websocket_client.send_json({"id": 7, "type": "subscribe_entities"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"a": {"light.area": ANY}}
+
+    hass.states.async_set("light.area", "on")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"] == {"light.area": {"+": {"c": ANY, "lc": ANY, "s": "on"}}}
+
+    device_registry.async_update_device(device.id, area_id=other_area.id)
+    hass.states.async_set("light.area", "moved")
+    await hass.async_block_till_done()
+
+    # The permissions are checked again after moving back into the area
+    device_registry.async_update_device(device.id, area_id=permitted_area.id)
+    hass.states.async_set("light.area", "back")
+    msg = await websocket_client.receive_json()
+    assert msg["event"]["c"] == {
+        "light.area": {"+": {"c": ANY, "lc": ANY, "s": "back"}}
+    }
+
+
 async def test_subscribe_unsubscribe_entities_with_filter(
     hass: HomeAssistant,
     websocket_client: MockHAClientWebSocket,
@@ -3,7 +3,8 @@
 import asyncio
 from datetime import timedelta
 from typing import Any, cast
-from unittest.mock import patch
+from unittest.mock import ANY, patch
+import zlib
 
 from aiohttp import WSMsgType, WSServerHandshakeError, web
 import pytest
@@ -17,6 +18,7 @@ from homeassistant.components.websocket_api import (
 from homeassistant.components.websocket_api.connection import ActiveConnection
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.util.dt import utcnow
+from homeassistant.util.json import json_loads
 
 from tests.common import async_fire_time_changed
 from tests.typing import MockHAClientWebSocket, WebSocketGenerator
@@ -345,6 +347,53 @@ async def test_pending_msg_peak_but_does_not_overflow(
     assert "Client unable to keep up with pending messages" not in caplog.text
 
 
+async def test_state_diffs_coalesced_when_behind(
+    hass: HomeAssistant, websocket_client: MockHAClientWebSocket
+) -> None:
+    """Test state diffs of an entity are merged while the client is behind."""
+    hass.states.async_set("light.kitchen", "off", {"color": "blue"})
+    hass.states.async_set("light.hallway", "off")
+    await websocket_client.send_json({"id": 5, "type": "subscribe_entities"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    msg = await websocket_client.receive_json()
+    assert set(msg["event"]["a"]) == {"light.kitchen", "light.hallway"}
+
+    with patch(
+        "homeassistant.components.websocket_api.http.PENDING_MSG_COALESCE_STATE_DIFFS",
+        0,
+    ):
+        hass.states.async_set("light.kitchen", "on", {"color": "blue", "level": 1})
+        hass.states.async_set("light.hallway", "on")
+        hass.states.async_set("light.kitchen", "on", {"color": "blue", "level": 2})
+        hass.states.async_set("light.kitchen", "on", {"color": "red"})
+        hass.states.async_remove("light.hallway")
+        hass.states.async_set("light.porch", "on")
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 5
+    assert msg["event"] == {
+        "c": {
+            "light.kitchen": {
+                "+": {"a": {"color": "red"}, "c": ANY, "lc": ANY, "s": "on"}
+            }
+        }
+    }
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {"r": ["light.hallway"]}
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "a": {"light.porch": {"a": {}, "c": ANY, "lc": ANY, "s": "on"}}
+    }
+
+    # Once written, diffs are no longer merged
+    hass.states.async_set("light.kitchen", "off", {"color": "red"})
+    msg = await websocket_client.receive_json()
+    assert msg["event"] == {
+        "c": {"light.kitchen": {"+": {"c": ANY, "lc": ANY, "s": "off"}}}
+    }
+
+
 async def test_non_json_message(
     hass: HomeAssistant, websocket_client, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -451,6 +500,46 @@ async def test_enable_coalesce(
         await asyncio.gather(*send_tasks_with_close)
 
 
+async def test_enable_compressed_messages(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test enabling compressed messages."""
+    websocket_client = await hass_ws_client(hass)
+    decompressor = zlib.decompressobj(
+        wbits=-zlib.MAX_WBITS, zdict=const.COMPRESSED_MESSAGES_DICTIONARY
+    )
+
+    async def _receive_compressed_json() -> Any:
+        msg = await websocket_client.receive()
+        assert msg.type is WSMsgType.BINARY
+        return json_loads(decompressor.decompress(msg.data))
+
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {const.FEATURE_COMPRESSED_MESSAGES: 1},
+        }
+    )
+    msg = await _receive_compressed_json()
+    assert msg["id"] == 1
+    assert msg["success"] is True
+
+    # Messages share the compression stream so
+    # they must be decompressed in order
+    for id_ in range(2, 5):
+        await websocket_client.send_json({"id": id_, "type": "ping"})
+        assert await _receive_compressed_json() == {"id": id_, "type": "pong"}
+
+    # Compression stays enabled when features are set again
+    await websocket_client.send_json(
+        {"id": 5, "type": "supported_features", "features": {}}
+    )
+    msg = await _receive_compressed_json()
+    assert msg["id"] == 5
+    assert msg["success"] is True
+
+
 async def test_binary_message(
     hass: HomeAssistant, websocket_client, caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -26,6 +26,7 @@ from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
+    StateChangeFilter,
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
@@ -552,6 +553,87 @@ async def test_async_track_state_change_event_with_empty_list(
     unsub_single()
 
 
+async def test_async_track_state_change_event_with_state_filter(
+    hass: HomeAssistant,
+) -> None:
+    """Test async_track_state_change_event with a state filter."""
+    state_tracker: list[str | None] = []
+    attribute_tracker: list[str | None] = []
+    delta_tracker: list[str | None] = []
+    coroutine_tracker: list[str | None] = []
+
+    def _new_state(event: Event[EventStateChangedData]) -> str | None:
+        new_state = event.data["new_state"]
+        return new_state.state if new_state else None
+
+    @ha.callback
+    def state_callback(event: Event[EventStateChangedData]) -> None:
+        state_tracker.append(_new_state(event))
+
+    @ha.callback
+    def attribute_callback(event: Event[EventStateChangedData]) -> None:
+        attribute_tracker.append(_new_state(event))
+
+    @ha.callback
+    def delta_callback(event: Event[EventStateChangedData]) -> None:
+        delta_tracker.append(_new_state(event))
+
+    async def coroutine_callback(event: Event[EventStateChangedData]) -> None:
+        coroutine_tracker.append(_new_state(event))
+
+    unsubs = [
+        async_track_state_change_event(
+            hass, "sensor.power", state_callback, state_filter=StateChangeFilter()
+        ),
+        async_track_state_change_event(
+            hass,
+            "sensor.power",
+            attribute_callback,
+            state_filter=StateChangeFilter(state=False, attributes=["unit"]),
+        ),
+        async_track_state_change_event(
+            hass,
+            "sensor.power",
+            delta_callback,
+            state_filter=StateChangeFilter(numeric_delta=5, attributes=["unit"]),
+        ),
+        async_track_state_change_event(
+            hass,
+            "sensor.power",
+            coroutine_callback,
+            state_filter=StateChangeFilter(numeric_delta=5),
+        ),
+    ]
+
+    # Adding the entity always passes
+    hass.states.async_set("sensor.power", "10", {"unit": "W"})
+    # Attribute only changes
+    hass.states.async_set("sensor.power", "10", {"unit": "W", "other": 1})
+    hass.states.async_set("sensor.power", "10", {"unit": "kW"})
+    # Small numeric changes accumulate until they exceed the delta
+    hass.states.async_set("sensor.power", "13", {"unit": "kW"})
+    hass.states.async_set("sensor.power", "16", {"unit": "kW"})
+    hass.states.async_set("sensor.power", "14", {"unit": "kW"})
+    # Moving to a non numeric state always passes
+    hass.states.async_set("sensor.power", "unavailable", {"unit": "kW"})
+    hass.states.async_set("sensor.power", "20", {"unit": "kW"})
+    # Removing the entity always passes
+    hass.states.async_remove("sensor.power")
+    await hass.async_block_till_done()
+
+    assert state_tracker == ["10", "13", "16", "14", "unavailable", "20", None]
+    assert attribute_tracker == ["10", "10", None]
+    assert delta_tracker == ["10", "10", "16", "unavailable", "20", None]
+    assert coroutine_tracker == ["10", "16", "unavailable", "20", None]
+
+    for unsub in unsubs:
+        unsub()
+
+    hass.states.async_set("sensor.power", "30")
+    await hass.async_block_till_done()
+    assert len(state_tracker) == 7
+
+
 async def test_async_track_state_added_domain(hass: HomeAssistant) -> None:
     """Test async_track_state_added_domain."""
     single_entity_id_tracker = []
@@ -2251,6 +2333,70 @@ async def test_track_template_result_iterator(hass: HomeAssistant) -> None:
     assert filter_runs == ["", "sensor.new"]
 
 
+async def test_track_template_result_incremental_aggregate(
+    hass: HomeAssistant,
+) -> None:
+    """Test tracking a template reducing a domain is maintained incrementally."""
+    template_str = (
+        "{{ states.sensor | selectattr('attributes.unit_of_measurement', 'eq', 'W')"
+        " | map(attribute='state') | map('float') | sum }}"
+    )
+    hass.states.async_set("sensor.a", "10", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.b", "5", {"unit_of_measurement": "W"})
+    hass.states.async_set("sensor.c", "3", {"unit_of_measurement": "kW"})
+
+    runs = []
+
+    @ha.callback
+    def refresh_listener(
+        event: Event[EventStateChangedData] | None,
+        updates: list[TrackTemplateResult],
+    ) -> None:
+        runs.append(updates.pop().result)
+
+    template = Template(template_str, hass)
+    info = async_track_template_result(
+        hass, [TrackTemplate(template, None, 0)], refresh_listener
+    )
+    await hass.async_block_till_done()
+    assert info.listeners == {
+        "all": False,
+        "domains": {"sensor"},
+        "entities": set(),
+        "time": False,
+    }
+    renders = template._renders
+
+    hass.states.async_set("sensor.a", "12", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.c", "3", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    hass.states.async_remove("sensor.b")
+    await hass.async_block_till_done()
+    hass.states.async_set("sensor.d", "0.1", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    assert runs == [17.0, 20.0, 15.0, 15.1]
+    assert Template(template_str, hass).async_render() == 15.1
+    assert template._renders == renders
+
+    # Errors are raised by a full render
+    hass.states.async_set("sensor.d", "unknown", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    assert isinstance(runs[-1], TemplateError)
+    assert template._renders > renders
+    renders = template._renders
+
+    hass.states.async_set("sensor.d", "1", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    assert runs[-1] == 16.0
+    assert template._renders == renders
+
+    info.async_remove()
+    hass.states.async_set("sensor.a", "20", {"unit_of_measurement": "W"})
+    await hass.async_block_till_done()
+    assert runs[-1] == 16.0
+
+
 async def test_track_template_result_errors(
     hass: HomeAssistant, caplog: pytest.LogCaptureFixture
 ) -> None:
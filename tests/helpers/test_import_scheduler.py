@@ -0,0 +1,99 @@
+"""Test the import scheduler."""
+
+import asyncio
+from collections.abc import Iterable
+from concurrent.futures import Executor
+from unittest.mock import patch
+
+from homeassistant import loader
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.import_scheduler import (
+    PREFETCH_WORKERS,
+    ImportScheduler,
+    critical_path_priorities,
+)
+
+from tests.common import MockModule, mock_integration
+
+
+async def test_critical_path_priorities() -> None:
+    """Test the priority includes the import times of the dependents."""
+    assert critical_path_priorities(
+        {
+            "http": set(),
+            "cloud": {"http"},
+            "light": {"http"},
+            "hue": {"http", "light"},
+            "sun": set(),
+        },
+        {"http": 0.1, "cloud": 1.0, "light": 0.2, "hue": 0.3},
+    ) == {
+        "http": 1.1,
+        "cloud": 1.0,
+        "light": 0.5,
+        "hue": 0.3,
+        "sun": 0,
+    }
+
+
+async def test_prefetch_order(hass: HomeAssistant) -> None:
+    """Test integrations sharing modules are not prefetched at the same time."""
+    mock_integration(hass, MockModule("http"))
+    mock_integration(hass, MockModule("cloud", dependencies=["http"]))
+    mock_integration(hass, MockModule("light", dependencies=["http"]))
+    mock_integration(hass, MockModule("hue", dependencies=["light"]))
+    mock_integration(hass, MockModule("sun"))
+    mock_integration(hass, MockModule("zone"))
+    integrations = await loader.async_get_integrations(
+        hass, ["http", "cloud", "light", "hue", "sun", "zone"]
+    )
+    for integration in integrations.values():
+        assert await integration.resolve_dependencies()
+
+    running: set[str] = set()
+    started: list[tuple[str, set[str]]] = []
+
+    async def mock_prefetch(
+        integration: loader.Integration,
+        executor: Executor,
+        platform_names: Iterable[str],
+    ) -> None:
+        started.append((integration.domain, running.copy()))
+        running.add(integration.domain)
+        await asyncio.sleep(0)
+        running.remove(integration.domain)
+
+    scheduler = ImportScheduler(
+        hass,
+        integrations,
+        {},
+        {"http": 0.1, "cloud": 1.0, "light": 0.2, "hue": 0.3, "sun": 0.6},
+    )
+    # zone is not prefetched since it imports fast
+    assert scheduler.queue == ["http", "cloud", "sun", "light", "hue"]
+    with patch.object(loader.Integration, "async_prefetch", mock_prefetch):
+        await scheduler.async_run()
+
+    assert started == [
+        ("http", set()),
+        ("sun", {"http"}),
+        ("cloud", set()),
+        ("light", {"cloud"}),
+        ("hue", set()),
+    ]
+    assert all(len(others) < PREFETCH_WORKERS for _, others in started)
+
+
+async def test_prefetch(hass: HomeAssistant) -> None:
+    """Test prefetching an integration and its platforms."""
+    integration = await loader.async_get_integration(hass, "automation")
+    scheduler = ImportScheduler(
+        hass, {"automation": integration}, {"automation": ["config"]}, {"automation": 1}
+    )
+    await scheduler.async_run()
+
+    assert loader.is_component_module_loaded(hass, "automation")
+    assert integration.platforms_are_loaded(["config"])
+    assert {"automation", "automation.config"} <= loader.async_get_import_times(
+        hass
+    ).keys()
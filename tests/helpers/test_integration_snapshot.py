@@ -0,0 +1,82 @@
+"""Test the integration snapshot."""
+
+from datetime import timedelta
+from typing import Any
+from unittest.mock import patch
+
+from homeassistant import loader
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.integration_snapshot import (
+    SAVE_DELAY,
+    STORAGE_KEY,
+    IntegrationSnapshot,
+)
+from homeassistant.util import dt as dt_util
+
+from tests.common import async_fire_time_changed
+
+
+async def _async_save_snapshot(hass: HomeAssistant) -> None:
+    """Save a snapshot of the resolved integrations."""
+    IntegrationSnapshot(hass).async_schedule_save()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SAVE_DELAY))
+    await hass.async_block_till_done()
+
+
+async def test_save_and_load(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test the integrations of the snapshot are resolved without manifests."""
+    automation = await loader.async_get_integration(hass, "automation")
+    assert await automation.resolve_dependencies()
+    await automation.async_get_component()
+    await automation.async_get_platforms(["config"])
+    await _async_save_snapshot(hass)
+
+    data = hass_storage[STORAGE_KEY]["data"]
+    assert data["imports"] == ["automation"]
+    assert data["platforms"] == {"automation": ["config"]}
+    assert data["import_times"].keys() == {"automation"}
+    assert data["integrations"]["automation"]["all_dependencies"] == sorted(
+        automation.all_dependencies
+    )
+
+    hass.data[loader.DATA_INTEGRATIONS].clear()
+    snapshot = IntegrationSnapshot(hass)
+    with patch.object(loader.Integration, "resolve_from_root") as mock_resolve:
+        assert await snapshot.async_load()
+        integration = await loader.async_get_integration(hass, "automation")
+    assert not mock_resolve.called
+    assert integration is not automation
+    assert integration.all_dependencies_resolved
+    assert integration.all_dependencies == automation.all_dependencies
+    assert integration.top_level_files == automation.top_level_files
+    assert snapshot.imports == ["automation"]
+
+    with (
+        patch.object(loader.Integration, "async_get_component") as mock_component,
+        patch.object(loader.Integration, "async_get_platforms") as mock_platforms,
+    ):
+        snapshot.async_preimport({"automation", "light"})
+        await hass.async_block_till_done(wait_background_tasks=True)
+    assert mock_component.call_count == 1
+    mock_platforms.assert_called_once_with(data["platforms"]["automation"])
+
+
+async def test_invalidated(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test the snapshot is not used when the version or integrations changed."""
+    automation = await loader.async_get_integration(hass, "automation")
+    await _async_save_snapshot(hass)
+    data = hass_storage[STORAGE_KEY]["data"]
+
+    with patch("homeassistant.helpers.integration_snapshot.HA_VERSION", "1970.1.0"):
+        assert not await IntegrationSnapshot(hass).async_load()
+
+    data["fingerprint"][str(automation.file_path)] += 1
+    assert not await IntegrationSnapshot(hass).async_load()
+
+    data["fingerprint"][str(automation.file_path)] -= 1
+    hass.config.recovery_mode = True
+    assert not await IntegrationSnapshot(hass).async_load()
+
+    hass.config.recovery_mode = False
+    assert await IntegrationSnapshot(hass).async_load()
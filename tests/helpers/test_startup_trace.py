@@ -0,0 +1,127 @@
+"""Test the startup trace."""
+
+from unittest.mock import patch
+
+from homeassistant import setup
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers.startup_trace import (
+    CriticalPathEntry,
+    StartupTrace,
+    TracePhases,
+    async_enable_startup_trace,
+    get_startup_trace,
+)
+
+from tests.common import MockModule, mock_integration
+
+
+def _trace_with_spans() -> StartupTrace:
+    """Return a trace of a startup with three stages."""
+    with patch("homeassistant.helpers.startup_trace.monotonic", return_value=100):
+        trace = StartupTrace()
+    trace.async_add_stage("recorder", {"recorder"})
+    trace.async_add_stage("stage 1", {"http", "cloud"})
+    trace.async_add_stage("stage 2", {"light", "hue", "sun"})
+    trace.async_add_dependencies("cloud", ["http"])
+    trace.async_add_dependencies("hue", ["light"])
+    trace.async_add_dependencies("light", ["http"])
+    trace.add_span("recorder", "setup", None, 100, 101)
+    trace.add_span("http", TracePhases.MANIFEST, None, 100.5, 100.6)
+    trace.add_span("http", "setup", None, 101, 102)
+    trace.add_span("cloud", "setup", None, 102, 105)
+    trace.add_span("sun", "setup", None, 105, 106)
+    trace.add_span("light", TracePhases.IMPORT_EXECUTOR, None, 105, 107)
+    trace.add_span("light", "setup", None, 107, 108)
+    trace.add_span("hue", "setup", None, 108, 109)
+    trace.add_span("hue", "config_entry_setup", "entry_id", 109, 112)
+    return trace
+
+
+async def test_critical_path() -> None:
+    """Test the critical path follows the dependencies and stages."""
+    trace = _trace_with_spans()
+    assert trace.critical_path() == [
+        CriticalPathEntry("recorder", 100, 101),
+        CriticalPathEntry("http", 100.5, 102),
+        CriticalPathEntry("cloud", 102, 105),
+        CriticalPathEntry("light", 105, 108),
+        CriticalPathEntry("hue", 108, 112),
+    ]
+    assert StartupTrace().critical_path() == []
+
+
+async def test_chrome_trace() -> None:
+    """Test exporting the trace as Chrome trace events."""
+    trace = _trace_with_spans()
+    chrome_trace = trace.as_chrome_trace()
+    events = chrome_trace["traceEvents"]
+
+    tracks = {
+        event["args"]["name"]: event["tid"]
+        for event in events
+        if event["name"] == "thread_name"
+    }
+    assert sorted(tracks) == ["cloud", "http", "hue", "light", "recorder", "sun"]
+    hue_spans = [
+        event
+        for event in events
+        if event["ph"] == "X" and event["tid"] == tracks["hue"]
+    ]
+    assert [
+        (span["name"], span["ts"], span["dur"], span["args"]["critical_path"])
+        for span in hue_spans
+    ] == [
+        ("setup", 8_000_000, 1_000_000, True),
+        ("config_entry_setup entry_id", 9_000_000, 3_000_000, True),
+    ]
+    sun_span = next(
+        event
+        for event in events
+        if event["ph"] == "X" and event["tid"] == tracks["sun"]
+    )
+    assert sun_span["args"]["critical_path"] is False
+
+    # The dependencies are flows from the end of the dependency to the start
+    flows = [
+        (event["ph"], event["tid"], event["ts"])
+        for event in events
+        if event.get("cat") == "dependency" and event["id"] == 2
+    ]
+    assert flows == [
+        ("s", tracks["light"], 8_000_000 - 1),
+        ("f", tracks["hue"], 8_000_000),
+    ]
+    assert chrome_trace["otherData"]["dependencies"] == {
+        "cloud": ["http"],
+        "hue": ["light"],
+        "light": ["http"],
+    }
+    assert [
+        entry["domain"] for entry in chrome_trace["otherData"]["critical_path"]
+    ] == ["recorder", "http", "cloud", "light", "hue"]
+
+
+async def test_trace_setup(hass: HomeAssistant) -> None:
+    """Test setting up an integration during startup is traced."""
+    hass.set_state(CoreState.not_running)
+    trace = async_enable_startup_trace(hass)
+    mock_integration(hass, MockModule("dep"))
+    mock_integration(hass, MockModule("comp", dependencies=["dep"]))
+
+    assert await setup.async_setup_component(hass, "comp", {})
+
+    assert trace.dependencies == {"comp": {"dep"}, "dep": set()}
+    phases = {(span.domain, span.phase) for span in trace.spans}
+    assert {
+        ("comp", TracePhases.MANIFEST),
+        ("comp", TracePhases.REQUIREMENTS),
+        ("comp", setup.SetupPhases.SETUP),
+        ("dep", setup.SetupPhases.SETUP),
+    } <= phases
+
+    # Nothing is recorded once the startup is finished
+    trace.async_finish()
+    assert get_startup_trace(hass) is None
+    span_count = len(trace.spans)
+    trace.add_span("comp", setup.SetupPhases.SETUP, None, 0, 1)
+    assert len(trace.spans) == span_count
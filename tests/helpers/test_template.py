@@ -5170,6 +5170,65 @@ async def test_cache_garbage_collection() -> None:
     assert not template._NO_HASS_ENV.template_cache.get(template_string)
 
 
+async def test_bytecode_cache(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test compiled templates are persisted and reused."""
+    template_string = "{{ 'bytecode' ~ 'cache' }}"
+    await template.async_load_bytecode_cache(hass)
+    tpl = template.Template(template_string, hass)
+    assert tpl.async_render() == "bytecodecache"
+    await hass.async_block_till_done()
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=template.BYTECODE_CACHE_SAVE_DELAY)
+    )
+    await hass.async_block_till_done()
+    data = hass_storage[template.BYTECODE_CACHE_STORAGE_KEY]["data"]
+    assert len(data["templates"]) == 1
+
+    # Reload the cache and drop the in-memory compiled templates
+    await template.async_load_bytecode_cache(hass)
+    tpl._env.template_cache.clear()
+    with patch("jinja2.Environment.compile") as mock_compile:
+        tpl = template.Template(template_string, hass)
+        assert tpl.async_render() == "bytecodecache"
+    assert not mock_compile.called
+
+
+async def test_bytecode_cache_version_mismatch(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the bytecode cache is discarded when the version changes."""
+    hass_storage[template.BYTECODE_CACHE_STORAGE_KEY] = {
+        "version": template.BYTECODE_CACHE_STORAGE_VERSION,
+        "key": template.BYTECODE_CACHE_STORAGE_KEY,
+        "data": {
+            "cache_version": "old",
+            "templates": {"abc": "invalid"},
+        },
+    }
+    bytecode_cache = template.TemplateBytecodeCache(hass)
+    await bytecode_cache.async_load()
+    assert bytecode_cache._entries == {}
+
+
+async def test_bytecode_cache_eviction(hass: HomeAssistant) -> None:
+    """Test the least recently used templates are evicted."""
+    bytecode_cache = template.TemplateBytecodeCache(hass)
+    await bytecode_cache.async_load()
+    env = template.TemplateEnvironment(None)
+    sources = [f"{{{{ {i} }}}}" for i in range(3)]
+    with patch.object(template, "BYTECODE_CACHE_SIZE", 2):
+        for source in sources[:2]:
+            bytecode_cache.add(source, env.compile(source))
+        assert bytecode_cache.get(sources[0]) is not None
+        bytecode_cache.add(sources[2], env.compile(sources[2]))
+    assert bytecode_cache.get(sources[0]) is not None
+    assert bytecode_cache.get(sources[1]) is None
+    assert bytecode_cache.get(sources[2]) is not None
+
+
 def test_is_template_string() -> None:
     """Test is template string."""
     assert template.is_template_string("{{ x }}") is True
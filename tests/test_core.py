@@ -1169,6 +1169,119 @@ async def test_eventbus_filtered_listener(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_shared_filter(hass: HomeAssistant) -> None:
+    """Test a filter shared by listeners runs once per event."""
+    calls = []
+    filter_calls = []
+
+    @ha.callback
+    def mock_filter(event_data):
+        """Mock filter."""
+        filter_calls.append(event_data)
+        return not event_data["filtered"]
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(("filtered", event.data))
+
+    @ha.callback
+    def match_all_listener(event):
+        """Mock listener of all events."""
+        calls.append(("match_all", event.data))
+
+    hass.bus.async_listen(MATCH_ALL, match_all_listener)
+    unsub = hass.bus.async_listen("test", listener, event_filter=mock_filter)
+    hass.bus.async_listen("test", listener, event_filter=mock_filter)
+
+    hass.bus.async_fire("test", {"filtered": True})
+    hass.bus.async_fire("test", {"filtered": False})
+    assert filter_calls == [{"filtered": True}, {"filtered": False}]
+    assert calls == [
+        ("match_all", {"filtered": True}),
+        ("filtered", {"filtered": False}),
+        ("filtered", {"filtered": False}),
+        ("match_all", {"filtered": False}),
+    ]
+
+    calls.clear()
+    unsub()
+    hass.bus.async_fire("test", {"filtered": False})
+    assert calls == [
+        ("filtered", {"filtered": False}),
+        ("match_all", {"filtered": False}),
+    ]
+
+
+async def test_eventbus_shared_filter_keeps_order(hass: HomeAssistant) -> None:
+    """Test listeners sharing a filter still run in the order they were added."""
+    calls = []
+    filter_calls = []
+
+    @ha.callback
+    def mock_filter(event_data):
+        """Mock filter."""
+        filter_calls.append(event_data)
+        return True
+
+    def _listener(name):
+        @ha.callback
+        def listener(event):
+            """Mock listener."""
+            calls.append(name)
+
+        return listener
+
+    hass.bus.async_listen("test", _listener("a"), event_filter=mock_filter)
+    hass.bus.async_listen("test", _listener("b"))
+    hass.bus.async_listen("test", _listener("c"), event_filter=mock_filter)
+    hass.bus.async_listen("test", _listener("d"), event_filter=mock_filter)
+
+    hass.bus.async_fire("test", {})
+    assert calls == ["a", "b", "c", "d"]
+    assert len(filter_calls) == 2
+
+
+async def test_eventbus_listeners_changed_while_firing(hass: HomeAssistant) -> None:
+    """Test listeners added or removed while firing apply to the next event."""
+    calls = []
+    unsubs = []
+
+    @ha.callback
+    def first_listener(event):
+        """Add a listener and remove the second listener."""
+        calls.append("first")
+        unsubs.pop()()
+        hass.bus.async_listen("test", third_listener)
+
+    @ha.callback
+    def second_listener(event):
+        """Mock listener."""
+        calls.append("second")
+
+    @ha.callback
+    def third_listener(event):
+        """Mock listener."""
+        calls.append("third")
+
+    hass.bus.async_listen_once("test", first_listener)
+    unsubs.append(hass.bus.async_listen("test", second_listener))
+
+    hass.bus.async_fire("test")
+    assert calls == ["first", "second"]
+
+    calls.clear()
+    hass.bus.async_fire("test")
+    assert calls == ["third"]
+
+    # Listeners of all events are used for event types without listeners
+    hass.bus.async_listen(MATCH_ALL, second_listener)
+    calls.clear()
+    hass.bus.async_fire("other")
+    hass.bus.async_fire("test")
+    assert calls == ["second", "third", "second"]
+
+
 async def test_eventbus_run_immediately_callback(hass: HomeAssistant) -> None:
     """Test we can call events immediately with a callback."""
     calls = []
@@ -1492,6 +1605,62 @@ async def test_statemachine_remove(hass: HomeAssistant) -> None:
     assert len(events) == 1
 
 
+async def test_statemachine_changelog(hass: HomeAssistant) -> None:
+    """Test the changelog of state changes."""
+    start = hass.states.async_resume_sequence()
+    hass.states.async_set("light.bowl", "on")
+    hass.states.async_set("light.kitchen", "on")
+    assert hass.states.async_resume_sequence() == start + 2
+    # Reported states are not changes
+    hass.states.async_set("light.kitchen", "on")
+    assert hass.states.async_changed_since(start) == ["light.kitchen", "light.bowl"]
+    assert hass.states.async_changed_since(start + 1) == ["light.kitchen"]
+    assert hass.states.async_changed_since(start + 2) == []
+    # Sequence numbers from the future are from another changelog
+    assert hass.states.async_changed_since(start + 3) is None
+
+    hass.states.async_set("light.bowl", "off")
+    assert hass.states.async_remove("light.kitchen")
+    assert hass.states.async_changed_since(start + 1) == [
+        "light.kitchen",
+        "light.bowl",
+    ]
+
+    # Changes of the oldest entities are dropped from the changelog
+    with patch.object(ha, "MAX_STATE_CHANGELOG_SIZE", 1):
+        hass.states.async_set("light.bowl", "on")
+        hass.states.async_set("light.kitchen", "on")
+    end = hass.states.async_resume_sequence()
+    assert hass.states.async_changed_since(end - 2) is None
+    assert hass.states.async_changed_since(end - 1) == ["light.kitchen"]
+
+
+async def test_statemachine_resume_sequence_nested_changes(
+    hass: HomeAssistant,
+) -> None:
+    """Test the resume sequence when listeners change states."""
+    start = hass.states.async_resume_sequence()
+    sequences: list[tuple[str, int]] = []
+
+    @callback
+    def _change_nested(event: ha.Event[ha.EventStateChangedData]) -> None:
+        if event.data["entity_id"] == "light.outer":
+            hass.states.async_set("light.nested", "on")
+
+    @callback
+    def _record_sequence(event: ha.Event[ha.EventStateChangedData]) -> None:
+        sequences.append((event.data["entity_id"], hass.states.async_resume_sequence()))
+
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _change_nested)
+    hass.bus.async_listen(EVENT_STATE_CHANGED, _record_sequence)
+    hass.states.async_set("light.outer", "on")
+
+    # The nested change reaches the listener before the outer
+    # change, so it may only resume from before the outer change
+    assert sequences == [("light.nested", start), ("light.outer", start + 1)]
+    assert hass.states.async_resume_sequence() == start + 2
+
+
 async def test_state_machine_case_insensitivity(hass: HomeAssistant) -> None:
     """Test setting and getting states entity_id insensitivity."""
     events = async_capture_events(hass, EVENT_STATE_CHANGED)
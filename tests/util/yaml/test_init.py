@@ -767,3 +767,80 @@ def test_load_yaml_wrap_oserror(
         pytest.raises(load_yaml_exception),
     ):
         yaml_loader.load_yaml("bla")
+
+
+@pytest.mark.usefixtures("try_both_loaders")
+def test_yaml_cache(tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test only changed files and the files including them are parsed again."""
+    monkeypatch.setenv("YAML_CACHE_TEST", "env")
+    (tmp_path / yaml.SECRET_YAML).write_text("password: pwhash\n")
+    (tmp_path / "included.yaml").write_text("key: !secret password\n")
+    (tmp_path / "other.yaml").write_text("- value\n")
+    (tmp_path / "dir").mkdir()
+    (tmp_path / "dir" / "one.yaml").write_text("one: 1\n")
+    config_file = tmp_path / YAML_CONFIG_FILE
+    config_file.write_text(
+        "included: !include included.yaml\n"
+        "other: !include other.yaml\n"
+        "dir: !include_dir_merge_named dir\n"
+        "env: !env_var YAML_CACHE_TEST\n"
+    )
+    cache = yaml.YamlCache()
+
+    def _load() -> tuple[Any, list[str]]:
+        with patch.object(
+            yaml_loader, "parse_yaml", wraps=yaml_loader.parse_yaml
+        ) as parse_mock:
+            loaded = yaml.load_yaml(config_file, yaml.Secrets(tmp_path), cache)
+        assert loaded == yaml.load_yaml(config_file, yaml.Secrets(tmp_path))
+        # Secrets are loaded for every load to check if they changed
+        return loaded, [
+            name
+            for call in parse_mock.call_args_list
+            if (name := pathlib.Path(call.args[0].name).name) != yaml.SECRET_YAML
+        ]
+
+    data, parsed = _load()
+    assert data == {
+        "included": {"key": "pwhash"},
+        "other": ["value"],
+        "dir": {"one": 1},
+        "env": "env",
+    }
+    assert parsed == [YAML_CONFIG_FILE, "included.yaml", "other.yaml", "one.yaml"]
+    assert data["included"].__config_file__ == str(config_file)
+    assert data["included"].__line__ == 1
+    assert data["other"].__line__ == 2
+
+    # Changes to the loaded data don't change the cache
+    data["included"]["key"] = "changed"
+    data.pop("other")
+    data, parsed = _load()
+    assert data["included"] == {"key": "pwhash"}
+    assert data["other"] == ["value"]
+    assert parsed == []
+
+    (tmp_path / "other.yaml").write_text("- changed\n")
+    data, parsed = _load()
+    assert data["other"] == ["changed"]
+    assert parsed == [YAML_CONFIG_FILE, "other.yaml"]
+
+    (tmp_path / yaml.SECRET_YAML).write_text("password: changed\n")
+    data, parsed = _load()
+    assert data["included"] == {"key": "changed"}
+    assert parsed == [YAML_CONFIG_FILE, "included.yaml"]
+
+    (tmp_path / "dir" / "two.yaml").write_text("two: 2\n")
+    data, parsed = _load()
+    assert data["dir"] == {"one": 1, "two": 2}
+    assert parsed == [YAML_CONFIG_FILE, "two.yaml"]
+
+    monkeypatch.setenv("YAML_CACHE_TEST", "changed")
+    data, parsed = _load()
+    assert data["env"] == "changed"
+    assert parsed == [YAML_CONFIG_FILE]
+
+    # A file which only changed its modification time isn't parsed again
+    os.utime(tmp_path / "other.yaml")
+    _, parsed = _load()
+    assert parsed == []